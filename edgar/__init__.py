@@ -48,6 +48,7 @@ from edgar.xbrl import XBRL
 from edgar.files.html import Document
 from edgar.financials import Financials, MultiFinancials
 from edgar.storage import use_local_storage, is_using_local_storage, download_edgar_data, download_filings
+from edgar.current_feed import CurrentFilingsTailer
 
 # Another name for get_current_filings
 get_latest_filings = get_current_filings
@@ -19,7 +19,7 @@ import pyarrow as pa
 import pyarrow.compute as pc
 import pyarrow.csv as pa_csv
 import pyarrow.parquet as pq
-from bs4 import BeautifulSoup
+from lxml import etree
 from rich import box
 from rich.columns import Columns
 from rich.console import Group
@@ -67,8 +67,7 @@ from edgar.reference.tickers import find_ticker
 from edgar.richtools import repr_rich, print_rich, rich_to_text
 from edgar.search import BM25Search, RegexSearch
 from edgar.sgml import FilingSGML, Reports, Statements, FilingHeader
-from edgar.storage import local_filing_path, is_using_local_storage
-from edgar.xmltools import child_text
+from edgar.storage import local_filing_path, is_using_local_storage, read_local_filing
 from edgar.xbrl import XBRL, XBRLFilingWithNoXbrlData
 
 """ Contain functionality for working with SEC filing indexes and filings
@@ -1002,6 +1001,7 @@ Get the current filings from the SEC. Use this to get the filings filed after th
 GET_CURRENT_URL = "https://www.sec.gov/cgi-bin/browse-edgar?action=getcurrent&output=atom&owner=only&count=100"
 title_regex = re.compile(r"(.*) - (.*) \((\d+)\) \((.*)\)")
 summary_regex = re.compile(r'<b>([^<]+):</b>\s+([^<\s]+)')
+ATOM_NAMESPACE = "http://www.w3.org/2005/Atom"
 
 
 def parse_title(title: str):
@@ -1055,15 +1055,26 @@ def get_current_url(atom: bool = True,
 def get_current_entries_on_page(count: int, start: int, form: Optional[str] = None, owner: str = 'include'):
     url = get_current_url(count=count, start=start, form=form if form else '', owner=owner, atom=True)
     response = get_with_retry(url)
+    return parse_current_entries(response.content)
 
-    soup = BeautifulSoup(response.text, features="xml")
+
+def parse_current_entries(content: Union[str, bytes]) -> List[Dict[str, Any]]:
+    """
+    Parse the entries of a page of the current filings Atom feed into dicts with the
+    form, company, cik, filing_date and accession_number, newest first as in the feed
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    root = etree.fromstring(content, parser=etree.XMLParser(recover=True, resolve_entities=False))
     entries = []
-    for entry in soup.find_all("entry"):
+    if root is None:
+        return entries
+    for entry in root.iterfind(f"{{{ATOM_NAMESPACE}}}entry"):
         # The title contains the form type, company name, CIK, and status e.g 4 - WILKS LEWIS (0001076463) (Reporting)
-        title = child_text(entry, "title")
+        title = entry.findtext(f"{{{ATOM_NAMESPACE}}}title", default='').strip()
         form_type, company_name, cik, status = parse_title(title)
         # The summary contains the filing date and link to the filing
-        summary = child_text(entry, "summary")
+        summary = entry.findtext(f"{{{ATOM_NAMESPACE}}}summary", default='')
         filing_date, accession_number = parse_summary(summary)
 
         entries.append({'form': form_type,
@@ -1085,7 +1096,9 @@ def get_current_filings(form: str = '',
     page_size = page_size if page_size in [10, 20, 40, 80, 100] else 40
     start = 0
 
-    entries = get_current_entries_on_page(count=page_size, start=start, form=form, owner=owner)
+    # The pages are cached so paging back and forth is quick, but a new call gets the latest filings.
+    # The first page is read without the cache, leaving the pages of other CurrentFilings cached
+    entries = get_current_entries_on_page.__wrapped__(count=page_size, start=start, form=form, owner=owner)
     if not entries:
         return CurrentFilings(filing_index=_empty_filing_index(), owner=owner, form=form, page_size=page_size)
     return CurrentFilings(filing_index=pa.Table.from_pylist(entries), owner=owner, form=form, page_size=page_size)
@@ -1517,9 +1530,9 @@ class Filing:
         if self._sgml:
             return self._sgml
         if is_using_local_storage():
-            local_path = local_filing_path(str(self.filing_date), self.accession_no)
-            if local_path.exists():
-                self._sgml = FilingSGML.from_source(local_path)
+            content = read_local_filing(str(self.filing_date), self.accession_no)
+            if content is not None:
+                self._sgml = FilingSGML.from_text(content)
 
         if self._sgml is None:
             self._sgml = FilingSGML.from_filing(self)
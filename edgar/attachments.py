@@ -28,6 +28,7 @@ from edgar.richtools import repr_rich, print_xml, print_rich, rich_to_text
 from edgar.core import sec_dot_gov, binary_extensions, text_extensions, has_html_content
 from edgar.httprequests import get_with_retry, download_file, download_file_async
 from edgar.httpclient import async_http_client
+from edgar.documentcache import get_document_cache
 
 
 xbrl_document_types = ['XBRL INSTANCE DOCUMENT', 'XBRL INSTANCE FILE', 'EXTRACTED XBRL INSTANCE DOCUMENT']
@@ -40,6 +41,11 @@ def sec_document_url(attachment_url: str) -> str:
     attachment_url = re.sub(r"ix(\.xhtml)?\?doc=/", "", attachment_url)
     return f"{sec_dot_gov}{attachment_url}"
 
+def accession_from_url(url: str) -> Optional[str]:
+    """Get the accession number folder e.g. 000032019324000123 from a document url"""
+    match = re.search(r"/data/\d+/(\d{18})/", url)
+    return match.group(1) if match else None
+
 def sequence_sort_key(x):
     seq = x.sequence_number
     if seq.strip() == '':  # Handle empty or whitespace-only strings
@@ -188,8 +194,11 @@ class Attachment:
     def content(self):
         if self.sgml_document:
             return self.sgml_document.content
-        else:
-            return download_file(self.url)
+        url = self.url
+        accession_number = accession_from_url(url)
+        if accession_number and not self.empty:
+            return get_document_cache().get_or_fetch(accession_number, self.document, lambda: download_file(url))
+        return download_file(url)
 
     @property
     def url(self):
@@ -253,10 +262,11 @@ class Attachment:
             file_path = path
 
         # Save the file
-        if isinstance(self.content, bytes):
-            file_path.write_bytes(self.content)
+        content = self.content
+        if isinstance(content, bytes):
+            file_path.write_bytes(content)
         else:
-            file_path.write_text(self.content)
+            file_path.write_text(content)
 
         return str(file_path)
 
@@ -35,8 +35,13 @@ __all__ = [
 
 class CompanyReport:
 
-    def __init__(self, filing):
+    def __init__(self, filing, lazy: bool = False):
+        """
+        :param filing: The filing of the report
+        :param lazy: Only chunk the items of the document that are requested, for getting a few items of many reports
+        """
         self._filing = filing
+        self._lazy = lazy
 
     @property
     def filing_date(self):
@@ -74,6 +79,9 @@ class CompanyReport:
     @property
     @lru_cache(maxsize=1)
     def chunked_document(self):
+        if self._lazy:
+            # Items are chunked on demand so getting one item does not chunk the whole document
+            return ChunkedDocument(self._filing.html(), lazy=True, accession_number=self._filing.accession_no)
         return ChunkedDocument(self._filing.html())
 
     @property
@@ -240,9 +248,9 @@ class TenK(CompanyReport):
         }
     })
 
-    def __init__(self, filing):
+    def __init__(self, filing, lazy: bool = False):
         assert filing.form in ['10-K', '10-K/A'], f"This form should be a 10-K but was {filing.form}"
-        super().__init__(filing)
+        super().__init__(filing, lazy=lazy)
 
     @property
     def business(self):
@@ -379,9 +387,9 @@ class TenQ(CompanyReport):
         }
     })
 
-    def __init__(self, filing):
+    def __init__(self, filing, lazy: bool = False):
         assert filing.form in ['10-Q', '10-Q/A'], f"This form should be a 10-Q but was {filing.form}"
-        super().__init__(filing)
+        super().__init__(filing, lazy=lazy)
 
     def __str__(self):
         return f"""TenQ('{self.company}')"""
@@ -484,9 +492,9 @@ class TwentyF(CompanyReport):
         }
     })
 
-    def __init__(self, filing):
+    def __init__(self, filing, lazy: bool = False):
         assert filing.form in ['20-F', '20-F/A'], f"This form should be a 20-F but was {filing.form}"
-        super().__init__(filing)
+        super().__init__(filing, lazy=lazy)
 
     def __str__(self):
         return f"""TwentyF('{self.company}')"""
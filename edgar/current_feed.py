@@ -0,0 +1,206 @@
+"""
+Follow the current filings feed and get each new filing as soon as it appears.
+
+`get_current_filings` returns a page of the most recent filings. `CurrentFilingsTailer` polls the first
+page of the feed every `interval` seconds and yields the filings it has not seen before, oldest first.
+If every filing on a page is new the tailer reads the next page as well, so no filings are missed
+when many are filed between polls. Filings are deduplicated by accession number.
+
+Each poll is a conditional request, so when the server supports it an unchanged feed is a 304 with no body.
+The requests wait for the throttler shared with the rest of the library and back off when the SEC
+responds with 429 Too Many Requests.
+
+```
+tailer = CurrentFilingsTailer(form='8-K', interval=5)
+
+async for filing in tailer:
+    print(filing)
+
+# Or with a callback, blocking until stopped
+tailer.run(lambda filing: print(filing))
+```
+"""
+import asyncio
+from collections import OrderedDict
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from httpx import AsyncClient, HTTPStatusError, RequestError
+
+from edgar._filings import Filing, get_current_url, parse_current_entries
+from edgar.core import log
+from edgar.httpclient import async_http_client
+from edgar.httprequests import TooManyRequestsError, get_throttler
+
+__all__ = ['CurrentFilingsTailer']
+
+PAGE_SIZES = [10, 20, 40, 80, 100]
+MAX_BACKOFF = 300
+
+
+class CurrentFilingsTailer:
+    """
+    Poll the current filings feed and get only the filings that are new since the last poll
+    """
+
+    def __init__(self,
+                 form: str = '',
+                 owner: str = 'include',
+                 interval: float = 10.0,
+                 page_size: int = 100,
+                 max_pages: int = 10,
+                 include_existing: bool = False,
+                 max_seen: int = 50000):
+        """
+        :param form: Only follow filings of this form e.g. 8-K
+        :param owner: Whether to include the filings of insiders. 'include', 'exclude' or 'only'
+        :param interval: The seconds between polls
+        :param page_size: The number of filings on a page of the feed. One of 10, 20, 40, 80 or 100
+        :param max_pages: The most pages to read in one poll when every filing on a page is new
+        :param include_existing: Yield the filings already in the feed on the first poll. By default
+                                 they are only marked as seen so only filings after the start are yielded
+        :param max_seen: The number of accession numbers remembered to deduplicate filings
+        """
+        self.form = form or ''
+        self.owner = owner if owner in ['include', 'exclude', 'only'] else 'include'
+        self.interval = interval
+        self.page_size = page_size if page_size in PAGE_SIZES else 100
+        self.max_pages = max(1, max_pages)
+        self.include_existing = include_existing
+        self.max_seen = max_seen
+        self.polls = 0
+        self.not_modified = 0
+        # Whether a poll has completed and marked the filings already in the feed as seen
+        self._primed = False
+        self._seen: OrderedDict = OrderedDict()
+        # The ETag and Last-Modified of the first page for the conditional requests
+        self._validators: Dict[str, str] = {}
+        self._backoff = 0.0
+        self._stopped = False
+
+    def __len__(self):
+        return len(self._seen)
+
+    def __contains__(self, accession_number: str):
+        return accession_number in self._seen
+
+    def stop(self):
+        """Stop tailing after the current poll"""
+        self._stopped = True
+
+    def _page_url(self, start: int) -> str:
+        return get_current_url(atom=True, count=self.page_size, start=start, form=self.form, owner=self.owner)
+
+    async def _get_page(self, client: AsyncClient, start: int) -> Tuple[Optional[List[dict]], Dict[str, str]]:
+        """
+        Get the entries on a page of the feed, or None if the first page has not changed,
+        and the ETag and Last-Modified validators of the page
+        """
+        headers = {}
+        if start == 0:
+            if 'etag' in self._validators:
+                headers['If-None-Match'] = self._validators['etag']
+            if 'last-modified' in self._validators:
+                headers['If-Modified-Since'] = self._validators['last-modified']
+        url = self._page_url(start)
+        throttler = get_throttler()
+        await throttler.wait_for_ticket_async()
+        throttler.update_metrics()
+        response = await client.get(url, headers=headers)
+        if response.status_code == 429:
+            raise TooManyRequestsError(url)
+        if response.status_code == 304:
+            return None, self._validators
+        response.raise_for_status()
+        validators = {name: response.headers[name] for name in ['etag', 'last-modified'] if name in response.headers}
+        return parse_current_entries(response.content), validators
+
+    def _add_seen(self, accession_number: str):
+        self._seen[accession_number] = None
+        while len(self._seen) > self.max_seen:
+            self._seen.popitem(last=False)
+
+    async def poll(self, client: AsyncClient) -> List[Filing]:
+        """
+        Read the feed once and return the filings not seen before, oldest first
+        """
+        # Until a poll completes the filings in the feed are the existing ones, even if earlier polls failed
+        first_poll = not self._primed
+        self.polls += 1
+        new_entries = []
+        validators = self._validators
+        for page in range(self.max_pages):
+            entries, page_validators = await self._get_page(client, start=page * self.page_size)
+            if page == 0:
+                validators = page_validators
+            if entries is None:
+                self.not_modified += 1
+                break
+            page_entries = [entry for entry in entries if entry['accession_number'] not in self._seen]
+            new_entries.extend(page_entries)
+            # Only read the next page if every filing on this one is new and there could be more
+            if first_poll and not self.include_existing:
+                break
+            if len(page_entries) < len(entries) or len(entries) < self.page_size:
+                break
+
+        filings = []
+        # The feed is newest first. Return the oldest first, once per accession number
+        for entry in reversed(new_entries):
+            if entry['accession_number'] in self._seen:
+                continue
+            self._add_seen(entry['accession_number'])
+            filings.append(Filing(cik=int(entry['cik']),
+                                  company=entry['company'],
+                                  form=entry['form'],
+                                  filing_date=entry['filing_date'].isoformat(),
+                                  accession_no=entry['accession_number']))
+        # Keep the validators of the first page only once every page of the poll has been read.
+        # If a later page fails the next poll reads the changed feed again instead of getting a 304
+        self._validators = validators
+        self._primed = True
+        if first_poll and not self.include_existing:
+            return []
+        return filings
+
+    async def _poll_with_backoff(self, client: AsyncClient) -> List[Filing]:
+        try:
+            filings = await self.poll(client)
+            self._backoff = 0.0
+            return filings
+        except (TooManyRequestsError, RequestError, HTTPStatusError) as e:
+            # Wait longer after each failure, and much longer when the SEC asks to slow down
+            minimum = 60 if isinstance(e, TooManyRequestsError) else self.interval
+            self._backoff = min(max(self._backoff * 2, minimum), MAX_BACKOFF)
+            log.warning(f"Could not poll the current filings ({e}). Retrying in {self._backoff:.0f}s")
+            return []
+
+    async def tail(self, max_polls: Optional[int] = None) -> AsyncIterator[Filing]:
+        """
+        Yield each new filing as it appears in the feed until stopped, or after max_polls polls
+        """
+        self._stopped = False
+        polls = 0
+        async with async_http_client() as client:
+            while not self._stopped:
+                for filing in await self._poll_with_backoff(client):
+                    yield filing
+                polls += 1
+                if self._stopped or (max_polls is not None and polls >= max_polls):
+                    break
+                await asyncio.sleep(self._backoff or self.interval)
+
+    def __aiter__(self) -> AsyncIterator[Filing]:
+        return self.tail()
+
+    async def run_async(self, callback: Callable[[Filing], None], max_polls: Optional[int] = None):
+        """Call the callback with each new filing until stopped, or after max_polls polls"""
+        async for filing in self.tail(max_polls=max_polls):
+            callback(filing)
+
+    def run(self, callback: Callable[[Filing], None], max_polls: Optional[int] = None):
+        """Call the callback with each new filing, blocking until stopped or after max_polls polls"""
+        asyncio.run(self.run_async(callback, max_polls=max_polls))
+
+    def __repr__(self):
+        return (f"CurrentFilingsTailer(form='{self.form}', owner='{self.owner}', interval={self.interval}, "
+                f"seen={len(self)})")
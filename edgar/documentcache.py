@@ -0,0 +1,322 @@
+"""
+A process-wide cache for the documents in a filing.
+
+Filing.sgml(), Attachment.content, Filing.html() and XBRL.from_filing all read the same bytes for a filing.
+The DocumentCache keys content by (accession number, document name) so that every consumer is served from one fetch.
+
+There are two tiers
+- A memory tier bounded by the total size of the cached content. Least recently used entries are evicted first
+- An optional disk tier under `<edgar data directory>/documents`. Content is gzip compressed on disk
+  and the oldest files are evicted when the tier grows beyond its size limit
+
+The tiers can be configured with environment variables
+
+    EDGAR_DOCUMENT_CACHE_MEMORY_MB  - size of the memory tier in MB (default 256, 0 disables)
+    EDGAR_DOCUMENT_CACHE_DISK_MB    - size of the disk tier in MB (default 0, which disables the disk tier)
+
+or in code
+
+```
+from edgar.documentcache import configure_document_cache
+configure_document_cache(memory_mb=512, disk_mb=4096)
+```
+"""
+import gzip
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional, Tuple, Union
+
+from edgar.core import get_edgar_data_directory
+
+log = logging.getLogger(__name__)
+
+__all__ = ['DocumentCache',
+           'CacheStats',
+           'get_document_cache',
+           'configure_document_cache',
+           'clear_document_cache',
+           'document_key',
+           'SUBMISSION_TEXT']
+
+# The document name used to cache the full text submission of a filing
+SUBMISSION_TEXT = "<submission>"
+
+Content = Union[str, bytes]
+DocumentKey = Tuple[str, str]
+
+MB = 1024 * 1024
+default_memory_mb = 256
+default_disk_mb = 0
+
+_unsafe_filename_chars = re.compile(r'[^A-Za-z0-9._-]')
+
+
+def document_key(accession_number: str, document: str) -> DocumentKey:
+    """
+    Normalize the key for a document. Accession numbers are stored without dashes
+    so that keys built from urls (0000320193-24-000123 -> 000032019324000123) match keys built from filings
+    """
+    return str(accession_number).replace('-', ''), document
+
+
+def _content_size(content: Content) -> int:
+    # Sizes are approximate. For str we use the character count which is close enough for ascii heavy SEC content
+    return len(content)
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    memory_bytes: int = 0
+    memory_entries: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class DocumentCache:
+    """
+    A two tier cache of filing documents keyed by (accession number, document name)
+    """
+
+    def __init__(self,
+                 memory_limit: int = default_memory_mb * MB,
+                 disk_limit: int = default_disk_mb * MB,
+                 cache_directory: Optional[Path] = None):
+        self.memory_limit = memory_limit
+        self.disk_limit = disk_limit
+        self._cache_directory = cache_directory
+        self._memory: OrderedDict[DocumentKey, Content] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes: Optional[int] = None
+        self._lock = threading.RLock()
+        self.stats = CacheStats()
+
+    @property
+    def cache_directory(self) -> Path:
+        if self._cache_directory is None:
+            self._cache_directory = get_edgar_data_directory() / "documents"
+        return self._cache_directory
+
+    @property
+    def disk_enabled(self) -> bool:
+        return self.disk_limit > 0
+
+    def get(self, accession_number: str, document: str) -> Optional[Content]:
+        """Get the document content from memory or disk. Returns None if not cached"""
+        key = document_key(accession_number, document)
+        with self._lock:
+            content = self._memory.get(key)
+            if content is not None:
+                self._memory.move_to_end(key)
+                self.stats.memory_hits += 1
+                return content
+
+        if self.disk_enabled:
+            content = self._read_from_disk(key)
+            if content is not None:
+                with self._lock:
+                    self.stats.disk_hits += 1
+                    self._put_in_memory(key, content)
+                return content
+
+        with self._lock:
+            self.stats.misses += 1
+        return None
+
+    def put(self, accession_number: str, document: str, content: Optional[Content]):
+        """Add the document content to the cache"""
+        if content is None:
+            return
+        key = document_key(accession_number, document)
+        with self._lock:
+            self._put_in_memory(key, content)
+        if self.disk_enabled:
+            self._write_to_disk(key, content)
+
+    def get_or_fetch(self,
+                     accession_number: str,
+                     document: str,
+                     fetch: Callable[[], Optional[Content]]) -> Optional[Content]:
+        """
+        Get the document from the cache, calling `fetch` to retrieve and cache it on a miss
+        """
+        content = self.get(accession_number, document)
+        if content is None:
+            content = fetch()
+            self.put(accession_number, document, content)
+        return content
+
+    def __contains__(self, key: DocumentKey) -> bool:
+        key = document_key(*key)
+        with self._lock:
+            if key in self._memory:
+                return True
+        return self.disk_enabled and self._find_disk_path(key) is not None
+
+    def __len__(self):
+        return len(self._memory)
+
+    def clear(self, disk: bool = False):
+        """Clear the memory tier, and optionally the disk tier"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            self.stats = CacheStats()
+            if disk and self.cache_directory.exists():
+                for path in self.cache_directory.rglob("*.gz"):
+                    path.unlink(missing_ok=True)
+                self._disk_bytes = 0
+
+    def get_stats(self) -> CacheStats:
+        with self._lock:
+            self.stats.memory_bytes = self._memory_bytes
+            self.stats.memory_entries = len(self._memory)
+            return CacheStats(**self.stats.__dict__)
+
+    # Memory tier
+
+    def _put_in_memory(self, key: DocumentKey, content: Content):
+        size = _content_size(content)
+        if size > self.memory_limit:
+            return
+        existing = self._memory.pop(key, None)
+        if existing is not None:
+            self._memory_bytes -= _content_size(existing)
+        self._memory[key] = content
+        self._memory_bytes += size
+        self._trim_memory()
+
+    def _trim_memory(self):
+        while self._memory_bytes > self.memory_limit and self._memory:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= _content_size(evicted)
+            self.stats.evictions += 1
+
+    # Disk tier
+
+    def _disk_path(self, key: DocumentKey, is_text: bool) -> Path:
+        accession_number, document = key
+        suffix = "t.gz" if is_text else "b.gz"
+        filename = _unsafe_filename_chars.sub('_', document)
+        return self.cache_directory / accession_number / f"{filename}.{suffix}"
+
+    def _find_disk_path(self, key: DocumentKey) -> Optional[Path]:
+        for is_text in (True, False):
+            path = self._disk_path(key, is_text)
+            if path.exists():
+                return path
+        return None
+
+    def _read_from_disk(self, key: DocumentKey) -> Optional[Content]:
+        path = self._find_disk_path(key)
+        if path is None:
+            return None
+        try:
+            data = gzip.decompress(path.read_bytes())
+        except (OSError, EOFError):
+            log.warning(f"Could not read cached document {path}")
+            path.unlink(missing_ok=True)
+            return None
+        os.utime(path)  # Mark as recently used for eviction
+        return data.decode('utf-8') if path.name.endswith("t.gz") else data
+
+    def _write_to_disk(self, key: DocumentKey, content: Content):
+        is_text = isinstance(content, str)
+        data = gzip.compress(content.encode('utf-8') if is_text else content, compresslevel=6)
+        if len(data) > self.disk_limit:
+            return
+        path = self._disk_path(key, is_text)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file then rename so readers never see partial content
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_usage()
+            else:
+                self._disk_bytes += len(data)
+            if self._disk_bytes > self.disk_limit:
+                self._evict_from_disk()
+
+    def _scan_disk_usage(self) -> int:
+        return sum(path.stat().st_size for path in self.cache_directory.rglob("*.gz"))
+
+    def _evict_from_disk(self):
+        """Remove the least recently used files until the disk tier is within 90% of its limit"""
+        target = int(self.disk_limit * 0.9)
+        files = sorted(self.cache_directory.rglob("*.gz"), key=lambda p: p.stat().st_mtime)
+        for path in files:
+            if self._disk_bytes <= target:
+                break
+            size = path.stat().st_size
+            path.unlink(missing_ok=True)
+            self._disk_bytes -= size
+            self.stats.evictions += 1
+
+
+def _limit_from_env(name: str, default_mb: int) -> int:
+    value = os.getenv(name)
+    if value is None:
+        return default_mb * MB
+    try:
+        return int(float(value) * MB)
+    except ValueError:
+        log.warning(f"Ignoring invalid value for {name}: {value}")
+        return default_mb * MB
+
+
+_document_cache: Optional[DocumentCache] = None
+_document_cache_lock = threading.Lock()
+
+
+def get_document_cache() -> DocumentCache:
+    """Get the process-wide document cache"""
+    global _document_cache
+    if _document_cache is None:
+        with _document_cache_lock:
+            if _document_cache is None:
+                _document_cache = DocumentCache(
+                    memory_limit=_limit_from_env('EDGAR_DOCUMENT_CACHE_MEMORY_MB', default_memory_mb),
+                    disk_limit=_limit_from_env('EDGAR_DOCUMENT_CACHE_DISK_MB', default_disk_mb))
+    return _document_cache
+
+
+def configure_document_cache(memory_mb: Optional[float] = None,
+                             disk_mb: Optional[float] = None,
+                             cache_directory: Optional[Union[str, Path]] = None) -> DocumentCache:
+    """
+    Configure the size of the process-wide document cache tiers.
+    Setting a size to 0 disables that tier
+    """
+    cache = get_document_cache()
+    with cache._lock:
+        if memory_mb is not None:
+            cache.memory_limit = int(memory_mb * MB)
+            cache._trim_memory()
+        if disk_mb is not None:
+            cache.disk_limit = int(disk_mb * MB)
+        if cache_directory is not None:
+            cache._cache_directory = Path(cache_directory)
+            cache._disk_bytes = None
+    return cache
+
+
+def clear_document_cache(disk: bool = False):
+    """Clear the process-wide document cache"""
+    get_document_cache().clear(disk=disk)
@@ -9,6 +9,7 @@ import httpx
 
 from edgar.core import log
 from edgar.entity.data import parse_entity_submissions
+from edgar.entity.submissions_store import load_company_submissions_from_store
 from edgar.httprequests import download_json
 from edgar.storage import get_edgar_data_directory, is_using_local_storage
 
@@ -75,6 +76,9 @@ def get_entity_submissions(cik: int) -> Optional[Any]:
     """
     # Check the environment var EDGAR_USE_LOCAL_DATA
     if is_using_local_storage():
+        company_data = load_company_submissions_from_store(cik)
+        if company_data:
+            return company_data
         submissions_json = load_company_submissions_from_local(cik)
         if not submissions_json:
             submissions_json = download_entity_submissions_from_sec(cik)
@@ -0,0 +1,367 @@
+"""
+A local store of the submissions of every entity, as Parquet.
+
+`build_submissions_store` converts the SEC bulk `submissions.zip` into
+
+    submissions_store/
+        entities.parquet                 one row per entity with the company data
+        filings/year=2024/part-*.parquet the filings of all entities, partitioned by filing year
+
+The JSON in the zip is read entry by entry and never extracted. The filings in each part file are sorted
+by cik, so reading the filings of one company only reads the row groups that contain it, and queries
+across companies like all the 8-Ks filed by Nasdaq companies last week are one scan of the dataset.
+
+```
+store = SubmissionsStore.open()
+filings = store.get_filings(form='8-K', filing_date='2025-01-06:2025-01-10', exchange='Nasdaq')
+```
+
+With `use_local_storage()` the company data of `Company(cik)` is read from the store when it exists.
+"""
+import json
+import os
+import re
+import shutil
+import zipfile
+from functools import cached_property, lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from edgar.core import extract_dates, get_edgar_data_directory, listify, log
+from edgar.entity.data import extract_company_filings_table, parse_entity_submissions
+
+__all__ = ['SubmissionsStore', 'build_submissions_store', 'load_company_submissions_from_store']
+
+STORE_DIRECTORY = "submissions_store"
+ENTITIES_FILE = "entities.parquet"
+FILINGS_DIRECTORY = "filings"
+ROWS_PER_GROUP = 2048
+
+FILING_COLUMNS = ['accessionNumber', 'filingDate', 'reportDate', 'acceptanceDateTime', 'act', 'form', 'fileNumber',
+                  'items', 'size', 'isXBRL', 'isInlineXBRL', 'primaryDocument', 'primaryDocDescription']
+
+ENTITY_SCHEMA = pa.schema([
+    ('cik', pa.int64()),
+    ('name', pa.string()),
+    ('entity_type', pa.string()),
+    ('sic', pa.string()),
+    ('sic_description', pa.string()),
+    ('tickers', pa.list_(pa.string())),
+    ('exchanges', pa.list_(pa.string())),
+    ('state_of_incorporation', pa.string()),
+    ('fiscal_year_end', pa.string()),
+    # The rest of the submissions json without the filings, to create the company data
+    ('submissions', pa.string()),
+])
+
+SUBMISSIONS_FILE = re.compile(r'CIK(\d{10})(-submissions-\d+)?\.json$')
+
+
+def default_store_directory() -> Path:
+    return get_edgar_data_directory() / STORE_DIRECTORY
+
+
+class _FilingBatch:
+    """The filings of a batch of entities, collected as columns"""
+
+    def __init__(self):
+        self.columns: Dict[str, List] = {column: [] for column in FILING_COLUMNS}
+        self.ciks: List[int] = []
+
+    def add(self, cik: int, filings_json: Dict[str, Any]):
+        count = len(filings_json.get('accessionNumber') or [])
+        if count == 0:
+            return
+        for column in FILING_COLUMNS:
+            values = filings_json.get(column)
+            self.columns[column].extend(values if values is not None else [None] * count)
+        self.ciks.extend([cik] * count)
+
+    def __len__(self):
+        return len(self.ciks)
+
+    def to_table(self) -> pa.Table:
+        table = extract_company_filings_table(self.columns)
+        table = table.append_column('cik', pa.array(self.ciks, pa.int64()))
+        table = table.append_column('year', pc.year(table['filing_date']).cast(pa.int16()))
+        # A stable sort so the filings of each entity keep the order of the submissions json
+        return table.sort_by([('cik', 'ascending')])
+
+
+def _entity_row(cik: int, submissions: Dict[str, Any]) -> Dict[str, Any]:
+    metadata = dict(submissions)
+    metadata['filings'] = {'files': (submissions.get('filings') or {}).get('files', [])}
+    return {'cik': cik,
+            'name': submissions.get('name'),
+            'entity_type': submissions.get('entityType'),
+            'sic': submissions.get('sic'),
+            'sic_description': submissions.get('sicDescription'),
+            'tickers': submissions.get('tickers') or [],
+            'exchanges': [exchange for exchange in submissions.get('exchanges') or [] if exchange],
+            'state_of_incorporation': submissions.get('stateOfIncorporation'),
+            'fiscal_year_end': submissions.get('fiscalYearEnd'),
+            'submissions': json.dumps(metadata)}
+
+
+def build_submissions_store(source: Union[str, Path],
+                            directory: Optional[Path] = None,
+                            batch_size: int = 20000) -> "SubmissionsStore":
+    """
+    Build the submissions store from the bulk submissions.zip, or a directory of the extracted json files.
+    The store is written to a temporary directory that replaces the store when it is complete
+
+    :param source: The submissions.zip file or a directory of CIK##########.json files
+    :param directory: The store directory. Defaults to `submissions_store` in the Edgar data directory
+    :param batch_size: The number of json files in each part file of the filings
+    """
+    source = Path(source)
+    directory = Path(directory) if directory else default_store_directory()
+    temporary_directory = directory.with_name(directory.name + '.tmp')
+    shutil.rmtree(temporary_directory, ignore_errors=True)
+    (temporary_directory / FILINGS_DIRECTORY).mkdir(parents=True)
+
+    archive = zipfile.ZipFile(source) if source.is_file() else None
+    try:
+        if archive:
+            names = archive.namelist()
+
+            def read(name: str) -> bytes:
+                return archive.read(name)
+        else:
+            names = [path.name for path in source.glob('CIK*.json')]
+
+            def read(name: str) -> bytes:
+                return (source / name).read_bytes()
+
+        entities: List[Dict[str, Any]] = []
+        batch, part = _FilingBatch(), 0
+        # Sorted by cik so each part file holds a narrow range of ciks
+        for position, name in enumerate(sorted(names)):
+            match = SUBMISSIONS_FILE.search(name)
+            if not match:
+                continue
+            cik = int(match.group(1))
+            submissions = json.loads(read(name))
+            if match.group(2):
+                # An older page of filings e.g. CIK0000320193-submissions-001.json
+                batch.add(cik, submissions)
+            else:
+                entities.append(_entity_row(cik, submissions))
+                batch.add(cik, (submissions.get('filings') or {}).get('recent') or {})
+            if (position + 1) % batch_size == 0 and len(batch):
+                _write_filings(batch.to_table(), temporary_directory, part)
+                batch, part = _FilingBatch(), part + 1
+        if len(batch):
+            _write_filings(batch.to_table(), temporary_directory, part)
+    except BaseException:
+        shutil.rmtree(temporary_directory, ignore_errors=True)
+        raise
+    finally:
+        if archive:
+            archive.close()
+
+    pq.write_table(pa.Table.from_pylist(entities, schema=ENTITY_SCHEMA), temporary_directory / ENTITIES_FILE)
+    if directory.exists():
+        shutil.rmtree(directory)
+    os.replace(temporary_directory, directory)
+    log.info(f"Built the submissions store in {directory} with {len(entities):,} entities")
+    return SubmissionsStore.open(directory)
+
+
+def _write_filings(table: pa.Table, directory: Path, part: int):
+    ds.write_dataset(table,
+                     directory / FILINGS_DIRECTORY,
+                     format='parquet',
+                     partitioning=ds.partitioning(pa.schema([('year', pa.int16())]), flavor='hive'),
+                     basename_template=f"part-{part:05d}-{{i}}.parquet",
+                     # Small row groups so a read of one cik skips the row groups of other ciks
+                     min_rows_per_group=ROWS_PER_GROUP,
+                     max_rows_per_group=ROWS_PER_GROUP,
+                     existing_data_behavior='overwrite_or_ignore')
+
+
+class SubmissionsStore:
+    """
+    The submissions of all entities stored locally as Parquet. See `build_submissions_store`
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    @classmethod
+    def open(cls, directory: Optional[Path] = None) -> "SubmissionsStore":
+        directory = Path(directory) if directory else default_store_directory()
+        entities_path = directory / ENTITIES_FILE
+        if not entities_path.exists():
+            raise FileNotFoundError(f"There is no submissions store in {directory}")
+        # Rebuilding the store writes a new entities file so the cached store is replaced
+        return _open_store(directory, entities_path.stat().st_mtime_ns)
+
+    @classmethod
+    def exists(cls, directory: Optional[Path] = None) -> bool:
+        directory = Path(directory) if directory else default_store_directory()
+        return (directory / ENTITIES_FILE).exists()
+
+    @cached_property
+    def entities(self) -> pa.Table:
+        return pq.read_table(self.directory / ENTITIES_FILE)
+
+    @cached_property
+    def _entity_positions(self) -> Dict[int, int]:
+        return {cik: position for position, cik in enumerate(self.entities['cik'].to_pylist())}
+
+    @cached_property
+    def filings_dataset(self) -> ds.Dataset:
+        return ds.dataset(self.directory / FILINGS_DIRECTORY, format='parquet', partitioning='hive')
+
+    def __contains__(self, cik: int):
+        return cik in self._entity_positions
+
+    def __len__(self):
+        return len(self.entities)
+
+    def get_submissions(self, cik: int) -> Optional[Dict[str, Any]]:
+        """The submissions json of an entity without the filings"""
+        position = self._entity_positions.get(cik)
+        if position is None:
+            return None
+        return json.loads(self.entities['submissions'][position].as_py())
+
+    @cached_property
+    def _cik_ranges(self) -> List[Tuple[pq.ParquetFile, np.ndarray, np.ndarray]]:
+        """The open part files with the smallest and largest cik of each row group"""
+        cik_ranges = []
+        for fragment in self.filings_dataset.get_fragments():
+            parquet_file = pq.ParquetFile(fragment.path)
+            metadata = parquet_file.metadata
+            cik_column = parquet_file.schema_arrow.get_field_index('cik')
+            statistics = [metadata.row_group(group).column(cik_column).statistics
+                          for group in range(metadata.num_row_groups)]
+            cik_ranges.append((parquet_file,
+                               np.array([stat.min for stat in statistics]),
+                               np.array([stat.max for stat in statistics])))
+        return cik_ranges
+
+    def get_company_filings(self, cik: int) -> pa.Table:
+        """All the filings of a company, newest first, with the columns of `extract_company_filings_table`"""
+        # Read only the row groups that can contain the cik, from files that are already open
+        tables = []
+        for parquet_file, min_ciks, max_ciks in self._cik_ranges:
+            row_groups = np.flatnonzero((min_ciks <= cik) & (max_ciks >= cik))
+            if len(row_groups):
+                table = parquet_file.read_row_groups(row_groups.tolist(), use_threads=False)
+                tables.append(table.filter(pc.equal(table['cik'], cik)))
+        if not tables:
+            return extract_company_filings_table({})
+        table = pa.concat_tables(tables).sort_by([('filing_date', 'descending')])
+        return table.drop_columns(['cik'])
+
+    def get_company_data(self, cik: int):
+        """The company data of an entity with all its filings, or None if the entity is not in the store"""
+        submissions = self.get_submissions(cik)
+        if submissions is None:
+            return None
+        submissions['filings'] = {'recent': {}, 'files': []}
+        company_data = parse_entity_submissions(submissions)
+        from edgar.entity.filings import EntityFilings
+        company_data.filings = EntityFilings(self.get_company_filings(cik),
+                                             cik=company_data.cik,
+                                             company_name=company_data.name)
+        # The store has all the filings, including the older ones
+        company_data._loaded_all_filings = True
+        return company_data
+
+    def get_filings(self,
+                    form: Optional[Union[str, List[str]]] = None,
+                    filing_date: Optional[str] = None,
+                    cik: Optional[Union[int, List[int]]] = None,
+                    exchange: Optional[Union[str, List[str]]] = None,
+                    ticker: Optional[Union[str, List[str]]] = None):
+        """
+        Get the filings of all the entities in the store in one scan of the filings
+
+        :param form: The form or forms e.g. '8-K'
+        :param filing_date: A date or a date range e.g. '2025-01-06:2025-01-10'
+        :param cik: Only the filings of these ciks
+        :param exchange: Only the filings of companies listed on these exchanges e.g. 'Nasdaq'
+        :param ticker: Only the filings of companies with these tickers
+        :return: Filings newest first
+        """
+        from edgar._filings import Filings
+        expression = None
+
+        def add(condition):
+            nonlocal expression
+            expression = condition if expression is None else expression & condition
+
+        if form:
+            add(ds.field('form').isin(listify(form)))
+        if filing_date:
+            start, end, is_range = extract_dates(filing_date)
+            end = end if is_range else start
+            if start:
+                add(ds.field('year') >= start.year)
+                add(ds.field('filing_date') >= start.date())
+            if end:
+                add(ds.field('year') <= end.year)
+                add(ds.field('filing_date') <= end.date())
+
+        ciks = set(listify(cik)) if cik is not None else None
+        if exchange or ticker:
+            entity_ciks = set(self._entity_ciks(exchange=exchange, ticker=ticker))
+            ciks = entity_ciks if ciks is None else ciks & entity_ciks
+        if ciks is not None:
+            add(ds.field('cik').isin(sorted(ciks)))
+
+        table = self.filings_dataset.to_table(filter=expression)
+        companies = self.entities.select(['cik', 'name']).rename_columns(['cik', 'company'])
+        table = table.join(companies, 'cik', join_type='left outer')
+        columns = ['form', 'company', 'cik', 'filing_date', 'accession_number']
+        table = table.select(columns + [column for column in table.column_names
+                                        if column not in columns and column != 'year'])
+        return Filings(table.sort_by([('filing_date', 'descending'), ('acceptanceDateTime', 'descending')]))
+
+    def _entity_ciks(self, exchange=None, ticker=None) -> Iterable[int]:
+        mask = None
+        if exchange:
+            exchanges = pc.list_flatten(self.entities['exchanges'])
+            parents = pc.list_parent_indices(self.entities['exchanges'])
+            matches = pc.is_in(pc.utf8_lower(exchanges), pa.array([e.lower() for e in listify(exchange)]))
+            mask = _rows_with_match(len(self.entities), parents, matches)
+        if ticker:
+            tickers = pc.list_flatten(self.entities['tickers'])
+            parents = pc.list_parent_indices(self.entities['tickers'])
+            matches = pc.is_in(pc.utf8_upper(tickers), pa.array([t.upper() for t in listify(ticker)]))
+            ticker_mask = _rows_with_match(len(self.entities), parents, matches)
+            mask = ticker_mask if mask is None else pc.and_(mask, ticker_mask)
+        return self.entities['cik'].filter(mask).to_pylist()
+
+    def __repr__(self):
+        return f"SubmissionsStore({self.directory}, {len(self):,} entities)"
+
+
+def _rows_with_match(rows: int, parents: pa.Array, matches: pa.Array) -> pa.Array:
+    """Whether each row of a list column has a matching value"""
+    matched_rows = pc.unique(parents.filter(matches))
+    return pc.is_in(pa.array(range(rows), pa.int64()), matched_rows.cast(pa.int64()))
+
+
+@lru_cache(maxsize=4)
+def _open_store(directory: Path, modified: int) -> SubmissionsStore:
+    return SubmissionsStore(directory)
+
+
+def load_company_submissions_from_store(cik: int):
+    """
+    The company data of an entity from the submissions store, or None if there is no store
+    or the entity is not in it
+    """
+    if not SubmissionsStore.exists():
+        return None
+    return SubmissionsStore.open().get_company_data(cik)
@@ -0,0 +1,187 @@
+"""
+Daily feed archives kept compressed, with an index for reading one filing without extracting the day,
+or extracted into a directory of filings.
+
+A daily feed `YYYYMMDD.nc.tar.gz` is a single gzip stream so a filing in the middle can only be read by
+decompressing everything before it. `compress_feed_archive` rewrites the archive as `YYYYMMDD.nc.gz`
+with every filing in its own gzip member, one after the other, and writes the offset and length of each
+member to `YYYYMMDD.nc.idx`. A filing is read by seeking to its member and decompressing only that.
+
+The archive is still a valid gzip file, so `gunzip -c 20240102.nc.gz` prints all the filings of the day.
+
+```
+archive = FeedArchive.open(data_directory / '20240102.nc.gz')
+text = archive.read_filing('0000320193-24-000001')
+```
+"""
+import gzip
+import io
+import json
+import os
+import shutil
+import tarfile
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple, Union
+
+__all__ = ['FeedArchive', 'compress_feed_archive', 'extract_feed_archive', 'feed_archive_path', 'accession_filter']
+
+ARCHIVE_SUFFIX = ".nc.gz"
+INDEX_SUFFIX = ".nc.idx"
+
+
+def feed_archive_path(directory: Path, day: str) -> Path:
+    """The compressed archive of a day e.g. filings/20240102.nc.gz"""
+    return directory / f"{day}{ARCHIVE_SUFFIX}"
+
+
+def index_path(archive_path: Path) -> Path:
+    return archive_path.with_name(archive_path.name[:-len(ARCHIVE_SUFFIX)] + INDEX_SUFFIX)
+
+
+def accession_filter(accession_numbers: Optional[Iterable[str]]):
+    """
+    A function that checks whether a filing file name like 0000320193-24-000001.nc is
+    one of the accession numbers, with or without dashes. Keeps every filing if there are no accession numbers
+    """
+    if accession_numbers is None:
+        return lambda filename: True
+    keep = {accession_number.replace('-', '') for accession_number in accession_numbers}
+    return lambda filename: filename.split('.')[0].replace('-', '') in keep
+
+
+class FeedArchive:
+    """
+    The filings of a day in a compressed archive with an index of where each filing is
+    """
+
+    def __init__(self, path: Path, index: Dict[str, Tuple[int, int]]):
+        self.path = path
+        self.index = index
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> "FeedArchive":
+        path = Path(path)
+        stat = path.stat()
+        return _open_feed_archive(path, stat.st_mtime_ns, stat.st_size)
+
+    def __contains__(self, filename: str):
+        return filename in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def filenames(self) -> List[str]:
+        return list(self.index)
+
+    def read_bytes(self, filename: str) -> Optional[bytes]:
+        """Read the bytes of a file in the archive, or None if it is not in the archive"""
+        location = self.index.get(filename)
+        if location is None:
+            return None
+        offset, length = location
+        with self.path.open('rb') as f:
+            f.seek(offset)
+            return gzip.decompress(f.read(length))
+
+    def read(self, filename: str) -> Optional[str]:
+        """Read a file in the archive as text, with the same line endings as reading the extracted file"""
+        data = self.read_bytes(filename)
+        if data is None:
+            return None
+        return io.TextIOWrapper(io.BytesIO(data), encoding='utf-8').read()
+
+    def read_filing(self, accession_number: str, correction: bool = False) -> Optional[str]:
+        """Read the full text submission of a filing in the archive"""
+        return self.read(f"{accession_number}.{'corr' if correction else 'nc'}")
+
+    def __repr__(self):
+        return f"FeedArchive({self.path.name}, {len(self)} files)"
+
+
+@lru_cache(maxsize=32)
+def _open_feed_archive(path: Path, modified: int, size: int) -> FeedArchive:
+    # The modification time and size are part of the cache key so a rewritten archive is read again
+    index = json.loads(index_path(path).read_text())
+    return FeedArchive(path, {filename: tuple(location) for filename, location in index.items()})
+
+
+def open_feed_tar(source: Union[Path, BinaryIO]) -> tarfile.TarFile:
+    """Open a feed tar.gz file, or a stream of one, to read the members in order"""
+    if isinstance(source, (str, Path)):
+        return tarfile.open(source, 'r|gz')
+    return tarfile.open(fileobj=source, mode='r|gz')
+
+
+def compress_feed_archive(source: Union[Path, BinaryIO],
+                          archive_path: Path,
+                          accession_numbers: Optional[Iterable[str]] = None,
+                          compresslevel: int = 6) -> FeedArchive:
+    """
+    Rewrite a feed tar.gz as a compressed archive with one gzip member per filing, and write its index.
+
+    :param source: The downloaded feed file e.g. 20240102.nc.tar.gz, or a stream of it as it downloads
+    :param archive_path: The archive to write e.g. filings/20240102.nc.gz
+    :param accession_numbers: Only keep these filings
+    :param compresslevel: The gzip compression level of each filing
+    """
+    keep = accession_filter(accession_numbers)
+    index: Dict[str, Tuple[int, int]] = {}
+    archive_path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path = archive_path.with_name(archive_path.name + '.tmp')
+    try:
+        with open_feed_tar(source) as tar, temporary_path.open('wb') as archive:
+            for member in tar:
+                filename = os.path.basename(member.name)
+                if not member.isfile() or not keep(filename):
+                    continue
+                member_data = gzip.compress(tar.extractfile(member).read(), compresslevel=compresslevel, mtime=0)
+                index[filename] = (archive.tell(), len(member_data))
+                archive.write(member_data)
+    except BaseException:
+        temporary_path.unlink(missing_ok=True)
+        raise
+
+    temporary_index_path = index_path(archive_path).with_name(index_path(archive_path).name + '.tmp')
+    temporary_index_path.write_text(json.dumps(index, separators=(',', ':')))
+    os.replace(temporary_index_path, index_path(archive_path))
+    os.replace(temporary_path, archive_path)
+    return FeedArchive.open(archive_path)
+
+
+def extract_feed_archive(source: Union[Path, BinaryIO],
+                         directory: Path,
+                         accession_numbers: Optional[Iterable[str]] = None) -> int:
+    """
+    Extract the filings in a feed tar.gz, or a stream of one as it downloads, into a day directory.
+    The filings are written to a temporary directory that replaces the day directory when all are extracted
+
+    :param source: The downloaded feed file e.g. 20240102.nc.tar.gz, or a stream of it
+    :param directory: The day directory e.g. filings/20240102
+    :param accession_numbers: Only extract these filings
+    :return: The number of filings extracted
+    """
+    keep = accession_filter(accession_numbers)
+    temporary_directory = directory.with_name(directory.name + '.tmp')
+    shutil.rmtree(temporary_directory, ignore_errors=True)
+    temporary_directory.mkdir(parents=True)
+    filings = 0
+    try:
+        with open_feed_tar(source) as tar:
+            for member in tar:
+                # Only the file name is used so a member cannot be written outside the directory
+                filename = os.path.basename(member.name)
+                if not member.isfile() or not keep(filename):
+                    continue
+                with tar.extractfile(member) as member_file, (temporary_directory / filename).open('wb') as f:
+                    shutil.copyfileobj(member_file, f)
+                filings += 1
+    except BaseException:
+        shutil.rmtree(temporary_directory, ignore_errors=True)
+        raise
+
+    if directory.exists():
+        shutil.rmtree(directory)
+    os.replace(temporary_directory, directory)
+    return filings
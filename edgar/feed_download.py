@@ -0,0 +1,435 @@
+"""
+Download the daily filing feed archives concurrently and resumably.
+
+The SEC publishes a `YYYYMMDD.nc.tar.gz` archive of all the filings of each day in
+https://www.sec.gov/Archives/edgar/Feed/. A year of feeds is a few hundred archives of hundreds of MB each.
+`download_feed_files` fetches several archives at a time while every request waits for a ticket from the
+throttler shared with the rest of the library, so the downloads stay within the SEC rate limit.
+
+Each archive is written to `_partial/<name>.part` under the data directory first. If a download is
+interrupted the next attempt, or the next run, asks for the rest of the file with an HTTP Range request.
+When the archive is complete it is extracted into the day directory e.g. `filings/20240102/`, keeping only the
+filings of `accession_numbers` if given. With compress=True it is rewritten as an indexed compressed archive
+e.g. `filings/20240102.nc.gz` instead (see `edgar.feed_archive`).
+The number of bytes is checked against the Content-Length and the size in the directory listing.
+
+With stream=True each archive is extracted as it downloads and never written to disk. An interrupted stream
+cannot be resumed and starts again from the beginning, so streaming suits fast and reliable connections.
+
+Completed days are recorded in `_feed_manifest.json` in the data directory so a rerun skips them.
+
+```
+from edgar.feed_download import download_feed_files
+from edgar.storage import list_filing_feed_files_for_quarter
+
+feed_files = list_filing_feed_files_for_quarter(2024, 1)
+summary = download_feed_files(feed_files, data_directory)
+```
+"""
+import asyncio
+import io
+import json
+import os
+import queue
+import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+from httpx import AsyncClient, HTTPStatusError, RequestError
+
+from edgar.core import log
+from edgar.feed_archive import compress_feed_archive, extract_feed_archive, feed_archive_path, index_path
+from edgar.httpclient import async_http_client
+from edgar.httprequests import TooManyRequestsError, attempts, get_throttler
+
+__all__ = ['download_feed_files', 'download_feed_files_async', 'FeedDownloadManifest', 'FeedDownloadSummary']
+
+MANIFEST_FILENAME = "_feed_manifest.json"
+PARTIAL_DIRECTORY = "_partial"
+CHUNK_SIZE = 1024 * 1024
+
+# The directory listing shows rounded sizes like 1.2M or 345K
+LISTED_SIZE_TOLERANCE = 0.06
+
+
+@dataclass
+class FeedDownloadSummary:
+    downloaded: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    resumed: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    bytes_downloaded: int = 0
+    filings: int = 0
+
+    def __str__(self):
+        return (f"Downloaded {len(self.downloaded)} feed files ({self.bytes_downloaded / 1024 / 1024:.1f} MB, "
+                f"resumed {len(self.resumed)}) with {self.filings} filings, "
+                f"skipped {len(self.skipped)}, failed {len(self.failed)}")
+
+
+class FeedDownloadManifest:
+    """The feed files that have been downloaded and extracted, saved as JSON after each one"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.completed: Dict[str, dict] = {}
+        if path.exists():
+            try:
+                self.completed = json.loads(path.read_text())
+            except ValueError:
+                log.warning(f"Ignoring the unreadable feed manifest {path}")
+
+    def __contains__(self, name: str):
+        return name in self.completed
+
+    def add(self, name: str, size: int, path: Path):
+        self.completed[name] = {'size': size,
+                                'path': path.name,
+                                'completed': datetime.now().isoformat(timespec='seconds')}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = self.path.with_suffix('.tmp')
+        temporary_path.write_text(json.dumps(self.completed, indent=1, sort_keys=True))
+        os.replace(temporary_path, self.path)
+
+    def discard(self, name: str):
+        self.completed.pop(name, None)
+
+
+def feed_directory_name(name: str) -> str:
+    """The directory a feed file is extracted to e.g. 20240102.nc.tar.gz -> 20240102"""
+    return name.split('.')[0]
+
+
+def size_matches_listing(size: int, listed_size: Optional[int]) -> bool:
+    """Check a downloaded size against the rounded size shown in the SEC directory listing"""
+    if not listed_size or pd.isna(listed_size):
+        return True
+    return abs(size - listed_size) <= max(listed_size * LISTED_SIZE_TOLERANCE, 1024)
+
+
+def parse_content_range(content_range: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """Get the start and total size from a Content-Range header like 'bytes 100-199/1000' or 'bytes */1000'"""
+    match = re.match(r'bytes (?:(\d+)-\d+|\*)/(\d+|\*)', content_range or '')
+    if not match:
+        return None, None
+    start = int(match.group(1)) if match.group(1) else None
+    total = int(match.group(2)) if match.group(2) != '*' else None
+    return start, total
+
+
+async def _download_archive(client: AsyncClient, url: str, part_path: Path) -> Tuple[int, Optional[int], bool]:
+    """
+    Download a file to part_path, continuing from the bytes already in part_path.
+
+    Returns:
+        The number of bytes downloaded, the total size from the response headers and whether it was resumed
+    """
+    offset = part_path.stat().st_size if part_path.exists() else 0
+    headers = {'Range': f'bytes={offset}-'} if offset else {}
+    throttler = get_throttler()
+    await throttler.wait_for_ticket_async()
+    throttler.update_metrics()
+    async with client.stream('GET', url, headers=headers) as response:
+        if response.status_code == 429:
+            raise TooManyRequestsError(url)
+        if response.status_code == 416:
+            # The partial file is already complete, or it is larger than the file and has to be downloaded again
+            _, total = parse_content_range(response.headers.get('Content-Range'))
+            if total == offset:
+                return 0, total, True
+            part_path.unlink()
+            raise RequestError(f"Partial download of {url} does not match the file. Restarting", request=response.request)
+        response.raise_for_status()
+
+        if response.status_code == 206:
+            start, total = parse_content_range(response.headers.get('Content-Range'))
+            if start != offset:
+                part_path.unlink()
+                raise RequestError(f"Unexpected range {response.headers.get('Content-Range')} for {url}",
+                                   request=response.request)
+            mode, resumed = 'ab', True
+        else:
+            # The server sent the whole file
+            content_length = response.headers.get('Content-Length')
+            total = int(content_length) if content_length else None
+            mode, resumed = 'wb', False
+
+        downloaded = 0
+        with part_path.open(mode) as f:
+            # Raw bytes so the file on disk matches the byte ranges of the archive
+            async for chunk in response.aiter_raw(chunk_size=CHUNK_SIZE):
+                f.write(chunk)
+                downloaded += len(chunk)
+        return downloaded, total, resumed
+
+
+class ChunkStream(io.RawIOBase):
+    """
+    A file that reads the chunks of a download as they arrive, so a tar.gz can be extracted in a thread
+    while it downloads. The download puts the chunks then None at the end, or the error that interrupted it.
+    The extraction calls `stop` when it is done so the download does not wait for it
+    """
+
+    def __init__(self, max_chunks: int = 64):
+        super().__init__()
+        self._chunks = queue.Queue(max_chunks)
+        self._buffer = memoryview(b'')
+        self.stopped = False
+
+    def readable(self):
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer:
+            chunk = self._chunks.get()
+            if chunk is None:
+                return 0
+            if isinstance(chunk, BaseException):
+                raise chunk
+            self._buffer = memoryview(chunk)
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def put_nowait(self, chunk) -> bool:
+        try:
+            self._chunks.put_nowait(chunk)
+            return True
+        except queue.Full:
+            return False
+
+    async def put(self, chunk):
+        """Wait for room for the chunk, unless the reader has stopped"""
+        while not self.stopped and not self.put_nowait(chunk):
+            await asyncio.sleep(0.005)
+
+    def stop(self):
+        self.stopped = True
+
+
+async def _stream_archive(client: AsyncClient,
+                          url: str,
+                          listed_size: Optional[int],
+                          process) -> Tuple[int, Optional[int], object]:
+    """
+    Download a file and process it while it downloads. `process` is called in a thread with a file
+    that reads the bytes as they arrive. A Content-Length that does not match the listed size fails before
+    anything is processed.
+
+    Returns:
+        The number of bytes downloaded, the Content-Length and the result of process
+    """
+    throttler = get_throttler()
+    await throttler.wait_for_ticket_async()
+    throttler.update_metrics()
+    async with client.stream('GET', url) as response:
+        if response.status_code == 429:
+            raise TooManyRequestsError(url)
+        response.raise_for_status()
+        content_length = response.headers.get('Content-Length')
+        total = int(content_length) if content_length else None
+        if total is not None and not size_matches_listing(total, listed_size):
+            raise IOError(f"The size of {url} is {total} bytes but expected {listed_size}")
+
+        stream = ChunkStream()
+
+        def read_stream():
+            try:
+                return process(stream)
+            finally:
+                stream.stop()
+
+        # A thread of its own rather than the default executor, which could be filled by other streams
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            processing = asyncio.get_running_loop().run_in_executor(executor, read_stream)
+            downloaded = 0
+            try:
+                async for chunk in response.aiter_raw(chunk_size=CHUNK_SIZE):
+                    downloaded += len(chunk)
+                    if not stream.stopped:
+                        await stream.put(chunk)
+                    elif processing.done() and processing.exception():
+                        break
+            except BaseException as e:
+                # Stop the processing thread before retrying
+                await stream.put(e)
+                await asyncio.gather(processing, return_exceptions=True)
+                raise
+            # The end of the stream
+            await stream.put(None)
+            return downloaded, total, await processing
+
+
+async def download_feed_file(client: AsyncClient,
+                             name: str,
+                             url: str,
+                             listed_size: Optional[int],
+                             data_directory: Path,
+                             manifest: FeedDownloadManifest,
+                             summary: FeedDownloadSummary,
+                             accession_numbers: Optional[Iterable[str]] = None,
+                             compress: bool = False,
+                             stream: bool = False) -> Path:
+    """
+    Download, verify and extract one feed file.
+    Returns the directory the feed file was extracted to, or the compressed archive if compress is True
+
+    With stream=True the feed file is extracted as it downloads and never written to disk.
+    An interrupted stream starts again from the beginning. Otherwise the feed file is downloaded to a
+    partial file that is resumed if the download is interrupted, then extracted.
+    A partial file left by an earlier download is always resumed.
+    """
+    day = feed_directory_name(name)
+    if compress:
+        path = feed_archive_path(data_directory, day)
+
+        def process(source) -> int:
+            return len(compress_feed_archive(source, path, accession_numbers))
+    else:
+        path = data_directory / day
+
+        def process(source) -> int:
+            return extract_feed_archive(source, path, accession_numbers)
+
+    partial_directory = data_directory / PARTIAL_DIRECTORY
+    part_path = partial_directory / f"{name}.part"
+    stream = stream and not part_path.exists()
+    if not stream:
+        partial_directory.mkdir(parents=True, exist_ok=True)
+
+    total, filings = None, None
+    for attempt in range(attempts):
+        try:
+            if stream:
+                downloaded, total, filings = await _stream_archive(client, url, listed_size, process)
+            else:
+                downloaded, total, resumed = await _download_archive(client, url, part_path)
+                if resumed:
+                    summary.resumed.append(name)
+            summary.bytes_downloaded += downloaded
+            break
+        except (RequestError, TooManyRequestsError, HTTPStatusError) as e:
+            server_error = isinstance(e, HTTPStatusError) and e.response.status_code >= 500
+            if attempt == attempts - 1 or (isinstance(e, HTTPStatusError) and not server_error):
+                raise
+            log.info(f"Download of {name} interrupted ({e}). {'Restarting' if stream else 'Resuming'}")
+            await asyncio.sleep(min(2 ** attempt, 30))
+
+    if stream:
+        size = downloaded
+    else:
+        size = part_path.stat().st_size
+    if (total is not None and size != total) or not size_matches_listing(size, listed_size):
+        if stream:
+            _remove(path, compress)
+        else:
+            part_path.unlink()
+        raise IOError(f"Downloaded {size} bytes for {name} but expected {total or listed_size}")
+
+    if not stream:
+        try:
+            filings = await asyncio.to_thread(process, part_path)
+        finally:
+            part_path.unlink(missing_ok=True)
+
+    manifest.add(name, size, path)
+    summary.downloaded.append(name)
+    summary.filings += filings
+    return path
+
+
+def _remove(path: Path, compress: bool):
+    if compress:
+        path.unlink(missing_ok=True)
+        index_path(path).unlink(missing_ok=True)
+    else:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+async def download_feed_files_async(feed_files: pd.DataFrame,
+                                    data_directory: Path,
+                                    overwrite_existing: bool = False,
+                                    max_downloads: int = 4,
+                                    on_complete=None,
+                                    accession_numbers: Optional[Iterable[str]] = None,
+                                    compress: bool = False,
+                                    stream: bool = False) -> FeedDownloadSummary:
+    """
+    Download feed files concurrently. See `download_feed_files`
+    """
+    data_directory = Path(data_directory)
+    data_directory.mkdir(parents=True, exist_ok=True)
+    manifest = FeedDownloadManifest(data_directory / MANIFEST_FILENAME)
+    summary = FeedDownloadSummary()
+    download_slots = asyncio.Semaphore(max_downloads)
+
+    async def download(client: AsyncClient, name: str, url: str, listed_size: Optional[int]):
+        async with download_slots:
+            try:
+                path = await download_feed_file(client, name, url, listed_size, data_directory, manifest, summary,
+                                                accession_numbers=accession_numbers, compress=compress,
+                                                stream=stream)
+            except Exception as e:
+                log.warning(f"Could not download feed file {name}: {e}")
+                summary.failed[name] = str(e)
+                return
+        log.info('Downloaded feed file to %s', path)
+        if on_complete is not None:
+            on_complete(path)
+
+    async with async_http_client() as client:
+        tasks = []
+        for row in feed_files.itertuples(index=False):
+            day = feed_directory_name(row.Name)
+            path = feed_archive_path(data_directory, day) if compress else data_directory / day
+            if not overwrite_existing:
+                if row.Name in manifest and path.exists():
+                    summary.skipped.append(row.Name)
+                    continue
+                if path.exists():
+                    log.info('Skipping %s. Already exists', path)
+                    summary.skipped.append(row.Name)
+                    continue
+            else:
+                manifest.discard(row.Name)
+            tasks.append(download(client, row.Name, row.File, row.Size))
+        await asyncio.gather(*tasks)
+    return summary
+
+
+def download_feed_files(feed_files: pd.DataFrame,
+                        data_directory: Path,
+                        overwrite_existing: bool = False,
+                        max_downloads: int = 4,
+                        on_complete=None,
+                        accession_numbers: Optional[Iterable[str]] = None,
+                        compress: bool = False,
+                        stream: bool = False) -> FeedDownloadSummary:
+    """
+    Download and extract feed files, at most `max_downloads` at a time and within the SEC rate limit.
+    Interrupted downloads are resumed and completed feed files are recorded in a manifest
+    so they are skipped next time.
+
+    :param feed_files: The feed files with the Name, File and Size columns of `list_filing_feed_files`
+    :param data_directory: The directory to extract the feed files to, one directory per day
+    :param overwrite_existing: Download the feed files again even if they were downloaded before
+    :param max_downloads: The maximum number of concurrent downloads
+    :param on_complete: Optional function called with the directory or archive of each downloaded feed file
+    :param accession_numbers: Only keep the filings with these accession numbers
+    :param compress: Keep each day as an indexed compressed archive instead of extracting it
+    :param stream: Extract the feed files as they download instead of downloading each feed file to a
+                   partial file that can be resumed, then extracting it. An interrupted stream starts again
+    """
+    return asyncio.run(download_feed_files_async(feed_files, data_directory,
+                                                 overwrite_existing=overwrite_existing,
+                                                 max_downloads=max_downloads,
+                                                 on_complete=on_complete,
+                                                 accession_numbers=accession_numbers,
+                                                 compress=compress,
+                                                 stream=stream))
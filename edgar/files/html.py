@@ -485,11 +485,20 @@ class Document:
         return [node for node in self.nodes if node.type == 'heading']
 
     @classmethod
-    def parse(cls, html: str) -> Optional['Document']:
+    def parse(cls, html: str, parser: Literal['bs4', 'lxml'] = 'bs4') -> Optional['Document']:
+        """
+        Parse html into a Document.
+        parser='lxml' uses the faster LxmlHTMLParser which works directly on lxml elements
+        """
+        if parser == 'lxml':
+            from edgar.files.html_lxml import LxmlHTMLParser
+            lxml_parser = LxmlHTMLParser.from_html(html)
+            if lxml_parser:
+                return lxml_parser.parse()
+            return None
         root = HtmlDocument.get_root(html)
         if root:
-            parser = SECHTMLParser(root)
-            return parser.parse()
+            return SECHTMLParser(root).parse()
 
     def to_markdown(self) -> str:
         from edgar.files.markdown import MarkdownRenderer
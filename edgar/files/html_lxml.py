@@ -0,0 +1,754 @@
+"""
+An lxml-native backend for parsing SEC HTML into a Document.
+
+LxmlHTMLParser produces the same nodes as SECHTMLParser but works directly on lxml elements instead of
+a BeautifulSoup tree. This avoids building the soup, and the per-call overhead of the BeautifulSoup find_* methods.
+It also
+- parses each distinct inline style string once (see parse_style_cached)
+- computes the stripped text of an element once and reuses it for heading detection
+- marks the elements containing tables in a single pass over the tree
+- extracts text with an explicit stack rather than recursion so deeply nested inline markup is safe
+
+Use it through `Document.parse(html, parser='lxml')`
+"""
+import re
+from typing import Optional, List, Dict, Any, Iterator, Union, Set
+
+from lxml import etree
+
+from edgar.core import log
+from edgar.files.html import (SECHTMLParser, IXTagTracker, Document, BaseNode, TableCell, TableRow, create_node)
+from edgar.files.html_documents import get_text_between_tags
+from edgar.files.styles import (StyleInfo, parse_style_cached, HEADING_PATTERNS, _has_minimum_heading_traits,
+                                _is_prominently_styled, _is_likely_section_heading)
+
+__all__ = ['LxmlHTMLParser', 'get_lxml_root']
+
+# The text of these elements is not included by BeautifulSoup's get_text
+_non_text_tags = {'script', 'style', 'template'}
+
+_xml_declaration = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+_block_elements = {
+    'div', 'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'ul', 'ol', 'li', 'blockquote', 'pre', 'hr',
+    'table', 'form', 'fieldset', 'address'
+}
+
+_bold_weights = ['bold', '700', '800', '900']
+
+# BeautifulSoup collapses strings made only of these characters unless they are inside a whitespace preserving tag
+_ascii_spaces = ' \n\t\f\r'
+_whitespace_preserving_tags = ('pre', 'textarea')
+
+Element = etree._Element
+
+
+def get_lxml_root(html: str) -> Optional[Element]:
+    """Parse the html into an lxml tree and return the root <html> element"""
+    # First check if the html is inside a <DOCUMENT><TEXT> block
+    if "<TEXT>" in html[:500]:
+        html = get_text_between_tags(html, 'TEXT')
+    # lxml does not accept unicode strings with an encoding declaration
+    html = _xml_declaration.sub('', html, count=1)
+    if not html.strip():
+        return None
+    parser = etree.HTMLParser(recover=True, huge_tree=True)
+    try:
+        root = etree.fromstring(html, parser)
+    except etree.XMLSyntaxError:
+        return None
+    if root is None:
+        return None
+    if root.tag == 'html':
+        return root
+    return next(root.iter('html'), None)
+
+
+def _is_tag(node) -> bool:
+    """Comments and processing instructions have a function as their tag"""
+    return isinstance(node.tag, str)
+
+
+def _collapse_whitespace(text: str) -> str:
+    """Replace a whitespace-only string with a single newline or space, as BeautifulSoup does"""
+    if text.strip(_ascii_spaces):
+        return text
+    return '\n' if '\n' in text else ' '
+
+
+def _iter_children(element: Element, preserve_whitespace: bool = False) -> Iterator[Union[str, Element]]:
+    """Iterate the child elements and text nodes of an element in document order"""
+    text = element.text
+    if text:
+        yield text if preserve_whitespace else _collapse_whitespace(text)
+    for child in element:
+        if _is_tag(child):
+            yield child
+        tail = child.tail
+        if tail:
+            yield tail if preserve_whitespace else _collapse_whitespace(tail)
+
+
+def _iter_strings(element: Element,
+                  br_as_newline: bool = False,
+                  preformatted: Set[Element] = frozenset()) -> Iterator[str]:
+    """
+    Iterate the text under an element the way BeautifulSoup's get_text does,
+    skipping comments and the content of script, style and template elements
+    """
+    stack = [_string_items(element, br_as_newline, preformatted)]
+    while stack:
+        item = next(stack[-1], None)
+        if item is None:
+            stack.pop()
+        elif isinstance(item, str):
+            yield item
+        else:
+            stack.append(_string_items(item, br_as_newline, preformatted))
+
+
+def _string_items(element: Element, br_as_newline: bool, preformatted: Set[Element]) -> Iterator[Union[str, Element]]:
+    """The text of an element followed by each child element and its tail"""
+    if element.tag == 'br' and br_as_newline:
+        yield '\n'
+        return
+    if element.tag == 'template':
+        return
+    children = _iter_children(element, element in preformatted)
+    if element.tag in _non_text_tags and element.text:
+        next(children)  # skip the script or style text
+    yield from children
+
+
+class _LxmlIXTagTracker(IXTagTracker):
+    """Tracks IX tag context for lxml elements"""
+
+    def __init__(self, table_containers: Set[Element]):
+        super().__init__()
+        self.table_containers = table_containers
+
+    def enter_tag(self, element: Element) -> None:
+        name = element.tag
+        if not name.startswith('ix:'):
+            return
+
+        if name == 'ix:continuation':
+            continued_at = element.get('continuedAt')
+            tag_id = element.get('id')
+            if continued_at and tag_id:
+                self.continuation_map[tag_id] = self.continuation_map.get(continued_at, {})
+        else:
+            tag_info = {
+                'name': element.get('name', ''),
+                'contextRef': element.get('contextRef', ''),
+                'id': element.get('id', '')
+            }
+            for key, value in element.attrib.items():
+                if key not in {'name', 'contextRef', 'id'}:
+                    tag_info[key] = value.split() if key == 'class' else value
+            # SECHTMLParser marks the elements containing tables with an attribute
+            if element in self.table_containers:
+                tag_info['has_table'] = True
+
+            if tag_info['id']:
+                self.continuation_map[tag_info['id']] = tag_info
+
+            self.tag_stack.append(tag_info)
+
+    def exit_tag(self, element: Element) -> None:
+        if element.tag.startswith('ix:') and element.tag != 'ix:continuation':
+            if self.tag_stack:
+                self.tag_stack.pop()
+
+    def get_current_context(self, element: Element) -> Dict[str, Any]:
+        if element.tag == 'ix:continuation':
+            tag_id = element.get('id')
+            if tag_id in self.continuation_map:
+                original_tag = self.continuation_map[tag_id]
+                return {
+                    'ix_tag': original_tag.get('name'),
+                    'ix_context': original_tag.get('contextRef'),
+                    'ix_original_id': original_tag.get('id'),
+                    'ix_continuation_id': tag_id,
+                    **{f'ix_{k}': v for k, v in original_tag.items()
+                       if k not in {'name', 'contextRef', 'id'}}
+                }
+            return {}
+
+        if not self.tag_stack:
+            return {}
+
+        current = self.tag_stack[-1]
+        metadata = {
+            'ix_tag': current.get('name'),
+            'ix_context': current.get('contextRef'),
+            'ix_id': current.get('id')
+        }
+        for key, value in current.items():
+            if key not in {'name', 'contextRef', 'id'}:
+                metadata[f'ix_{key}'] = value
+
+        return metadata
+
+
+class LxmlHTMLParser(SECHTMLParser):
+    """
+    Parse SEC HTML into a Document working directly on lxml elements.
+    The output is the same as SECHTMLParser. Inline XBRL header data is removed but not extracted
+    """
+
+    def __init__(self, root: Element):
+        self.data = None
+        self.root: Element = root
+        self.base_font_size = 10.0
+        self.style_stack: List[StyleInfo] = []
+        self._text_cache: Dict[Element, str] = {}
+        self._split_heading_cache: Dict[Element, Optional[int]] = {}
+        self._remove_ix_headers()
+        self.table_containers: Set[Element] = self._find_table_containers()
+        self._non_text_containers: Set[Element] = self._find_non_text_containers()
+        self._preformatted: Set[Element] = {element
+                                            for pre in self.root.iter(*_whitespace_preserving_tags)
+                                            for element in pre.iter()}
+        self.ix_tracker = _LxmlIXTagTracker(self.table_containers)
+
+    @classmethod
+    def from_html(cls, html: str) -> Optional['LxmlHTMLParser']:
+        root = get_lxml_root(html)
+        if root is not None:
+            return cls(root)
+
+    def parse(self) -> Optional[Document]:
+        body = next(self.root.iter('body'), None)
+        if body is None:
+            log.warning("No body tag found in HTML")
+            return None
+
+        nodes = self._parse_element(body)
+        return Document(nodes=nodes)
+
+    def parse_tables(self) -> List[BaseNode]:
+        """
+        Parse only the tables, skipping the rest of the document.
+        Tables nested inside other tables are parsed as part of the outer table
+        """
+        body = next(self.root.iter('body'), None)
+        tables = []
+        for element in (body if body is not None else self.root).iter('table'):
+            if next(element.iterancestors('table'), None) is not None:
+                continue
+            table_node = self._process_table(element)
+            if table_node:
+                tables.append(table_node)
+        return tables
+
+    # Tree preparation
+
+    def _remove_ix_headers(self):
+        """Remove the hidden ix:header elements, keeping any text that follows them"""
+        for header in list(self.root.iter('ix:header')):
+            parent = header.getparent()
+            if parent is None:
+                continue
+            if header.tail:
+                previous = header.getprevious()
+                if previous is not None:
+                    previous.tail = (previous.tail or '') + header.tail
+                else:
+                    parent.text = (parent.text or '') + header.tail
+            parent.remove(header)
+
+    def _find_table_containers(self) -> Set[Element]:
+        """Find every element that has a table somewhere beneath it"""
+        containers: Set[Element] = set()
+        for table in self.root.iter('table'):
+            for ancestor in table.iterancestors():
+                if ancestor in containers:
+                    break
+                containers.add(ancestor)
+        return containers
+
+    def _find_non_text_containers(self) -> Set[Element]:
+        """Find every element containing script, style or template elements whose text get_text skips"""
+        containers: Set[Element] = set()
+        for element in self.root.iter(*_non_text_tags):
+            containers.add(element)
+            for ancestor in element.iterancestors():
+                if ancestor in containers:
+                    break
+                containers.add(ancestor)
+        return containers
+
+    # Text helpers
+
+    def _children(self, element: Element) -> Iterator[Union[str, Element]]:
+        return _iter_children(element, element in self._preformatted)
+
+    def _stripped_text(self, element: Element) -> str:
+        """Equivalent to BeautifulSoup's element.get_text(strip=True), cached per element"""
+        text = self._text_cache.get(element)
+        if text is None:
+            if element in self._non_text_containers:
+                strings = _iter_strings(element)
+            else:
+                strings = element.itertext()
+            text = ''.join(string.strip() for string in strings)
+            self._text_cache[element] = text
+        return text
+
+    def _get_text_with_spacing(self, element: Element) -> str:
+        """Extract text while preserving meaningful whitespace"""
+        if element.tag == 'table':
+            return ''
+
+        # Each frame holds the children still to visit, the text collected so far and whether the last part was text
+        stack = [(self._children(element), [], [False])]
+        while True:
+            children, texts, last_was_text = stack[-1]
+            for child in children:
+                if isinstance(child, str):
+                    text = self._clean_text(child)
+                    if text.strip():
+                        texts.append(text.strip())
+                        last_was_text[0] = True
+                    elif text.isspace() and last_was_text[0]:
+                        texts.append(' ')
+                elif child.tag == 'br':
+                    texts.append('\n')
+                    last_was_text[0] = False
+                elif child.tag == 'table':
+                    continue
+                else:
+                    stack.append((self._children(child), [], [False]))
+                    break
+            else:
+                stack.pop()
+                child_text = ''.join(texts)
+                if not stack:
+                    return child_text
+                _, parent_texts, parent_last_was_text = stack[-1]
+                if child_text.strip():
+                    if (parent_texts and parent_last_was_text[0] and not parent_texts[-1].endswith(' ')
+                            and not child_text.startswith(' ')):
+                        parent_texts.append(' ')
+                    parent_texts.append(child_text.strip())
+                    parent_last_was_text[0] = True
+
+    # Styles and headings
+
+    def _get_effective_style(self, element: Element, base_style: StyleInfo) -> StyleInfo:
+        """Get combined styles with parent-first approach and semantic tag handling"""
+        effective_style = base_style or StyleInfo()
+
+        span_parent = None
+        div_found = False
+        in_bold = False
+        for parent in element.iterancestors():
+            tag = parent.tag
+            if tag == 'div' and not div_found:
+                effective_style = effective_style.merge(parse_style_cached(parent.get('style', '')))
+                div_found = True
+            elif tag == 'span' and span_parent is None:
+                span_parent = parent
+            elif tag in ('strong', 'b'):
+                in_bold = True
+
+        if span_parent is not None:
+            effective_style = effective_style.merge(parse_style_cached(span_parent.get('style', '')))
+
+        effective_style = effective_style.merge(parse_style_cached(element.get('style', '')))
+
+        if element.tag in ('strong', 'b') or in_bold:
+            effective_style = StyleInfo(
+                font_weight='700',
+                margin_top=effective_style.margin_top,
+                margin_bottom=effective_style.margin_bottom,
+                font_size=effective_style.font_size,
+                text_align=effective_style.text_align,
+                line_height=effective_style.line_height,
+                width=effective_style.width,
+                text_decoration=effective_style.text_decoration,
+                display=effective_style.display
+            )
+        return effective_style
+
+    def _get_heading_level(self, element: Element, style: StyleInfo, text: str) -> Optional[int]:
+        """The lxml equivalent of styles.get_heading_level"""
+        if not text.strip():
+            return None
+
+        # Headings split across several spans in a div are checked as a whole
+        parent_div = next(element.iterancestors('div'), None)
+        if parent_div is not None:
+            if parent_div in self._split_heading_cache:
+                return self._split_heading_cache[parent_div]
+            spans = list(parent_div.iter('span'))
+            if len(spans) > 1:
+                combined_text = ' '.join(self._stripped_text(span) for span in spans)
+                if combined_text.strip():
+                    div_style = parse_style_cached(parent_div.get('style', ''))
+                    has_bold = any(
+                        'font-weight' in span.get('style', '').lower() and
+                        any(weight in span.get('style', '').lower() for weight in _bold_weights)
+                        for span in spans
+                    )
+                    if has_bold:
+                        div_style = StyleInfo(
+                            font_weight='700',
+                            margin_top=div_style.margin_top,
+                            font_size=div_style.font_size,
+                            text_align=div_style.text_align,
+                            display=div_style.display
+                        )
+                    level = self._get_heading_level(parent_div, div_style, combined_text)
+                    self._split_heading_cache[parent_div] = level
+                    return level
+
+        complete_style = self._get_effective_style(element, style)
+        if not _has_minimum_heading_traits(complete_style, text):
+            return None
+
+        text_to_check = text.strip()
+        if HEADING_PATTERNS['l1'].match(text_to_check):
+            return 1
+        if any(pattern.match(text_to_check) for pattern in HEADING_PATTERNS['l2']):
+            return 2
+        if _is_prominently_styled(complete_style):
+            if any(pattern.match(text_to_check) for pattern in HEADING_PATTERNS['l3']):
+                return 3
+            if _is_likely_section_heading(text_to_check, complete_style):
+                return 3
+        if (complete_style.font_weight in _bold_weights and
+                len(text_to_check) < 50 and
+                not text_to_check.startswith(('Note:', '*', '(', '$')) and
+                not text_to_check.endswith(':')):
+            return 4
+        return None
+
+    def _is_block_element(self, element: Element) -> bool:
+        """Determine if an element is block-level"""
+        style_str = element.get('style', '')
+        style = parse_style_cached(style_str)
+        if style.display:
+            return style.display != 'inline'
+        return element.tag in _block_elements and 'float:left' not in style_str
+
+    # Element processing
+
+    def _parse_element(self, element: Element) -> List[BaseNode]:
+        nodes = []
+        for child in element:
+            if not _is_tag(child):
+                continue
+            node = self._process_element(child)
+            if node:
+                nodes.extend(node if isinstance(node, list) else [node])
+        return self._merge_adjacent_nodes(nodes)
+
+    def _collect(self, nodes: List[BaseNode], result, ix_metadata: Dict[str, Any]):
+        """Add the result of processing an element to nodes, tagging it with the ix metadata"""
+        if not result:
+            return
+        results = result if isinstance(result, list) else [result]
+        if ix_metadata:
+            for node in results:
+                node.metadata.update(ix_metadata)
+        nodes.extend(results)
+
+    @staticmethod
+    def _single_or_list(nodes: List[BaseNode]):
+        return nodes[0] if len(nodes) == 1 else nodes if nodes else None
+
+    def _process_element(self, element: Element) -> Optional[Union[BaseNode, List[BaseNode]]]:
+        """Process an element into one or more nodes with inherited styles and ix metadata"""
+        current_style = parse_style_cached(element.get('style', ''))
+        if self.style_stack:
+            current_style = current_style.merge(self.style_stack[-1])
+
+        self.ix_tracker.enter_tag(element)
+        ix_metadata = self.ix_tracker.get_current_context(element)
+        tag = element.tag
+
+        try:
+            self.style_stack.append(current_style)
+            try:
+                text = self._stripped_text(element)
+                if text:
+                    heading_level = self._get_heading_level(element, current_style, text)
+                    if heading_level is not None:
+                        node = create_node(type_='heading', content=text, style=current_style, level=heading_level)
+                        if ix_metadata:
+                            node.metadata.update(ix_metadata)
+                        return node
+
+                if tag.startswith('ix:'):
+                    nodes = []
+                    for child in list(element):
+                        if not _is_tag(child):
+                            continue
+                        if child.tag == 'table':
+                            self._collect(nodes, self._process_table(child), ix_metadata)
+                        elif child.tag == 'p':
+                            self._collect(nodes, self._process_paragraph(child, current_style), ix_metadata)
+                        elif child.tag == 'div':
+                            div_style = parse_style_cached(child.get('style', '')).merge(current_style)
+                            self._collect(nodes, self._process_structured_content(child, div_style), ix_metadata)
+                        else:
+                            self._collect(nodes, self._process_element(child), ix_metadata)
+                    return self._single_or_list(nodes)
+
+                if tag == 'table':
+                    table_node = self._process_table(element)
+                    if table_node and ix_metadata:
+                        table_node.metadata.update(ix_metadata)
+                    return table_node
+
+                elif tag == 'p':
+                    # The heading check above has already been made with the same text and style
+                    para_node = self._process_paragraph(element, current_style)
+                    if para_node and ix_metadata:
+                        para_node.metadata.update(ix_metadata)
+                    return para_node
+
+                elif tag == 'div':
+                    if element in self.table_containers:
+                        block_result = self._process_structured_content(element, current_style)
+                    else:
+                        block_result = self._process_inline_content(element, current_style)
+                    if block_result and ix_metadata:
+                        for node in (block_result if isinstance(block_result, list) else [block_result]):
+                            node.metadata.update(ix_metadata)
+                    return block_result
+
+                nodes = []
+                for child in element:
+                    if _is_tag(child):
+                        self._collect(nodes, self._process_element(child), ix_metadata)
+                return self._single_or_list(nodes)
+
+            finally:
+                self.style_stack.pop()
+        finally:
+            self.ix_tracker.exit_tag(element)
+
+    def _process_structured_content(self, element: Element, style: StyleInfo) -> Optional[Union[BaseNode, List[BaseNode]]]:
+        """Process content in structure-preserving mode (for elements containing tables)"""
+        nodes = []
+        text_parts = []
+
+        def flush_text():
+            if text_parts:
+                text = ' '.join(text_parts).strip()
+                if text:
+                    nodes.append(create_node(type_='text_block', content=text, style=style))
+                text_parts.clear()
+
+        for child in self._children(element):
+            if isinstance(child, str):
+                text = child.strip()
+                if text:
+                    text_parts.append(text)
+            elif child.tag == 'table':
+                flush_text()
+                table_node = self._process_table(child)
+                if table_node:
+                    nodes.append(table_node)
+            elif child in self.table_containers:
+                flush_text()
+                self._collect(nodes, self._process_element(child), {})
+            else:
+                text = self._get_text_with_spacing(child).strip()
+                if text:
+                    text_parts.append(text)
+
+        flush_text()
+        return self._single_or_list(nodes)
+
+    def _process_inline_content(self, element: Element, style: StyleInfo) -> Optional[Union[BaseNode, List[BaseNode]]]:
+        """Process content in content-combining mode (for elements without tables)"""
+        text = self._stripped_text(element)
+        if text:
+            heading_level = self._get_heading_level(element, style, text)
+            if heading_level is not None:
+                return create_node(type_='heading', content=text, style=style, level=heading_level)
+
+        nodes = []
+        text_parts: List[str] = []
+
+        def flush_text():
+            if text_parts:
+                text = ' '.join(text_parts).strip()
+                if text:
+                    heading_level = self._get_heading_level(element, style, text)
+                    if heading_level is not None:
+                        nodes.append(create_node(type_='heading', content=text, style=style, level=heading_level))
+                    else:
+                        nodes.append(create_node(type_='text_block', content=text, style=style))
+                    text_parts.clear()
+
+        for child in self._children(element):
+            if isinstance(child, str):
+                text = child.strip()
+                if text and text != '​':
+                    text_parts.append(text)
+            elif child.tag == 'br':
+                text_parts.append('\n')
+            elif not self._is_block_element(child):
+                child_style = parse_style_cached(child.get('style', '')).merge(style)
+                text = self._get_text_with_spacing(child).strip()
+                if text:
+                    heading_level = self._get_heading_level(child, child_style, text)
+                    if heading_level is not None:
+                        flush_text()
+                        nodes.append(create_node(type_='heading', content=text, style=child_style, level=heading_level))
+                    else:
+                        text_parts.append(text)
+                        style = child_style
+            else:
+                flush_text()
+                self._collect(nodes, self._process_element(child), {})
+
+        flush_text()
+        return self._single_or_list(nodes)
+
+    def _process_paragraph(self, element: Element, style: StyleInfo) -> Optional[BaseNode]:
+        """Process a paragraph element with inherited styles"""
+        text_parts = []
+        last_was_text = False
+
+        for child in self._children(element):
+            if isinstance(child, str):
+                if child.strip():
+                    text_parts.append(child)
+                    last_was_text = True
+                elif child.isspace() and last_was_text:
+                    text_parts.append(' ')
+            elif child.tag == 'br':
+                text_parts.append('\n')
+                last_was_text = False
+            elif child.tag in ('span', 'font', 'strong', 'em', 'b', 'i', 'a'):
+                text = self._get_text_with_spacing(child)
+                if text.strip():
+                    text_parts.append(text.strip())
+                    last_was_text = True
+
+        if not text_parts:
+            return None
+
+        text = ''.join(text_parts)
+        lines = [' '.join(line.split()) for line in text.split('\n')]
+        text = '\n'.join(line for line in lines if line)
+
+        if text.strip():
+            return create_node(type_='text_block', content=text, style=style)
+        return None
+
+    # Tables
+
+    def _cell_text(self, cell: Element) -> str:
+        """Extract text from a cell with careful line break handling"""
+        divs = [child for child in cell if child.tag == 'div']
+        if divs:
+            return '\n'.join(_replace_html_entities(self._stripped_text(div)) for div in divs)
+        text = ''.join(_iter_strings(cell, br_as_newline=True, preformatted=self._preformatted))
+        return _replace_html_entities(text).strip()
+
+    def _process_cell(self, cell: Element) -> List[TableCell]:
+        """Process cell preserving exact colspan and positioning values correctly"""
+        try:
+            colspan = int(cell.get('colspan', '1'))
+        except ValueError:
+            colspan = 1
+        style = parse_style_cached(cell.get('style', ''))
+        text = self._cell_text(cell)
+
+        # A right-aligned cell spanning columns (like percentage values) puts the value in the last column
+        if style.text_align == 'right' and colspan > 1:
+            cells = [TableCell(content='', colspan=1, align='right', is_currency=False) for _ in range(colspan - 1)]
+            cells.append(TableCell(content=text, colspan=1, align='right', is_currency=False))
+            return cells
+
+        return [TableCell(content=text, colspan=colspan, align=style.text_align or 'left', is_currency=text.startswith('$'))]
+
+    def _process_row(self, row: Element) -> TableRow:
+        cells = []
+        for td in row:
+            if td.tag not in ('td', 'th'):
+                continue
+            nested_table = next(td.iterdescendants('table'), None)
+            if nested_table is not None:
+                table_node = self._process_table(nested_table)
+                if table_node:
+                    cells.append(TableCell(content=table_node,
+                                           colspan=int(td.get('colspan', '1')),
+                                           align=td.get('align', 'left')))
+            else:
+                cells.extend(self._process_cell(td))
+        is_header = next(row.iterancestors('thead'), None) is not None
+        return TableRow(cells=cells, is_header=is_header)
+
+    def _process_table(self, element: Element) -> Optional[BaseNode]:
+        """Process table element into a TableNode"""
+        if element is None:
+            return None
+
+        rows = []
+        for tr in element:
+            if tr.tag == 'tr':
+                row = self._process_row(tr)
+                if row.cells:
+                    rows.append(row)
+
+        if rows:
+            metadata = {
+                'id': element.get('id', ''),
+                'class': element.get('class', '').split() if element.get('class') is not None else [],
+                'data_attrs': {k: v for k, v in element.attrib.items() if k.startswith('data-')}
+            }
+            return create_node('table', rows, parse_style_cached(element.get('style', '')), metadata=metadata)
+
+        return None
+
+
+_entity_replacements = {
+    '&horbar;': '-----',
+    '&mdash;': '-----',
+    '&ndash;': '---',
+    '&minus;': '-',
+    '&hyphen;': '-',
+    '&dash;': '-',
+    '&nbsp;': ' ',
+    '&amp;': '&',
+    '&lt;': '<',
+    '&gt;': '>',
+    '&quot;': '"',
+    '&apos;': "'",
+    '&#8202;': ' ',
+    '&#8203;': '',
+    '&#x2014;': '-----',
+    '&#x2013;': '---',
+    '&#x2212;': '-',
+}
+
+_dash_codepoints = {
+    '8208': '-',
+    '8209': '-',
+    '8210': '-',
+    '8211': '---',
+    '8212': '-----',
+    '8213': '-----',
+    '8722': '-',
+}
+
+
+def _replace_html_entities(text: str) -> str:
+    """Replace escaped HTML entities left in cell text with markdown-safe alternatives"""
+    if '&' not in text:
+        return text
+    for entity, replacement in _entity_replacements.items():
+        text = text.replace(entity, replacement)
+    for code, replacement in _dash_codepoints.items():
+        text = text.replace(f'&#{code};', replacement)
+        text = text.replace(f'&#x{hex(int(code))[2:]};', replacement)
+    return text
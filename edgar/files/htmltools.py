@@ -1,10 +1,13 @@
+import json
+import os
 import re
-from dataclasses import dataclass
-from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
 from functools import partial
 from io import StringIO
-from typing import Any, Optional, Dict, Callable
-from typing import List
+from typing import Any, Optional, Dict, Callable, Tuple, Iterable
+from typing import List, Literal
 
 import numpy as np
 import pandas as pd
@@ -12,18 +15,26 @@ from rich import box
 from rich.panel import Panel
 from rich.table import Table
 
+from lxml import etree
+
 from edgar.datatools import compress_dataframe
+from edgar.documentcache import get_document_cache
 from edgar.files.html_documents import HtmlDocument, Block, TableBlock, table_to_markdown
+from edgar.files.html_lxml import LxmlHTMLParser, get_lxml_root
+from edgar.files.tables import TableProcessor
 from edgar.richtools import repr_rich
 
 __all__ = [
     "Element",
     "extract_tables",
+    "extract_tables_from_documents",
     'chunks2df',
     "html_to_text",
     'html_sections',
     'decimal_chunk_fn',
     "ChunkedDocument",
+    "ItemIndex",
+    "build_item_index",
     'remove_bold_tags',
     'detect_decimal_items',
     'adjust_for_empty_items',
@@ -41,7 +52,18 @@ class Element:
 
 
 def extract_tables(html_str: str,
-                   table_filters: List = None) -> List[pd.DataFrame]:
+                   table_filters: List = None,
+                   parser: Literal['pandas', 'lxml'] = 'pandas') -> List[pd.DataFrame]:
+    """
+    Extract the tables in the html as DataFrames
+
+    parser='pandas' reads the tables with pandas.read_html.
+    parser='lxml' is a fast path that only looks at the <table> elements.
+    Each table is processed with TableProcessor, so period headers become the column names
+    and numeric columns are converted to floats
+    """
+    if parser == 'lxml':
+        return _extract_tables_lxml(html_str)
     table_filters = table_filters or [filter_tiny_table]
     tables = pd.read_html(StringIO(html_str))
     # Compress and filter the tables
@@ -55,6 +77,36 @@ def extract_tables(html_str: str,
     return tables
 
 
+def _extract_tables_lxml(html_str: str) -> List[pd.DataFrame]:
+    lxml_parser = LxmlHTMLParser.from_html(html_str)
+    if not lxml_parser:
+        return []
+    tables = []
+    for table_node in lxml_parser.parse_tables():
+        processed_table = TableProcessor.process_table(table_node)
+        if processed_table:
+            table = processed_table.to_dataframe()
+            if len(table) > 0:
+                tables.append(table)
+    return tables
+
+
+def extract_tables_from_documents(documents: Iterable[str],
+                                  max_workers: Optional[int] = None) -> List[List[pd.DataFrame]]:
+    """
+    Extract the tables from many html documents, e.g. the exhibits of a set of 8-K filings,
+    using the lxml table fast path in a pool of worker processes.
+    Returns the list of tables for each document in the same order as the documents
+    """
+    documents = list(documents)
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1 or len(documents) <= 1:
+        return [_extract_tables_lxml(document) for document in documents]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        chunksize = max(1, len(documents) // (max_workers * 4))
+        return list(executor.map(_extract_tables_lxml, documents, chunksize=chunksize))
+
+
 def html_sections(html_str: str,
                   ignore_tables: bool = False) -> List[str]:
     """split the html into sections"""
@@ -99,6 +151,12 @@ def chunk(html: str):
 
 int_item_pattern = r"^(Item\s{1,3}[0-9]{1,2}[A-Z]?)\.?"
 decimal_item_pattern = r"^(Item\s{1,3}[0-9]{1,2}\.[0-9]{2})\.?"
+toc_link_pattern = re.compile('^Table of Contents$', flags=re.IGNORECASE | re.MULTILINE)
+
+
+def is_toc_link(text: str) -> bool:
+    # Matched with re rather than Series.str.match because pandas with arrow strings rejects these flags
+    return toc_link_pattern.match(text) is not None
 
 
 def detect_table_of_contents(text: str):
@@ -253,8 +311,7 @@ def chunks2df(chunks: List[List[Block]],
                              for blocks in chunks]
                             ).assign(Chars=lambda df: df.Text.apply(len),
                                      Signature=lambda df: df.Text.apply(detect_signature).fillna(""),
-                                     TocLink=lambda df: df.Text.str.match('^Table of Contents$',
-                                                                          flags=re.IGNORECASE | re.MULTILINE),
+                                     TocLink=lambda df: df.Text.apply(is_toc_link),
                                      Toc=lambda df: df.Text.head(100).apply(detect_table_of_contents),
                                      Empty=lambda df: df.Text.str.contains('^$', na=True),
                                      Item=lambda df: item_detector(df.Text)
@@ -296,21 +353,204 @@ decimal_chunk_fn = partial(chunks2df,
                            item_adjuster=adjust_for_empty_items)
 
 
+# Elements that can hold the block level content of a document
+_segment_tags = {'div', 'p', 'table', 'ul', 'ol', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+                 'center', 'section', 'article', 'blockquote', 'pre'}
+# Elements that are never part of the text of an item
+_skipped_segment_tags = {'ix:header', 'script', 'style', 'head'}
+# Look for the table of contents in the first segments of the document
+toc_search_limit = 200
+page_number_pattern = re.compile(r'^\d{1,3}$')
+
+
+@dataclass
+class ItemIndex:
+    """
+    The boundaries of the items in a document.
+    Each item is a range [start, end) of content segments, the leaf block elements of the document in order.
+    An item can appear more than once e.g. Item 1 in Part I and Part II of a 10-Q
+    """
+    items: List[Tuple[str, int, int]] = field(default_factory=list)
+    segments: int = 0
+
+    def list_items(self) -> List[str]:
+        return list(dict.fromkeys(item for item, _, _ in self.items))
+
+    def ranges_for(self, item: str) -> List[Tuple[int, int]]:
+        item = re.sub(r'\s+', ' ', item.strip()).title()
+        return [(start, end) for name, start, end in self.items if name == item]
+
+    def to_json(self) -> str:
+        return json.dumps({'items': self.items, 'segments': self.segments})
+
+    @classmethod
+    def from_json(cls, data: str) -> 'ItemIndex':
+        index = json.loads(data)
+        return cls(items=[tuple(item) for item in index['items']], segments=index['segments'])
+
+    def __len__(self):
+        return len(self.items)
+
+
+def _is_segment_container(element) -> bool:
+    """A container is expanded into its children. It has block level children and no text of its own"""
+    if element.tag in ('table', 'ul', 'ol'):
+        return False
+    if (element.text or '').strip():
+        return False
+    has_block_children = False
+    for child in element:
+        if (child.tail or '').strip():
+            return False
+        if child.tag in _segment_tags:
+            has_block_children = True
+    return has_block_children
+
+
+def content_segments(root) -> List[Any]:
+    """Get the leaf block elements of the document body in document order"""
+    body = root.find('body')
+    stack = [body if body is not None else root]
+    segments = []
+    while stack:
+        element = stack.pop()
+        if _is_segment_container(element):
+            stack.extend(reversed([child for child in element
+                                   if isinstance(child.tag, str) and child.tag not in _skipped_segment_tags]))
+        else:
+            segments.append(element)
+    return segments
+
+
+def _segment_text(segment) -> str:
+    """The text of the segment. Table rows are put on separate lines, as they are when tables are rendered"""
+    if segment.tag == 'table':
+        rows = []
+        for row in segment.iter('tr'):
+            cells = [re.sub(r'\s+', ' ', cell.xpath('string()')).strip() for cell in row if cell.tag in ('td', 'th')]
+            rows.append(' | '.join(cell for cell in cells if cell))
+        return '\n'.join(rows)
+    return re.sub(r'\s+', ' ', segment.xpath('string()')).strip()
+
+
+def build_item_index(segments: List[Any], item_pattern: str = int_item_pattern) -> ItemIndex:
+    """
+    Find the item boundaries in the content segments of a document.
+    This follows the rules that chunks2df uses to assign items to chunks
+    - items listed in the table of contents are ignored
+    - a heading matching the item pattern starts an item, which runs until the next item
+    - the signature block ends the last item
+    """
+    pattern = re.compile(item_pattern, flags=re.IGNORECASE | re.MULTILINE)
+    texts = [_segment_text(segment) for segment in segments]
+
+    toc_end = -1
+    for index, text in enumerate(texts[:toc_search_limit]):
+        if detect_table_of_contents(text):
+            toc_end = index
+
+    items = []
+    current_item, start = None, 0
+    end = len(texts)
+    for index in range(toc_end + 1, len(texts)):
+        text = texts[index]
+        if detect_signature(text):
+            end = index
+            break
+        match = pattern.search(text)
+        if match:
+            if current_item:
+                items.append((current_item, start, index))
+            current_item, start = re.sub(r'\s+', ' ', match.group(1)).title(), index
+    if current_item:
+        items.append((current_item, start, end))
+    return ItemIndex(items=items, segments=len(segments))
+
+
+def _item_pattern_for(chunk_fn: Callable) -> str:
+    item_detector = getattr(chunk_fn, 'keywords', {}).get('item_detector')
+    return decimal_item_pattern if item_detector is detect_decimal_items else int_item_pattern
+
+
 class ChunkedDocument:
     """
     Contains the html as broken into chunks
+
+    By default the whole document is chunked when it is created. With `lazy=True` nothing is done up front.
+    Getting an item builds a lightweight index of the item boundaries and only the chunks for that item are rendered.
+    Items that are not in the index are found by chunking the whole document, as when it is not lazy.
+    The index is cached in the document cache when an accession number is given
     """
 
     def __init__(self,
                  html: str,
-                 chunk_fn: Callable[[List], pd.DataFrame] = chunks2df):
+                 chunk_fn: Callable[[List], pd.DataFrame] = chunks2df,
+                 lazy: bool = False,
+                 accession_number: Optional[str] = None):
         """
         :param html: The filing html
         :param chunk_fn: A function that converts the chunks to a dataframe
+        :param lazy: If True only chunk the parts of the document that are requested
+        :param accession_number: The accession number of the filing, used as the cache key for the item index
         """
-        self.chunks = chunk(html)
-        self._chunked_data = chunk_fn(self.chunks)
+        self.html = html
         self.chunk_fn = chunk_fn
+        self.lazy = lazy
+        self.accession_number = accession_number
+        if not lazy:
+            _ = self._chunked_data
+
+    @cached_property
+    def chunks(self) -> List[List[Block]]:
+        return chunk(self.html)
+
+    @cached_property
+    def _chunked_data(self) -> pd.DataFrame:
+        return self.chunk_fn(self.chunks)
+
+    @cached_property
+    def _segments(self) -> List[Any]:
+        root = get_lxml_root(self.html)
+        return content_segments(root) if root is not None else []
+
+    @cached_property
+    def item_index(self) -> ItemIndex:
+        item_pattern = _item_pattern_for(self.chunk_fn)
+        cache_name = "<decimal-item-index>" if item_pattern == decimal_item_pattern else "<item-index>"
+        if self.accession_number:
+            cached = get_document_cache().get(self.accession_number, cache_name)
+            if cached:
+                item_index = ItemIndex.from_json(cached)
+                if item_index.segments == len(self._segments):
+                    return item_index
+        item_index = build_item_index(self._segments, item_pattern=item_pattern)
+        if self.accession_number:
+            get_document_cache().put(self.accession_number, cache_name, item_index.to_json())
+        return item_index
+
+    def _use_item_index(self) -> bool:
+        # Fall back to chunking the whole document if no items could be found with the index
+        return self.lazy and len(self.item_index) > 0
+
+    def _render_item(self, item: str) -> Optional[str]:
+        """Render only the segments of the document that belong to the item"""
+        segments = self._segments
+        fragment = "".join(etree.tostring(segment, encoding='unicode', method='html', with_tail=False)
+                           for start, end in self.item_index.ranges_for(item)
+                           for segment in segments[start:end])
+        if not fragment:
+            return None
+        document = HtmlDocument.from_html(f"<html><body>{fragment}</body></html>")
+        if not document:
+            return None
+        texts = []
+        for chunk_ in document.generate_chunks():
+            text = _render_blocks_using_old_markdown_tables(chunk_)
+            # Skip empty chunks and page numbers
+            if not text or page_number_pattern.match(text):
+                continue
+            texts.append("".join(block.get_text() for block in chunk_))
+        return "".join(texts) or None
 
     @lru_cache(maxsize=4)
     def as_dataframe(self):
@@ -325,6 +565,8 @@ class ChunkedDocument:
         return result
 
     def list_items(self):
+        if self._use_item_index():
+            return self.item_index.list_items()
         return [item for item in self._chunked_data.Item.drop_duplicates().tolist() if item]
 
     def _chunks_for(self, item_or_part: str, col: str = 'Item'):
@@ -364,7 +606,10 @@ class ChunkedDocument:
     def __getitem__(self, item):
         if isinstance(item, int):
             chunks = [self.chunks[item]]
+        elif isinstance(item, str) and self._use_item_index() and self.item_index.ranges_for(item):
+            return self._render_item(item)
         elif isinstance(item, str):
+            # Items that are not in the index are looked up in the fully chunked document
             chunks = list(self.chunks_for_item(item))
         else:
             return None
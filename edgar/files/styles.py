@@ -1,5 +1,6 @@
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from functools import lru_cache
 from enum import Enum
 from typing import Optional, Dict, Any, Tuple
 from typing import Union
@@ -8,7 +9,7 @@ from bs4 import Tag
 
 from edgar.core import log as logger
 
-__all__ = ['StyleInfo', 'UnitType', 'StyleUnit', 'parse_style', 'is_heading', 'get_heading_level']
+__all__ = ['StyleInfo', 'UnitType', 'StyleUnit', 'parse_style', 'parse_style_cached', 'is_heading', 'get_heading_level']
 
 base_font_size = 10.0
 
@@ -49,6 +50,18 @@ class UnitType(Enum):
     REM = 'rem'
 
 
+_inches_per_unit = {
+    UnitType.INCH: 1.0,
+    UnitType.POINT: 1 / 72,  # 72 points per inch
+    UnitType.PIXEL: 1 / 96,  # 96 pixels per inch
+    UnitType.CM: 0.393701,  # 1 cm = 0.393701 inches
+    UnitType.MM: 0.0393701,  # 1 mm = 0.0393701 inches
+    UnitType.EM: 1 / 6,  # Approximate, assumes 1em = 1/6 inch
+    UnitType.REM: 1 / 6,  # Same as EM
+    UnitType.PERCENT: 1.0  # Handled separately in to_chars
+}
+
+
 @dataclass
 class StyleUnit:
     """Represents a CSS measurement with original and normalized values
@@ -85,17 +98,7 @@ class StyleUnit:
 
     def _to_inches(self) -> float:
         """Convert any unit to inches"""
-        conversions = {
-            UnitType.INCH: 1.0,
-            UnitType.POINT: 1 / 72,  # 72 points per inch
-            UnitType.PIXEL: 1 / 96,  # 96 pixels per inch
-            UnitType.CM: 0.393701,  # 1 cm = 0.393701 inches
-            UnitType.MM: 0.0393701,  # 1 mm = 0.0393701 inches
-            UnitType.EM: 1 / 6,  # Approximate, assumes 1em = 1/6 inch
-            UnitType.REM: 1 / 6,  # Same as EM
-            UnitType.PERCENT: 1.0  # Handled separately in to_chars
-        }
-        return self.value * conversions[self.unit]
+        return self.value * _inches_per_unit[self.unit]
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, StyleUnit):
@@ -192,6 +195,17 @@ class StyleInfo:
 
 def parse_style(style_str: str) -> StyleInfo:
     """Parse inline CSS style string into StyleInfo object with robust unit validation"""
+    # Return a copy because callers are allowed to modify the style they get back
+    return replace(parse_style_cached(style_str))
+
+
+@lru_cache(maxsize=8192)
+def parse_style_cached(style_str: str) -> StyleInfo:
+    """
+    Parse inline CSS style string, memoized per style string.
+    SEC documents repeat a small number of style strings thousands of times.
+    The returned StyleInfo is shared so it must not be modified
+    """
     style = StyleInfo()
     if not style_str:
         return style
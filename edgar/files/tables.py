@@ -1,5 +1,8 @@
 from dataclasses import dataclass
 from typing import Optional, Union
+
+import pandas as pd
+
 from edgar.richtools import rich_to_text
 import re
 from functools import lru_cache
@@ -12,6 +15,35 @@ class ProcessedTable:
     data_rows: list[list[str]]
     column_alignments: list[str]  # "left" or "right" for each column
 
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Convert to a DataFrame. Columns holding only $ or % signs are dropped
+        and columns where every value is a number are converted to floats
+        """
+        if not self.data_rows:
+            return pd.DataFrame()
+        col_count = len(self.data_rows[0])
+        keep = [col for col in range(col_count)
+                if any(row[col].strip() not in missing_values for row in self.data_rows)
+                or (col == 0 and self.headers and self.headers[0])]
+
+        columns = []
+        for col in keep:
+            name = (self.headers[col] if self.headers else '').replace('\n', ' ').strip() or f"col_{col}"
+            while name in columns:
+                name = f"{name}_{col}"
+            columns.append(name)
+
+        data = {}
+        for name, col in zip(columns, keep):
+            values = [row[col].strip() for row in self.data_rows]
+            present = [value for value in values if value not in missing_values]
+            if col > 0 and present and all(is_number(value) for value in present):
+                data[name] = [parse_number(value) for value in values]
+            else:
+                data[name] = values
+        return pd.DataFrame(data)
+
 
 # Looks for actual numeric data values, currency, or calculations
 data_indicators = [
@@ -24,6 +56,10 @@ data_indicators = [
 data_pattern = '|'.join(data_indicators)
 
 
+# Cells that hold no value, such as currency and percent signs in their own columns
+missing_values = {'', '$', '%', '-', '—', '–', '---', '-----'}
+
+
 def is_number(s: str) -> bool:
     """
     Check if a string represents a number in common financial formats.
@@ -47,6 +83,27 @@ def is_number(s: str) -> bool:
     if not s or s.isspace():
         return False
 
+    try:
+        float(_normalize_number(s))
+        return True
+    except ValueError:
+        return False
+
+
+def parse_number(s: str) -> Optional[float]:
+    """
+    Convert a string in one of the financial formats accepted by `is_number` to a float.
+    Returns None if the string is not a number
+    """
+    if not s or s.isspace():
+        return None
+    try:
+        return float(_normalize_number(s))
+    except ValueError:
+        return None
+
+
+def _normalize_number(s: str) -> str:
     # Convert unicode minus/dash characters to regular minus
     s = s.replace('−', '-').replace('–', '-').replace('—', '-')
 
@@ -64,12 +121,7 @@ def is_number(s: str) -> bool:
     else:
         # Remove thousands separators
         s = s.replace(',', '')
-
-    try:
-        float(s)
-        return True
-    except ValueError:
-        return False
+    return s
 
 class TableProcessor:
     @staticmethod
@@ -2,7 +2,7 @@ import logging
 import threading
 from contextlib import asynccontextmanager, contextmanager, nullcontext
 import httpx
-from typing import AsyncGenerator, Optional
+from typing import AsyncGenerator, Callable, List, Optional
 
 from edgar.core import client_headers, edgar_mode
 
@@ -19,11 +19,49 @@ DEFAULT_PARAMS = {
 client_factory_class = httpx.Client
 asyncclient_factory_class = httpx.AsyncClient
 
+# Functions called with each response of the clients when its headers arrive e.g. to count the requests per host.
+# The clients call the hooks registered now, so a hook can be added after the persistent client is created
+_response_hooks: List[Callable[[httpx.Response], None]] = []
+
+
+def add_response_hook(hook: Callable[[httpx.Response], None]):
+    """Call `hook` with each response of the edgar http clients"""
+    _response_hooks.append(hook)
+
+
+def remove_response_hook(hook: Callable[[httpx.Response], None]):
+    if hook in _response_hooks:
+        _response_hooks.remove(hook)
+
+
+def _run_response_hooks(response: httpx.Response):
+    for hook in list(_response_hooks):
+        try:
+            hook(response)
+        except Exception:
+            log.exception("Exception in response hook")
+
+
+async def _run_async_response_hooks(response: httpx.Response):
+    _run_response_hooks(response)
+
+
+def response_event_hooks(asynchronous: bool = False, event_hooks: Optional[dict] = None) -> dict:
+    """
+    The httpx event hooks that run the response hooks, added to `event_hooks`.
+    Use for clients created outside edgar so their responses are seen by the hooks too
+    """
+    hooks = {event: list(event_hook) for event, event_hook in (event_hooks or {}).items()}
+    hooks.setdefault("response", []).append(_run_async_response_hooks if asynchronous else _run_response_hooks)
+    return hooks
+
+
 def _client_factory(**kwargs)-> httpx.Client:
     params = DEFAULT_PARAMS.copy()
     params["headers"] = client_headers()
     
     params.update(**kwargs)
+    params["event_hooks"] = response_event_hooks(event_hooks=params.get("event_hooks"))
     
     return client_factory_class(**params)
 
@@ -79,6 +117,7 @@ async def async_http_client(client: Optional[httpx.AsyncClient] = None, **kwargs
     params["headers"] = client_headers()
     
     params.update(**kwargs)
+    params["event_hooks"] = response_event_hooks(asynchronous=True, event_hooks=params.get("event_hooks"))
     async with asyncclient_factory_class(**params) as client:
         yield client
 
@@ -1,3 +1,4 @@
+import asyncio
 import gzip
 import logging
 import os
@@ -23,7 +24,7 @@ from edgar.httpclient import http_client, async_http_client
 __all__ = ["get_with_retry", "get_with_retry_async", "stream_with_retry", "post_with_retry", "post_with_retry_async",
            "download_file", "download_file_async", "download_json", "download_json_async", "stream_file",
            "download_text", "download_text_between_tags", "download_bulk_data", "download_datafile",
-           "throttle_requests"]
+           "throttle_requests", "get_throttler", "extract_archive"]
 
 attempts = 6
 retry_timeout = 40
@@ -90,6 +91,11 @@ class Throttler:
         while not self.get_ticket():
             time.sleep(self.sleep_interval)
 
+    async def wait_for_ticket_async(self):
+        """Wait for a ticket without blocking the event loop"""
+        while not self.get_ticket():
+            await asyncio.sleep(self.sleep_interval)
+
     def update_metrics(self):
         self.total_calls += 1
         current_call_rate: float = len(self.request_timestamps) / self.request_rate.time_window
@@ -152,6 +158,11 @@ def throttle_requests(request_rate=None, requests_per_second=None, **kwargs):
     return decorator
 
 
+def get_throttler() -> Throttler:
+    """Get the throttler shared by all the requests to the SEC"""
+    return _throttler_instances["global_throttler"]
+
+
 def is_redirect(response):
     return response.status_code in [301, 302]
 
@@ -629,10 +640,49 @@ def download_text_between_tags(url: str, tag: str):
 logger = logging.getLogger(__name__)
 
 
+def extract_archive(archive: Path, directory: Path) -> None:
+    """
+    Extract a zip or tar.gz archive into a directory
+
+    Raises:
+        ValueError: If the archive format is not supported or a tar member is outside the directory
+        zipfile.BadZipFile: If the zip file is corrupted
+        tarfile.TarError: If the tar.gz file is corrupted
+    """
+    filename = archive.name
+    try:
+        if filename.endswith(".zip"):
+            with zipfile.ZipFile(archive, 'r') as z:
+                z.extractall(directory)
+        elif any(filename.endswith(ext) for ext in (".tar.gz", ".tgz")):
+            with tarfile.open(archive, 'r:gz') as tar:
+                # Security check for tar files to prevent path traversal
+                def is_within_directory(directory: Path, target: Path) -> bool:
+                    try:
+                        return os.path.commonpath([directory, target]) == str(directory)
+                    except ValueError:
+                        return False
+
+                def safe_extract(tar: tarfile.TarFile, path: str) -> None:
+                    for member in tar.getmembers():
+                        member_path = os.path.join(path, member.name)
+                        if not is_within_directory(Path(path), Path(member_path)):
+                            raise ValueError(f"Attempted path traversal in tar file: {member.name}")
+                    tar.extractall(path)
+
+                safe_extract(tar, str(directory))
+        else:
+            raise ValueError(f"Unsupported file format: {filename}")
+
+    except (zipfile.BadZipFile, tarfile.TarError) as e:
+        raise type(e)(f"Failed to extract archive {filename}: {e}")
+
+
 @retry(on=RequestError, attempts=attempts, timeout=retry_timeout, wait_initial=wait_initial)
 async def download_bulk_data(url: str,
                              data_directory: Path = get_edgar_data_directory(),
-                             client: Optional[AsyncClient] = None) -> Path:
+                             client: Optional[AsyncClient] = None,
+                             extract: bool = True) -> Path:
     """
     Download and extract bulk data from zip or tar.gz archives
 
@@ -640,9 +690,10 @@ async def download_bulk_data(url: str,
         client: The httpx.AsyncClient instance
         url: URL to download from (e.g. "https://www.sec.gov/Archives/edgar/daily-index/xbrl/companyfacts.zip")
         data_directory: Base directory for downloads
+        extract: If False keep the archive without extracting it
 
     Returns:
-        Path to the directory containing the extracted data
+        Path to the directory containing the extracted data, or to the archive if extract is False
 
     Raises:
         ValueError: If the URL or filename is invalid
@@ -671,33 +722,12 @@ async def download_bulk_data(url: str,
         except Exception as e:
             raise IOError(f"Failed to download file: {e}")
 
+        if not extract:
+            return download_filename
+
         # Extract based on file extension
         try:
-            if filename.endswith(".zip"):
-                with zipfile.ZipFile(download_filename, 'r') as z:
-                    z.extractall(download_path)
-            elif any(filename.endswith(ext) for ext in (".tar.gz", ".tgz")):
-                with tarfile.open(download_filename, 'r:gz') as tar:
-                    # Security check for tar files to prevent path traversal
-                    def is_within_directory(directory: Path, target: Path) -> bool:
-                        try:
-                            return os.path.commonpath([directory, target]) == str(directory)
-                        except ValueError:
-                            return False
-
-                    def safe_extract(tar: tarfile.TarFile, path: str) -> None:
-                        for member in tar.getmembers():
-                            member_path = os.path.join(path, member.name)
-                            if not is_within_directory(Path(path), Path(member_path)):
-                                raise ValueError(f"Attempted path traversal in tar file: {member.name}")
-                        tar.extractall(path)
-
-                    safe_extract(tar, str(download_path))
-            else:
-                raise ValueError(f"Unsupported file format: {filename}")
-
-        except (zipfile.BadZipFile, tarfile.TarError) as e:
-            raise type(e)(f"Failed to extract archive {filename}: {e}")
+            extract_archive(download_filename, download_path)
 
         finally:
             # Always try to clean up the archive file, but don't fail if we can't
@@ -0,0 +1,255 @@
+"""
+Extract items from many 10-K, 10-Q and 8-K filings.
+
+TenK, TenQ and EightK work on one filing at a time and chunking a document is CPU bound.
+`extract_items` runs the work for a selection of filings as a pipeline
+
+    download (async, bounded) -> parse + chunk + extract (process pool) -> sink (JSONL or Parquet)
+
+Each completed filing is recorded in a checkpoint file next to the output so a long run
+that is interrupted can be restarted with the same arguments and will skip the filings already done.
+
+```
+from edgar import get_filings
+from edgar.item_extraction import extract_items
+
+filings = get_filings(2024, 1, form="10-K")
+extract_items(filings, ["Item 1A", "Item 7"], "risk_factors.jsonl")
+```
+"""
+import asyncio
+import json
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, List, Optional, Set, Tuple, Union
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from edgar.core import has_html_content, log
+from edgar.documentcache import SUBMISSION_TEXT, get_document_cache
+from edgar.files.htmltools import ChunkedDocument, chunks2df, decimal_chunk_fn
+from edgar.httpclient import async_http_client
+from edgar.httprequests import download_file_async
+from edgar.sgml import FilingSGML
+from edgar.storage import is_using_local_storage, read_local_filing
+
+__all__ = ['extract_items', 'extract_items_async', 'ItemExtractionSummary']
+
+# The schema of the rows written to the sink
+item_schema = pa.schema([
+    ('accession_no', pa.string()),
+    ('form', pa.string()),
+    ('company', pa.string()),
+    ('cik', pa.int64()),
+    ('filing_date', pa.string()),
+    ('item', pa.string()),
+    ('text', pa.string()),
+])
+
+
+@dataclass
+class ItemExtractionSummary:
+    output: Path
+    completed: int = 0
+    skipped: int = 0
+    items: int = 0
+    failed: List[str] = field(default_factory=list)
+
+    def __str__(self):
+        return (f"Extracted {self.items} items from {self.completed} filings to {self.output} "
+                f"(skipped {self.skipped}, failed {len(self.failed)})")
+
+
+def _extract_filing_items(submission_text: str, form: str, items: List[str]) -> List[Tuple[str, str]]:
+    """
+    Parse the submission and extract the items from the primary html document.
+    This runs in a worker process so it only takes and returns plain data
+    """
+    html = FilingSGML.from_text(submission_text).html()
+    if not html or not has_html_content(html):
+        return []
+    chunk_fn = decimal_chunk_fn if form.startswith("8-K") else chunks2df
+    # Eager chunking so the items have the same text as TenK(filing)[item] and the other reports
+    document = ChunkedDocument(html, chunk_fn=chunk_fn)
+    results = []
+    for item in items:
+        text = document[item]
+        if text:
+            results.append((item, text))
+    return results
+
+
+class ExtractionCheckpoint:
+    """The accession numbers of the filings that have been written to the sink, one per line"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.completed: Set[str] = set()
+        if path.exists():
+            self.completed = {line.strip() for line in path.read_text().splitlines() if line.strip()}
+
+    def __contains__(self, accession_no: str):
+        return accession_no in self.completed
+
+    def add(self, accession_nos: Iterable[str]):
+        accession_nos = list(accession_nos)
+        if not accession_nos:
+            return
+        with self.path.open("a") as f:
+            f.write("".join(f"{accession_no}\n" for accession_no in accession_nos))
+            f.flush()
+            os.fsync(f.fileno())
+        self.completed.update(accession_nos)
+
+
+class JsonlItemSink:
+    """Append each item as a line of JSON. The checkpoint is updated after each filing is written"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.checkpoint = ExtractionCheckpoint(path.with_name(f"{path.name}.checkpoint"))
+
+    def write(self, rows: List[dict], accession_no: str):
+        with self.path.open("a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+        self.checkpoint.add([accession_no])
+
+    def close(self):
+        pass
+
+
+class ParquetItemSink:
+    """
+    Write the items as parquet files in a directory. Rows are buffered and written as a new part file
+    every `batch_size` filings, after which the checkpoint is updated
+    """
+
+    def __init__(self, directory: Path, batch_size: int = 100):
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.checkpoint = ExtractionCheckpoint(directory / "_checkpoint.txt")
+        self._rows: List[dict] = []
+        self._pending: List[str] = []
+        self._part = len(list(directory.glob("part-*.parquet")))
+
+    def write(self, rows: List[dict], accession_no: str):
+        self._rows.extend(rows)
+        self._pending.append(accession_no)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._rows:
+            table = pa.Table.from_pylist(self._rows, schema=item_schema)
+            pq.write_table(table, self.directory / f"part-{self._part:05d}.parquet")
+            self._part += 1
+        self.checkpoint.add(self._pending)
+        self._rows, self._pending = [], []
+
+    def close(self):
+        self.flush()
+
+
+async def _get_submission_text(client, filing) -> str:
+    if is_using_local_storage():
+        content = read_local_filing(str(filing.filing_date), filing.accession_no)
+        if content is not None:
+            return content
+    cache = get_document_cache()
+    content = cache.get(filing.accession_no, SUBMISSION_TEXT)
+    if content is None:
+        content = await download_file_async(client, filing.text_url, as_text=True)
+        cache.put(filing.accession_no, SUBMISSION_TEXT, content)
+    return content
+
+
+async def extract_items_async(filings,
+                              items: List[str],
+                              output: Union[str, Path],
+                              max_downloads: int = 4,
+                              max_workers: Optional[int] = None,
+                              batch_size: int = 100,
+                              executor: Optional[Executor] = None) -> ItemExtractionSummary:
+    """
+    Extract the items from the filings and write them to `output`. See `extract_items`
+    """
+    output = Path(output)
+    sink = JsonlItemSink(output) if output.suffix == ".jsonl" else ParquetItemSink(output, batch_size=batch_size)
+    summary = ItemExtractionSummary(output=output)
+
+    max_workers = max_workers or os.cpu_count() or 1
+    own_executor = executor is None
+    executor = executor or ProcessPoolExecutor(max_workers=max_workers)
+    # Limit the number of filings downloaded but not yet extracted so memory stays bounded
+    in_flight = asyncio.Semaphore(max_workers * 2)
+    download_slots = asyncio.Semaphore(max_downloads)
+    loop = asyncio.get_running_loop()
+
+    async def process(client, filing):
+        async with in_flight:
+            try:
+                async with download_slots:
+                    submission_text = await _get_submission_text(client, filing)
+                extracted = await loop.run_in_executor(executor, _extract_filing_items,
+                                                       submission_text, filing.form, items)
+            except Exception as e:
+                log.warning(f"Could not extract items from {filing.accession_no}: {e}")
+                summary.failed.append(filing.accession_no)
+                return
+            rows = [dict(accession_no=filing.accession_no, form=filing.form, company=filing.company,
+                         cik=int(filing.cik), filing_date=str(filing.filing_date), item=item, text=text)
+                    for item, text in extracted]
+            sink.write(rows, filing.accession_no)
+            summary.completed += 1
+            summary.items += len(rows)
+
+    try:
+        async with async_http_client() as client:
+            tasks = []
+            for filing in filings:
+                if filing.accession_no in sink.checkpoint:
+                    summary.skipped += 1
+                    continue
+                tasks.append(process(client, filing))
+            await asyncio.gather(*tasks)
+    finally:
+        sink.close()
+        if own_executor:
+            executor.shutdown()
+    return summary
+
+
+def extract_items(filings,
+                  items: List[str],
+                  output: Union[str, Path],
+                  max_downloads: int = 4,
+                  max_workers: Optional[int] = None,
+                  batch_size: int = 100) -> ItemExtractionSummary:
+    """
+    Extract items such as "Item 1A" or "Item 5.02" from many 10-K, 10-Q or 8-K filings
+
+    Filings are downloaded concurrently, at most `max_downloads` at a time and within the SEC rate limit.
+    Parsing and chunking run in a process pool of `max_workers` processes.
+    Results are written as rows of (accession_no, form, company, cik, filing_date, item, text) to
+
+    - a JSON lines file if `output` ends with .jsonl
+    - otherwise a directory of parquet files, written every `batch_size` filings
+
+    Completed filings are recorded in a checkpoint so running again with the same output resumes the extraction
+
+    :param filings: The filings e.g. get_filings(form="10-K")
+    :param items: The items to extract
+    :param output: The output file or directory
+    :param max_downloads: The maximum number of concurrent downloads
+    :param max_workers: The number of worker processes. Defaults to the number of cpus
+    :param batch_size: The number of filings per parquet file
+    """
+    return asyncio.run(extract_items_async(filings, items, output,
+                                           max_downloads=max_downloads,
+                                           max_workers=max_workers,
+                                           batch_size=batch_size))
@@ -7,6 +7,7 @@ from typing import Iterator, Dict, DefaultDict
 from typing import List, Union, Optional, Tuple
 
 from edgar.attachments import Attachments, Attachment, get_document_type
+from edgar.documentcache import get_document_cache, SUBMISSION_TEXT
 from edgar.httprequests import stream_with_retry
 from edgar.sgml.sgml_header import FilingHeader
 from edgar.sgml.sgml_parser import SGMLParser, SGMLFormatType, SGMLDocument
@@ -430,8 +431,13 @@ class FilingSGML:
 
     @classmethod
     def from_filing(cls, filing: 'Filing') -> 'FilingSGML':
-        """Create from a Filing object that provides text_url."""
-        filing_sgml = cls.from_source(filing.text_url)
+        """Create from a Filing object that provides text_url.
+        The full text submission is served from the document cache so it is only fetched once per accession number
+        """
+        content = get_document_cache().get_or_fetch(filing.accession_no,
+                                                    SUBMISSION_TEXT,
+                                                    lambda: read_content_as_string(filing.text_url))
+        filing_sgml = cls.from_text(content)
         if not filing_sgml.accession_number:
             filing_sgml.header.filing_metadata.update('ACCESSION NUMBER', filing.accession_no)
         if not filing_sgml.header.filing_metadata.get("CIK"):
@@ -8,7 +8,6 @@ from typing import Optional, Union, List
 import pandas as pd
 from bs4 import BeautifulSoup
 from httpx import HTTPStatusError, AsyncClient
-from tqdm.auto import tqdm
 
 from edgar.core import log, get_edgar_data_directory, filing_date_to_year_quarters, extract_dates, strtobool
 from edgar.httprequests import download_bulk_data, download_datafile, download_text, throttle_requests
@@ -23,6 +22,7 @@ __all__ = ['download_edgar_data',
            'is_using_local_storage',
            'download_filings',
            'local_filing_path',
+           'read_local_filing',
            '_filter_extracted_files']
 
 def use_local_storage(use_local: bool = True):
@@ -54,20 +54,34 @@ def download_facts() -> Path:
     
     return asyncio.run(download_facts_async(client = None))
 
-async def download_submissions_async(client: Optional[AsyncClient]) -> Path:
+async def download_submissions_async(client: Optional[AsyncClient], as_parquet: bool = True) -> Path:
     """
-    Download company submissions
+    Download company submissions.
+    With as_parquet the submissions.zip is converted into the Parquet submissions store without extracting
+    the json files. See `edgar.entity.submissions_store`
     """
-    log.info(f"Downloading Company submissions to {get_edgar_data_directory()}/submissions")
-
-    return await download_bulk_data(client=client, url="https://www.sec.gov/Archives/edgar/daily-index/bulkdata/submissions.zip")
+    url = "https://www.sec.gov/Archives/edgar/daily-index/bulkdata/submissions.zip"
+    if not as_parquet:
+        log.info(f"Downloading Company submissions to {get_edgar_data_directory()}/submissions")
+        return await download_bulk_data(client=client, url=url)
+
+    from edgar.entity.submissions_store import build_submissions_store
+    log.info(f"Downloading Company submissions to the submissions store in {get_edgar_data_directory()}")
+    archive = await download_bulk_data(client=client, url=url, data_directory=get_edgar_data_directory(), extract=False)
+    try:
+        store = await asyncio.to_thread(build_submissions_store, archive)
+    finally:
+        archive.unlink(missing_ok=True)
+        if archive.parent.exists() and not any(archive.parent.iterdir()):
+            archive.parent.rmdir()
+    return store.directory
 
 
-def download_submissions() -> Path:
+def download_submissions(as_parquet: bool = True) -> Path:
     """
-    Download company facts
+    Download company submissions into the Parquet submissions store, or as json files if as_parquet is False
     """
-    return asyncio.run(download_submissions_async(client = None))
+    return asyncio.run(download_submissions_async(client=None, as_parquet=as_parquet))
 
 def download_ticker_data(reference_data_directory: Path):
     """
@@ -109,10 +123,21 @@ def download_edgar_data(submissions: bool = True,
 def download_filings(filing_date: Optional[str] = None,
                      data_directory: Optional[str] = None,
                      overwrite_existing:bool=False,
-                     filings: Optional['Filings'] = None):
+                     filings: Optional['Filings'] = None,
+                     max_downloads: int = 4,
+                     compress: bool = False,
+                     stream: bool = False):
     """
     Download feed files for the specified date or date range, or for specific filings.
 
+    Feed files are downloaded concurrently, at most `max_downloads` at a time and within the SEC rate limit.
+    Interrupted downloads are resumed, each feed file is extracted keeping only the filings asked for, and
+    completed feed files are recorded in a manifest in the data directory so running again skips them.
+    See `edgar.feed_download`
+
+    With compress=True each day is kept as a compressed archive with an index instead of being extracted
+    into thousands of files. Filings are read from the archive with `read_local_filing`. See `edgar.feed_archive`
+
     Examples
 
     download_filings('2025-01-03:')
@@ -127,10 +152,18 @@ def download_filings(filing_date: Optional[str] = None,
         data_directory: Directory to save the downloaded files. Defaults to the Edgar data directory.
         overwrite_existing: If True, overwrite existing files. Default is False.
         filings: Optional Filings object. If provided, will download only filings with matching accession numbers.
+        max_downloads: The maximum number of feed files downloaded at the same time
+        compress: If True, keep each day as an indexed compressed archive instead of extracting it
+        stream: If True extract the feed files as they download. An interrupted stream starts again from the
+                beginning. By default each feed file is downloaded first, resuming interrupted downloads,
+                then extracted
     """
+    from edgar.feed_download import download_feed_files
+
     if not data_directory:
         data_directory = get_edgar_data_directory() / 'filings'
         log.info('Using data directory: %s', data_directory)
+    data_directory = Path(data_directory)
 
     # If filings object is provided, extract accession numbers
     accession_numbers = None
@@ -157,13 +190,11 @@ def download_filings(filing_date: Optional[str] = None,
 
     # Get quarters to process
     year_and_quarters = filing_date_to_year_quarters(filing_date)
-    
-    # Track statistics
-    total_feed_files_downloaded = 0
-    total_filings_kept = 0
 
+    # Collect the feed files in the date range for all quarters so they can be downloaded together
+    feed_files_in_range = []
     for year, quarter in year_and_quarters:
-        log.info('Downloading feed files for %d Q%d', year, quarter)
+        log.info('Listing feed files for %d Q%d', year, quarter)
         # Get list of feed files for this quarter
         feed_files = list_filing_feed_files_for_quarter(year, quarter)
 
@@ -176,32 +207,26 @@ def download_filings(filing_date: Optional[str] = None,
             )
         ]
         log.info('Found %d feed files in date range', len(filtered_files))
-
-        if not filtered_files.empty:
-            # Process the filtered files...
-            for _, row in tqdm(filtered_files.iterrows(), desc='Downloading feed file(s)'):
-                bulk_filing_file = row['File']
-                bulk_file_directory = data_directory / row['Name'][:8]
-                if not overwrite_existing:
-                    if bulk_file_directory.exists():
-                        log.info('Skipping %s. Already exists', bulk_file_directory)
-                        continue
-                path = asyncio.run(download_bulk_data(client=None, url=bulk_filing_file, data_directory=data_directory))
-                log.info('Downloaded feed file to %s', path)
-                total_feed_files_downloaded += 1
-                
-                # If we have specific accession numbers, filter the extracted files
-                if accession_numbers and path.exists():
-                    log.info('Filtering extracted files to keep only specified accession numbers')
-                    filings_kept = _filter_extracted_files(path, accession_numbers)
-                    total_filings_kept += filings_kept
-        else:
+        if filtered_files.empty:
             log.info('No feed files found for %d Q%d in date range %s', year, quarter, filing_date)
-    
-    # Log summary statistics
-    log.info('Download complete. Downloaded %d feed files.', total_feed_files_downloaded)
-    if accession_numbers:
-        log.info('Kept %d filings out of %d requested.', total_filings_kept, len(accession_numbers))
+        else:
+            feed_files_in_range.append(filtered_files)
+
+    if feed_files_in_range:
+        summary = download_feed_files(pd.concat(feed_files_in_range, ignore_index=True),
+                                      data_directory,
+                                      overwrite_existing=overwrite_existing,
+                                      max_downloads=max_downloads,
+                                      accession_numbers=accession_numbers,
+                                      compress=compress,
+                                      stream=stream)
+        log.info(str(summary))
+        for name, error in summary.failed.items():
+            log.warning('Failed to download feed file %s: %s', name, error)
+
+        # Log summary statistics
+        if accession_numbers:
+            log.info('Kept %d filings out of %d requested.', summary.filings, len(accession_numbers))
 
 
 def _filter_extracted_files(directory_path: Path, accession_numbers: List[str]) -> int:
@@ -403,3 +428,21 @@ def local_filing_path(filing_date:Union[str, date],
         filing_date = filing_date.strftime('%Y-%m-%d')
     filing_date = filing_date.replace('-', '')
     return get_edgar_data_directory() / 'filings' / filing_date / f"{accession_number}.{ext}"
+
+
+def read_local_filing(filing_date: Union[str, date],
+                      accession_number: str,
+                      correction: bool = False) -> Optional[str]:
+    """
+    Read the full text submission of a filing from local storage.
+    Reads the extracted file if there is one, otherwise the filing from the compressed archive of the day
+    written by `download_filings(compress=True)`. Returns None if the filing is not stored locally
+    """
+    from edgar.feed_archive import FeedArchive, feed_archive_path
+    local_path = local_filing_path(filing_date, accession_number, correction=correction)
+    if local_path.exists():
+        return local_path.read_text(encoding='utf-8')
+    archive_path = feed_archive_path(local_path.parent.parent, local_path.parent.name)
+    if archive_path.exists():
+        return FeedArchive.open(archive_path).read_filing(accession_number, correction=correction)
+    return None
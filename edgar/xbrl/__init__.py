@@ -34,6 +34,7 @@ Example usage:
     df = stitched_income.to_dataframe()
 """
 
+from edgar.xbrl.fact_dataset import FactDataset, FactDatasetQuery
 from edgar.xbrl.facts import FactQuery, FactsView
 from edgar.xbrl.rendering import RenderedStatement
 from edgar.xbrl.standardization import StandardConcept
@@ -58,5 +59,7 @@ __all__ = [
     'RenderedStatement',
     'to_pandas',
     'FactsView',
-    'FactQuery'
+    'FactQuery',
+    'FactDataset',
+    'FactDatasetQuery'
 ]
\ No newline at end of file
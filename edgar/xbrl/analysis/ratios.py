@@ -7,8 +7,9 @@ DataFrame operations for handling multiple periods efficiently.
 """
 
 from dataclasses import dataclass
-from typing import Callable, Dict, List, Mapping, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 from pandas import Index
 from rich import box
@@ -20,6 +21,9 @@ from rich.text import Text
 from edgar.richtools import repr_rich
 from edgar.xbrl.standardization import MappingStore, StandardConcept
 
+if TYPE_CHECKING:
+    from edgar.xbrl.xbrl import XBRL
+
 
 @dataclass
 class ConceptEquivalent:
@@ -175,6 +179,44 @@ class RatioAnalysis:
         return repr_rich(self.__rich__())
 
 
+def concept_equivalents() -> Dict[str, List[ConceptEquivalent]]:
+    """The equivalent calculations for concepts that are missing from the statements.
+
+    The calculations take the calculation DataFrame and a period. They can also be given
+    a list of periods to calculate the values for all the periods at once.
+    """
+    return {
+        StandardConcept.GROSS_PROFIT: [
+            ConceptEquivalent(
+                target_concept=StandardConcept.GROSS_PROFIT,
+                required_concepts=[
+                    StandardConcept.REVENUE,
+                    StandardConcept.COST_OF_REVENUE
+                ],
+                calculation=lambda df, period: (
+                        df.loc[StandardConcept.REVENUE, period] -
+                        df.loc[StandardConcept.COST_OF_REVENUE, period]
+                ),
+                description="Revenue - Cost of Revenue"
+            )
+        ],
+        StandardConcept.OPERATING_INCOME: [
+            ConceptEquivalent(
+                target_concept=StandardConcept.OPERATING_INCOME,
+                required_concepts=[
+                    StandardConcept.GROSS_PROFIT,
+                    StandardConcept.OPERATING_EXPENSES
+                ],
+                calculation=lambda df, period: (
+                        df.loc[StandardConcept.GROSS_PROFIT, period] -
+                        df.loc[StandardConcept.OPERATING_EXPENSES, period]
+                ),
+                description="Gross Profit - Operating Expenses"
+            )
+        ]
+    }
+
+
 class FinancialRatios:
     """Calculate and analyze financial ratios from XBRL data using DataFrame operations."""
 
@@ -335,36 +377,7 @@ class FinancialRatios:
         Returns:
             Dictionary mapping concepts to their possible equivalent calculations.
         """
-        return {
-            StandardConcept.GROSS_PROFIT: [
-                ConceptEquivalent(
-                    target_concept=StandardConcept.GROSS_PROFIT,
-                    required_concepts=[
-                        StandardConcept.REVENUE,
-                        StandardConcept.COST_OF_REVENUE
-                    ],
-                    calculation=lambda df, period: (
-                            df.loc[StandardConcept.REVENUE, period] -
-                            df.loc[StandardConcept.COST_OF_REVENUE, period]
-                    ),
-                    description="Revenue - Cost of Revenue"
-                )
-            ],
-            StandardConcept.OPERATING_INCOME: [
-                ConceptEquivalent(
-                    target_concept=StandardConcept.OPERATING_INCOME,
-                    required_concepts=[
-                        StandardConcept.GROSS_PROFIT,
-                        StandardConcept.OPERATING_EXPENSES
-                    ],
-                    calculation=lambda df, period: (
-                            df.loc[StandardConcept.GROSS_PROFIT, period] -
-                            df.loc[StandardConcept.OPERATING_EXPENSES, period]
-                    ),
-                    description="Gross Profit - Operating Expenses"
-                )
-            ]
-        }
+        return concept_equivalents()
 
     def _get_concept_value(self, concept: str, calc_df: pd.DataFrame) -> Tuple[pd.Series, Optional[str]]:
         """Get a concept value from the calculation DataFrame.
@@ -1103,3 +1116,189 @@ class FinancialRatios:
             }
         except ValueError as e:
             raise ValueError(f"Failed to calculate all ratios: {str(e)}")
+
+
+# The concepts used by the batch ratio calculations
+RATIO_CONCEPTS = [
+    StandardConcept.TOTAL_CURRENT_ASSETS,
+    StandardConcept.TOTAL_CURRENT_LIABILITIES,
+    StandardConcept.CASH_AND_EQUIVALENTS,
+    StandardConcept.INVENTORY,
+    StandardConcept.ACCOUNTS_RECEIVABLE,
+    StandardConcept.TOTAL_ASSETS,
+    StandardConcept.TOTAL_EQUITY,
+    StandardConcept.LONG_TERM_DEBT,
+    StandardConcept.REVENUE,
+    StandardConcept.COST_OF_REVENUE,
+    StandardConcept.GROSS_PROFIT,
+    StandardConcept.OPERATING_EXPENSES,
+    StandardConcept.OPERATING_INCOME,
+    StandardConcept.INTEREST_EXPENSE,
+    StandardConcept.NET_INCOME,
+]
+
+# Concepts that are treated as 0 when they are not found, as in the quick ratio
+RATIO_CONCEPT_DEFAULTS = {
+    StandardConcept.INVENTORY: 0.0,
+}
+
+# group -> ratio -> calculation on the concept rows, each an array over all the filing periods
+BATCH_RATIOS: Dict[str, Dict[str, Callable[[Dict[str, np.ndarray]], np.ndarray]]] = {
+    'liquidity': {
+        'current': lambda c: c[StandardConcept.TOTAL_CURRENT_ASSETS] / c[StandardConcept.TOTAL_CURRENT_LIABILITIES],
+        'quick': lambda c: ((c[StandardConcept.TOTAL_CURRENT_ASSETS] - c[StandardConcept.INVENTORY]) /
+                            c[StandardConcept.TOTAL_CURRENT_LIABILITIES]),
+        'cash': lambda c: c[StandardConcept.CASH_AND_EQUIVALENTS] / c[StandardConcept.TOTAL_CURRENT_LIABILITIES],
+        'working_capital': lambda c: (c[StandardConcept.TOTAL_CURRENT_ASSETS] -
+                                      c[StandardConcept.TOTAL_CURRENT_LIABILITIES]),
+    },
+    'profitability': {
+        'gross_margin': lambda c: c[StandardConcept.GROSS_PROFIT] / c[StandardConcept.REVENUE],
+        'operating_margin': lambda c: c[StandardConcept.OPERATING_INCOME] / c[StandardConcept.REVENUE],
+        'net_margin': lambda c: c[StandardConcept.NET_INCOME] / c[StandardConcept.REVENUE],
+        'return_on_assets': lambda c: c[StandardConcept.NET_INCOME] / c[StandardConcept.TOTAL_ASSETS],
+        'return_on_equity': lambda c: c[StandardConcept.NET_INCOME] / c[StandardConcept.TOTAL_EQUITY],
+    },
+    'efficiency': {
+        'asset_turnover': lambda c: c[StandardConcept.REVENUE] / c[StandardConcept.TOTAL_ASSETS],
+        'inventory_turnover': lambda c: c[StandardConcept.COST_OF_REVENUE] / c[StandardConcept.INVENTORY],
+        'receivables_turnover': lambda c: c[StandardConcept.REVENUE] / c[StandardConcept.ACCOUNTS_RECEIVABLE],
+        'days_sales_outstanding': lambda c: 365 * c[StandardConcept.ACCOUNTS_RECEIVABLE] / c[StandardConcept.REVENUE],
+    },
+    'leverage': {
+        'debt_to_equity': lambda c: c[StandardConcept.LONG_TERM_DEBT] / c[StandardConcept.TOTAL_EQUITY],
+        'debt_to_assets': lambda c: c[StandardConcept.LONG_TERM_DEBT] / c[StandardConcept.TOTAL_ASSETS],
+        'interest_coverage': lambda c: c[StandardConcept.OPERATING_INCOME] / c[StandardConcept.INTEREST_EXPENSE],
+        'equity_multiplier': lambda c: c[StandardConcept.TOTAL_ASSETS] / c[StandardConcept.TOTAL_EQUITY],
+    },
+}
+
+
+class BatchFinancialRatios:
+    """Calculate all the ratio groups for many filings at once.
+
+    `FinancialRatios` looks up the concepts of each ratio in the statements one ratio at a time.
+    Here each filing's statements are read once into a concept x period matrix, the matrices of all
+    the filings are joined into one and the ratios are calculated as array expressions over every
+    filing period together
+
+        ratios = BatchFinancialRatios({filing.accession_no: XBRL.from_filing(filing) for filing in filings})
+        df = ratios.calculate_all()
+
+    The result is a tidy DataFrame with one row per filing, period and ratio.
+    """
+
+    def __init__(self, xbrls: Union[Dict[str, 'XBRL'], Iterable['XBRL']]):
+        """Initialize with XBRL instances.
+
+        Args:
+            xbrls: filing key -> XBRL, or XBRL instances which are then keyed by their position
+        """
+        if not isinstance(xbrls, dict):
+            xbrls = {str(position): xbrl for position, xbrl in enumerate(xbrls)}
+        self.xbrls = xbrls
+        self._mapping_store = MappingStore()
+        self._concept_equivalents = concept_equivalents()
+        self._concept_matrix: Optional[pd.DataFrame] = None
+
+    def _statement_dataframes(self, xbrl) -> List[pd.DataFrame]:
+        """The balance sheet, income statement and cash flow statement with their period columns"""
+        statement_dfs = []
+        for statement in [xbrl.statements.balance_sheet(),
+                          xbrl.statements.income_statement(),
+                          xbrl.statements.cashflow_statement()]:
+            if statement is None:
+                continue
+            rendered = statement.render()
+            df = rendered.to_dataframe()
+            periods = [str(period.end_date) for period in rendered.periods]
+            statement_dfs.append(df[['concept', 'label'] + [period for period in periods if period in df.columns]])
+        return statement_dfs
+
+    def _filing_matrix(self, xbrl) -> pd.DataFrame:
+        """Find the ratio concepts in the statements of one filing, in the order used by FinancialRatios -
+        the mapped company concepts, the concept itself and then a label containing the concept"""
+        statement_dfs = self._statement_dataframes(xbrl)
+        periods = sorted({column for df in statement_dfs for column in df.columns[2:]})
+        period_positions = {period: position for position, period in enumerate(periods)}
+        matrix = np.full((len(RATIO_CONCEPTS), len(periods)), np.nan)
+
+        statements = []
+        for df in statement_dfs:
+            # The first row of each concept, the lower case labels and the values as one float array
+            first_rows = dict(zip(reversed(df['concept'].tolist()), reversed(range(len(df)))))
+            labels = [label.lower() if isinstance(label, str) else '' for label in df['label']]
+            values = df.iloc[:, 2:].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+            columns = [period_positions[period] for period in df.columns[2:]]
+            statements.append((first_rows, labels, values, columns))
+
+        for index, concept in enumerate(RATIO_CONCEPTS):
+            candidates = [concept.value] + list(self._mapping_store.mappings.get(concept.value, ()))
+            found = None
+            for statement in statements:
+                positions = [statement[0][candidate] for candidate in candidates if candidate in statement[0]]
+                if positions:
+                    found = statement, min(positions)
+                    break
+            if found is None:
+                label = concept.value.lower()
+                for statement in statements:
+                    position = next((row for row, text in enumerate(statement[1]) if label in text), None)
+                    if position is not None:
+                        found = statement, position
+                        break
+            if found is not None:
+                (_, _, values, columns), position = found
+                matrix[index, columns] = values[position]
+        return pd.DataFrame(matrix, index=pd.Index(RATIO_CONCEPTS), columns=pd.Index(periods, dtype=object))
+
+    def concept_matrix(self) -> pd.DataFrame:
+        """The ratio concepts of all the filings, with a (filing, period) column for each filing period.
+        Missing concepts are calculated with their equivalents and defaults are applied."""
+        if self._concept_matrix is not None:
+            return self._concept_matrix
+        matrices = {key: self._filing_matrix(xbrl) for key, xbrl in self.xbrls.items()}
+        if matrices:
+            matrix = pd.concat(matrices, axis=1, names=['filing', 'period'])
+        else:
+            matrix = pd.DataFrame(index=pd.Index(RATIO_CONCEPTS),
+                                  columns=pd.MultiIndex.from_tuples([], names=['filing', 'period']), dtype=float)
+
+        # Equivalents are calculated for all filing periods at once, in dependency order
+        for concept, equivalents in self._concept_equivalents.items():
+            for equivalent in equivalents:
+                missing = matrix.loc[concept].isna().to_numpy()
+                if not missing.any():
+                    break
+                values = equivalent.calculation(matrix, matrix.columns).to_numpy(dtype=float)
+                matrix.loc[concept, missing] = values[missing]
+        for concept, default_value in RATIO_CONCEPT_DEFAULTS.items():
+            matrix.loc[concept] = matrix.loc[concept].fillna(default_value)
+
+        self._concept_matrix = matrix
+        return matrix
+
+    def calculate_all(self) -> pd.DataFrame:
+        """Calculate all the ratio groups for all the filings.
+
+        Returns:
+            DataFrame with the columns filing, period, group, ratio and value.
+            Ratios that cannot be calculated for a period are left out
+        """
+        matrix = self.concept_matrix()
+        concepts = {concept: matrix.loc[concept].to_numpy(dtype=float) for concept in RATIO_CONCEPTS}
+        filings = matrix.columns.get_level_values('filing').to_numpy(dtype=object)
+        periods = matrix.columns.get_level_values('period').to_numpy(dtype=object)
+
+        frames = []
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for group, ratios in BATCH_RATIOS.items():
+                for ratio, calculation in ratios.items():
+                    values = calculation(concepts)
+                    valid = np.isfinite(values)
+                    frames.append(pd.DataFrame({'filing': filings[valid],
+                                                'period': periods[valid],
+                                                'group': group,
+                                                'ratio': ratio,
+                                                'value': values[valid]}))
+        return pd.concat(frames, ignore_index=True)
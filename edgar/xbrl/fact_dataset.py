@@ -0,0 +1,407 @@
+"""
+A fact dataset over many XBRL filings.
+
+`FactQuery` filters the facts of one XBRL instance one fact dictionary at a time. To find
+the values of a concept across many filings the facts of every filing are combined into one
+columnar table and the queries are evaluated on whole columns
+
+    dataset = FactDataset.from_filings(company.get_filings(form="10-K").head(20))
+    df = (dataset.query()
+                 .by_concept("us-gaap:Revenues", exact=True)
+                 .by_dimension("srt:ProductOrServiceAxis")
+                 .by_unit("iso4217_USD")
+                 .to_dataframe())
+
+The facts table has one row per fact with a `filing` column identifying the filing.
+Concepts, labels, units, periods and filings are stored as categoricals so the pattern filters
+only run once per distinct value. The dimensions of the facts are held in a separate long table
+of (fact row, dimension, member) and are only spread into `dim_` columns for the query results.
+"""
+from __future__ import annotations
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from edgar.core import log
+
+__all__ = ['FactDataset', 'FactDatasetQuery']
+
+# The columns of the facts table, in display order
+FACT_COLUMNS = ['filing', 'entity_name', 'document_type', 'concept', 'label', 'value', 'numeric_value',
+                'unit_ref', 'decimals', 'period_type', 'period_start', 'period_end', 'period_instant',
+                'period_key', 'fiscal_year', 'fiscal_period', 'statement_type', 'context_ref', 'entity_identifier']
+
+# Columns with few distinct values that are stored as categoricals
+CATEGORY_COLUMNS = ['filing', 'entity_name', 'document_type', 'concept', 'label', 'unit_ref', 'decimals',
+                    'period_type', 'period_start', 'period_end', 'period_instant', 'period_key',
+                    'fiscal_year', 'fiscal_period', 'statement_type', 'entity_identifier']
+
+DIMENSION_PREFIX = 'dim_'
+
+
+def _dimension_key(dimension: str) -> str:
+    """Dimensions are keyed like the `dim_` columns of the facts dataframe e.g. us-gaap_StatementGeographicalAxis"""
+    dimension = dimension[len(DIMENSION_PREFIX):] if dimension.startswith(DIMENSION_PREFIX) else dimension
+    return dimension.replace(':', '_')
+
+
+def _filing_frames(key: str, facts: pd.DataFrame, entity_info: Optional[Dict[str, Any]] = None):
+    """
+    Split the facts dataframe of one filing into the facts columns and the long table of dimensions
+    """
+    entity_info = entity_info or {}
+    columns = {}
+    for column in FACT_COLUMNS:
+        if column == 'filing':
+            columns[column] = np.full(len(facts), key, dtype=object)
+        elif column in facts.columns:
+            columns[column] = facts[column].to_numpy()
+        else:
+            value = entity_info.get(column) if column in ('entity_name', 'document_type') else None
+            columns[column] = np.full(len(facts), value, dtype=object)
+    frame = pd.DataFrame(columns)
+
+    dimension_columns = [column for column in facts.columns if column.startswith(DIMENSION_PREFIX)]
+    dimensions = None
+    if dimension_columns:
+        members = facts[dimension_columns].to_numpy(dtype=object)
+        rows, positions = np.nonzero(pd.notna(members))
+        names = np.array([column[len(DIMENSION_PREFIX):] for column in dimension_columns], dtype=object)
+        dimensions = pd.DataFrame({'row': rows, 'dimension': names[positions], 'member': members[rows, positions]})
+    return frame, dimensions
+
+
+class FactDataset:
+    """
+    The facts of many XBRL filings in one columnar table that can be queried with `query()`
+    """
+
+    def __init__(self, facts: pd.DataFrame, dimensions: Optional[pd.DataFrame] = None):
+        """
+        Args:
+            facts: The facts table with the FACT_COLUMNS and a default index
+            dimensions: The dimensions of the facts with columns row (the position of the fact), dimension and member
+        """
+        self.facts = facts
+        if dimensions is None:
+            dimensions = pd.DataFrame({'row': np.array([], dtype=np.int64), 'dimension': [], 'member': []})
+        self.dimensions = dimensions
+
+        # Period dates for the date range filters. Instants start and end on the instant
+        instants = pd.to_datetime(facts['period_instant'].astype(object), errors='coerce').to_numpy()
+        starts = pd.to_datetime(facts['period_start'].astype(object), errors='coerce').to_numpy()
+        ends = pd.to_datetime(facts['period_end'].astype(object), errors='coerce').to_numpy()
+        self._start_dates = np.where(pd.isna(starts), instants, starts)
+        self._end_dates = np.where(pd.isna(ends), instants, ends)
+        self._has_dimensions = np.zeros(len(facts), dtype=bool)
+        self._has_dimensions[dimensions['row'].to_numpy()] = True
+
+    @classmethod
+    def from_dataframes(cls,
+                        frames: Dict[str, pd.DataFrame],
+                        entity_info: Optional[Dict[str, Dict[str, Any]]] = None) -> 'FactDataset':
+        """
+        Create a FactDataset from the facts dataframes of filings, as returned by `xbrl.facts.to_dataframe()`
+
+        Args:
+            frames: filing key -> facts dataframe
+            entity_info: Optional filing key -> entity info used for the entity_name and document_type columns
+        """
+        entity_info = entity_info or {}
+        fact_frames, dimension_frames = [], []
+        offset = 0
+        for key, df in frames.items():
+            facts, dimensions = _filing_frames(key, df, entity_info.get(key))
+            if dimensions is not None:
+                dimensions['row'] += offset
+                dimension_frames.append(dimensions)
+            fact_frames.append(facts)
+            offset += len(facts)
+
+        if fact_frames:
+            facts = pd.concat(fact_frames, ignore_index=True)
+        else:
+            facts = pd.DataFrame({column: pd.Series(dtype=object) for column in FACT_COLUMNS})
+        # Categories are set after concatenating because categoricals with different categories concatenate to objects
+        for column in CATEGORY_COLUMNS:
+            facts[column] = facts[column].astype(object).astype('category')
+        facts['numeric_value'] = pd.to_numeric(facts['numeric_value'], errors='coerce')
+
+        dimensions = None
+        if dimension_frames:
+            dimensions = pd.concat(dimension_frames, ignore_index=True)
+            dimensions['dimension'] = dimensions['dimension'].astype(object).astype('category')
+            dimensions['member'] = dimensions['member'].astype(object).astype('category')
+        return cls(facts, dimensions)
+
+    @classmethod
+    def from_xbrl(cls, xbrls: Union[Dict[str, Any], Iterable[Any]]) -> 'FactDataset':
+        """
+        Create a FactDataset from XBRL objects
+
+        Args:
+            xbrls: filing key -> XBRL, or XBRL objects which are then keyed by their position
+        """
+        if not isinstance(xbrls, dict):
+            xbrls = {str(position): xbrl for position, xbrl in enumerate(xbrls)}
+        return cls.from_dataframes({key: xbrl.facts.to_dataframe() for key, xbrl in xbrls.items()},
+                                   entity_info={key: xbrl.entity_info for key, xbrl in xbrls.items()})
+
+    @classmethod
+    def from_filings(cls,
+                     filings: Iterable[Any],
+                     parts: Optional[Iterable[str]] = ('instance', 'label', 'calculation'),
+                     max_workers: Optional[int] = None) -> 'FactDataset':
+        """
+        Create a FactDataset from filings, keyed by accession number.
+
+        The filings are loaded in a thread pool so that their downloads overlap. Parsing is mostly CPU bound
+        and gains little from the threads. Only the documents in `parts` are loaded, by default the instance,
+        the labels and the calculation linkbase, whose weights give the values the same signs as `XBRLS.facts`.
+        Facts have no statement_type unless 'presentation' is included. See `XBRL.from_filing`
+
+        Args:
+            filings: The filings e.g. a `Filings` selection
+            parts: The XBRL documents to load for each filing. All of them if None
+            max_workers: The number of threads. Defaults to min(32, cpu count + 4)
+        """
+        from edgar.xbrl.xbrl import XBRL
+
+        filings = list(filings)
+
+        def load_facts(filing):
+            try:
+                xbrl = XBRL.from_filing(filing, parts=parts)
+            except Exception as e:
+                log.warning(f"Could not parse XBRL from filing {filing.accession_no}: {e}")
+                return None
+            if xbrl is None:
+                return None
+            return xbrl.facts.to_dataframe(), xbrl.entity_info
+
+        # Each filing downloads its submission before parsing, so the threads wait on the network together
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(load_facts, filings))
+
+        frames, entity_info = {}, {}
+        for filing, result in zip(filings, results):
+            if result is not None:
+                frames[filing.accession_no], entity_info[filing.accession_no] = result
+        return cls.from_dataframes(frames, entity_info=entity_info)
+
+    @property
+    def filings(self) -> List[str]:
+        return list(self.facts['filing'].cat.categories)
+
+    def get_unique_concepts(self) -> List[str]:
+        return sorted(self.facts['concept'].cat.categories)
+
+    def get_unique_dimensions(self) -> List[str]:
+        return sorted(self.dimensions['dimension'].unique())
+
+    def query(self) -> 'FactDatasetQuery':
+        """Start building a query against the facts of all filings"""
+        return FactDatasetQuery(self)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """All the facts with their dimensions as dim_ columns"""
+        return self.query().to_dataframe()
+
+    def __len__(self):
+        return len(self.facts)
+
+    def __str__(self):
+        return f"FactDataset(filings={len(self.filings)}, facts={len(self)})"
+
+    def __repr__(self):
+        return str(self)
+
+
+class FactDatasetQuery:
+    """
+    A query over a FactDataset. Each filter selects rows of the facts table with a boolean mask,
+    and the masks are combined when the query is executed
+    """
+
+    def __init__(self, dataset: FactDataset):
+        self._dataset = dataset
+        self._masks: List[np.ndarray] = []
+        self._sort_by = None
+        self._sort_ascending = True
+        self._limit = None
+
+    def __str__(self):
+        return f"FactDatasetQuery(filters={len(self._masks)})"
+
+    def _category_mask(self, column: str, matches: Callable[[pd.Index], np.ndarray]) -> np.ndarray:
+        """Match the distinct values of a categorical column then select the rows that have them"""
+        values = self._dataset.facts[column].cat
+        matching_codes = np.flatnonzero(matches(values.categories))
+        return np.isin(values.codes, matching_codes)
+
+    def _pattern_mask(self, column: str, pattern: str, exact: bool) -> np.ndarray:
+        if exact:
+            return self._category_mask(column, lambda categories: categories == pattern)
+        regex = re.compile(pattern, re.IGNORECASE)
+        return self._category_mask(column, lambda categories: np.array([bool(regex.search(str(category)))
+                                                                        for category in categories], dtype=bool))
+
+    def _add(self, mask: np.ndarray) -> 'FactDatasetQuery':
+        self._masks.append(mask)
+        return self
+
+    def by_concept(self, pattern: str, exact: bool = False) -> 'FactDatasetQuery':
+        """
+        Filter facts by concept name e.g. us-gaap:Revenues
+
+        Args:
+            pattern: Pattern to match against concept names
+            exact: If True, require exact match; otherwise, use regex pattern matching
+        """
+        return self._add(self._pattern_mask('concept', pattern, exact))
+
+    def by_label(self, pattern: str, exact: bool = False) -> 'FactDatasetQuery':
+        """
+        Filter facts by label
+
+        Args:
+            pattern: Pattern to match against labels
+            exact: If True, require exact match; otherwise, use regex pattern matching
+        """
+        return self._add(self._pattern_mask('label', pattern, exact))
+
+    def by_filing(self, filings: Union[str, List[str]]) -> 'FactDatasetQuery':
+        """Filter facts by the filing key, the accession number for datasets created from filings"""
+        filings = [filings] if isinstance(filings, str) else list(filings)
+        return self._add(self._category_mask('filing', lambda categories: categories.isin(filings)))
+
+    def by_unit(self, unit: str) -> 'FactDatasetQuery':
+        """Filter facts by unit reference e.g. iso4217_USD"""
+        return self._add(self._category_mask('unit_ref', lambda categories: categories == unit))
+
+    def by_period_type(self, period_type: str) -> 'FactDatasetQuery':
+        """Filter facts by period type, 'instant' or 'duration'"""
+        return self._add(self._category_mask('period_type', lambda categories: categories == period_type))
+
+    def by_statement_type(self, statement_type: str) -> 'FactDatasetQuery':
+        """Filter facts by statement type ('BalanceSheet', 'IncomeStatement', etc.)"""
+        return self._add(self._category_mask('statement_type', lambda categories: categories == statement_type))
+
+    def by_fiscal_year(self, fiscal_year: Union[int, str]) -> 'FactDatasetQuery':
+        """Filter facts by fiscal year"""
+        return self._add(self._category_mask('fiscal_year',
+                                             lambda categories: categories.astype(str) == str(fiscal_year)))
+
+    def by_fiscal_period(self, fiscal_period: str) -> 'FactDatasetQuery':
+        """Filter facts by fiscal period ('FY', 'Q1', 'Q2', etc.)"""
+        return self._add(self._category_mask('fiscal_period', lambda categories: categories == fiscal_period))
+
+    def by_date_range(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> 'FactDatasetQuery':
+        """
+        Filter facts to the periods within a date range. Durations have to start on or after the start date and
+        end on or before the end date, instants have to be between the dates
+
+        Args:
+            start_date: Optional start date string in YYYY-MM-DD format
+            end_date: Optional end date string in YYYY-MM-DD format
+        """
+        mask = ~pd.isna(self._dataset._end_dates)
+        if start_date:
+            mask &= self._dataset._start_dates >= np.datetime64(start_date)
+        if end_date:
+            mask &= self._dataset._end_dates <= np.datetime64(end_date)
+        return self._add(mask)
+
+    def by_dimension(self, dimension: str, value: Optional[str] = None) -> 'FactDatasetQuery':
+        """
+        Filter facts by dimension
+
+        Args:
+            dimension: Dimension name e.g. us-gaap:StatementGeographicalAxis
+            value: Optional dimension member to filter by
+        """
+        dimensions = self._dataset.dimensions
+        selected = dimensions['dimension'].to_numpy() == _dimension_key(dimension)
+        if value is not None:
+            selected &= dimensions['member'].to_numpy() == value
+        mask = np.zeros(len(self._dataset), dtype=bool)
+        mask[dimensions['row'].to_numpy()[selected]] = True
+        return self._add(mask)
+
+    def without_dimensions(self) -> 'FactDatasetQuery':
+        """Filter to the facts that have no dimensions, the totals reported in the statements"""
+        return self._add(~self._dataset._has_dimensions)
+
+    def by_value(self, value_filter: Union[Callable, int, float, list, tuple]) -> 'FactDatasetQuery':
+        """
+        Filter facts by numeric value
+
+        Args:
+            value_filter: Can be:
+                - A callable that takes the numeric values as a Series and returns a boolean Series
+                - A tuple or list of (min, max) for range filtering
+                - A specific value to match exactly
+        """
+        values = self._dataset.facts['numeric_value']
+        if callable(value_filter):
+            mask = value_filter(values)
+        elif isinstance(value_filter, (list, tuple)) and len(value_filter) == 2:
+            mask = values.between(*value_filter)
+        else:
+            mask = values == value_filter
+        return self._add(np.asarray(mask.fillna(False) if isinstance(mask, pd.Series) else mask, dtype=bool))
+
+    def sort_by(self, column: str, ascending: bool = True) -> 'FactDatasetQuery':
+        self._sort_by = column
+        self._sort_ascending = ascending
+        return self
+
+    def limit(self, n: int) -> 'FactDatasetQuery':
+        self._limit = n
+        return self
+
+    def execute(self) -> np.ndarray:
+        """
+        Execute the query and return the positions of the matching facts in the facts table
+        """
+        mask = np.ones(len(self._dataset), dtype=bool)
+        for filter_mask in self._masks:
+            mask &= filter_mask
+        return np.flatnonzero(mask)
+
+    def count(self) -> int:
+        return len(self.execute())
+
+    def to_dataframe(self, *columns) -> pd.DataFrame:
+        """
+        Execute the query and return the matching facts with their dimensions as dim_ columns
+
+        Args:
+            columns: The columns to include. All of them if none are given
+        """
+        rows = self.execute()
+        df = self._dataset.facts.iloc[rows]
+        # The results have plain columns like the facts dataframe of an XBRL
+        for column in CATEGORY_COLUMNS:
+            df[column] = df[column].astype(df[column].cat.categories.dtype)
+
+        dimensions = self._dataset.dimensions
+        dimensions = dimensions[np.isin(dimensions['row'].to_numpy(), rows)]
+        if len(dimensions):
+            wide = dimensions.pivot(index='row', columns='dimension', values='member')
+            wide = wide.loc[:, wide.notna().any()]
+            wide.columns = [f"{DIMENSION_PREFIX}{dimension}" for dimension in wide.columns]
+            df = df.join(wide.astype(object))
+
+        df = df.dropna(axis=1, how='all')
+        if self._sort_by and self._sort_by in df.columns:
+            df = df.sort_values(self._sort_by, ascending=self._sort_ascending)
+        if self._limit is not None:
+            df = df.head(self._limit)
+        if columns:
+            df = df.filter(columns)
+        return df.reset_index(drop=True)
@@ -9,6 +9,7 @@ It enables convenient retrieval of facts as pandas DataFrames for analysis.
 from __future__ import annotations
 
 import re
+from collections import defaultdict
 from decimal import Decimal
 from typing import Any, Callable, Dict, List, Optional, Set, Union
 
@@ -595,6 +596,10 @@ class FactsView:
         self.xbrl = xbrl
         self._facts_cache = None
         self._facts_df_cache = None
+        self._facts_by_concept = None
+        # Standardized labels by concept. Kept apart from the enriched facts so standardization
+        # never needs to rebuild them
+        self._standard_labels: Dict[str, Dict[str, str]] = {}
 
     def __len__(self):
         return len(self.get_facts())
@@ -614,7 +619,9 @@ class FactsView:
         # Prepare a mapping of roles to statement types for faster lookup
         # This avoids repeated calls to get_all_statements() for each fact
         role_to_statement_type = {}
-        statements = self.xbrl.get_all_statements()
+        # Facts are built from the linkbases that are loaded so that a facts only XBRL stays facts only
+        statements = [] if 'presentation' in self.xbrl.deferred_parts else self.xbrl.get_all_statements()
+        presentation_trees = self.xbrl.parser.presentation_trees
         for stmt in statements:
             if stmt['role'] and stmt['type']:
                 role_to_statement_type[stmt['role']] = (stmt['type'], stmt['role'])
@@ -733,7 +740,7 @@ class FactsView:
                 # First look up preferred_label from presentation trees 
                 # to ensure label consistency between rendering and facts
                 preferred_label = None
-                for role, tree in self.xbrl.presentation_trees.items():
+                for role, tree in presentation_trees.items():
                     if element_id in tree.all_nodes:
                         # Get presentation node to find preferred_label
                         pres_node = tree.all_nodes[element_id]
@@ -756,7 +763,7 @@ class FactsView:
                 fact_dict['original_label'] = label
 
             # Determine statement type by checking presentation trees using our precomputed mapping
-            for role, tree in self.xbrl.presentation_trees.items():
+            for role, tree in presentation_trees.items():
                 if element_id in tree.all_nodes and role in role_to_statement_type:
                     statement_type, statement_role = role_to_statement_type[role]
                     fact_dict['statement_type'] = statement_type
@@ -766,8 +773,51 @@ class FactsView:
             enriched_facts.append(fact_dict)
 
         self._facts_cache = enriched_facts
+        self._apply_standard_labels(self._standard_labels)
         return enriched_facts
 
+    def apply_standard_labels(self, standard_labels: Dict[str, Dict[str, str]]) -> None:
+        """
+        Overlay standardized labels on the facts.
+
+        The enriched facts are updated in place so the fact cache is kept.
+        A fact takes the standardized label if its original label matches the one that was standardized.
+
+        Args:
+            standard_labels: Mapping of concept -> {'label': standardized label, 'original_label': original label}
+        """
+        if not standard_labels:
+            return
+        self._standard_labels.update(standard_labels)
+        if self._facts_cache is not None:
+            self._apply_standard_labels(standard_labels)
+
+    def _apply_standard_labels(self, standard_labels: Dict[str, Dict[str, str]]) -> None:
+        if not standard_labels:
+            return
+        # Statements use element ids (us-gaap_Revenue) while facts use qnames (us-gaap:Revenue)
+        standard_labels = {concept.replace(':', '_'): mapping for concept, mapping in standard_labels.items()}
+        if self._facts_by_concept is None:
+            self._facts_by_concept = defaultdict(list)
+            for fact in self._facts_cache:
+                self._facts_by_concept[fact['concept'].replace(':', '_')].append(fact)
+
+        for concept, mapping in standard_labels.items():
+            for fact in self._facts_by_concept.get(concept, ()):
+                if fact.get('original_label') == mapping['original_label']:
+                    fact['label'] = mapping['label']
+
+        # Update the cached dataframe rather than rebuilding it
+        df = self._facts_df_cache
+        if df is not None and 'original_label' in df.columns:
+            concepts = df['concept'].str.replace(':', '_', regex=False)
+            original_labels = concepts.map({concept: mapping['original_label']
+                                            for concept, mapping in standard_labels.items()})
+            matches = original_labels.notna() & (original_labels == df['original_label'])
+            if matches.any():
+                df.loc[matches, 'label'] = concepts[matches].map({concept: mapping['label']
+                                                                  for concept, mapping in standard_labels.items()})
+
     def query(self) -> FactQuery:
         """
         Start building a query against facts.
@@ -1216,6 +1266,7 @@ class FactsView:
         """Clear cached data."""
         self._facts_cache = None
         self._facts_df_cache = None
+        self._facts_by_concept = None
 
     def __str__(self):
         return f"Facts for {self.xbrl}"
@@ -4,7 +4,10 @@ Data models for XBRL parsing.
 This module defines the core data structures used throughout the XBRL parser.
 """
 
-from typing import Any, Dict, List, Optional, Union
+import sys
+from array import array
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 from pydantic import BaseModel, Field
 
@@ -95,12 +98,173 @@ class Context(BaseModel):
     @property
     def period_string(self) -> str:
         """Return a human-readable string representation of the period."""
-        if self.period.get('type') == 'instant':
-            return f"As of {self.period.get('instant')}"
-        elif self.period.get('type') == 'duration':
-            return f"From {self.period.get('startDate')} to {self.period.get('endDate')}"
+        return format_period_string(self.period)
+
+
+def format_period_string(period: Dict[str, Any]) -> str:
+    """Return a human-readable string representation of a context period."""
+    if period.get('type') == 'instant':
+        return f"As of {period.get('instant')}"
+    elif period.get('type') == 'duration':
+        return f"From {period.get('startDate')} to {period.get('endDate')}"
+    else:
+        return "Forever"
+
+
+class ContextView:
+    """
+    A lightweight view of one context in a ContextTable, with the same attributes as Context.
+
+    The entity, period and dimensions dicts are shared by every context with the same values
+    so they must not be modified.
+    """
+    __slots__ = ('_table', 'index')
+
+    def __init__(self, table: 'ContextTable', index: int):
+        self._table = table
+        self.index = index
+
+    @property
+    def context_id(self) -> str:
+        return self._table._context_ids[self.index]
+
+    @property
+    def entity(self) -> Dict[str, Any]:
+        return self._table._entities.value(self._table._entity_ids[self.index])
+
+    @property
+    def period_id(self) -> int:
+        return self._table._period_ids[self.index]
+
+    @property
+    def period(self) -> Dict[str, Any]:
+        return self._table._periods.value(self.period_id)
+
+    @property
+    def dimensions(self) -> Dict[str, str]:
+        return self._table._dimensions.value(self._table._dimension_ids[self.index])
+
+    @property
+    def period_string(self) -> str:
+        return format_period_string(self.period)
+
+    def model_dump(self) -> Dict[str, Any]:
+        return {'context_id': self.context_id,
+                'entity': dict(self.entity),
+                'period': dict(self.period),
+                'dimensions': dict(self.dimensions)}
+
+    def __eq__(self, other):
+        if isinstance(other, (ContextView, Context)):
+            return self.model_dump() == other.model_dump()
+        return NotImplemented
+
+    def __repr__(self):
+        return (f"Context(context_id={self.context_id!r}, entity={self.entity!r}, "
+                f"period={self.period!r}, dimensions={self.dimensions!r})")
+
+
+class _InternTable:
+    """Distinct dict values stored once and referred to by integer id"""
+    __slots__ = ('_ids', '_values')
+
+    def __init__(self):
+        self._ids: Dict[Tuple, int] = {}
+        self._values: List[Dict[str, Any]] = []
+
+    def intern(self, value: Dict[str, Any]) -> int:
+        key = tuple(value.items())
+        value_id = self._ids.get(key)
+        if value_id is None:
+            value_id = self._ids[key] = len(self._values)
+            self._values.append({sys.intern(name): item for name, item in value.items()})
+        return value_id
+
+    def value(self, value_id: int) -> Dict[str, Any]:
+        return self._values[value_id]
+
+    def __len__(self):
+        return len(self._values)
+
+
+class ContextTable(MutableMapping):
+    """
+    A compact table of the contexts in an XBRL instance, used as a mapping of context id -> context.
+
+    Each context is a row of integer ids into tables of the distinct entities, periods and dimension sets,
+    so the thousands of contexts in a dimensional filing share a few dozen period and entity dicts.
+    Contexts are numbered in document order and `index_of` and `period_id` give their integer ids.
+    Getting a context returns a ContextView with the same attributes as the Context model.
+    """
+
+    def __init__(self):
+        self._index: Dict[str, int] = {}
+        self._context_ids: List[str] = []
+        self._entity_ids = array('I')
+        self._period_ids = array('I')
+        self._dimension_ids = array('I')
+        self._entities = _InternTable()
+        self._periods = _InternTable()
+        self._dimensions = _InternTable()
+
+    def add(self,
+            context_id: str,
+            entity: Optional[Dict[str, Any]] = None,
+            period: Optional[Dict[str, Any]] = None,
+            dimensions: Optional[Dict[str, str]] = None) -> int:
+        """Add or replace a context and return its integer id"""
+        entity_id = self._entities.intern(entity or {})
+        period_id = self._periods.intern(period or {})
+        dimension_id = self._dimensions.intern(dimensions or {})
+        index = self._index.get(context_id)
+        if index is None:
+            index = self._index[context_id] = len(self._context_ids)
+            self._context_ids.append(context_id)
+            self._entity_ids.append(entity_id)
+            self._period_ids.append(period_id)
+            self._dimension_ids.append(dimension_id)
         else:
-            return "Forever"
+            self._entity_ids[index] = entity_id
+            self._period_ids[index] = period_id
+            self._dimension_ids[index] = dimension_id
+        return index
+
+    def index_of(self, context_id: str) -> Optional[int]:
+        """The integer id of a context"""
+        return self._index.get(context_id)
+
+    def period_id(self, context_id: str) -> Optional[int]:
+        """The integer id of the period of a context. Contexts for the same period have the same id"""
+        index = self._index.get(context_id)
+        return self._period_ids[index] if index is not None else None
+
+    def period(self, period_id: int) -> Dict[str, Any]:
+        return self._periods.value(period_id)
+
+    @property
+    def period_count(self) -> int:
+        return len(self._periods)
+
+    def __setitem__(self, context_id: str, context: Union[Context, ContextView]):
+        self.add(context_id, context.entity, context.period, context.dimensions)
+
+    def __getitem__(self, context_id: str) -> ContextView:
+        return ContextView(self, self._index[context_id])
+
+    def __delitem__(self, context_id: str):
+        del self._index[context_id]
+
+    def __contains__(self, context_id) -> bool:
+        return context_id in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __repr__(self):
+        return f"ContextTable(contexts={len(self)}, periods={len(self._periods)}, dimension sets={len(self._dimensions)})"
 
 
 class Fact(BaseModel):
@@ -6,7 +6,7 @@ This module provides functions for parsing XBRL files and extracting data.
 
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from lxml import etree as ET
 
@@ -16,7 +16,7 @@ from edgar.xbrl.models import (
     Axis,
     CalculationNode,
     CalculationTree,
-    Context,
+    ContextTable,
     Domain,
     ElementCatalog,
     Fact,
@@ -25,15 +25,35 @@ from edgar.xbrl.models import (
     Table,
     XBRLProcessingError,
 )
+from edgar.xbrl.taxonomy_catalog import TaxonomyCatalog, get_taxonomy_catalog, standard_taxonomy
+
+
+XmlContent = Union[str, bytes, ET._Element]
+
+
+def parse_xml(content: XmlContent, huge_tree: bool = False) -> ET._Element:
+    """
+    Parse XBRL document content with lxml. Content that is already parsed is returned as is.
+
+    A new XMLParser is used for every call so documents can be parsed concurrently in threads.
+    """
+    if isinstance(content, ET._Element):
+        return content
+    parser = ET.XMLParser(remove_blank_text=True, recover=True, huge_tree=huge_tree)
+    content_bytes = content.encode('utf-8') if isinstance(content, str) else content
+    return ET.XML(content_bytes, parser)
 
 
 class XBRLParser:
     """Parser for XBRL files."""
     
-    def __init__(self):
+    def __init__(self, taxonomy_catalog: Optional[TaxonomyCatalog] = None):
         # Core data structures
         self.element_catalog: Dict[str, ElementCatalog] = {}
-        self.contexts: Dict[str, Context] = {}
+        # Standard taxonomy elements are shared with other filings. Maps element id -> taxonomy schema
+        self.taxonomy_catalog = taxonomy_catalog if taxonomy_catalog is not None else get_taxonomy_catalog()
+        self.shared_elements: Dict[str, str] = {}
+        self.contexts = ContextTable()
         self.facts: Dict[str, Fact] = {}
         self.units: Dict[str, Any] = {}
         
@@ -60,6 +80,10 @@ class XBRLParser:
         
         # Mapping of context IDs to period identifiers for easy lookup
         self.context_period_map: Dict[str, str] = {}
+
+        # Facts by normalized element id and integer context id, built when first needed
+        self._fact_index: Optional[Dict[str, Dict[int, Fact]]] = None
+        self._fact_index_key: Optional[Tuple] = None
         
     def _create_normalized_fact_key(self, element_id: str, context_ref: str) -> str:
         """
@@ -97,41 +121,86 @@ class XBRLParser:
         normalized_key = self._create_normalized_fact_key(element_id, context_ref)
         return self.facts.get(normalized_key)
     
-    def parse_directory(self, directory_path: Union[str, Path]) -> None:
+    @staticmethod
+    def find_xbrl_files(directory_path: Union[str, Path]) -> Dict[str, Path]:
         """
-        Parse all XBRL files in a directory.
+        Find the XBRL files in a directory.
         
         Args:
             directory_path: Path to directory containing XBRL files
+            
+        Returns:
+            Dictionary of file type (instance, schema, presentation, calculation, definition, label) -> path
         """
         directory = Path(directory_path)
         if not directory.exists() or not directory.is_dir():
             raise ValueError(f"Directory {directory} does not exist or is not a directory")
         
-        # Find and categorize files
-        instance_file = None
-        schema_file = None
-        presentation_file = None
-        calculation_file = None
-        definition_file = None
-        label_file = None
-        
+        xbrl_files: Dict[str, Path] = {}
         for file_path in directory.glob("*"):
             if file_path.is_file():
                 file_name = file_path.name.lower()
                 
                 if file_name.endswith('.xml') and '<xbrl' in file_path.read_text()[:2000]:
-                    instance_file = file_path
+                    xbrl_files['instance'] = file_path
                 elif file_name.endswith('.xsd'):
-                    schema_file = file_path
+                    xbrl_files['schema'] = file_path
                 elif '_pre.xml' in file_name:
-                    presentation_file = file_path
+                    xbrl_files['presentation'] = file_path
                 elif '_cal.xml' in file_name:
-                    calculation_file = file_path
+                    xbrl_files['calculation'] = file_path
                 elif '_def.xml' in file_name:
-                    definition_file = file_path
+                    xbrl_files['definition'] = file_path
                 elif '_lab.xml' in file_name:
-                    label_file = file_path
+                    xbrl_files['label'] = file_path
+        return xbrl_files
+    
+    def get_element_facts(self, element_id: str) -> List[Tuple[str, Fact]]:
+        """
+        Get the facts for an element as (context id, fact) in context order.
+        Handles both colon and underscore formats of the element id.
+        """
+        # Rebuild the index if facts or contexts were added or replaced
+        if self._fact_index_key != self._fact_index_state():
+            self._build_fact_index()
+        normalized_element_id = element_id.replace(':', '_', 1)
+        facts_by_context = self._fact_index.get(normalized_element_id)
+        if not facts_by_context:
+            return []
+        context_ids = self.contexts._context_ids
+        return [(context_ids[index], facts_by_context[index]) for index in sorted(facts_by_context)]
+
+    def _build_fact_index(self) -> None:
+        fact_index: Dict[str, Dict[int, Fact]] = {}
+        for fact_key, fact in self.facts.items():
+            context_index = self.contexts.index_of(fact.context_ref)
+            if context_index is None:
+                continue
+            normalized_element_id = fact.element_id.replace(':', '_', 1)
+            # Only the fact stored under the normalized key is found by get_fact
+            if fact_key != f"{normalized_element_id}_{fact.context_ref}":
+                continue
+            fact_index.setdefault(normalized_element_id, {})[context_index] = fact
+        self._fact_index = fact_index
+        self._fact_index_key = self._fact_index_state()
+
+    def _fact_index_state(self) -> Tuple:
+        return id(self.facts), len(self.facts), id(self.contexts), len(self.contexts)
+
+    def parse_directory(self, directory_path: Union[str, Path]) -> None:
+        """
+        Parse all XBRL files in a directory.
+        
+        Args:
+            directory_path: Path to directory containing XBRL files
+        """
+        xbrl_files = self.find_xbrl_files(directory_path)
+        instance_file = xbrl_files.get('instance')
+        schema_file = xbrl_files.get('schema')
+        presentation_file = xbrl_files.get('presentation')
+        calculation_file = xbrl_files.get('calculation')
+        definition_file = xbrl_files.get('definition')
+        label_file = xbrl_files.get('label')
         
         # Parse schema first to handle embedded linkbases if standalone files aren't available
         if schema_file:
@@ -188,7 +257,7 @@ class XBRLParser:
         except Exception as e:
             raise XBRLProcessingError(f"Error parsing schema file {file_path}: {str(e)}")
     
-    def parse_schema_content(self, content: str) -> None:
+    def parse_schema_content(self, content: XmlContent) -> None:
         """Parse schema content and extract element information."""
         try:
             # Use the safe XML parsing helper
@@ -222,6 +291,7 @@ class XBRLParser:
                             period_type = period_element.text
                 
                 # Create element catalog entry
+                self.shared_elements.pop(element_id, None)
                 self.element_catalog[element_id] = ElementCatalog(
                     name=name,
                     data_type=data_type,
@@ -232,7 +302,7 @@ class XBRLParser:
                 )
                 
             # Extract embedded linkbases if present
-            embedded_linkbases = self._extract_embedded_linkbases(content)
+            embedded_linkbases = self._extract_embedded_linkbases(root)
             
             # If embedded linkbases were found, parse them
             if embedded_linkbases and 'linkbases' in embedded_linkbases:
@@ -251,12 +321,12 @@ class XBRLParser:
         except Exception as e:
             raise XBRLProcessingError(f"Error parsing schema content: {str(e)}")
     
-    def _extract_embedded_linkbases(self, schema_content: str) -> Dict[str, Dict[str, str]]:
+    def _extract_embedded_linkbases(self, schema_content: XmlContent) -> Dict[str, Dict[str, str]]:
         """
         Extract embedded linkbases and role types from the schema file.
         
         Args:
-            schema_content: XML content of the schema file
+            schema_content: XML content of the schema file, or its parsed root element
             
         Returns:
             Dictionary containing embedded linkbases and role type information
@@ -338,7 +408,7 @@ class XBRLParser:
         except Exception as e:
             raise XBRLProcessingError(f"Error parsing label file {file_path}: {str(e)}")
     
-    def parse_labels_content(self, content: str) -> None:
+    def parse_labels_content(self, content: XmlContent) -> None:
         """Parse label linkbase content and extract label information."""
         try:
             # Optimize: Register namespaces for faster XPath lookups
@@ -349,8 +419,7 @@ class XBRLParser:
             }
             
             # Optimize: Use lxml parser with smart string handling
-            parser = ET.XMLParser(remove_blank_text=True, recover=True)
-            root = ET.XML(content.encode('utf-8'), parser)
+            root = parse_xml(content)
             
             # Optimize: Use specific XPath expressions with namespaces for faster lookups
             # This is much faster than using findall with '//' in element tree
@@ -403,6 +472,9 @@ class XBRLParser:
                     loc_by_label[loc_label] = loc.get(xlink_href)
             
             # Connect labels to elements using arcs - with optimized lookups
+            # Collect the labels of each element first so that shared standard elements are interned once
+            element_labels_by_id: Dict[str, Dict[str, str]] = {}
+            element_hrefs: Dict[str, str] = {}
             for arc in label_arcs:
                 from_ref = arc.get(xlink_from)
                 to_ref = arc.get(xlink_to)
@@ -420,12 +492,28 @@ class XBRLParser:
                 
                 # Find labels for this element - check most likely case first
                 if 'en-US' in label_lookup[to_ref]:
-                    element_labels = label_lookup[to_ref]['en-US']
-                    
-                    # Optimize: Update catalog with minimal overhead
-                    catalog_entry = self.element_catalog.get(element_id)
-                    if catalog_entry:
-                        catalog_entry.labels.update(element_labels)
+                    element_labels = element_labels_by_id.get(element_id)
+                    if element_labels is None:
+                        element_labels_by_id[element_id] = dict(label_lookup[to_ref]['en-US'])
+                        element_hrefs[element_id] = href
+                    else:
+                        element_labels.update(label_lookup[to_ref]['en-US'])
+
+            for element_id, element_labels in element_labels_by_id.items():
+                catalog_entry = self.element_catalog.get(element_id)
+                if element_id in self.shared_elements:
+                    # Never modify a shared entry - intern the merged labels instead
+                    self.element_catalog[element_id] = self.taxonomy_catalog.intern_element(
+                        self.shared_elements[element_id], element_id, {**catalog_entry.labels, **element_labels})
+                elif catalog_entry:
+                    catalog_entry.labels.update(element_labels)
+                else:
+                    taxonomy = standard_taxonomy(element_hrefs[element_id])
+                    if taxonomy:
+                        # Standard taxonomy elements are shared with other filings
+                        self.element_catalog[element_id] = self.taxonomy_catalog.intern_element(
+                            taxonomy, element_id, element_labels)
+                        self.shared_elements[element_id] = taxonomy
                     else:
                         # Create placeholder in catalog
                         self.element_catalog[element_id] = ElementCatalog(
@@ -446,7 +534,7 @@ class XBRLParser:
         except Exception as e:
             raise XBRLProcessingError(f"Error parsing presentation file {file_path}: {str(e)}")
     
-    def parse_presentation_content(self, content: str) -> None:
+    def parse_presentation_content(self, content: XmlContent) -> None:
         """Parse presentation linkbase content and build presentation trees."""
         try:
             # Optimize: Register namespaces for faster XPath lookups
@@ -456,8 +544,7 @@ class XBRLParser:
             }
             
             # Optimize: Use lxml parser with smart string handling
-            parser = ET.XMLParser(remove_blank_text=True, recover=True)
-            root = ET.XML(content.encode('utf-8'), parser)
+            root = parse_xml(content)
             
             # Optimize: Use XPath with namespaces for faster extraction
             presentation_links = root.xpath('//link:presentationLink', namespaces=nsmap)
@@ -648,28 +735,19 @@ class XBRLParser:
         except Exception as e:
             raise XBRLProcessingError(f"Error parsing calculation file {file_path}: {str(e)}")
     
-    def _safe_parse_xml(self, content: str) -> ET.Element:
+    def _safe_parse_xml(self, content: XmlContent) -> ET.Element:
         """
         Safely parse XML content with lxml, handling encoding declarations properly.
         
         Args:
-            content: XML content as string or bytes
+            content: XML content as string or bytes, or an already parsed root element
             
         Returns:
             parsed XML root element
         """
-        parser = ET.XMLParser(remove_blank_text=True, recover=True)
-        
-        # Convert to bytes for safer parsing if needed
-        if isinstance(content, str):
-            content_bytes = content.encode('utf-8')
-        else:
-            content_bytes = content
-            
-        # Parse with lxml
-        return ET.XML(content_bytes, parser)
+        return parse_xml(content)
 
-    def parse_calculation_content(self, content: str) -> None:
+    def parse_calculation_content(self, content: XmlContent) -> None:
         """Parse calculation linkbase content and build calculation trees."""
         try:
             # Use safe XML parsing method
@@ -844,7 +922,7 @@ class XBRLParser:
         except Exception as e:
             raise XBRLProcessingError(f"Error parsing definition file {file_path}: {str(e)}")
     
-    def parse_definition_content(self, content: str) -> None:
+    def parse_definition_content(self, content: XmlContent) -> None:
         """Parse definition linkbase content and build dimensional structures."""
         try:
             root = self._safe_parse_xml(content)
@@ -1037,20 +1115,11 @@ class XBRLParser:
         except Exception as e:
             raise XBRLProcessingError(f"Error parsing instance file {file_path}: {str(e)}")
     
-    def parse_instance_content(self, content: str) -> None:
+    def parse_instance_content(self, content: XmlContent) -> None:
         """Parse instance document content and extract contexts, facts, and units."""
         try:
             # Use lxml's optimized parser with smart string handling and recovery mode
-            parser = ET.XMLParser(remove_blank_text=True, recover=True, huge_tree=True)
-            
-            # Convert to bytes for faster parsing if not already
-            if isinstance(content, str):
-                content_bytes = content.encode('utf-8')
-            else:
-                content_bytes = content
-                
-            # Parse content with optimized settings
-            root = ET.XML(content_bytes, parser)
+            root = parse_xml(content, huge_tree=True)
             
             # Extract data in optimal order (contexts first, then units, then facts)
             # This ensures dependencies are resolved before they're needed
@@ -1172,8 +1241,10 @@ class XBRLParser:
                 if not context_id:
                     continue
 
-                # Create context object
-                context = Context(context_id=context_id)
+                # Collect the context values, the context table stores each distinct value once
+                entity = {}
+                period = {}
+                dimensions = {}
 
                 # Extract entity information
                 entity_elem = context_elem.find('.//{http://www.xbrl.org/2003/instance}entity')
@@ -1183,7 +1254,7 @@ class XBRLParser:
                     if identifier_elem is not None:
                         scheme = identifier_elem.get('scheme', '')
                         identifier = identifier_elem.text
-                        context.entity = {
+                        entity = {
                             'scheme': scheme,
                             'identifier': identifier
                         }
@@ -1196,7 +1267,7 @@ class XBRLParser:
                             dimension = dim_elem.get('dimension')
                             value = dim_elem.text
                             if dimension and value:
-                                context.dimensions[dimension] = value
+                                dimensions[dimension] = value
 
                         # Extract typed dimensions
                         for dim_elem in segment_elem.findall('.//{http://xbrl.org/2006/xbrldi}typedMember'):
@@ -1204,7 +1275,7 @@ class XBRLParser:
                             if dimension:
                                 # The typed dimension value is the first child element
                                 for child in dim_elem:
-                                    context.dimensions[dimension] = child.tag
+                                    dimensions[dimension] = child.tag
                                     break
 
                 # Extract period information
@@ -1213,7 +1284,7 @@ class XBRLParser:
                     # Check for instant period
                     instant_elem = period_elem.find('.//{http://www.xbrl.org/2003/instance}instant')
                     if instant_elem is not None and instant_elem.text:
-                        context.period = {
+                        period = {
                             'type': 'instant',
                             'instant': instant_elem.text
                         }
@@ -1222,7 +1293,7 @@ class XBRLParser:
                     start_elem = period_elem.find('.//{http://www.xbrl.org/2003/instance}startDate')
                     end_elem = period_elem.find('.//{http://www.xbrl.org/2003/instance}endDate')
                     if start_elem is not None and end_elem is not None and start_elem.text and end_elem.text:
-                        context.period = {
+                        period = {
                             'type': 'duration',
                             'startDate': start_elem.text,
                             'endDate': end_elem.text
@@ -1231,12 +1302,12 @@ class XBRLParser:
                     # Check for forever period
                     forever_elem = period_elem.find('.//{http://www.xbrl.org/2003/instance}forever')
                     if forever_elem is not None:
-                        context.period = {
+                        period = {
                             'type': 'forever'
                         }
 
                 # Add context to registry
-                self.contexts[context_id] = context
+                self.contexts.add(context_id, entity, period, dimensions)
 
         except Exception as e:
             raise XBRLProcessingError(f"Error extracting contexts: {str(e)}")
@@ -1626,7 +1697,7 @@ class XBRLParser:
             duration_periods = {}
             
             for context_id, context in self.contexts.items():
-                if 'period' in context.model_dump() and 'type' in context.period:
+                if 'type' in context.period:
                     period_type = context.period.get('type')
                     
                     if period_type == 'instant':
@@ -955,11 +955,17 @@ def render_statement(
     """
     if entity_info is None:
         entity_info = {}
+
+    # The XBRL instance is passed along with the entity info so standardized labels can be applied to its facts.
+    # It is not kept in the statement metadata
+    xbrl_instance = entity_info.get('xbrl_instance')
+    if xbrl_instance is not None:
+        entity_info = {key: value for key, value in entity_info.items() if key != 'xbrl_instance'}
     
     # Apply standardization if requested
     if standard:
-        # Create a concept mapper with default mappings
-        mapper = standardization.ConceptMapper(standardization.initialize_default_mappings())
+        # Use the shared concept mapper so mappings are cached across statements
+        mapper = standardization.get_concept_mapper()
         
         # Add statement type to context for better mapping
         for item in statement_data:
@@ -968,12 +974,8 @@ def render_statement(
         # Standardize the statement data
         statement_data = standardization.standardize_statement(statement_data, mapper)
         
-        # Update facts with standardized labels if XBRL instance is available
-        xbrl_instance = entity_info.get('xbrl_instance')
-        if xbrl_instance and hasattr(xbrl_instance, 'facts_view'):
-            facts_view = xbrl_instance.facts_view
-            facts = facts_view.get_facts()
-            
+        # Overlay the standardized labels on the facts if XBRL instance is available
+        if xbrl_instance is not None and hasattr(xbrl_instance, 'facts'):
             # Create a mapping of concept -> standardized label from statement data
             standardization_map = {}
             for item in statement_data:
@@ -984,20 +986,9 @@ def render_statement(
                         'label': item['label'],
                         'original_label': item['original_label']
                     }
-            
-            # Update facts with standardized labels
-            for fact in facts:
-                if 'concept' in fact and fact['concept'] in standardization_map:
-                    mapping = standardization_map[fact['concept']]
-                    if fact.get('label') == mapping.get('original_label'):
-                        # Store original label if not already set
-                        if 'original_label' not in fact:
-                            fact['original_label'] = fact['label']
-                        # Update with standardized label
-                        fact['label'] = mapping['label']
-            
-            # Clear the cache to ensure it's rebuilt with updated facts
-            facts_view.clear_cache()
+
+            # The facts view keeps the labels as an overlay so its fact cache is not rebuilt
+            xbrl_instance.facts.apply_standard_labels(standardization_map)
         
         # Indicate that standardization is being used in the title
         statement_title = f"{statement_title} (Standardized)"
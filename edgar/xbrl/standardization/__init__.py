@@ -6,12 +6,22 @@ to standardized concept names, enabling consistent presentation of financial
 statements regardless of the filing entity.
 """
 
-from edgar.xbrl.standardization.core import ConceptMapper, MappingStore, StandardConcept, initialize_default_mappings, standardize_statement
+from edgar.xbrl.standardization.core import (
+    ConceptMapper,
+    InferredMappingCache,
+    MappingStore,
+    StandardConcept,
+    get_concept_mapper,
+    initialize_default_mappings,
+    standardize_statement,
+)
 
 __all__ = [
     'StandardConcept',
     'MappingStore', 
     'ConceptMapper', 
     'standardize_statement',
-    'initialize_default_mappings'
+    'initialize_default_mappings',
+    'InferredMappingCache',
+    'get_concept_mapper'
 ]
\ No newline at end of file
@@ -6,13 +6,26 @@ to standardized concept names, enabling consistent presentation of financial
 statements regardless of the filing entity.
 """
 
+import atexit
+import hashlib
 import json
+import logging
 import os
+import threading
 from difflib import SequenceMatcher
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set, Tuple
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 import pandas as pd
+from rapidfuzz import fuzz, process
+
+from edgar.core import get_edgar_data_directory
+
+log = logging.getLogger(__name__)
+
+# Bump this when the inference rules change so that persisted inferred mappings are recomputed
+INFERENCE_VERSION = 4
 
 
 class StandardConcept(str, Enum):
@@ -320,6 +333,105 @@ class MappingStore:
         return self.mappings.get(standard_concept, set())
 
 
+class InferredMappingCache:
+    """
+    A persistent cache of inferred mappings keyed by (company concept, statement type, label).
+
+    Inferring a mapping means fuzzy matching a label against every standard concept, and in batch
+    standardization the same company concepts are inferred over and over. The results, including
+    concepts that could not be mapped, are kept in a JSON file so they survive across processes.
+    The file is stamped with a fingerprint of the standard concepts and the inference rules
+    and is ignored if either changes.
+
+    Attributes:
+        path (Path): The JSON file holding the inferred mappings
+    """
+
+    def __init__(self, path: Union[str, Path], autosave_every: int = 500):
+        """
+        Initialize the cache, loading any mappings already saved at `path`.
+
+        Args:
+            path: The JSON file holding the inferred mappings
+            autosave_every: Save to disk after this many new mappings. 0 saves only when save() is called
+        """
+        self.path = Path(path)
+        self.autosave_every = autosave_every
+        self._lock = threading.RLock()
+        self._unsaved = 0
+        self._mappings: Dict[Tuple[str, str, str], Optional[str]] = self._load()
+
+    @staticmethod
+    def fingerprint() -> str:
+        standard_values = "|".join(sorted(StandardConcept.get_all_values()))
+        return hashlib.sha1(f"{INFERENCE_VERSION}:{standard_values}".encode("utf-8")).hexdigest()
+
+    def _load(self) -> Dict[Tuple[str, str, str], Optional[str]]:
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError):
+            log.warning(f"Ignoring unreadable inferred mapping cache {self.path}")
+            return {}
+        if data.get("fingerprint") != self.fingerprint():
+            return {}
+        return {(concept, statement_type, label): standard_concept
+                for statement_type, concepts in data.get("mappings", {}).items()
+                for concept, labels in concepts.items()
+                for label, standard_concept in labels.items()}
+
+    def __contains__(self, key: Tuple[str, str, str]) -> bool:
+        return key in self._mappings
+
+    def __len__(self):
+        return len(self._mappings)
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[str]:
+        return self._mappings.get(key)
+
+    def put(self, key: Tuple[str, str, str], standard_concept: Optional[str]) -> None:
+        with self._lock:
+            if key in self._mappings and self._mappings[key] == standard_concept:
+                return
+            self._mappings[key] = standard_concept
+            self._unsaved += 1
+            if self.autosave_every and self._unsaved >= self.autosave_every:
+                self.save()
+
+    def save(self) -> None:
+        """Write the mappings to disk if anything changed since the last save"""
+        with self._lock:
+            if not self._unsaved:
+                return
+            # Merge with mappings saved by other processes since we loaded
+            mappings = {**self._load(), **self._mappings}
+            nested: Dict[str, Dict[str, Dict[str, Optional[str]]]] = {}
+            for (concept, statement_type, label), standard_concept in mappings.items():
+                nested.setdefault(statement_type, {}).setdefault(concept, {})[label] = standard_concept
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                # Write to a temporary file then rename so readers never see a partial file
+                tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+                with open(tmp_path, 'w') as f:
+                    json.dump({"fingerprint": self.fingerprint(), "mappings": nested}, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                log.warning(f"Could not save inferred mapping cache {self.path}: {e}")
+                return
+            self._mappings = mappings
+            self._unsaved = 0
+
+    def clear(self) -> None:
+        """Remove all inferred mappings from memory and disk"""
+        with self._lock:
+            self._mappings = {}
+            self._unsaved = 0
+            if self.path.exists():
+                self.path.unlink()
+
+
 class ConceptMapper:
     """
     Maps company-specific concepts to standard concepts using various techniques.
@@ -327,27 +439,40 @@ class ConceptMapper:
     Attributes:
         mapping_store (MappingStore): Storage for concept mappings
         pending_mappings (Dict): Low-confidence mappings pending review
+        inferred_cache (InferredMappingCache): Optional persistent cache of inferred mappings
         _cache (Dict): In-memory cache of mapped concepts
     """
     
-    def __init__(self, mapping_store: MappingStore):
+    def __init__(self, mapping_store: MappingStore, inferred_cache: Optional[InferredMappingCache] = None):
         """
         Initialize the concept mapper.
         
         Args:
             mapping_store: Storage for concept mappings
+            inferred_cache: Optional persistent cache of inferred mappings shared across runs
         """
         self.mapping_store = mapping_store
+        self.inferred_cache = inferred_cache
         self.pending_mappings = {}
         # Cache for faster lookups of previously mapped concepts
         self._cache = {}
         # Precompute lowercased standard concept values for faster comparison
         self._std_concept_values = [(concept, concept.value.lower()) for concept in StandardConcept]
+        self._std_concept_by_label = {value: concept for concept, value in self._std_concept_values}
         
         # Statement-specific keyword sets for faster contextual matching
         self._bs_keywords = {'assets', 'liabilities', 'equity', 'cash', 'debt', 'inventory', 'receivable', 'payable'}
         self._is_keywords = {'revenue', 'sales', 'income', 'expense', 'profit', 'loss', 'tax', 'earnings'}
         self._cf_keywords = {'cash', 'operating', 'investing', 'financing', 'activities'}
+
+        # The candidate standard labels for each statement type are fixed so build them once
+        all_labels = [value for _, value in self._std_concept_values]
+        self._candidate_labels = {'': all_labels}
+        for statement_type, keywords in (("BalanceSheet", self._bs_keywords),
+                                         ("IncomeStatement", self._is_keywords),
+                                         ("CashFlowStatement", self._cf_keywords)):
+            self._candidate_labels[statement_type] = [value for value in all_labels
+                                                      if any(kw in value for kw in keywords)] or all_labels
         
     def map_concept(self, company_concept: str, label: str, context: Dict[str, Any]) -> Optional[str]:
         """
@@ -361,8 +486,8 @@ class ConceptMapper:
         Returns:
             The standard concept or None if no mapping found
         """
-        # Use cache for faster lookups
-        cache_key = (company_concept, context.get('statement_type', ''))
+        # Use cache for faster lookups. Inference depends on the label, so it is part of the key
+        cache_key = (company_concept, context.get('statement_type', ''), label.lower())
         if cache_key in self._cache:
             return self._cache[cache_key]
         
@@ -371,19 +496,22 @@ class ConceptMapper:
         if standard_concept:
             self._cache[cache_key] = standard_concept
             return standard_concept
+
+        # Check if this concept was inferred in an earlier run
+        if self.inferred_cache is not None and cache_key in self.inferred_cache:
+            standard_concept = self.inferred_cache.get(cache_key)
+            self._cache[cache_key] = standard_concept
+            return standard_concept
         
         # Infer mapping and confidence
         inferred_concept, confidence = self._infer_mapping(company_concept, label, context)
         
-        # Only use high-confidence mappings
-        if confidence >= 0.9:
-            # Cache the result for future lookups
-            self._cache[cache_key] = inferred_concept
-            return inferred_concept
-            
-        # Cache negative results too to avoid repeated inference
-        self._cache[cache_key] = None
-        return None
+        # Only use high-confidence mappings. Negative results are cached too to avoid repeated inference
+        standard_concept = inferred_concept if confidence >= 0.9 else None
+        self._cache[cache_key] = standard_concept
+        if self.inferred_cache is not None:
+            self.inferred_cache.put(cache_key, standard_concept)
+        return standard_concept
     
     def _infer_mapping(self, company_concept: str, label: str, context: Dict[str, Any]) -> Tuple[Optional[str], float]:
         """
@@ -408,48 +536,39 @@ class ConceptMapper:
         elif "net income" in label_lower and "parent" not in label_lower:
             return StandardConcept.NET_INCOME.value, 0.9
         
-        # Faster direct match checking with precomputed lowercase values
-        for std_concept, std_value_lower in self._std_concept_values:
-            if std_value_lower == label_lower:
-                return std_concept.value, 1.0  # Perfect match
-        
-        # Fall back to sequence matching for similarity
-        best_match = None
-        best_score = 0
+        # Direct match against the precomputed lowercase values
+        std_concept = self._std_concept_by_label.get(label_lower)
+        if std_concept is not None:
+            return std_concept.value, 1.0  # Perfect match
         
         # Only compute similarity if some relevant keywords are present to reduce workload
         statement_type = context.get("statement_type", "")
         
         # Statement type based filtering to reduce unnecessary comparisons
-        limited_concepts = []
-        if statement_type == "BalanceSheet":
-            if any(kw in label_lower for kw in self._bs_keywords):
-                # Filter to balance sheet concepts only
-                limited_concepts = [c for c, v in self._std_concept_values 
-                                  if any(kw in v for kw in self._bs_keywords)]
-        elif statement_type == "IncomeStatement":
-            if any(kw in label_lower for kw in self._is_keywords):
-                # Filter to income statement concepts only
-                limited_concepts = [c for c, v in self._std_concept_values 
-                                  if any(kw in v for kw in self._is_keywords)]
-        elif statement_type == "CashFlowStatement":
-            if any(kw in label_lower for kw in self._cf_keywords):
-                # Filter to cash flow concepts only
-                limited_concepts = [c for c, v in self._std_concept_values 
-                                  if any(kw in v for kw in self._cf_keywords)]
-        
-        # Use limited concepts if available, otherwise use all
-        concepts_to_check = limited_concepts if limited_concepts else [c for c, _ in self._std_concept_values]
-        
-        # Calculate similarities for candidate concepts
-        for std_concept in concepts_to_check:
-            # Calculate similarity between labels
-            similarity = SequenceMatcher(None, label_lower, std_concept.value.lower()).ratio()
-            
-            # Check if this is the best match so far
-            if similarity > best_score:
+        keywords = {"BalanceSheet": self._bs_keywords,
+                    "IncomeStatement": self._is_keywords,
+                    "CashFlowStatement": self._cf_keywords}.get(statement_type)
+        if keywords and any(kw in label_lower for kw in keywords):
+            candidates = self._candidate_labels[statement_type]
+        else:
+            candidates = self._candidate_labels['']
+        
+        # Score all the candidates with rapidfuzz in one call, then rescore them with SequenceMatcher from the
+        # highest rapidfuzz score down. The rapidfuzz ratio is an upper bound on the SequenceMatcher ratio, so
+        # once it falls below the best ratio found no later candidate can beat it, and the match is the same as
+        # scoring every candidate with SequenceMatcher. Ties go to the earliest candidate, as in a full scan
+        best_match = None
+        best_score = 0
+        best_index = None
+        ranked = process.extract(label_lower, candidates, scorer=fuzz.ratio, processor=None, limit=None)
+        for std_value_lower, upper_bound, index in ranked:
+            if upper_bound / 100 + 1e-9 < best_score:
+                break
+            similarity = SequenceMatcher(None, label_lower, std_value_lower).ratio()
+            if similarity > best_score or (similarity == best_score and best_index is not None and index < best_index):
                 best_score = similarity
-                best_match = std_concept.value
+                best_index = index
+                best_match = self._std_concept_by_label[std_value_lower].value
         
         # Apply specific contextual rules based on statement type
         if statement_type == "BalanceSheet":
@@ -516,18 +635,17 @@ class ConceptMapper:
             if standard_concept and confidence >= 0.9:
                 if standard_concept not in mappings_to_add:
                     mappings_to_add[standard_concept] = set()
-                mappings_to_add[standard_concept].add(concept)
+                mappings_to_add[standard_concept].add((concept, context["statement_type"], label.lower()))
             elif standard_concept and confidence >= 0.5:
                 if standard_concept not in self.pending_mappings:
                     self.pending_mappings[standard_concept] = []
                 self.pending_mappings[standard_concept].append((concept, confidence, label))
         
         # Batch add all mappings at once
-        for std_concept, concepts in mappings_to_add.items():
-            for concept in concepts:
-                self.mapping_store.add(concept, std_concept)
+        for std_concept, cache_keys in mappings_to_add.items():
+            for cache_key in cache_keys:
+                self.mapping_store.add(cache_key[0], std_concept)
                 # Update cache
-                cache_key = (concept, filing.get("statement_type", ""))
                 self._cache[cache_key] = std_concept
     
     def save_pending_mappings(self, destination: str) -> None:
@@ -682,4 +800,30 @@ def initialize_default_mappings(read_only: bool = False) -> MappingStore:
     if not read_only and not os.path.exists(store.source):
         create_default_mappings_file(store.source)
     
-    return store
\ No newline at end of file
+    return store
+
+_concept_mapper: Optional[ConceptMapper] = None
+_concept_mapper_lock = threading.Lock()
+
+
+def default_inferred_mappings_path() -> Path:
+    """The location of the persistent inferred mapping cache in the edgar data directory"""
+    return get_edgar_data_directory() / "standardization" / "inferred_mappings.json"
+
+
+def get_concept_mapper() -> ConceptMapper:
+    """
+    Get the process-wide ConceptMapper.
+
+    The mapper is created once with the default mappings so its cache is shared across statements,
+    and inferred mappings are persisted under the edgar data directory so they are reused by later runs.
+    """
+    global _concept_mapper
+    if _concept_mapper is None:
+        with _concept_mapper_lock:
+            if _concept_mapper is None:
+                inferred_cache = InferredMappingCache(default_inferred_mappings_path())
+                atexit.register(inferred_cache.save)
+                _concept_mapper = ConceptMapper(initialize_default_mappings(read_only=True),
+                                                inferred_cache=inferred_cache)
+    return _concept_mapper
@@ -0,0 +1,91 @@
+"""
+A per-XBRL cache of generated statements.
+
+Finding a statement, generating its line items, choosing the periods to display and rendering it
+only depend on the parsed XBRL and the arguments, so the results are memoized on the XBRL instance.
+Balance sheet, ratio and score calculations that ask for the same statements many times
+are served from the cache.
+
+The cache holds one namespace per kind of result
+
+    find_statement - (statement type, parenthetical) -> (matching statements, role, statement type)
+    statement      - (role, period filter, display dimensions) -> line items
+    period_views   - statement type -> period views
+    periods        - (statement type, period filter, period view) -> periods to display
+    rendered       - (statement type, period filter, period view, standard, show date range, parenthetical)
+                     -> RenderedStatement
+
+The XBRL returns deep copies of the cached line items, statements, period views and rendered statements,
+so editing a result does not change what later calls return.
+If the XBRL is modified after statements were generated call `XBRL.clear_statement_cache()`
+"""
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Optional
+
+__all__ = ['StatementCache', 'StatementCacheStats']
+
+
+@dataclass
+class StatementCacheStats:
+    hits: Dict[str, int] = field(default_factory=dict)
+    misses: Dict[str, int] = field(default_factory=dict)
+    invalidations: int = 0
+
+    @property
+    def total_hits(self) -> int:
+        return sum(self.hits.values())
+
+    @property
+    def total_misses(self) -> int:
+        return sum(self.misses.values())
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.total_hits + self.total_misses
+        return self.total_hits / lookups if lookups else 0.0
+
+    def __str__(self):
+        kinds = sorted(set(self.hits) | set(self.misses))
+        counts = ", ".join(f"{kind}: {self.hits.get(kind, 0)}/{self.hits.get(kind, 0) + self.misses.get(kind, 0)}"
+                           for kind in kinds)
+        return f"StatementCacheStats(hit_rate={self.hit_rate:.1%}, {counts})"
+
+
+class StatementCache:
+    """
+    Memoized statement results for one XBRL instance, grouped by kind
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._entries: Dict[str, Dict[Hashable, Any]] = {}
+        self.stats = StatementCacheStats()
+
+    def get_or_compute(self, kind: str, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Get the cached result for the key, calling `compute` to create and cache it on a miss"""
+        if not self.enabled:
+            return compute()
+        entries = self._entries.setdefault(kind, {})
+        if key in entries:
+            self.stats.hits[kind] = self.stats.hits.get(kind, 0) + 1
+            return entries[key]
+        self.stats.misses[kind] = self.stats.misses.get(kind, 0) + 1
+        result = compute()
+        entries[key] = result
+        return result
+
+    def invalidate(self, kind: Optional[str] = None):
+        """Remove the cached results of one kind, or all of them"""
+        if kind is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(kind, None)
+        self.stats.invalidations += 1
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._entries.values())
+
+    def get_stats(self) -> StatementCacheStats:
+        return StatementCacheStats(hits=dict(self.stats.hits),
+                                   misses=dict(self.stats.misses),
+                                   invalidations=self.stats.invalidations)
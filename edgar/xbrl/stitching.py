@@ -11,12 +11,14 @@ from datetime import date, datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional, Set, Tuple, Union, TYPE_CHECKING
 
+import numpy as np
 import pandas as pd
 
 from edgar.xbrl.core import format_date, parse_date
-from edgar.xbrl.standardization import ConceptMapper, initialize_default_mappings, standardize_statement
+from edgar.xbrl.standardization import ConceptMapper, get_concept_mapper, standardize_statement
 
 if TYPE_CHECKING:
+    from edgar.xbrl.fact_dataset import FactDataset
     from edgar.xbrl.xbrl import XBRL
     from edgar.xbrl.statements import StitchedStatements
 
@@ -440,14 +442,10 @@ class StatementStitcher:
         
         Args:
             concept_mapper: Optional ConceptMapper for standardizing concepts.
-                            If None, a default mapper is created.
+                            If None, the shared default mapper is used.
         """
-        if concept_mapper is None:
-            self.mapping_store = initialize_default_mappings()
-            self.concept_mapper = ConceptMapper(self.mapping_store)
-        else:
-            self.concept_mapper = concept_mapper
-            self.mapping_store = concept_mapper.mapping_store
+        self.concept_mapper = concept_mapper or get_concept_mapper()
+        self.mapping_store = self.concept_mapper.mapping_store
         
         # Initialize data structures
         self.periods = []  # Ordered list of period identifiers
@@ -460,7 +458,8 @@ class StatementStitcher:
         statements: List[Dict[str, Any]], 
         period_type: Union[PeriodType, str] = PeriodType.RECENT_PERIODS,
         max_periods: int = None,
-        standard: bool = True
+        standard: bool = True,
+        columnar: bool = True
     ) -> Dict[str, Any]:
         """
         Stitch multiple statements into a unified view.
@@ -470,6 +469,8 @@ class StatementStitcher:
             period_type: Type of period view to generate
             max_periods: Maximum number of periods to include
             standard: Whether to use standardized concept labels
+            columnar: Collect the values as (label, period) rows and pivot them once (default: True).
+                      If False, integrate each statement into nested dicts
             
         Returns:
             Dictionary with stitched statement data
@@ -489,6 +490,9 @@ class StatementStitcher:
         # Select appropriate periods based on period_type
         selected_periods = self._select_periods(all_periods, period_type, max_periods)
         self.periods = selected_periods
+
+        if columnar:
+            return self._stitch_columnar(statements, standard)
         
         # Process each statement
         for i, statement in enumerate(statements):
@@ -825,6 +829,150 @@ class StatementStitcher:
                             'decimals': item.get('decimals', {}).get(period_id, 0)
                         }
     
+    def _stitch_columnar(self, statements: List[Dict[str, Any]], standard: bool) -> Dict[str, Any]:
+        """
+        Stitch the statements by collecting every value as a (row, period) cell in flat arrays
+        and pivoting the cells into a row x period matrix once.
+
+        Rows are keyed by label in the same way as `_integrate_statement_data`, with later statements
+        overwriting earlier ones and labels taken from the statement with the most recent period,
+        so the output is the same. Period positions are looked up in a dict and the most recent period
+        of each row is tracked as values are added, rather than searching the period list for every item.
+        """
+        period_index = {period_id: index for index, period_id in enumerate(self.periods)}
+        no_period = len(self.periods)
+
+        # The cells, in the order they were written
+        row_index: Dict[str, int] = {}
+        cell_rows: List[int] = []
+        cell_periods: List[int] = []
+        cell_values: List[Any] = []
+        cell_decimals: List[Any] = []
+        # The position of the most recent period with a value for each row
+        most_recent_period: Dict[str, int] = {}
+        # Rows that have been given a slot for values, which decides whether a relabelled row copies its values
+        keys_with_data: Set[str] = set()
+
+        def add_cell(key: str, period: int, value: Any, decimal: Any):
+            cell_rows.append(row_index.setdefault(key, len(row_index)))
+            cell_periods.append(period)
+            cell_values.append(value)
+            cell_decimals.append(decimal)
+            keys_with_data.add(key)
+            if period < most_recent_period.get(key, no_period):
+                most_recent_period[key] = period
+
+        def copy_row(from_key: str, to_key: str):
+            from_row = row_index[from_key]
+            latest = {}
+            for row, period, value, decimal in zip(cell_rows, cell_periods, cell_values, cell_decimals):
+                if row == from_row:
+                    latest[period] = (value, decimal)
+            for period, (value, decimal) in latest.items():
+                add_cell(to_key, period, value, decimal)
+
+        for statement in statements:
+            relevant_periods = [(period_id, period_index[period_id])
+                                for period_id in statement['periods'] if period_id in period_index]
+            if not relevant_periods:
+                continue
+
+            statement_data = self._standardize_statement_data(statement) if standard else statement['data']
+            most_recent_idx = min(index for _, index in relevant_periods)
+            concept_to_label_map = {}
+
+            for item in statement_data:
+                concept = item.get('concept')
+                label = item.get('label')
+                if not concept or not label:
+                    continue
+                if item.get('is_abstract', False) and not item.get('children'):
+                    continue
+                if any(bracket in label for bracket in ['[Axis]', '[Domain]', '[Member]', '[Line Items]', '[Table]', '[Abstract]']):
+                    continue
+
+                concept_key = concept_to_label_map.setdefault(concept, label)
+
+                if concept_key not in self.concept_metadata:
+                    self.concept_metadata[concept_key] = {
+                        'level': item.get('level', 0),
+                        'is_abstract': item.get('is_abstract', False),
+                        'is_total': item.get('is_total', False) or 'total' in label.lower(),
+                        'original_concept': concept,
+                        'latest_label': label
+                    }
+                else:
+                    keys_with_data.add(concept_key)
+                    # Relabel the row if this statement has more recent data than the row has so far
+                    if most_recent_idx < most_recent_period.get(concept_key, -1):
+                        if label != concept_key:
+                            if label not in keys_with_data:
+                                copy_row(concept_key, label)
+                                keys_with_data.add(label)
+                            self.concept_metadata[label] = {**self.concept_metadata[concept_key], 'latest_label': label}
+                            concept_to_label_map[concept] = label
+                            concept_key = label
+                        else:
+                            self.concept_metadata[concept_key]['latest_label'] = label
+
+                item_values = item.get('values', {})
+                item_decimals = item.get('decimals', {})
+                for period_id, period in relevant_periods:
+                    value = item_values.get(period_id)
+                    if value is not None:
+                        add_cell(concept_key, period, value, item_decimals.get(period_id, 0))
+
+        return self._format_columnar_output(row_index, cell_rows, cell_periods, cell_values, cell_decimals)
+
+    def _format_columnar_output(self,
+                                row_index: Dict[str, int],
+                                cell_rows: List[int],
+                                cell_periods: List[int],
+                                cell_values: List[Any],
+                                cell_decimals: List[Any]) -> Dict[str, Any]:
+        """
+        Pivot the cells into row x period matrices, keeping the last value written to each cell,
+        and build the stitched statement data from the matrices
+        """
+        shape = (len(row_index), len(self.periods))
+        values = np.empty(shape, dtype=object)
+        decimals = np.empty(shape, dtype=object)
+        present = np.zeros(shape, dtype=bool)
+        if cell_rows:
+            # Keep the last write to each cell by taking the first occurrence in the reversed cells
+            flat = np.asarray(cell_rows, dtype=np.int64) * shape[1] + np.asarray(cell_periods, dtype=np.int64)
+            _, first_in_reversed = np.unique(flat[::-1], return_index=True)
+            last = len(flat) - 1 - first_in_reversed
+            rows, periods = np.divmod(flat[last], shape[1])
+            values[rows, periods] = np.fromiter(cell_values, dtype=object, count=len(cell_values))[last]
+            decimals[rows, periods] = np.fromiter(cell_decimals, dtype=object, count=len(cell_decimals))[last]
+            present[rows, periods] = True
+
+        result = {
+            'periods': [(pid, self.period_dates.get(pid, pid)) for pid in self.periods],
+            'statement_data': []
+        }
+        for concept, metadata in sorted(self.concept_metadata.items(), key=lambda x: (x[1]['level'], x[0])):
+            item = {
+                'label': metadata.get('latest_label', concept),
+                'level': metadata['level'],
+                'is_abstract': metadata['is_abstract'],
+                'is_total': metadata['is_total'],
+                'concept': metadata['original_concept'],
+                'values': {},
+                'decimals': {}
+            }
+            row = row_index.get(concept)
+            if row is not None:
+                for period in np.flatnonzero(present[row]):
+                    period_id = self.periods[period]
+                    item['values'][period_id] = values[row, period]
+                    item['decimals'][period_id] = decimals[row, period]
+            item['has_values'] = len(item['values']) > 0
+            if item['has_values'] or item['is_abstract']:
+                result['statement_data'].append(item)
+        return result
+
     def _format_output(self) -> Dict[str, Any]:
         """
         Format the stitched data for rendering.
@@ -1083,6 +1231,9 @@ class XBRLS:
         
         # Cache for stitched statements
         self._statement_cache = {}
+
+        # Facts of all the filings, created on first use
+        self._fact_dataset = None
     
     @classmethod
     def from_filings(cls, filings: List[Any]) -> 'XBRLS':
@@ -1124,6 +1275,20 @@ class XBRLS:
         """
         return cls(xbrl_list)
     
+    @property
+    def facts(self) -> 'FactDataset':
+        """
+        Get the facts of all the filings as one dataset that can be queried across filings.
+        The filings are keyed by their position in this XBRLS, newest first
+
+        Returns:
+            FactDataset object
+        """
+        if self._fact_dataset is None:
+            from edgar.xbrl.fact_dataset import FactDataset
+            self._fact_dataset = FactDataset.from_xbrl(self.xbrl_list)
+        return self._fact_dataset
+
     @property
     def statements(self) -> 'StitchedStatements':
         """
@@ -0,0 +1,111 @@
+"""
+A process wide catalog of standard taxonomy elements shared by XBRL filings.
+
+Filings only declare their extension elements in their own schema. Standard us-gaap, dei, srt ... elements
+are added to the element catalog from the label linkbase, and their labels are usually the same from one
+filing to the next. When many XBRL objects are alive, as in `XBRLS`, each would hold its own copy of the
+same elements.
+
+The TaxonomyCatalog interns these entries, keyed by the taxonomy schema the element is located in,
+which includes the taxonomy version e.g. https://xbrl.fasb.org/us-gaap/2023/elts/us-gaap-2023.xsd
+
+    taxonomy schema -> (element id, labels) -> ElementCatalog
+
+Filings with the same labels for a standard element share one ElementCatalog. A filing that relabels an element
+gets its own entry, so a filing's element catalog is the shared entries plus its extension elements and label deltas.
+Entries are held weakly and are released when no XBRL uses them.
+
+Shared entries must not be modified. The parser copies an entry before changing it.
+"""
+import sys
+import threading
+import weakref
+from typing import Dict, List, Optional
+
+from edgar.xbrl.models import ElementCatalog
+
+__all__ = ['TaxonomyCatalog', 'get_taxonomy_catalog', 'standard_taxonomy']
+
+
+def standard_taxonomy(href: str) -> Optional[str]:
+    """
+    Get the taxonomy schema for a locator href if it points to a published taxonomy.
+    Filing extension schemas are referenced by a relative path so return None
+    """
+    if href.startswith(('http://', 'https://')):
+        return sys.intern(href.split('#', 1)[0])
+    return None
+
+
+class TaxonomyCatalog:
+    """
+    Interned ElementCatalog entries for standard taxonomy elements
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        # taxonomy schema -> element id -> the label variants of the element in use
+        self._entries: Dict[str, Dict[str, List[weakref.ref]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def intern_element(self, taxonomy: str, element_id: str, labels: Dict[str, str]) -> ElementCatalog:
+        """Get the shared catalog entry for a standard element with these labels, creating it if needed"""
+        if not self.enabled:
+            return ElementCatalog(name=element_id, data_type="", period_type="duration", labels=dict(labels))
+        with self._lock:
+            elements = self._entries.get(taxonomy)
+            if elements is None:
+                elements = self._entries[sys.intern(taxonomy)] = {}
+            variants = elements.get(element_id)
+            if variants is None:
+                variants = elements[sys.intern(element_id)] = []
+            for reference in variants:
+                entry = reference()
+                # Label order decides the fallback display label so it has to match as well
+                if entry is not None and entry.labels == labels and list(entry.labels) == list(labels):
+                    self.hits += 1
+                    return entry
+            self.misses += 1
+            # The labels come from the parser so skip validating them again
+            entry = ElementCatalog.model_construct(name=sys.intern(element_id),
+                                                   data_type="",
+                                                   period_type="duration",
+                                                   labels={sys.intern(role): text for role, text in labels.items()})
+            variants[:] = [reference for reference in variants if reference() is not None]
+            variants.append(weakref.ref(entry))
+            return entry
+
+    def taxonomies(self) -> List[str]:
+        return sorted(taxonomy for taxonomy, elements in self._entries.items()
+                      if any(reference() is not None for variants in elements.values() for reference in variants))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return sum(reference() is not None
+                   for elements in self._entries.values()
+                   for variants in elements.values()
+                   for reference in variants)
+
+    def __str__(self):
+        return f"TaxonomyCatalog(taxonomies={len(self.taxonomies())}, elements={len(self)}, hits={self.hits})"
+
+
+_taxonomy_catalog: Optional[TaxonomyCatalog] = None
+_taxonomy_catalog_lock = threading.Lock()
+
+
+def get_taxonomy_catalog() -> TaxonomyCatalog:
+    """Get the TaxonomyCatalog shared by all XBRL parsers in this process"""
+    global _taxonomy_catalog
+    if _taxonomy_catalog is None:
+        with _taxonomy_catalog_lock:
+            if _taxonomy_catalog is None:
+                _taxonomy_catalog = TaxonomyCatalog()
+    return _taxonomy_catalog
@@ -11,9 +11,12 @@ The XBRL class provides a unified interface for working with XBRL data,
 organizing facts according to presentation hierarchies, validating calculations,
 and handling dimensional qualifiers.
 """
+import copy
 import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 import pandas as pd
 from rich import box
@@ -26,13 +29,19 @@ from edgar.richtools import repr_rich
 from edgar.xbrl.core import STANDARD_LABEL
 from edgar.xbrl.facts import FactQuery
 from edgar.xbrl.models import PresentationNode
-from edgar.xbrl.parser import XBRLParser
+from edgar.xbrl.parser import XBRLParser, XmlContent, parse_xml
 from edgar.xbrl.periods import determine_periods_to_display, get_period_views
 from edgar.xbrl.rendering import RenderedStatement, generate_rich_representation, render_statement
+from edgar.xbrl.statement_cache import StatementCache, StatementCacheStats
 from edgar.xbrl.statement_resolver import StatementResolver
 from edgar.xbrl.statements import statement_to_concepts
 
 
+# The documents that make up an XBRL filing, in the order they are parsed
+LINKBASE_PARTS = ('schema', 'label', 'presentation', 'calculation', 'definition')
+XBRL_PARTS = LINKBASE_PARTS + ('instance',)
+
+
 class XBRLFilingWithNoXbrlData(Exception):
     """Exception raised when a filing does not contain XBRL data."""
     def __init__(self, message: str):
@@ -113,6 +122,26 @@ class XBRL:
         self._statement_by_role_uri = {}
         self._statement_by_role_name = {}
         self._all_statements_cached = None
+
+        # Memoized statement lookups, line items, periods and rendered statements
+        self._statement_cache = StatementCache()
+
+        # Linkbases that were not requested when loading, parsed when a statement needs them
+        self._deferred_parts: Dict[str, Callable[[], str]] = {}
+        self._parallel = False
+
+    def clear_statement_cache(self) -> None:
+        """
+        Clear the memoized statements. Call this if the parsed XBRL data is modified
+        after statements have been generated
+        """
+        self._statement_cache.invalidate()
+
+    def statement_cache_stats(self) -> StatementCacheStats:
+        """
+        Get the hit and miss counts of the statement cache, by kind of result
+        """
+        return self._statement_cache.get_stats()
     
     def _is_dimension_display_statement(self, statement_type: str, role_definition: str) -> bool:
         """
@@ -157,34 +186,42 @@ class XBRL:
         
     @property
     def presentation_roles(self):
+        self.load_deferred_parts()
         return self.parser.presentation_roles
         
     @property
     def presentation_trees(self):
+        self.load_deferred_parts()
         return self.parser.presentation_trees
         
     @property
     def calculation_roles(self):
+        self.load_deferred_parts()
         return self.parser.calculation_roles
         
     @property
     def calculation_trees(self):
+        self.load_deferred_parts()
         return self.parser.calculation_trees
         
     @property
     def definition_roles(self):
+        self.load_deferred_parts()
         return self.parser.definition_roles
         
     @property
     def tables(self):
+        self.load_deferred_parts()
         return self.parser.tables
         
     @property
     def axes(self):
+        self.load_deferred_parts()
         return self.parser.axes
         
     @property
     def domains(self):
+        self.load_deferred_parts()
         return self.parser.domains
         
     @property
@@ -207,25 +244,28 @@ class XBRL:
         return self.parser.context_period_map
     
     @classmethod
-    def parse_directory(cls, directory_path: Union[str, Path]) -> 'XBRL':
+    def parse_directory(cls,
+                        directory_path: Union[str, Path],
+                        parts: Optional[Iterable[str]] = None,
+                        parallel: bool = False) -> 'XBRL':
         """
         Parse all XBRL files in a directory.
         
         Args:
             directory_path: Path to directory containing XBRL files
+            parts: The XBRL documents to parse now. See `XBRL.from_filing`
+            parallel: Read and parse the documents concurrently. See `XBRL.from_filing`
             
         Returns:
             XBRL object with parsed data
         """
         xbrl = cls()
-        xbrl.parser.parse_directory(directory_path)
-        
-        # Try to create legacy instance as well for compatibility
-        directory = Path(directory_path)
-        for file_path in directory.glob("*"):
-            if file_path.is_file() and file_path.name.lower().endswith('.xml') and '<xbrl' in file_path.read_text()[:2000]:
-                break
-        
+        if parts is None and not parallel:
+            xbrl.parser.parse_directory(directory_path)
+            return xbrl
+
+        xbrl_files = XBRLParser.find_xbrl_files(directory_path)
+        xbrl._load_parts({part: file_path.read_text for part, file_path in xbrl_files.items()}, parts, parallel)
         return xbrl
     
     @classmethod
@@ -275,12 +315,29 @@ class XBRL:
         return xbrl
     
     @classmethod
-    def from_filing(cls, filing) -> Optional['XBRL']:
+    def from_filing(cls, filing, parts: Optional[Iterable[str]] = None, parallel: bool = False) -> Optional['XBRL']:
         """
         Create an XBRL object from a Filing object.
+
+        By default all the XBRL documents are downloaded and parsed. If you only need the facts
+        pass the documents to load now in `parts` e.g.
+
+            xbrl = XBRL.from_filing(filing, parts=['instance', 'label'])
+
+        The other linkbases are parsed the first time a statement or presentation tree is requested.
+        The instance document is always loaded, together with the calculation linkbase so that the fact
+        values have their calculation weights applied as in a full load.
+        The documents are read from the filing's attachments, so the whole submission is still downloaded.
+
+        With `parallel=True` the documents are downloaded and parsed by lxml in a thread pool,
+        then the element catalog, trees and facts are built from them one after the other in the usual order.
         
         Args:
             filing: Filing object with attachments containing XBRL files
+            parts: The documents to load now, from 'instance', 'schema', 'label', 'presentation',
+                   'calculation' and 'definition'. All of them if None. The instance and calculation
+                   linkbase are always loaded
+            parallel: Download and parse the documents concurrently
             
         Returns:
             XBRL object with parsed data
@@ -294,26 +351,94 @@ class XBRL:
             log.warning(f"No XBRL attachments found in filing {filing}")
             return None
 
-        if xbrl_attachments.get('schema'):
-            xbrl.parser.parse_schema_content(xbrl_attachments.get('schema').content)
-        
-        if xbrl_attachments.get('label'):
-            xbrl.parser.parse_labels_content(xbrl_attachments.get('label').content)
-        
-        if xbrl_attachments.get('presentation'):
-            xbrl.parser.parse_presentation_content(xbrl_attachments.get('presentation').content)
-        
-        if xbrl_attachments.get('calculation'):
-            xbrl.parser.parse_calculation_content(xbrl_attachments.get('calculation').content)
-        
-        if xbrl_attachments.get('definition'):
-            xbrl.parser.parse_definition_content(xbrl_attachments.get('definition').content)
-        
-        if xbrl_attachments.get('instance'):
-            xbrl.parser.parse_instance_content(xbrl_attachments.get('instance').content)
-
+        # The content of each document is read when it is parsed
+        sources = {}
+        for part in XBRL_PARTS:
+            attachment = xbrl_attachments.get(part)
+            if attachment:
+                sources[part] = partial(getattr, attachment, 'content')
+        xbrl._load_parts(sources, parts, parallel)
         return xbrl
 
+    def _load_parts(self,
+                    sources: Dict[str, Callable[[], str]],
+                    parts: Optional[Iterable[str]] = None,
+                    parallel: bool = False):
+        """
+        Parse the requested XBRL documents and defer parsing the other linkbases until they are needed.
+
+        Args:
+            sources: document type -> function returning the document content
+            parts: The document types to parse now. All of them if None
+            parallel: Read and parse the documents in a thread pool
+        """
+        parts = set(XBRL_PARTS if parts is None else parts)
+        unknown_parts = parts - set(XBRL_PARTS)
+        if unknown_parts:
+            raise ValueError(f"Unknown XBRL parts {sorted(unknown_parts)}. Use one of {list(XBRL_PARTS)}")
+        if 'label' in parts:
+            # Labels are added to the elements declared in the schema so the schema is parsed first
+            parts.add('schema')
+        # The calculation weights are applied to the facts as the instance is parsed
+        parts.update(['instance', 'calculation'])
+
+        self._parallel = parallel
+        for part in LINKBASE_PARTS:
+            if part in sources and part not in parts:
+                self._deferred_parts[part] = sources[part]
+        self._parse_parts({part: source for part, source in sources.items() if part in parts})
+
+    def _parse_parts(self, sources: Dict[str, Callable[[], str]]):
+        """
+        Parse XBRL documents in dependency order - schema, labels, presentation, calculation, definition
+        and then the instance. In parallel mode the documents are read and parsed into lxml trees concurrently
+        first, lxml releases the GIL while parsing, and the parser structures are built from the trees in order.
+        """
+        contents: Dict[str, XmlContent] = {}
+        if self._parallel and len(sources) > 1:
+            def read_and_parse(part: str):
+                return parse_xml(sources[part](), huge_tree=part == 'instance')
+
+            with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+                contents = dict(zip(sources, executor.map(read_and_parse, sources)))
+
+        for part in XBRL_PARTS:
+            if part in sources:
+                self._parse_part(part, contents[part] if part in contents else sources[part]())
+
+    def _parse_part(self, part: str, content: XmlContent):
+        parse_content = {
+            'schema': self.parser.parse_schema_content,
+            'label': self.parser.parse_labels_content,
+            'presentation': self.parser.parse_presentation_content,
+            'calculation': self.parser.parse_calculation_content,
+            'definition': self.parser.parse_definition_content,
+            'instance': self.parser.parse_instance_content,
+        }[part]
+        parse_content(content)
+
+    @property
+    def deferred_parts(self) -> List[str]:
+        """The linkbases that have not been parsed yet"""
+        return list(self._deferred_parts)
+
+    def load_deferred_parts(self) -> None:
+        """
+        Parse the linkbases that were deferred when this XBRL was loaded with `parts`.
+        This is called automatically when a statement or presentation tree is needed
+        """
+        if not self._deferred_parts:
+            return
+        deferred_parts, self._deferred_parts = self._deferred_parts, {}
+        self._parse_parts(deferred_parts)
+
+        # Statements and facts built from the partial XBRL are out of date
+        self._all_statements_cached = None
+        self._statement_resolver = None
+        self._statement_cache.invalidate()
+        if hasattr(self, '_facts_view'):
+            self._facts_view.clear_cache()
+
     @property
     def statements(self):
         from edgar.xbrl.statements import Statements
@@ -352,6 +477,10 @@ class XBRL:
         # Return cached result if available
         if self._all_statements_cached is not None:
             return self._all_statements_cached
+
+        # Statements only need the presentation linkbase
+        if 'presentation' in self._deferred_parts:
+            self.load_deferred_parts()
             
         statements = []
 
@@ -362,7 +491,7 @@ class XBRL:
         self._statement_by_role_uri = {}
         self._statement_by_role_name = {}
         
-        for role, tree in self.presentation_trees.items():
+        for role, tree in self.parser.presentation_trees.items():
             # Check if this role appears to be a financial statement
             role_def = tree.definition.lower()
             statement_type = None
@@ -568,11 +697,17 @@ class XBRL:
             # Determine whether to display dimensions
             should_display_dimensions = self._is_dimension_display_statement(actual_statement_type, role_definition)
             
-        # Generate line items recursively
-        line_items = []
-        self._generate_line_items(root_id, tree.all_nodes, line_items, period_filter, None, should_display_dimensions)
-        
-        return line_items
+        def generate_line_items():
+            line_items = []
+            self._generate_line_items(root_id, tree.all_nodes, line_items, period_filter, None,
+                                      should_display_dimensions)
+            return line_items
+
+        # Generate line items recursively, or get them from the cache.
+        # Callers annotate and edit the items, so they get their own deep copies
+        line_items = self._statement_cache.get_or_compute(
+            'statement', (found_role, period_filter, should_display_dimensions), generate_line_items)
+        return copy.deepcopy(line_items)
     
     def _generate_line_items(self, element_id: str, nodes: Dict[str, PresentationNode], 
                             result: List[Dict[str, Any]], period_filter: Optional[str] = None, 
@@ -833,10 +968,8 @@ class XBRL:
             
         relevant_facts = {}
         
-        # Check each context
-        for context_id in self.contexts:
-            # Use parser's get_fact method which handles normalization internally
-            fact = self.parser.get_fact(element_name, context_id)
+        # Check the facts of the element, in context order
+        for context_id, fact in self.parser.get_element_facts(element_name):
             
             if fact:
                 # If period filter is specified, check if context matches period
@@ -951,7 +1084,8 @@ class XBRL:
         Returns:
             List of period view options with name, description, and period keys
         """
-        return get_period_views(self, statement_type)
+        return copy.deepcopy(self._statement_cache.get_or_compute('period_views', statement_type,
+                                                                  lambda: get_period_views(self, statement_type)))
         
     def get_statements_by_category(self, category: str) -> List[Dict[str, Any]]:
         """
@@ -990,6 +1124,12 @@ class XBRL:
                 - Found role URI (or None if not found)
                 - Actual statement type (may be different from input if matched by role/name)
         """
+        return copy.deepcopy(
+            self._statement_cache.get_or_compute('find_statement', (statement_type, is_parenthetical),
+                                                 lambda: self._find_statement(statement_type, is_parenthetical)))
+
+    def _find_statement(self, statement_type: str,
+                        is_parenthetical: bool = False) -> Tuple[List[Dict[str, Any]], Optional[str], str]:
         # Initialize statement resolver if not already done
         if self._statement_resolver is None:
             self._statement_resolver = StatementResolver(self)
@@ -1072,6 +1212,18 @@ class XBRL:
         Returns:
             RichTable: A formatted table representation of the statement
         """
+        return copy.deepcopy(self._statement_cache.get_or_compute(
+            'rendered',
+            (statement_type, period_filter, period_view, standard, show_date_range, parenthetical),
+            lambda: self._render_statement(statement_type, period_filter, period_view,
+                                           standard, show_date_range, parenthetical)))
+
+    def _render_statement(self, statement_type: str,
+                          period_filter: Optional[str],
+                          period_view: Optional[str],
+                          standard: bool,
+                          show_date_range: bool,
+                          parenthetical: bool) -> Optional[RenderedStatement]:
         # Find the statement using the unified statement finder with parenthetical support
         matching_statements, found_role, actual_statement_type = self.find_statement(statement_type, parenthetical)
         
@@ -1104,8 +1256,9 @@ class XBRL:
             statement_title = f"{statement_title} (Parenthetical)"
         
         # Get periods to display using the new periods module
-        periods_to_display = determine_periods_to_display(
-            self, actual_statement_type, period_filter, period_view
+        periods_to_display = self._statement_cache.get_or_compute(
+            'periods', (actual_statement_type, period_filter, period_view),
+            lambda: determine_periods_to_display(self, actual_statement_type, period_filter, period_view)
         )
         
         # Render the statement
@@ -1114,7 +1267,7 @@ class XBRL:
             periods_to_display,
             statement_title,
             actual_statement_type,
-            self.entity_info,
+            {**self.entity_info, 'xbrl_instance': self},
             standard,
             show_date_range
         )
@@ -1258,9 +1411,8 @@ class XBRL:
                         item['statement_type'] = stmt_type
                     
                     # Apply standardization
-                    from edgar.xbrl.standardization import ConceptMapper, initialize_default_mappings, standardize_statement
-                    mapper = ConceptMapper(initialize_default_mappings(read_only=True))
-                    statement_data = standardize_statement(statement_data, mapper)
+                    from edgar.xbrl.standardization import get_concept_mapper, standardize_statement
+                    statement_data = standardize_statement(statement_data, get_concept_mapper())
                 
                 # Create rows for the DataFrame
                 rows = []
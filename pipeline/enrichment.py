@@ -7,12 +7,18 @@ SEC filing information and save the enhanced alerts.
 
 import json
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from edgar.core import log
 from pipeline.polygon import get_alerts_path
 
+# The number of tickers enriched at the same time. The SEC requests of all the workers
+# wait for the same edgar throttler so together they stay within the SEC rate limit
+MAX_ENRICHMENT_WORKERS = 4
+
 
 def append_filing_context_to_alert(ticker: str, filings: List[Dict[str, Any]]) -> bool:
     """
@@ -55,7 +61,48 @@ def append_filing_context_to_alert(ticker: str, filings: List[Dict[str, Any]]) -
         return False
 
 
-def enrich_all_alerts_with_filings(tickers: List[str]) -> Dict[str, List[str]]:
+def enrich_tickers_concurrently(tickers: List[str],
+                                enrich: Callable[[str], Optional[str]],
+                                max_workers: int = MAX_ENRICHMENT_WORKERS) -> Tuple[List[Optional[str]], Dict[str, float]]:
+    """
+    Run the enrichment of each ticker in a pool of worker threads.
+    
+    Args:
+        tickers: List of ticker symbols to process
+        enrich: Function that enriches one ticker and returns an error message, or None if it succeeded
+        max_workers: Maximum number of tickers processed at the same time
+        
+    Returns:
+        The error message or None for each ticker in the order of the tickers,
+        and the seconds taken by each ticker
+    """
+    timings: Dict[str, float] = {}
+    
+    def timed_enrich(ticker: str) -> Optional[str]:
+        start = time.perf_counter()
+        try:
+            return enrich(ticker)
+        finally:
+            timings[ticker] = round(time.perf_counter() - start, 3)
+            log.info(f"Enriched {ticker} in {timings[ticker]:.2f}s")
+    
+    if max_workers <= 1 or len(tickers) <= 1:
+        outcomes = [timed_enrich(ticker) for ticker in tickers]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(tickers)),
+                                thread_name_prefix='enrichment') as executor:
+            outcomes = list(executor.map(timed_enrich, tickers))
+    return outcomes, timings
+
+
+def _log_slowest_tickers(timings: Dict[str, float], n: int = 5):
+    slowest = sorted(timings.items(), key=lambda item: item[1], reverse=True)[:n]
+    if slowest:
+        log.info("Slowest tickers: " + ", ".join(f"{ticker} {seconds:.2f}s" for ticker, seconds in slowest))
+
+
+def enrich_all_alerts_with_filings(tickers: List[str],
+                                   max_workers: int = MAX_ENRICHMENT_WORKERS) -> Dict[str, Any]:
     """
     For each ticker: fetch filings, score them, append to alert JSON.
     
@@ -65,19 +112,20 @@ def enrich_all_alerts_with_filings(tickers: List[str]) -> Dict[str, List[str]]:
     3. Create summaries
     4. Append to alert files
     
+    Tickers are processed concurrently by up to max_workers threads.
+    
     Args:
         tickers: List of ticker symbols to process
+        max_workers: Maximum number of tickers processed at the same time
         
     Returns:
-        Dictionary with 'success' and 'failed' ticker lists
+        Dictionary with 'success' and 'failed' ticker lists and the seconds per ticker in 'timings'
     """
     from pipeline.sec_filings import fetch_recent_filings, get_drop_date_from_alert
     from pipeline.scoring import rank_filings_by_relevance, get_top_n_relevant_filings
     from pipeline.summarizer import create_filing_summary
     
-    results = {'success': [], 'failed': []}
-    
-    for ticker in tickers:
+    def enrich(ticker: str) -> Optional[str]:
         try:
             log.info(f"Processing {ticker} for SEC filing context...")
             
@@ -89,8 +137,7 @@ def enrich_all_alerts_with_filings(tickers: List[str]) -> Dict[str, List[str]]:
                 log.info(f"No recent filings found for {ticker}")
                 # Still append empty context to maintain consistency
                 append_filing_context_to_alert(ticker, [])
-                results['success'].append(ticker)
-                continue
+                return None
             
             # Step 2: Get drop date from alert
             drop_date = get_drop_date_from_alert(ticker)
@@ -108,15 +155,19 @@ def enrich_all_alerts_with_filings(tickers: List[str]) -> Dict[str, List[str]]:
             success = append_filing_context_to_alert(ticker, summaries)
             
             if success:
-                results['success'].append(ticker)
                 log.info(f"✓ Enriched {ticker} with {len(summaries)} filing contexts")
-            else:
-                results['failed'].append(ticker)
-                log.error(f"✗ Failed to save enriched alert for {ticker}")
+                return None
+            log.error(f"✗ Failed to save enriched alert for {ticker}")
+            return "Failed to save enriched alert"
                 
         except Exception as e:
-            results['failed'].append(ticker)
             log.error(f"✗ Failed to enrich alerts for {ticker}: {e}")
+            return str(e)
+    
+    outcomes, timings = enrich_tickers_concurrently(tickers, enrich, max_workers=max_workers)
+    results = {'success': [], 'failed': [], 'timings': timings}
+    for ticker, error in zip(tickers, outcomes):
+        results['failed' if error else 'success'].append(ticker)
     
     # Log summary
     total = len(tickers)
@@ -124,6 +175,7 @@ def enrich_all_alerts_with_filings(tickers: List[str]) -> Dict[str, List[str]]:
     failed = len(results['failed'])
     
     log.info(f"SEC filing enrichment complete: {successful}/{total} successful, {failed} failed")
+    _log_slowest_tickers(timings)
     
     return results
 
@@ -251,7 +303,8 @@ def validate_filing_context_structure(context: List[Dict[str, Any]]) -> bool:
     return True
 
 
-def safe_enrich_all_alerts(tickers: List[str]) -> Dict[str, List[str]]:
+def safe_enrich_all_alerts(tickers: List[str],
+                           max_workers: int = MAX_ENRICHMENT_WORKERS) -> Dict[str, Any]:
     """
     Enrich alerts with comprehensive error handling and validation.
     
@@ -260,23 +313,20 @@ def safe_enrich_all_alerts(tickers: List[str]) -> Dict[str, List[str]]:
     - Handles partial failures gracefully
     - Provides detailed error reporting
     
+    Tickers are processed concurrently by up to max_workers threads.
+    
     Args:
         tickers: List of ticker symbols to process
+        max_workers: Maximum number of tickers processed at the same time
         
     Returns:
-        Dictionary with 'success', 'failed', and 'errors' keys
+        Dictionary with 'success', 'failed', 'errors' and 'timings' keys
     """
     from pipeline.sec_filings import fetch_recent_filings, get_drop_date_from_alert, FilingError
     from pipeline.scoring import rank_filings_by_relevance, get_top_n_relevant_filings
     from pipeline.summarizer import create_filing_summary
     
-    results = {
-        'success': [],
-        'failed': [],
-        'errors': {}
-    }
-    
-    for ticker in tickers:
+    def enrich(ticker: str) -> Optional[str]:
         try:
             log.info(f"Processing {ticker} for SEC filing context...")
             
@@ -285,19 +335,14 @@ def safe_enrich_all_alerts(tickers: List[str]) -> Dict[str, List[str]]:
                 # Increased days_back to 90 to ensure we capture relevant quarterly/annual filings
                 filings = fetch_recent_filings(ticker, days_back=90, form_types=['8-K', '10-Q', '10-K'])
             except FilingError as e:
-                results['failed'].append(ticker)
-                results['errors'][ticker] = f"Filing fetch failed: {e}"
-                continue
+                return f"Filing fetch failed: {e}"
             
             if not filings:
                 log.info(f"No recent filings found for {ticker}")
                 # Still append empty context to maintain consistency
                 if append_filing_context_to_alert(ticker, []):
-                    results['success'].append(ticker)
-                else:
-                    results['failed'].append(ticker)
-                    results['errors'][ticker] = "Failed to save empty context"
-                continue
+                    return None
+                return "Failed to save empty context"
             
             # Step 2: Get drop date from alert
             drop_date = get_drop_date_from_alert(ticker)
@@ -313,24 +358,33 @@ def safe_enrich_all_alerts(tickers: List[str]) -> Dict[str, List[str]]:
             
             # Step 6: Validate structure before saving
             if not validate_filing_context_structure(summaries):
-                results['failed'].append(ticker)
-                results['errors'][ticker] = "Invalid filing context structure"
-                continue
+                return "Invalid filing context structure"
             
             # Step 7: Append to alert file
             success = append_filing_context_to_alert(ticker, summaries)
             
             if success:
-                results['success'].append(ticker)
                 log.info(f"✓ Enriched {ticker} with {len(summaries)} filing contexts")
-            else:
-                results['failed'].append(ticker)
-                results['errors'][ticker] = "Failed to save enriched alert"
+                return None
+            return "Failed to save enriched alert"
                 
         except Exception as e:
-            results['failed'].append(ticker)
-            results['errors'][ticker] = f"Unexpected error: {e}"
             log.error(f"✗ Unexpected error for {ticker}: {e}")
+            return f"Unexpected error: {e}"
+    
+    outcomes, timings = enrich_tickers_concurrently(tickers, enrich, max_workers=max_workers)
+    results = {
+        'success': [],
+        'failed': [],
+        'errors': {},
+        'timings': timings
+    }
+    for ticker, error in zip(tickers, outcomes):
+        if error:
+            results['failed'].append(ticker)
+            results['errors'][ticker] = error
+        else:
+            results['success'].append(ticker)
     
     # Log summary
     total = len(tickers)
@@ -338,8 +392,9 @@ def safe_enrich_all_alerts(tickers: List[str]) -> Dict[str, List[str]]:
     failed = len(results['failed'])
     
     log.info(f"SEC filing enrichment complete: {successful}/{total} successful, {failed} failed")
+    _log_slowest_tickers(timings)
     
     if failed > 0:
         log.warning(f"Failed tickers: {', '.join(results['failed'])}")
     
-    return results
\ No newline at end of file
+    return results
@@ -9,6 +9,8 @@ Key Functions:
 - extract_wacc_components: Extract cost of equity, cost of debt, and capital structure
 - calculate_wacc: Calculate Weighted Average Cost of Capital with sensitivity analysis
 - calculate_spread: Calculate ROIC-WACC spread with trend analysis
+- extract_financials_batch: ROIC history and WACC components for many tickers from the
+  SEC company facts, falling back to the 10-K XBRL only when concepts are missing
 
 Formulas:
 - ROIC = NOPAT / Invested Capital
@@ -19,16 +21,23 @@ Formulas:
 - WACC = (E/V × Re) + (D/V × Rd × (1-Tc))
 """
 
-import json
 import logging
-from datetime import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
+import numpy as np
 import pandas as pd
-from dataclasses import dataclass, asdict
+import pyarrow as pa
+import pyarrow.compute as pc
+from dataclasses import dataclass, asdict, field
 
 from edgar.core import get_identity, set_identity
 from edgar.entity.core import Company
+from edgar.entity.facts import get_company_facts, NoCompanyFactsFound
+from edgar.reference.tickers import find_cik
+from pipeline.financial_cache import METADATA_KEYS, open_financial_cache
+from pipeline.profiler import record_cache_lookups
 
 log = logging.getLogger(__name__)
 
@@ -36,6 +45,27 @@ log = logging.getLogger(__name__)
 DEFAULT_RISK_FREE_RATE = 0.040  # 4.0% (10-year Treasury)
 DEFAULT_MARKET_RISK_PREMIUM = 0.055  # 5.5%
 DEFAULT_BETA = 1.0  # Market beta
+DEFAULT_TAX_RATE = 0.21  # Federal corporate tax rate
+DEFAULT_COST_OF_DEBT = 0.05
+
+# The us-gaap concepts of each value used from the company facts, in order of preference.
+# These are the concepts searched in the XBRL statements by extract_roic_history and extract_wacc_components
+FACT_CONCEPTS = {
+    'operating_income': ['OperatingIncomeLoss',
+                         'IncomeLossFromContinuingOperationsBeforeIncomeTaxesExtraordinaryItemsNoncontrollingInterest'],
+    'income_tax_expense': ['IncomeTaxExpenseBenefit'],
+    'income_before_tax': ['IncomeLossFromContinuingOperationsBeforeIncomeTaxesExtraordinaryItemsNoncontrollingInterest'],
+    'total_assets': ['Assets'],
+    'cash': ['CashAndCashEquivalentsAtCarryingValue', 'Cash'],
+    'current_liabilities': ['LiabilitiesCurrent'],
+    # ROIC prefers short-term borrowings and WACC prefers current debt, as in the XBRL extraction
+    'short_term_borrowings': ['ShortTermBorrowings', 'DebtCurrent'],
+    'debt_current': ['DebtCurrent', 'ShortTermBorrowings'],
+    'long_term_debt': ['LongTermDebt', 'LongTermDebtNoncurrent'],
+    'interest_expense': ['InterestExpense', 'InterestExpenseDebt'],
+    'stockholders_equity': ['StockholdersEquity',
+                            'StockholdersEquityIncludingPortionAttributableToNoncontrollingInterest'],
+}
 
 
 class FinancialDataError(Exception):
@@ -117,47 +147,97 @@ class SpreadResult:
         }
 
 
+def get_cache_directory() -> Path:
+    """Get the directory of the financial cache store and its JSON exports"""
+    return Path(__file__).parent.parent / "data"
+
+
 def get_cache_path(ticker: str) -> Path:
-    """Get the cache file path for a ticker"""
-    return Path(__file__).parent.parent / "data" / f"financial_cache_{ticker}.json"
+    """Get the JSON export of the cached financial data for a ticker"""
+    return get_cache_directory() / f"financial_cache_{ticker}.json"
 
 
-def load_from_cache(ticker: str) -> Optional[Dict]:
-    """Load cached financial data for a ticker"""
-    cache_path = get_cache_path(ticker)
-    if cache_path.exists():
-        try:
-            with open(cache_path, 'r') as f:
-                data = json.load(f)
-                # Check if cache is recent (within 90 days)
-                cache_date = datetime.fromisoformat(data.get('cache_date', '2000-01-01'))
-                days_old = (datetime.now() - cache_date).days
-                if days_old < 90:
-                    log.info(f"Loaded cached financial data for {ticker} ({days_old} days old)")
-                    return data
-                else:
-                    log.info(f"Cache for {ticker} is {days_old} days old, refreshing...")
-        except Exception as e:
-            log.warning(f"Failed to load cache for {ticker}: {e}")
-    return None
+def load_from_cache(ticker: str, accession: Optional[str] = None) -> Optional[Dict]:
+    """
+    Load the cached financial data for a ticker.
+    
+    Args:
+        ticker: Stock ticker symbol
+        accession: Accession number of the latest 10-K. Sections calculated from an older 10-K are not loaded
+    
+    Returns:
+        The fresh sections e.g. 'roic_history', or None if no section is fresh
+    """
+    try:
+        sections = open_financial_cache(get_cache_directory()).load(ticker, accession=accession)
+    except Exception as e:
+        log.warning(f"Failed to load cache for {ticker}: {e}")
+        return None
+    if not sections:
+        return None
+    log.info(f"Loaded cached financial data for {ticker} ({', '.join(sections)})")
+    return sections
 
 
-def save_to_cache(ticker: str, data: Dict) -> None:
-    """Save financial data to cache"""
-    cache_path = get_cache_path(ticker)
-    cache_path.parent.mkdir(parents=True, exist_ok=True)
+def load_many_from_cache(tickers: List[str], accessions: Optional[Dict[str, str]] = None) -> Dict[str, Dict]:
+    """
+    Load the cached financial data for many tickers in one read of the cache store.
     
-    data['cache_date'] = datetime.now().isoformat()
-    data['ticker'] = ticker
+    Args:
+        tickers: Stock ticker symbols
+        accessions: Accession number of the latest 10-K of each ticker, when known
     
+    Returns:
+        The fresh sections of each ticker that has any
+    """
     try:
-        with open(cache_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        return open_financial_cache(get_cache_directory()).load_many(tickers, accessions=accessions)
+    except Exception as e:
+        log.warning(f"Failed to load cache for {len(tickers)} tickers: {e}")
+        return {}
+
+
+def save_to_cache(ticker: str, data: Dict, accession: Optional[str] = None) -> None:
+    """
+    Save sections of financial data to the cache. Sections not in `data` are kept as they are.
+    
+    Args:
+        ticker: Stock ticker symbol
+        data: The sections to save e.g. {'roic_history': {...}}
+        accession: Accession number of the latest 10-K the sections were calculated from
+    """
+    sections = {section: value for section, value in data.items() if section not in METADATA_KEYS}
+    try:
+        open_financial_cache(get_cache_directory()).save(ticker, sections, accession=accession)
         log.info(f"Saved financial data to cache for {ticker}")
     except Exception as e:
         log.warning(f"Failed to save cache for {ticker}: {e}")
 
 
+def get_latest_10k_accessions(tickers: List[str], max_workers: int = 4) -> Dict[str, str]:
+    """
+    Get the accession number of the latest 10-K of each ticker, which is what the cached sections are keyed by.
+    
+    Args:
+        tickers: Stock ticker symbols
+        max_workers: Maximum number of companies loaded at the same time
+    
+    Returns:
+        The accession number of each ticker with a 10-K
+    """
+    def latest_accession(ticker: str) -> Optional[str]:
+        try:
+            latest_10k = Company(ticker).get_filings(form='10-K', trigger_full_load=False).latest()
+            return latest_10k.accession_no if latest_10k else None
+        except Exception as e:
+            log.warning(f"Could not get the latest 10-K of {ticker}: {e}")
+            return None
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tickers) or 1))) as executor:
+        accessions = dict(zip(tickers, executor.map(latest_accession, tickers)))
+    return {ticker: accession for ticker, accession in accessions.items() if accession}
+
+
 def extract_xbrl_value(statement: Any, concepts: List[str], period: str = None) -> Optional[float]:
     """
     Extract a value from an XBRL statement by trying multiple concept names.
@@ -228,7 +308,7 @@ def extract_xbrl_value(statement: Any, concepts: List[str], period: str = None)
         return None
 
 
-def extract_roic_history(ticker: str, years: int = 5) -> ROICData:
+def extract_roic_history(ticker: str, years: int = 5, latest_accession: Optional[str] = None) -> ROICData:
     """
     Extract historical ROIC (Return on Invested Capital) for a ticker.
     
@@ -243,6 +323,7 @@ def extract_roic_history(ticker: str, years: int = 5) -> ROICData:
     Args:
         ticker: Stock ticker symbol
         years: Number of years of history to extract (default: 5)
+        latest_accession: Accession number of the latest 10-K, so a cached history from an older 10-K is not used
     
     Returns:
         ROICData object with years, ROIC values, NOPAT, and Invested Capital
@@ -251,8 +332,10 @@ def extract_roic_history(ticker: str, years: int = 5) -> ROICData:
         InsufficientDataError: If unable to extract minimum required data
     """
     # Check cache first
-    cache = load_from_cache(ticker)
-    if cache and 'roic_history' in cache:
+    cache = load_from_cache(ticker, accession=latest_accession)
+    cache_hit = bool(cache and 'roic_history' in cache)
+    record_cache_lookups('financial_cache.roic_history', hits=int(cache_hit), misses=int(not cache_hit))
+    if cache_hit:
         cached_roic = cache['roic_history']
         return ROICData(
             years=cached_roic['years'],
@@ -418,9 +501,7 @@ def extract_roic_history(ticker: str, years: int = 5) -> ROICData:
         )
         
         # Cache the result
-        cache_data = cache or {}
-        cache_data['roic_history'] = result.to_dict()
-        save_to_cache(ticker, cache_data)
+        save_to_cache(ticker, {'roic_history': result.to_dict()}, accession=latest_accession)
         
         return result
         
@@ -434,7 +515,8 @@ def extract_wacc_components(
     ticker: str,
     risk_free_rate: Optional[float] = None,
     market_risk_premium: Optional[float] = None,
-    beta: Optional[float] = None
+    beta: Optional[float] = None,
+    latest_accession: Optional[str] = None
 ) -> WACCComponents:
     """
     Extract components needed for WACC calculation.
@@ -459,6 +541,7 @@ def extract_wacc_components(
         risk_free_rate: Override for risk-free rate (default: 4.0%)
         market_risk_premium: Override for market risk premium (default: 5.5%)
         beta: Override for beta (default: 1.0)
+        latest_accession: Accession number of the latest 10-K, so cached components from an older 10-K are not used
     
     Returns:
         WACCComponents object with all necessary data
@@ -467,8 +550,10 @@ def extract_wacc_components(
         FinancialDataError: If unable to extract required data
     """
     # Check cache first
-    cache = load_from_cache(ticker)
-    if cache and 'wacc_components' in cache:
+    cache = load_from_cache(ticker, accession=latest_accession)
+    cache_hit = bool(cache and 'wacc_components' in cache)
+    record_cache_lookups('financial_cache.wacc_components', hits=int(cache_hit), misses=int(not cache_hit))
+    if cache_hit:
         cached_wacc = cache['wacc_components']
         return WACCComponents(**cached_wacc)
     
@@ -596,9 +681,7 @@ def extract_wacc_components(
         )
         
         # Cache the result
-        cache_data = cache or {}
-        cache_data['wacc_components'] = result.to_dict()
-        save_to_cache(ticker, cache_data)
+        save_to_cache(ticker, {'wacc_components': result.to_dict()}, accession=latest_accession)
         
         return result
         
@@ -611,7 +694,8 @@ def extract_wacc_components(
 def calculate_wacc(
     ticker: str,
     overrides: Optional[Dict[str, float]] = None,
-    sensitivity: bool = False
+    sensitivity: bool = False,
+    latest_accession: Optional[str] = None
 ) -> WACCResult:
     """
     Calculate Weighted Average Cost of Capital (WACC).
@@ -630,6 +714,7 @@ def calculate_wacc(
         ticker: Stock ticker symbol
         overrides: Optional dict with overrides for 'risk_free_rate', 'market_risk_premium', 'beta'
         sensitivity: If True, calculate pessimistic and optimistic scenarios (±100bps to risk-free rate)
+        latest_accession: Accession number of the latest 10-K
     
     Returns:
         WACCResult object with baseline WACC, scenarios, and component breakdown
@@ -645,7 +730,8 @@ def calculate_wacc(
             ticker,
             risk_free_rate=overrides.get('risk_free_rate'),
             market_risk_premium=overrides.get('market_risk_premium'),
-            beta=overrides.get('beta')
+            beta=overrides.get('beta'),
+            latest_accession=latest_accession
         )
         
         # Calculate baseline WACC
@@ -687,7 +773,7 @@ def calculate_wacc(
         raise FinancialDataError(f"Failed to calculate WACC for {ticker}: {e}")
 
 
-def calculate_spread(ticker: str, years: int = 5) -> SpreadResult:
+def calculate_spread(ticker: str, years: int = 5, latest_accession: Optional[str] = None) -> SpreadResult:
     """
     Calculate ROIC-WACC spread with trend analysis.
     
@@ -705,6 +791,7 @@ def calculate_spread(ticker: str, years: int = 5) -> SpreadResult:
     Args:
         ticker: Stock ticker symbol
         years: Number of years of history to analyze (default: 5)
+        latest_accession: Accession number of the latest 10-K
     
     Returns:
         SpreadResult object with current spread, history, trend, and durability
@@ -714,10 +801,10 @@ def calculate_spread(ticker: str, years: int = 5) -> SpreadResult:
     """
     try:
         # Get ROIC history
-        roic_data = extract_roic_history(ticker, years)
+        roic_data = extract_roic_history(ticker, years, latest_accession=latest_accession)
         
         # Calculate WACC
-        wacc_result = calculate_wacc(ticker, sensitivity=True)
+        wacc_result = calculate_wacc(ticker, sensitivity=True, latest_accession=latest_accession)
         
         # Calculate spreads for each year
         spread_history = [roic - wacc_result.baseline_wacc for roic in roic_data.roic_values]
@@ -757,9 +844,7 @@ def calculate_spread(ticker: str, years: int = 5) -> SpreadResult:
         log.info(f"Calculated spread for {ticker}: {current_spread:.2%} ({durability}, {spread_trend})")
         
         # Cache the full result
-        cache_data = load_from_cache(ticker) or {}
-        cache_data['spread_result'] = result.to_dict()
-        save_to_cache(ticker, cache_data)
+        save_to_cache(ticker, {'spread_result': result.to_dict()}, accession=latest_accession)
         
         return result
         
@@ -767,11 +852,301 @@ def calculate_spread(ticker: str, years: int = 5) -> SpreadResult:
         raise FinancialDataError(f"Failed to calculate spread for {ticker}: {e}")
 
 
+@dataclass
+class BatchFinancials:
+    """ROIC history and WACC components of many tickers, with where each came from"""
+    roic: Dict[str, ROICData] = field(default_factory=dict)
+    wacc_components: Dict[str, WACCComponents] = field(default_factory=dict)
+    sources: Dict[str, str] = field(default_factory=dict)  # 'cache', 'companyfacts' or 'xbrl'
+    failed: Dict[str, str] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)  # seconds per stage
+
+
+def load_annual_facts(ciks: Dict[str, int], max_workers: int = 4) -> Tuple[pd.DataFrame, Dict[str, str]]:
+    """
+    Load the company facts of each ticker and keep the 10-K facts of the concepts in FACT_CONCEPTS.
+    
+    The company facts are one request per company for every fact the company ever reported.
+    The requests of the workers share the edgar throttler so they stay within the SEC rate limit.
+    
+    Args:
+        ciks: The CIK of each ticker
+        max_workers: Maximum number of company facts downloaded at the same time
+    
+    Returns:
+        The facts of all the tickers with a ticker column, and the error for each ticker that could not be loaded
+    """
+    concepts = pa.array(sorted({concept for concepts in FACT_CONCEPTS.values() for concept in concepts}))
+    
+    def load(ticker: str, cik: int) -> Tuple[str, Optional[pd.DataFrame], Optional[str]]:
+        try:
+            company_facts = get_company_facts(cik)
+            if company_facts is None:
+                return ticker, None, f"No company facts for {ticker}"
+            facts = company_facts.facts
+            # Filter the Arrow table before converting so only the facts that are used become pandas rows
+            mask = pc.and_(pc.and_(pc.equal(facts['namespace'], 'us-gaap'), pc.is_in(facts['fact'], concepts)),
+                           pc.equal(facts['form'], '10-K'))
+            return ticker, facts.filter(mask).to_pandas().assign(ticker=ticker), None
+        except NoCompanyFactsFound:
+            return ticker, None, f"No company facts for {ticker}"
+        except Exception as e:
+            return ticker, None, f"Failed to load company facts for {ticker}: {e}"
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(ciks) or 1))) as executor:
+        results = list(executor.map(load, ciks.keys(), ciks.values()))
+    
+    frames = [df for _, df, _ in results if df is not None and not df.empty]
+    errors = {ticker: error for ticker, _, error in results if error}
+    columns = ['ticker', 'fact', 'val', 'accn', 'start', 'end', 'fy', 'fp', 'form', 'filed']
+    if not frames:
+        return pd.DataFrame(columns=columns), errors
+    return pd.concat(frames, ignore_index=True), errors
+
+
+def annual_report_values(facts: pd.DataFrame) -> pd.DataFrame:
+    """
+    Get the values of each 10-K for the fiscal year it reports.
+    
+    A 10-K also reports the prior years as comparatives, so the facts of each 10-K are limited to the
+    latest period end of the 10-K and, for income statement facts, to a period of about a year.
+    
+    Returns:
+        One row per ticker and 10-K with ticker, accn, filed and year columns and a column per value in FACT_CONCEPTS
+    """
+    if facts.empty:
+        return pd.DataFrame(columns=['ticker', 'accn', 'filed', 'year', *FACT_CONCEPTS])
+    facts = facts.dropna(subset=['val'])
+    end = pd.to_datetime(facts['end'], errors='coerce')
+    start = pd.to_datetime(facts['start'], errors='coerce') if 'start' in facts else pd.Series(pd.NaT, index=facts.index)
+    period_end = end.groupby([facts['ticker'], facts['accn']]).transform('max')
+    duration = (end - start).dt.days
+    current = (end == period_end) & (start.isna() | duration.between(350, 380))
+    facts = facts[current]
+    
+    concept_values = facts.pivot_table(index=['ticker', 'accn', 'filed'], columns='fact', values='val',
+                                       aggfunc='first')
+    values = pd.DataFrame(index=concept_values.index)
+    for name, concepts in FACT_CONCEPTS.items():
+        available = [concept for concept in concepts if concept in concept_values.columns]
+        # The first concept with a value, in order of preference
+        values[name] = concept_values[available].bfill(axis=1).iloc[:, 0] if available else np.nan
+    values = values.reset_index()
+    values['year'] = pd.to_datetime(values['filed']).dt.year
+    return values.sort_values(['ticker', 'filed']).reset_index(drop=True)
+
+
+def _tax_rates(income_tax_expense: pd.Series, income_before_tax: pd.Series) -> pd.Series:
+    """The effective tax rates, or the default tax rate where they cannot be calculated or are not between 0 and 50%"""
+    tax_rate = (income_tax_expense / income_before_tax).abs()
+    valid = (income_tax_expense.fillna(0) != 0) & (income_before_tax.fillna(0) != 0) & (tax_rate <= 0.5)
+    return tax_rate.where(valid, DEFAULT_TAX_RATE)
+
+
+def compute_roic_table(values: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calculate NOPAT, Invested Capital and ROIC for every row of `annual_report_values` at once,
+    with the same formulas and defaults as extract_roic_history.
+    
+    Rows without operating income or total assets, or without positive invested capital, have a missing ROIC.
+    """
+    result = values.copy()
+    result['tax_rate'] = _tax_rates(values['income_tax_expense'], values['income_before_tax'])
+    result['nopat'] = values['operating_income'] * (1 - result['tax_rate'])
+    non_interest_liabilities = (values['current_liabilities'].fillna(0)
+                                - values['short_term_borrowings'].fillna(0)).clip(lower=0)
+    result['invested_capital'] = values['total_assets'] - values['cash'].fillna(0) - non_interest_liabilities
+    valid = result['nopat'].notna() & (result['invested_capital'] > 0)
+    result['roic'] = (result['nopat'] / result['invested_capital']).where(valid)
+    return result
+
+
+def compute_wacc_components_table(values: pd.DataFrame,
+                                  risk_free_rate: Optional[float] = None,
+                                  market_risk_premium: Optional[float] = None,
+                                  beta: Optional[float] = None) -> pd.DataFrame:
+    """
+    Calculate the WACC components for every row of `annual_report_values` at once,
+    with the same formulas and defaults as extract_wacc_components.
+    
+    Rows without positive stockholders equity have missing ratios.
+    """
+    rf = risk_free_rate if risk_free_rate is not None else DEFAULT_RISK_FREE_RATE
+    mrp = market_risk_premium if market_risk_premium is not None else DEFAULT_MARKET_RISK_PREMIUM
+    b = beta if beta is not None else DEFAULT_BETA
+    
+    result = values[['ticker', 'accn', 'filed', 'year']].copy()
+    total_debt = values['debt_current'].fillna(0) + values['long_term_debt'].fillna(0)
+    cost_of_debt = values['interest_expense'].abs() / total_debt.where(total_debt > 0)
+    valid_cost_of_debt = (values['interest_expense'].fillna(0) != 0) & (cost_of_debt <= 0.20)
+    result['cost_of_debt'] = cost_of_debt.where(valid_cost_of_debt, DEFAULT_COST_OF_DEBT)
+    result['tax_rate'] = _tax_rates(values['income_tax_expense'], values['income_before_tax'])
+    
+    total_equity = values['stockholders_equity'].where(values['stockholders_equity'] > 0)
+    total_capital = total_equity + total_debt
+    result['total_debt'] = total_debt
+    result['total_equity'] = total_equity
+    result['equity_ratio'] = total_equity / total_capital
+    result['debt_ratio'] = total_debt / total_capital
+    result['cost_of_equity'] = rf + b * mrp
+    result['risk_free_rate'] = rf
+    result['beta'] = b
+    result['market_risk_premium'] = mrp
+    return result
+
+
+def extract_financials_batch(tickers: List[str],
+                             years: int = 5,
+                             risk_free_rate: Optional[float] = None,
+                             market_risk_premium: Optional[float] = None,
+                             beta: Optional[float] = None,
+                             fallback_to_xbrl: bool = True,
+                             use_cache: bool = True,
+                             max_workers: int = 4,
+                             latest_accessions: Optional[Dict[str, str]] = None) -> BatchFinancials:
+    """
+    Extract the ROIC history and WACC components of many tickers from the SEC company facts.
+    
+    The company facts of a ticker are a single request with every fact from every 10-K, so this replaces
+    downloading and parsing the XBRL of up to `years` 10-Ks per ticker. The values of all the tickers are
+    calculated together in pandas. Tickers whose company facts are missing the concepts needed fall back to
+    extract_roic_history and extract_wacc_components, which read the 10-K XBRL.
+    
+    The results are saved to the financial cache so calculate_spread uses them.
+    
+    Args:
+        tickers: Stock ticker symbols
+        years: Number of years of ROIC history (at least 3 are needed)
+        risk_free_rate: Override for risk-free rate (default: 4.0%)
+        market_risk_premium: Override for market risk premium (default: 5.5%)
+        beta: Override for beta (default: 1.0)
+        fallback_to_xbrl: Use the 10-K XBRL for the tickers that the company facts cannot answer
+        use_cache: Use and update the cached ROIC history and WACC components
+        max_workers: Maximum number of company facts downloaded at the same time
+        latest_accessions: Accession number of the latest 10-K of each ticker, so cached values from an older
+            10-K are not used
+    
+    Returns:
+        BatchFinancials with the ROIC history and WACC components of each ticker
+    """
+    result = BatchFinancials()
+    latest_accessions = dict(latest_accessions or {})
+    
+    start = time.perf_counter()
+    caches = load_many_from_cache(tickers, accessions=latest_accessions) if use_cache else {}
+    if use_cache:
+        for section in ['roic_history', 'wacc_components']:
+            hits = sum(1 for ticker in tickers if section in caches.get(ticker, {}))
+            record_cache_lookups(f'financial_cache.{section}', hits=hits, misses=len(tickers) - hits)
+    pending = []
+    for ticker in tickers:
+        cache = caches.get(ticker)
+        if cache and 'roic_history' in cache and 'wacc_components' in cache:
+            result.roic[ticker] = ROICData(**cache['roic_history'])
+            result.wacc_components[ticker] = WACCComponents(**cache['wacc_components'])
+            result.sources[ticker] = 'cache'
+        else:
+            pending.append(ticker)
+    result.timings['cache'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    ciks = {}
+    for ticker in pending:
+        cik = find_cik(ticker)
+        if cik is None:
+            result.failed[ticker] = f"Unknown ticker {ticker}"
+        else:
+            ciks[ticker] = cik
+    pending = list(ciks)
+    facts, load_errors = load_annual_facts(ciks, max_workers=max_workers)
+    result.timings['load_facts'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    values = annual_report_values(facts)
+    roic_table = compute_roic_table(values)
+    latest_reports = values.groupby('ticker').tail(1)
+    for ticker, accession in zip(latest_reports['ticker'], latest_reports['accn']):
+        latest_accessions.setdefault(ticker, accession)
+    wacc_table = compute_wacc_components_table(latest_reports, risk_free_rate=risk_free_rate,
+                                               market_risk_premium=market_risk_premium, beta=beta)
+    
+    # ROIC of the latest `years` 10-Ks of each ticker, skipping the 10-Ks without the values needed
+    latest_roic = roic_table.groupby('ticker').tail(years)
+    latest_roic = latest_roic[latest_roic['roic'].notna()].drop_duplicates(['ticker', 'year'], keep='last')
+    for ticker, rows in latest_roic.groupby('ticker', sort=False):
+        if len(rows) >= 3:
+            result.roic[ticker] = ROICData(years=[int(year) for year in rows['year']],
+                                           roic_values=[float(value) for value in rows['roic']],
+                                           nopat_values=[float(value) for value in rows['nopat']],
+                                           invested_capital_values=[float(value) for value in rows['invested_capital']])
+    for row in wacc_table[wacc_table['equity_ratio'].notna()].itertuples(index=False):
+        result.wacc_components[row.ticker] = WACCComponents(
+            cost_of_equity=float(row.cost_of_equity),
+            cost_of_debt=float(row.cost_of_debt),
+            tax_rate=float(row.tax_rate),
+            debt_ratio=float(row.debt_ratio),
+            equity_ratio=float(row.equity_ratio),
+            total_debt=float(row.total_debt),
+            total_equity=float(row.total_equity),
+            risk_free_rate=float(row.risk_free_rate),
+            beta=float(row.beta),
+            market_risk_premium=float(row.market_risk_premium)
+        )
+    result.timings['compute'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for ticker in pending:
+        missing = [name for name, values in [('ROIC history', result.roic), ('WACC components', result.wacc_components)]
+                   if ticker not in values]
+        if not missing:
+            result.sources[ticker] = 'companyfacts'
+            continue
+        if not fallback_to_xbrl:
+            result.failed[ticker] = load_errors.get(ticker, f"Company facts are missing the {' and '.join(missing)}")
+            continue
+        log.info(f"Company facts are missing the {' and '.join(missing)} for {ticker}. Using the 10-K XBRL")
+        try:
+            if ticker not in result.roic:
+                result.roic[ticker] = extract_roic_history(ticker, years,
+                                                           latest_accession=latest_accessions.get(ticker))
+            if ticker not in result.wacc_components:
+                result.wacc_components[ticker] = extract_wacc_components(ticker, risk_free_rate=risk_free_rate,
+                                                                         market_risk_premium=market_risk_premium,
+                                                                         beta=beta,
+                                                                         latest_accession=latest_accessions.get(ticker))
+            result.sources[ticker] = 'xbrl'
+        except FinancialDataError as e:
+            result.failed[ticker] = str(e)
+            result.roic.pop(ticker, None)
+            result.wacc_components.pop(ticker, None)
+    result.timings['xbrl_fallback'] = time.perf_counter() - start
+    
+    if use_cache:
+        for ticker in pending:
+            if ticker in result.roic and ticker in result.wacc_components:
+                save_to_cache(ticker, {'roic_history': result.roic[ticker].to_dict(),
+                                       'wacc_components': result.wacc_components[ticker].to_dict()},
+                              accession=latest_accessions.get(ticker))
+    
+    sources = pd.Series(result.sources).value_counts().to_dict()
+    log.info(f"Extracted financials for {len(tickers) - len(result.failed)}/{len(tickers)} tickers {sources} in "
+             + ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in result.timings.items()))
+    return result
+
+
 __all__ = [
     'extract_roic_history',
     'extract_wacc_components',
     'calculate_wacc',
     'calculate_spread',
+    'extract_financials_batch',
+    'get_latest_10k_accessions',
+    'load_many_from_cache',
+    'load_annual_facts',
+    'annual_report_values',
+    'compute_roic_table',
+    'compute_wacc_components_table',
+    'BatchFinancials',
     'ROICData',
     'WACCComponents',
     'WACCResult',
@@ -0,0 +1,222 @@
+"""
+Financial cache store for the financial analyzer.
+
+The cached sections of every ticker (ROIC history, WACC components and spread result) are kept in one
+SQLite database, `financial_cache.sqlite`, with a row per ticker and section. Each section has its own
+cached time and the accession number of the latest 10-K it was calculated from, so a section is stale when
+it is older than its TTL or when a newer 10-K has been filed.
+
+Writes are transactions, so workers saving different sections of the same ticker at the same time do not
+overwrite each other. After each write the sections of the ticker are exported to
+`financial_cache_{ticker}.json` next to the database for the dashboard and the deploy, replacing the file
+atomically. The first time the store is opened in a directory the existing JSON files are imported.
+
+```
+cache = open_financial_cache(data_directory)
+cache.save('AAPL', {'roic_history': roic.to_dict()}, accession='0000320193-24-000123')
+sections = cache.load_many(['AAPL', 'MSFT'], accessions={'AAPL': '0000320193-24-000123'})
+```
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+log = logging.getLogger(__name__)
+
+__all__ = ['FinancialCache', 'open_financial_cache', 'SECTION_TTLS', 'DEFAULT_TTL', 'CACHE_STORE_NAME']
+
+CACHE_STORE_NAME = "financial_cache.sqlite"
+DEFAULT_TTL = timedelta(days=90)
+# How long each section stays fresh when no newer 10-K has been filed.
+# The WACC components and the spread include market assumptions, so they are refreshed more often
+SECTION_TTLS = {
+    'roic_history': timedelta(days=90),
+    'wacc_components': timedelta(days=30),
+    'spread_result': timedelta(days=30),
+}
+# Keys of the JSON exports that are not sections
+METADATA_KEYS = ('cache_date', 'ticker', 'cache_sections')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS financial_cache (
+    ticker TEXT NOT NULL,
+    section TEXT NOT NULL,
+    data TEXT NOT NULL,
+    accession TEXT,
+    cached_at TEXT NOT NULL,
+    PRIMARY KEY (ticker, section)
+) WITHOUT ROWID
+"""
+
+# Tickers per query when loading many, below the SQLite limit on query parameters
+QUERY_BATCH_SIZE = 500
+
+
+class FinancialCache:
+    """
+    The cached financial data of every ticker in a directory, in one SQLite database
+    """
+
+    def __init__(self, directory: Path, ttls: Optional[Dict[str, timedelta]] = None):
+        self.directory = Path(directory)
+        self.path = self.directory / CACHE_STORE_NAME
+        self.ttls = {**SECTION_TTLS, **(ttls or {})}
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def export_path(self, ticker: str) -> Path:
+        """The JSON export of a ticker e.g. data/financial_cache_AAPL.json"""
+        return self.directory / f"financial_cache_{ticker}.json"
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection per call so the store can be used from many threads.
+        # The timeout is how long a write waits for another writer to commit
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def _initialize(self, create: bool) -> bool:
+        """Create the database the first time, importing the JSON files. False if there is no database to read"""
+        if self._initialized:
+            return True
+        with self._lock:
+            if self._initialized:
+                return True
+            if not self.path.exists():
+                legacy_files = sorted(self.directory.glob("financial_cache_*.json"))
+                if not create and not legacy_files:
+                    return False
+                self.directory.mkdir(parents=True, exist_ok=True)
+                with closing(self._connect()) as connection:
+                    connection.execute("PRAGMA journal_mode=WAL")
+                    connection.execute(SCHEMA)
+                    imported = self._import_json_files(connection, legacy_files)
+                if imported:
+                    log.info(f"Imported the financial cache of {imported} tickers into {self.path}")
+            else:
+                with closing(self._connect()) as connection:
+                    connection.execute(SCHEMA)
+            self._initialized = True
+            return True
+
+    def _import_json_files(self, connection: sqlite3.Connection, files: List[Path]) -> int:
+        imported = 0
+        for file in files:
+            try:
+                data = json.loads(file.read_text())
+                ticker = data.get('ticker') or file.stem[len("financial_cache_"):]
+                # Exports have the cached time and accession of each section, older files one date for all sections
+                metadata = data.get('cache_sections', {})
+                rows = [(ticker, section, json.dumps(value),
+                         metadata.get(section, {}).get('accession'),
+                         metadata.get(section, {}).get('cached_at') or data.get('cache_date', '2000-01-01'))
+                        for section, value in data.items()
+                        if section not in METADATA_KEYS and isinstance(value, dict)]
+            except (OSError, ValueError, AttributeError) as e:
+                log.warning(f"Could not import the financial cache file {file}: {e}")
+                continue
+            connection.executemany("INSERT OR IGNORE INTO financial_cache VALUES (?, ?, ?, ?, ?)", rows)
+            imported += 1
+        return imported
+
+    def is_fresh(self, section: str, cached_at: str, cached_accession: Optional[str],
+                 accession: Optional[str] = None, now: Optional[datetime] = None) -> bool:
+        """
+        Whether a cached section can be used. A section is stale when it is older than the TTL of the section,
+        or when it was calculated from a different 10-K than the latest accession.
+        Sections cached without an accession are only checked against the TTL
+        """
+        if accession and cached_accession and accession != cached_accession:
+            return False
+        age = (now or datetime.now()) - datetime.fromisoformat(cached_at)
+        return age < self.ttls.get(section, DEFAULT_TTL)
+
+    def load_many(self, tickers: Iterable[str],
+                  accessions: Optional[Dict[str, str]] = None) -> Dict[str, Dict[str, dict]]:
+        """
+        Load the fresh sections of many tickers with one query per batch of tickers.
+
+        :param tickers: The tickers to load
+        :param accessions: The accession number of the latest 10-K of each ticker, when known
+        :return: The fresh sections of each ticker that has any
+        """
+        tickers = list(dict.fromkeys(tickers))
+        accessions = accessions or {}
+        if not tickers or not self._initialize(create=False):
+            return {}
+        now = datetime.now()
+        result: Dict[str, Dict[str, dict]] = {}
+        with closing(self._connect()) as connection:
+            for index in range(0, len(tickers), QUERY_BATCH_SIZE):
+                batch = tickers[index:index + QUERY_BATCH_SIZE]
+                rows = connection.execute(
+                    "SELECT ticker, section, data, accession, cached_at FROM financial_cache "
+                    f"WHERE ticker IN ({', '.join('?' * len(batch))})", batch)
+                for ticker, section, data, cached_accession, cached_at in rows:
+                    if self.is_fresh(section, cached_at, cached_accession, accessions.get(ticker), now=now):
+                        result.setdefault(ticker, {})[section] = json.loads(data)
+        return result
+
+    def load(self, ticker: str, accession: Optional[str] = None) -> Dict[str, dict]:
+        """Load the fresh sections of a ticker"""
+        return self.load_many([ticker], {ticker: accession} if accession else None).get(ticker, {})
+
+    def save(self, ticker: str, sections: Dict[str, dict], accession: Optional[str] = None) -> None:
+        """
+        Save sections of a ticker, leaving its other sections as they are, and export the ticker to JSON.
+
+        :param ticker: The ticker
+        :param sections: The sections to save e.g. {'roic_history': {...}}
+        :param accession: The accession number of the latest 10-K the sections were calculated from
+        """
+        self._initialize(create=True)
+        cached_at = datetime.now().isoformat()
+        with closing(self._connect()) as connection:
+            # Take the write lock first so the export has every section committed before it
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.executemany(
+                    "INSERT INTO financial_cache VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (ticker, section) DO UPDATE SET "
+                    "data = excluded.data, accession = excluded.accession, cached_at = excluded.cached_at",
+                    [(ticker, section, json.dumps(value), accession, cached_at) for section, value in sections.items()])
+                self._export(connection, ticker)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def _export(self, connection: sqlite3.Connection, ticker: str) -> None:
+        """Write all the sections of a ticker to its JSON file, replacing the file when it is complete"""
+        rows = connection.execute(
+            "SELECT section, data, accession, cached_at FROM financial_cache WHERE ticker = ? ORDER BY section",
+            (ticker,)).fetchall()
+        export = {section: json.loads(data) for section, data, _, _ in rows}
+        export['cache_sections'] = {section: {'cached_at': cached_at, 'accession': accession}
+                                    for section, _, accession, cached_at in rows}
+        export['cache_date'] = max(cached_at for _, _, _, cached_at in rows)
+        export['ticker'] = ticker
+
+        export_path = self.export_path(ticker)
+        temporary_path = export_path.with_name(f"{export_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            temporary_path.write_text(json.dumps(export, indent=2))
+            os.replace(temporary_path, export_path)
+        except BaseException:
+            temporary_path.unlink(missing_ok=True)
+            raise
+
+    def __repr__(self):
+        return f"FinancialCache({self.path})"
+
+
+@lru_cache(maxsize=8)
+def open_financial_cache(directory: Path) -> FinancialCache:
+    """The financial cache of a directory, shared by every caller so it is only initialized once"""
+    return FinancialCache(directory)
@@ -8,7 +8,9 @@ manage state persistence, and handle errors gracefully.
 import json
 import logging
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional, List, Dict, Any
@@ -16,8 +18,10 @@ from typing import Optional, List, Dict, Any
 import httpx
 
 from edgar.core import log
+from edgar.httpclient import response_event_hooks
+from pipeline.profiler import record_cache_lookups, record_ticker_time
 
-__all__ = ['fetch_aapl_prices', 'fetch_aapl_last_7_days', 'get_prices_state', 'save_prices_state', 'PolygonAPIError', 'get_prices_state_path', 'detect_price_drop_alert', 'get_alerts_path', 'save_alerts', 'get_last_5_working_days', 'fetch_last_5_working_days_prices']
+__all__ = ['fetch_aapl_prices', 'fetch_aapl_last_7_days', 'get_prices_state', 'save_prices_state', 'PolygonAPIError', 'get_prices_state_path', 'detect_price_drop_alert', 'get_alerts_path', 'save_alerts', 'get_last_5_working_days', 'fetch_last_5_working_days_prices', 'PriceFetcher', 'TokenBucket', 'fetch_prices_for_tickers']
 
 
 # Set up error logging
@@ -170,6 +174,279 @@ def fetch_last_5_working_days_prices(ticker: str = 'AAPL', api_key: Optional[str
         raise PolygonAPIError(error_msg)
 
 
+OPEN_CLOSE_URL = "https://api.massive.com/v1/open-close/{ticker}/{date}"
+# The free tier allows 5 calls a minute. Set POLYGON_REQUESTS_PER_MINUTE for paid tiers, or 0 for no limit
+DEFAULT_REQUESTS_PER_MINUTE = 5
+MAX_PRICE_WORKERS = 4
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket that releases `rate` requests a second, with bursts of up to `capacity` requests.
+    
+    With a capacity of 1 the requests are spaced evenly, so no window of a minute has more than the rate allows.
+    """
+    
+    def __init__(self, rate: float, capacity: int = 1):
+        if rate <= 0:
+            raise ValueError("The rate of a token bucket must be positive")
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    @classmethod
+    def per_minute(cls, requests_per_minute: float, burst: int = 1) -> 'TokenBucket':
+        return cls(rate=requests_per_minute / 60.0, capacity=burst)
+    
+    def acquire(self) -> float:
+        """
+        Take a token, waiting until one is available.
+        
+        Returns:
+            float: The seconds waited
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Reserve the token now so waiting threads are released in order, one token apart
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+def get_requests_per_minute() -> float:
+    """Get the Polygon request rate from POLYGON_REQUESTS_PER_MINUTE, 0 meaning no limit"""
+    value = os.getenv('POLYGON_REQUESTS_PER_MINUTE')
+    if not value:
+        return DEFAULT_REQUESTS_PER_MINUTE
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        log.warning(f"Invalid POLYGON_REQUESTS_PER_MINUTE {value!r}, using {DEFAULT_REQUESTS_PER_MINUTE}")
+        return DEFAULT_REQUESTS_PER_MINUTE
+
+
+class PriceFetcher:
+    """
+    Fetch daily price bars for many tickers through one pooled client, scheduling the requests of all the
+    tickers against a shared token bucket.
+    
+    The bars already in a ticker's prices state file are reused, so each (ticker, date) is only fetched once.
+    
+    Usage:
+        with PriceFetcher(requests_per_minute=100) as fetcher:
+            result = fetcher.fetch_many(['AAPL', 'MSFT'])
+    """
+    
+    def __init__(self,
+                 api_key: Optional[str] = None,
+                 requests_per_minute: Optional[float] = None,
+                 burst: int = 1,
+                 max_workers: int = MAX_PRICE_WORKERS,
+                 url: str = OPEN_CLOSE_URL,
+                 max_retries: int = 2,
+                 retry_delay: float = 5.0,
+                 timeout: float = 30.0):
+        """
+        Args:
+            api_key: Massive.com API key (optional, defaults to env variable POLYGON_API_KEY)
+            requests_per_minute: Request rate (default: POLYGON_REQUESTS_PER_MINUTE or 5), 0 for no limit
+            burst: Requests that can be made at once before the rate applies
+            max_workers: Maximum number of requests in flight
+            url: The open-close URL template with {ticker} and {date}
+            max_retries: Retries of a request that fails
+            retry_delay: Seconds to wait before retrying a failed request
+            timeout: Request timeout in seconds
+        """
+        self.api_key = api_key or get_polygon_api_key()
+        if requests_per_minute is None:
+            requests_per_minute = get_requests_per_minute()
+        self.bucket = TokenBucket.per_minute(requests_per_minute, burst) if requests_per_minute > 0 else None
+        self.max_workers = max(1, max_workers)
+        self.url = url
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        # The response hooks of the edgar clients also see the responses of this client, for profiling
+        self.client = httpx.Client(timeout=timeout,
+                                   limits=httpx.Limits(max_connections=self.max_workers,
+                                                       max_keepalive_connections=self.max_workers),
+                                   event_hooks=response_event_hooks())
+        self.requests = 0
+        self.rate_limited = 0
+        self.counter_lock = threading.Lock()
+    
+    def close(self):
+        self.client.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def _get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Get a response within the rate limit, retrying failures. None if there is no bar for the date"""
+        for attempt in range(self.max_retries + 1):
+            if self.bucket:
+                self.bucket.acquire()
+            with self.counter_lock:
+                self.requests += 1
+            try:
+                response = self.client.get(url, params={"adjusted": "true", "apiKey": self.api_key})
+                # The open-close endpoint answers 404 for dates without trading
+                if response.status_code == 404:
+                    return None
+                response.raise_for_status()
+                return response.json()
+            except Exception as exc:
+                delay = self.retry_delay
+                if isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 429:
+                    with self.counter_lock:
+                        self.rate_limited += 1
+                    retry_after = exc.response.headers.get('Retry-After', '')
+                    delay = max(delay, float(retry_after) if retry_after.isdigit() else 60.0)
+                if attempt < self.max_retries:
+                    log.warning(f"Attempt {attempt + 1} failed for {url}: {exc}. Retrying in {delay:.0f} seconds...")
+                    time.sleep(delay)
+                else:
+                    log.error(f"Attempt {attempt + 1} failed for {url}: {exc}. No retries left.")
+                    raise
+    
+    def fetch_bar(self, ticker: str, date_str: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch the daily bar of a ticker for a date.
+        
+        Returns:
+            dict: The bar with keys date, open, high, low, close, volume, or None if the market was closed
+        """
+        data = self._get(self.url.format(ticker=ticker, date=date_str))
+        status = (data or {}).get("status")
+        if status != "OK":
+            log.info(f"No data for {ticker} on {date_str}: {status or 'NOT_FOUND'} (likely holiday or market closed)")
+            return None
+        return {
+            "date": date_str,
+            "open": data.get("open"),
+            "high": data.get("high"),
+            "low": data.get("low"),
+            "close": data.get("close"),
+            "volume": data.get("volume")
+        }
+    
+    def fetch_many(self, tickers: List[str], dates: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Fetch the daily bars of many tickers and save the prices state of each ticker.
+        
+        Args:
+            tickers: Stock ticker symbols
+            dates: Dates as YYYY-MM-DD (default: the last 5 working days)
+        
+        Returns:
+            dict: Dictionary with keys:
+                - states: The saved prices state of each ticker
+                - failed: The error of each ticker without any prices
+                - requests: Number of requests made
+                - reused_bars: Number of bars reused from the prices state files
+                - timings: Seconds spent fetching the bars of each ticker, including waiting for the rate limit
+                - elapsed: Seconds taken
+        """
+        start = time.perf_counter()
+        dates = sorted(dates or get_last_5_working_days())
+        requests_before = self.requests
+        
+        # Bars already fetched for the dates are reused from the prices state
+        bars: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for ticker in tickers:
+            saved = {price.get('date'): price for price in get_prices_state(ticker).get('prices', [])
+                     if price.get('close') is not None}
+            bars[ticker] = {date_str: saved[date_str] for date_str in dates if date_str in saved}
+        reused_bars = sum(len(ticker_bars) for ticker_bars in bars.values())
+        missing = [(ticker, date_str) for ticker in tickers for date_str in dates if date_str not in bars[ticker]]
+        log.info(f"Fetching {len(missing)} daily bars for {len(tickers)} tickers ({reused_bars} already fetched)")
+        record_cache_lookups('price_bars', hits=reused_bars, misses=len(missing))
+        
+        errors: Dict[str, str] = {}
+        timings: Dict[str, float] = {ticker: 0.0 for ticker in tickers}
+        
+        def fetch(key):
+            ticker, date_str = key
+            fetch_start = time.perf_counter()
+            try:
+                return key, self.fetch_bar(ticker, date_str), None, time.perf_counter() - fetch_start
+            except Exception as e:
+                error_logger.error(f"Failed to fetch {ticker} for {date_str}: {e}")
+                return key, None, str(e), time.perf_counter() - fetch_start
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for (ticker, date_str), bar, error, seconds in executor.map(fetch, missing):
+                timings[ticker] += seconds
+                if bar:
+                    bars[ticker][date_str] = bar
+                elif error:
+                    errors[ticker] = error
+        
+        states: Dict[str, Dict[str, Any]] = {}
+        failed: Dict[str, str] = {}
+        now = datetime.now(timezone.utc).isoformat()
+        for ticker in tickers:
+            prices = [bars[ticker][date_str] for date_str in dates if date_str in bars[ticker]]
+            if not prices:
+                failed[ticker] = errors.get(ticker, "No prices fetched for any working day")
+                error_logger.error(f"No prices fetched for {ticker}: {failed[ticker]}")
+                continue
+            state = {
+                'timestamp': now,
+                'ticker': ticker,
+                'prices': prices,
+                'last_fetch_timestamp': now
+            }
+            try:
+                save_prices_state(state, ticker)
+                states[ticker] = state
+            except PolygonAPIError as e:
+                failed[ticker] = str(e)
+        
+        for ticker, seconds in timings.items():
+            record_ticker_time(ticker, seconds)
+        
+        elapsed = time.perf_counter() - start
+        log.info(f"Fetched prices for {len(states)}/{len(tickers)} tickers with "
+                 f"{self.requests - requests_before} requests in {elapsed:.1f}s")
+        return {
+            'states': states,
+            'failed': failed,
+            'requests': self.requests - requests_before,
+            'reused_bars': reused_bars,
+            'timings': {ticker: round(seconds, 3) for ticker, seconds in timings.items()},
+            'elapsed': elapsed
+        }
+
+
+def fetch_prices_for_tickers(tickers: List[str],
+                             api_key: Optional[str] = None,
+                             requests_per_minute: Optional[float] = None,
+                             max_workers: int = MAX_PRICE_WORKERS) -> Dict[str, Any]:
+    """
+    Fetch the last 5 working days of prices for many tickers with one PriceFetcher.
+    
+    Args:
+        tickers: Stock ticker symbols
+        api_key: Massive.com API key (optional, defaults to env variable POLYGON_API_KEY)
+        requests_per_minute: Request rate (default: POLYGON_REQUESTS_PER_MINUTE or 5), 0 for no limit
+        max_workers: Maximum number of requests in flight
+    
+    Returns:
+        dict: See PriceFetcher.fetch_many
+    """
+    with PriceFetcher(api_key=api_key, requests_per_minute=requests_per_minute, max_workers=max_workers) as fetcher:
+        return fetcher.fetch_many(tickers)
+
+
 def get_polygon_api_key() -> str:
     """
     Get Polygon API key from environment variable.
@@ -0,0 +1,239 @@
+"""
+Profiling of the pipeline stages.
+
+Records the wall time of each stage and of each ticker within a stage, the HTTP requests and bytes received
+per host, and the hits and misses of the caches, and writes them as a JSON timing report next to the alerts.
+
+```
+profiler = PipelineProfiler()
+with profiler:
+    profiler.run_stage('fetch_prices', fetch_prices, tickers)
+profiler.write_report(get_timing_report_path())
+```
+
+The pipeline modules record into the active profiler with the module functions `profile_ticker`,
+`record_ticker_time` and `record_cache_lookups`, which do nothing when no profiler is active.
+Lookups that a batch has already recorded are left out with `skip_cache_lookups`.
+HTTP traffic is recorded from the response hooks of the edgar http clients, which the Polygon PriceFetcher
+client also runs.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Set
+
+import httpx
+
+from edgar.httpclient import add_response_hook, remove_response_hook
+
+__all__ = ['PipelineProfiler', 'get_timing_report_path', 'profile_ticker', 'record_ticker_time',
+           'record_cache_lookups', 'skip_cache_lookups', 'get_active_profiler']
+
+_active_profiler: Optional['PipelineProfiler'] = None
+
+
+def get_timing_report_path() -> Path:
+    """
+    Get the path to the timing report, next to the alerts.
+
+    Returns:
+        Path: The absolute path to pipeline_timing.json in the project data directory
+    """
+    return Path(__file__).parent.parent / 'data' / 'pipeline_timing.json'
+
+
+def get_active_profiler() -> Optional['PipelineProfiler']:
+    return _active_profiler
+
+
+class _CountingStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """A sync or async response stream that reports the bytes received when the response is closed"""
+
+    def __init__(self, stream, on_close: Callable[[int], None]):
+        self.stream = stream
+        self.on_close = on_close
+        self.bytes_received = 0
+
+    def __iter__(self):
+        for chunk in self.stream:
+            self.bytes_received += len(chunk)
+            yield chunk
+
+    async def __aiter__(self):
+        async for chunk in self.stream:
+            self.bytes_received += len(chunk)
+            yield chunk
+
+    def close(self):
+        try:
+            self.stream.close()
+        finally:
+            self.on_close(self.bytes_received)
+
+    async def aclose(self):
+        try:
+            await self.stream.aclose()
+        finally:
+            self.on_close(self.bytes_received)
+
+
+class PipelineProfiler:
+    """
+    The wall time of the pipeline stages and tickers, the HTTP traffic per host and the cache hit rates of a run
+    """
+
+    def __init__(self):
+        self.started = datetime.now(timezone.utc)
+        self.start_time = time.perf_counter()
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.tickers: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self.hosts: Dict[str, Dict[str, Any]] = defaultdict(
+            lambda: {'requests': 0, 'errors': 0, 'bytes_received': 0, 'seconds': 0.0})
+        self.caches: Dict[str, Dict[str, int]] = defaultdict(lambda: {'hits': 0, 'misses': 0})
+        self.skipped_caches: Set[str] = set()
+        self.current_stage: Optional[str] = None
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        global _active_profiler
+        _active_profiler = self
+        add_response_hook(self.record_response)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        global _active_profiler
+        remove_response_hook(self.record_response)
+        if _active_profiler is self:
+            _active_profiler = None
+
+    def run_stage(self, name: str, stage: Callable, *args, **kwargs):
+        """Run a stage, recording its wall time and whether it succeeded. Returns the result of the stage"""
+        self.current_stage = name
+        start = time.perf_counter()
+        result = None
+        try:
+            result = stage(*args, **kwargs)
+            return result
+        finally:
+            self.stages[name] = {'seconds': round(time.perf_counter() - start, 3),
+                                 'success': bool(result)}
+            self.current_stage = None
+
+    def record_ticker_time(self, ticker: str, seconds: float, stage: Optional[str] = None):
+        """Record the wall time of a ticker in a stage, by default the current stage"""
+        stage = stage or self.current_stage or 'other'
+        with self.lock:
+            self.tickers[ticker][stage] = round(self.tickers[ticker].get(stage, 0.0) + seconds, 3)
+
+    def record_cache_lookups(self, cache: str, hits: int = 0, misses: int = 0):
+        if cache in self.skipped_caches:
+            return
+        with self.lock:
+            self.caches[cache]['hits'] += hits
+            self.caches[cache]['misses'] += misses
+
+    def record_response(self, response: httpx.Response):
+        """Record a response of an http client. The bytes are counted as the body is read"""
+        host = response.request.url.host
+        with self.lock:
+            self.hosts[host]['requests'] += 1
+            if response.status_code >= 400:
+                self.hosts[host]['errors'] += 1
+        # Responses served by the http cache have the from_cache extension
+        if 'from_cache' in response.extensions:
+            self.record_cache_lookups('http', hits=int(bool(response.extensions['from_cache'])),
+                                      misses=int(not response.extensions['from_cache']))
+
+        def on_close(bytes_received: int):
+            try:
+                # The elapsed time is set when the stream of the client is closed
+                elapsed = response.elapsed.total_seconds()
+            except RuntimeError:
+                elapsed = 0.0
+            with self.lock:
+                self.hosts[host]['bytes_received'] += bytes_received
+                self.hosts[host]['seconds'] += elapsed
+
+        response.stream = _CountingStream(response.stream, on_close)
+
+    def report(self) -> Dict[str, Any]:
+        """The timing report as a JSON serializable dict"""
+        with self.lock:
+            ticker_totals = {ticker: round(sum(stages.values()), 3) for ticker, stages in self.tickers.items()}
+            return {
+                'started': self.started.isoformat(),
+                'finished': datetime.now(timezone.utc).isoformat(),
+                'total_seconds': round(time.perf_counter() - self.start_time, 3),
+                'stages': dict(self.stages),
+                'tickers': {ticker: {'total_seconds': ticker_totals[ticker], 'stages': dict(stages)}
+                            for ticker, stages in sorted(self.tickers.items())},
+                'slowest_tickers': sorted(ticker_totals, key=ticker_totals.get, reverse=True)[:10],
+                'http': {host: {**counts, 'seconds': round(counts['seconds'], 3)}
+                         for host, counts in sorted(self.hosts.items())},
+                'caches': {cache: {**counts,
+                                   'hit_rate': round(counts['hits'] / (counts['hits'] + counts['misses']), 3)
+                                   if counts['hits'] + counts['misses'] else None}
+                           for cache, counts in sorted(self.caches.items())},
+            }
+
+    def write_report(self, path: Optional[Path] = None) -> Path:
+        """Write the timing report as JSON, replacing the file when it is complete"""
+        path = path or get_timing_report_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temporary_path.write_text(json.dumps(self.report(), indent=2))
+        os.replace(temporary_path, path)
+        return path
+
+    def summary(self) -> str:
+        """A one line summary of the stage times and HTTP traffic"""
+        stages = ", ".join(f"{name} {stage['seconds']:.1f}s" for name, stage in self.stages.items())
+        requests = sum(counts['requests'] for counts in self.hosts.values())
+        megabytes = sum(counts['bytes_received'] for counts in self.hosts.values()) / 1_000_000
+        return f"{stages} | {requests} HTTP requests, {megabytes:.1f} MB received"
+
+
+@contextmanager
+def profile_ticker(ticker: str):
+    """Record the wall time of a ticker in the current stage of the active profiler"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if _active_profiler is not None:
+            _active_profiler.record_ticker_time(ticker, time.perf_counter() - start)
+
+
+def record_ticker_time(ticker: str, seconds: float):
+    """Record the wall time of a ticker in the current stage of the active profiler"""
+    if _active_profiler is not None:
+        _active_profiler.record_ticker_time(ticker, seconds)
+
+
+def record_cache_lookups(cache: str, hits: int = 0, misses: int = 0):
+    """Record cache hits and misses in the active profiler"""
+    if _active_profiler is not None:
+        _active_profiler.record_cache_lookups(cache, hits=hits, misses=misses)
+
+
+@contextmanager
+def skip_cache_lookups(*caches: str):
+    """
+    Do not record lookups of the caches in the active profiler, e.g. when a batch has already recorded the
+    lookup of every ticker and the tickers are then read from the cache one by one
+    """
+    profiler = _active_profiler
+    skipped = set(caches) - profiler.skipped_caches if profiler is not None else set()
+    if profiler is not None:
+        profiler.skipped_caches |= skipped
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.skipped_caches -= skipped
@@ -50,58 +50,54 @@ def fetch_recent_filings(ticker: str, days_back: int = 2, form_types: List[str]
     filings = []
     cutoff_date = datetime.now() - timedelta(days=days_back)
     
-    for form_type in form_types:
-        try:
-            # Get filings for this form type
-            form_filings = company.get_filings(form=form_type, trigger_full_load=False)
-            
-            # Process each filing
-            for filing in form_filings:
-                # Check if filing is within our date range
-                # Try different possible date attribute names
-                filing_date = None
-                date_attrs = ['filing_date', 'date', 'filed_at', 'period']
-                
-                for attr in date_attrs:
-                    if hasattr(filing, attr):
-                        filing_date = getattr(filing, attr)
-                        break
-                
-                if filing_date is None:
-                    continue
-                
-                # Convert to datetime if needed
-                if isinstance(filing_date, str):
-                    try:
-                        filing_date = datetime.strptime(filing_date, '%Y-%m-%d')
-                    except ValueError:
-                        continue
-                elif isinstance(filing_date, date) and not isinstance(filing_date, datetime):
-                    # Convert date to datetime at midnight
-                    filing_date = datetime.combine(filing_date, datetime.min.time())
-                elif not isinstance(filing_date, datetime):
-                    continue
-                
-                if filing_date >= cutoff_date:
-                    filing_info = {
-                        'form_type': form_type,
-                        'filed_date': filing_date.strftime('%Y-%m-%d'),
-                        'url': getattr(filing, 'document_url', getattr(filing, 'url', '')),
-                    }
-                    
-                    # Extract summary from available fields
-                    summary = _extract_filing_summary(filing)
-                    filing_info['summary'] = summary
-                    
-                    filings.append(filing_info)
-                    
-        except Exception as e:
-            log.warning(f"Could not fetch {form_type} for {ticker}: {e}")
+    try:
+        # Filter the company's filings by all the form types and the cutoff date in one call,
+        # so the filtering happens on the Arrow table of filings instead of filing by filing
+        recent_filings = company.get_filings(form=form_types,
+                                             filing_date=f"{cutoff_date.strftime('%Y-%m-%d')}:",
+                                             trigger_full_load=False)
+    except Exception as e:
+        log.warning(f"Could not fetch {', '.join(form_types)} for {ticker}: {e}")
+        return filings
+    
+    if recent_filings is None:
+        return filings
+    
+    for filing in recent_filings:
+        filing_date = _to_datetime(getattr(filing, 'filing_date', None))
+        if filing_date is None or filing_date < cutoff_date.replace(hour=0, minute=0, second=0, microsecond=0):
             continue
+        
+        filing_info = {
+            'form_type': filing.form,
+            'filed_date': filing_date.strftime('%Y-%m-%d'),
+            'url': getattr(filing, 'document_url', getattr(filing, 'url', '')),
+        }
+        
+        # Extract summary from available fields
+        summary = _extract_filing_summary(filing)
+        filing_info['summary'] = summary
+        
+        filings.append(filing_info)
     
     return filings
 
 
+def _to_datetime(filing_date) -> Optional[datetime]:
+    """Convert a filing date that may be a string, date or datetime to a datetime"""
+    if isinstance(filing_date, datetime):
+        return filing_date
+    if isinstance(filing_date, date):
+        # Convert date to datetime at midnight
+        return datetime.combine(filing_date, datetime.min.time())
+    if isinstance(filing_date, str):
+        try:
+            return datetime.strptime(filing_date, '%Y-%m-%d')
+        except ValueError:
+            return None
+    return None
+
+
 def _extract_filing_summary(filing) -> str:
     """
     Extract a summary from a filing object.
@@ -28,6 +28,8 @@ from datetime import datetime
 from pathlib import Path
 
 from config.config_loader import load_tickers_config, ConfigError
+from pipeline.profiler import (PipelineProfiler, get_timing_report_path, profile_ticker, record_ticker_time,
+                               skip_cache_lookups)
 
 
 def log(message: str, level: str = "INFO") -> None:
@@ -56,18 +58,20 @@ def fetch_prices(tickers: list) -> bool:
     log("=" * 60)
     
     try:
-        from pipeline.polygon import fetch_last_5_working_days_prices
+        from pipeline.polygon import fetch_prices_for_tickers
         
+        # The requests of all tickers share one client and the rate limit (POLYGON_REQUESTS_PER_MINUTE),
+        # and the bars already in the prices files are not fetched again
+        result = fetch_prices_for_tickers(tickers)
         for ticker in tickers:
-            log(f"\nFetching {ticker}...")
-            try:
-                state = fetch_last_5_working_days_prices(ticker)
+            state = result['states'].get(ticker)
+            if state:
                 log(f"✓ Successfully fetched {len(state.get('prices', []))} price records for {ticker}")
-                if state.get('prices'):
-                    log(f"  Date range: {state['prices'][0].get('date')} to {state['prices'][-1].get('date')}")
-            except Exception as e:
-                log(f"✗ Failed to fetch {ticker}: {e}", "WARNING")
-                continue
+                log(f"  Date range: {state['prices'][0].get('date')} to {state['prices'][-1].get('date')}")
+            else:
+                log(f"✗ Failed to fetch {ticker}: {result['failed'].get(ticker)}", "WARNING")
+        log(f"Price fetch: {result['requests']} requests, {result['reused_bars']} bars reused, "
+            f"{result['elapsed']:.1f}s")
         
         return True
         
@@ -88,7 +92,8 @@ def detect_alerts(tickers: list) -> bool:
         for ticker in tickers:
             log(f"\nAnalyzing {ticker}...")
             try:
-                alert = detect_price_drop_alert(ticker)
+                with profile_ticker(ticker):
+                    alert = detect_price_drop_alert(ticker)
                 log(f"  - Alert triggered: {alert.get('alert_triggered')}")
                 log(f"  - First close: ${alert.get('price_first_close', 0):.2f}")
                 log(f"  - Last close: ${alert.get('price_last_close', 0):.2f}")
@@ -131,7 +136,14 @@ def enrich_with_sec_filings(tickers: list) -> bool:
             log(f"  - Failed to enrich: {', '.join(results['failed'])}", "WARNING")
             for ticker, error in results.get('errors', {}).items():
                 log(f"    {ticker}: {error}", "WARNING")
-        
+
+        timings = results.get('timings', {})
+        for ticker, seconds in timings.items():
+            record_ticker_time(ticker, seconds)
+        if timings:
+            slowest = sorted(timings.items(), key=lambda item: item[1], reverse=True)[:5]
+            log(f"  - Slowest tickers: {', '.join(f'{ticker} ({seconds:.2f}s)' for ticker, seconds in slowest)}")
+
         # Consider it successful if at least one ticker succeeded
         return successful > 0
         
@@ -147,16 +159,38 @@ def analyze_financials(tickers: list) -> bool:
     log("=" * 60)
     
     try:
-        from pipeline.financial_analyzer import calculate_spread, FinancialDataError
+        from pipeline.financial_analyzer import (calculate_spread, extract_financials_batch, get_latest_10k_accessions,
+                                                 FinancialDataError)
         
         successful = 0
         failed = 0
         
+        # The cached financial data of a ticker is used until a new 10-K is filed
+        latest_accessions = {}
+        try:
+            latest_accessions = get_latest_10k_accessions(tickers)
+        except Exception as e:
+            log(f"Could not get the latest 10-K accessions, using the cache TTLs only: {e}", "WARNING")
+        
+        # Extract ROIC and WACC inputs for all tickers from the SEC company facts in one batch.
+        # The results are cached so calculate_spread only reads the 10-K XBRL for tickers the batch could not answer
+        batch_caches = ()
+        try:
+            batch = extract_financials_batch(tickers, latest_accessions=latest_accessions)
+            # The batch has recorded the cache lookup of every ticker, so the reads of calculate_spread are not counted
+            batch_caches = ('financial_cache.roic_history', 'financial_cache.wacc_components')
+            sources = {source: list(batch.sources.values()).count(source) for source in set(batch.sources.values())}
+            log(f"Extracted financial data: {sources} in "
+                + ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in batch.timings.items()))
+        except Exception as e:
+            log(f"Batch financial extraction failed, analyzing tickers one by one: {e}", "WARNING")
+        
         for ticker in tickers:
             log(f"\nAnalyzing financials for {ticker}...")
             try:
                 # Calculate spread (this also calculates ROIC and WACC and caches everything)
-                result = calculate_spread(ticker)
+                with profile_ticker(ticker), skip_cache_lookups(*batch_caches):
+                    result = calculate_spread(ticker, latest_accession=latest_accessions.get(ticker))
                 
                 log(f"  - Current Spread: {result.current_spread:.2%}")
                 log(f"  - Trend: {result.spread_trend}")
@@ -348,6 +382,8 @@ def git_commit(tickers: list) -> bool:
             for file_pattern in [f"data/prices_{ticker}.json", f"data/alerts_{ticker}.json", f"data/financial_cache_{ticker}.json"]:
                 if os.path.exists(os.path.join(repo_dir, file_pattern)):
                     data_files.append(file_pattern)
+        if get_timing_report_path().exists():
+            data_files.append(os.path.relpath(get_timing_report_path(), repo_dir))
         
         subprocess.run(
             ["git", "add", "-f"] + data_files,
@@ -389,6 +425,16 @@ def git_commit(tickers: list) -> bool:
         return False
 
 
+def write_timing_report(profiler: PipelineProfiler) -> None:
+    """Write the timing report of the stages next to the alerts."""
+    try:
+        path = profiler.write_report(get_timing_report_path())
+        log(f"Timing: {profiler.summary()}")
+        log(f"Timing report written to {path}")
+    except Exception as e:
+        log(f"Failed to write timing report: {e}", "WARNING")
+
+
 def main() -> int:
     """Main pipeline execution."""
     log("=" * 60)
@@ -426,32 +472,26 @@ def main() -> int:
         log("Pipeline failed: Environment validation failed", "ERROR")
         return 1
     
-    # Step 2: Fetch prices
-    if not fetch_prices(tickers):
-        log("Pipeline failed: Price fetching failed", "ERROR")
-        return 1
-    
-    # Step 3: Detect alerts
-    if not detect_alerts(tickers):
-        log("Pipeline failed: Alert detection failed", "ERROR")
-        return 1
-    
-    # Step 4: Enrich with SEC filings (Phase 3)
-    if not enrich_with_sec_filings(tickers):
-        log("Pipeline failed: SEC filing enrichment failed", "ERROR")
-        return 1
-    
-    # Step 5: Analyze financials (Phase 4 - Pillar 1)
-    if not analyze_financials(tickers):
-        log("Pipeline failed: Financial analysis failed", "ERROR")
-        return 1
-    
-    # Step 6: Validate outputs
-    if not validate_outputs(tickers):
-        log("Pipeline failed: Output validation failed", "ERROR")
-        return 1
+    # Steps 2-6: Fetch prices, detect alerts, enrich with SEC filings (Phase 3),
+    # analyze financials (Phase 4 - Pillar 1) and validate outputs, timing each stage
+    stages = [
+        ('fetch_prices', fetch_prices, "Price fetching failed"),
+        ('detect_alerts', detect_alerts, "Alert detection failed"),
+        ('enrich_with_sec_filings', enrich_with_sec_filings, "SEC filing enrichment failed"),
+        ('analyze_financials', analyze_financials, "Financial analysis failed"),
+        ('validate_outputs', validate_outputs, "Output validation failed"),
+    ]
+    profiler = PipelineProfiler()
+    with profiler:
+        for name, stage, error in stages:
+            if not profiler.run_stage(name, stage, tickers):
+                write_timing_report(profiler)
+                log(f"Pipeline failed: {error}", "ERROR")
+                return 1
+    # The report is written before the commit so it is committed with the outputs
+    write_timing_report(profiler)
     
-    # Step 6: Git commit
+    # Step 7: Git commit
     if not git_commit(tickers):
         log("Pipeline failed: Git commit failed", "ERROR")
         return 2
@@ -0,0 +1,54 @@
+"""
+Compare preparing ratio data per filing with FinancialRatios against BatchFinancialRatios.
+
+    python tests/perf/perf_batch_ratios.py
+
+FinancialRatios finds the concepts of each ratio type in the statements one concept at a time.
+The per filing timing gets the ratio data of every ratio type, which is the lookup part of calculating
+the ratios. BatchFinancialRatios finds all the concepts once per filing and calculates every ratio group.
+The statements are rendered before timing so both only measure the ratio work.
+"""
+import time
+from pathlib import Path
+
+from rich import print
+from rich.table import Table
+
+from edgar.xbrl import XBRL
+from edgar.xbrl.analysis.ratios import BatchFinancialRatios, FinancialRatios
+
+fixtures = ['aapl/10k_2023', 'aapl/10k_2022', 'ba/10k_2024', 'msft/10k_2015', 'nvda/10k_2024', 'pg/10k_2023']
+ratio_types = ['current', 'operating_margin', 'return_on_assets', 'gross_margin', 'leverage']
+
+
+def per_filing(xbrls):
+    results = {}
+    for key, xbrl in xbrls.items():
+        ratios = FinancialRatios(xbrl)
+        for ratio_type in ratio_types:
+            try:
+                results[key, ratio_type] = ratios.get_ratio_data(ratio_type)
+            except (KeyError, ValueError):
+                pass
+    return results
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+if __name__ == '__main__':
+    parsed = {name: XBRL.parse_directory(Path('tests/fixtures/xbrl2') / name) for name in fixtures}
+    # Render the statements once so they come from the statement cache
+    per_filing(parsed)
+
+    table = Table("Filings", "FinancialRatios ratio data (s)", "Batch all ratios (s)", "Speedup", "Ratio values")
+    for copies in [1, 5, 20]:
+        xbrls = {f"{name}#{copy}": xbrl for copy in range(copies) for name, xbrl in parsed.items()}
+        per_filing_time, _ = timed(lambda: per_filing(xbrls))
+        batch_time, df = timed(lambda: BatchFinancialRatios(xbrls).calculate_all())
+        table.add_row(str(len(xbrls)), f"{per_filing_time:.3f}", f"{batch_time:.3f}",
+                      f"{per_filing_time / batch_time:.1f}x", str(len(df)))
+    print(table)
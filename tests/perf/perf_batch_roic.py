@@ -0,0 +1,58 @@
+"""
+Compare extracting ROIC history and WACC components ticker by ticker from the 10-K XBRL
+against extract_financials_batch, which uses the SEC company facts.
+
+    python tests/perf/perf_batch_roic.py AAPL MSFT GOOGL NVDA
+
+This makes requests to the SEC so set EDGAR_IDENTITY first. Neither side uses the financial cache.
+The per ticker path downloads and parses the XBRL of up to 5 10-Ks per ticker. The batch path downloads
+one company facts file per ticker and calculates the values of all the tickers together.
+"""
+import sys
+import time
+from unittest.mock import patch
+
+from rich import print
+from rich.table import Table
+
+from pipeline.financial_analyzer import (FinancialDataError, extract_financials_batch, extract_roic_history,
+                                         extract_wacc_components)
+
+
+def per_ticker(tickers):
+    results = {}
+    for ticker in tickers:
+        start = time.perf_counter()
+        try:
+            roic = extract_roic_history(ticker)
+            extract_wacc_components(ticker)
+            results[ticker] = (time.perf_counter() - start, roic.roic_values[-1])
+        except FinancialDataError as e:
+            results[ticker] = (time.perf_counter() - start, None)
+            print(f"{ticker}: {e}")
+    return results
+
+
+if __name__ == '__main__':
+    tickers = sys.argv[1:] or ['AAPL', 'MSFT', 'GOOGL', 'NVDA', 'JNJ']
+    with patch('pipeline.financial_analyzer.load_from_cache', return_value=None), \
+            patch('pipeline.financial_analyzer.save_to_cache'):
+        start = time.perf_counter()
+        per_ticker_results = per_ticker(tickers)
+        per_ticker_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = extract_financials_batch(tickers, use_cache=False)
+        batch_time = time.perf_counter() - start
+
+    table = Table("Ticker", "XBRL (s)", "XBRL latest ROIC", "Batch source", "Batch latest ROIC")
+    for ticker in tickers:
+        seconds, roic = per_ticker_results[ticker]
+        batch_roic = batch.roic.get(ticker)
+        table.add_row(ticker, f"{seconds:.2f}", f"{roic:.2%}" if roic is not None else "-",
+                      batch.sources.get(ticker, batch.failed.get(ticker, "")),
+                      f"{batch_roic.roic_values[-1]:.2%}" if batch_roic else "-")
+    print(table)
+    print(f"Per ticker XBRL: {per_ticker_time:.2f}s. Batch company facts: {batch_time:.2f}s "
+          f"({', '.join(f'{stage} {seconds:.2f}s' for stage, seconds in batch.timings.items())}). "
+          f"Speedup {per_ticker_time / batch_time:.1f}x")
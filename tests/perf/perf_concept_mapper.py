@@ -0,0 +1,94 @@
+"""
+Benchmark concept standardization over a corpus of statements from the xbrl2 fixtures.
+
+    python tests/perf/perf_concept_mapper.py
+
+- per statement (difflib)   : a new ConceptMapper for every statement scoring every label with difflib, the old behaviour
+- per statement (rapidfuzz) : a new ConceptMapper for every statement ranking with rapidfuzz and stopping difflib scoring at its bound
+- shared                    : one ConceptMapper for the whole corpus
+- shared + persisted        : a new process-like run that reads the inferred mappings saved by an earlier run
+"""
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from rich import print
+from rich.table import Table
+
+from edgar.xbrl import XBRL
+from edgar.xbrl.standardization import (ConceptMapper, InferredMappingCache, initialize_default_mappings,
+                                        standardize_statement)
+
+statement_types = ['BalanceSheet', 'IncomeStatement', 'CashFlowStatement']
+
+
+def load_corpus():
+    corpus = []
+    for directory in sorted(Path('tests/fixtures/xbrl2').glob('*/*')):
+        if not directory.is_dir() or not list(directory.glob('*.xml')):
+            continue
+        try:
+            xbrl = XBRL.parse_directory(directory)
+        except Exception:
+            continue
+        for statement_type in statement_types:
+            try:
+                statement_data = xbrl.get_statement(statement_type)
+            except Exception:
+                continue
+            if statement_data:
+                corpus.append([{**item, 'statement_type': statement_type} for item in statement_data])
+    return corpus
+
+
+def difflib_extract(query, choices, scorer=None, processor=None, limit=None):
+    # Give every choice the highest bound so that they are all scored with SequenceMatcher, the behaviour before rapidfuzz
+    return [(choice, 100, index) for index, choice in enumerate(choices)]
+
+
+def standardize_per_statement(corpus):
+    for statement_data in corpus:
+        standardize_statement(statement_data, ConceptMapper(initialize_default_mappings(read_only=True)))
+
+
+def standardize_shared(corpus, mapper):
+    for statement_data in corpus:
+        standardize_statement(statement_data, mapper)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    corpus = load_corpus()
+    items = sum(len(statement_data) for statement_data in corpus)
+    print(f"Standardizing {len(corpus)} statements with {items} line items")
+
+    with patch('edgar.xbrl.standardization.core.process', SimpleNamespace(extract=difflib_extract)):
+        difflib_time = timed(standardize_per_statement, corpus)
+    rapidfuzz_time = timed(standardize_per_statement, corpus)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = Path(tmp_dir) / 'inferred_mappings.json'
+        shared_mapper = ConceptMapper(initialize_default_mappings(read_only=True),
+                                      inferred_cache=InferredMappingCache(cache_path))
+        shared_time = timed(standardize_shared, corpus, shared_mapper)
+        shared_mapper.inferred_cache.save()
+
+        persisted_mapper = ConceptMapper(initialize_default_mappings(read_only=True),
+                                         inferred_cache=InferredMappingCache(cache_path))
+        persisted_time = timed(standardize_shared, corpus, persisted_mapper)
+        cached = len(persisted_mapper.inferred_cache)
+
+    table = Table("Mode", "Time (s)", "Speedup")
+    for mode, elapsed in [("per statement (difflib)", difflib_time),
+                          ("per statement (rapidfuzz)", rapidfuzz_time),
+                          ("shared", shared_time),
+                          (f"shared + persisted ({cached} inferred)", persisted_time)]:
+        table.add_row(mode, f"{elapsed:.3f}", f"{difflib_time / elapsed:.1f}x")
+    print(table)
@@ -0,0 +1,60 @@
+"""
+Compare parsing a page of the current filings feed with BeautifulSoup, as it was parsed before,
+against `parse_current_entries` with lxml.
+
+    python tests/perf/perf_current_feed.py
+
+A page of 100 entries is parsed once per poll by `CurrentFilingsTailer`, so the parse time is part of the
+latency between a filing appearing in the feed and the tailer yielding it.
+"""
+import time
+
+from bs4 import BeautifulSoup
+from rich import print
+from rich.table import Table
+
+from edgar._filings import parse_current_entries, parse_summary, parse_title
+from edgar.xmltools import child_text
+
+
+def current_feed(entries: int) -> bytes:
+    xml_entries = "".join(
+        f"<entry><title>8-K - COMPANY {i} INC. ({1000 + i:010d}) (Filer)</title>"
+        f"<link rel=\"alternate\" type=\"text/html\" href=\"https://www.sec.gov/Archives/edgar/data/{1000 + i}/\"/>"
+        f"<summary type=\"html\"> &lt;b&gt;Filed:&lt;/b&gt; 2025-01-08 &lt;b&gt;AccNo:&lt;/b&gt; 0000000001-25-{i:06d} "
+        f"&lt;b&gt;Size:&lt;/b&gt; 5 KB</summary><updated>2025-01-08T16:05:00-05:00</updated>"
+        f"<category scheme=\"https://www.sec.gov/\" label=\"form type\" term=\"8-K\"/>"
+        f"<id>urn:tag:sec.gov,2008:accession-number=0000000001-25-{i:06d}</id></entry>"
+        for i in range(entries))
+    return ('<?xml version="1.0" encoding="ISO-8859-1" ?>'
+            f'<feed xmlns="http://www.w3.org/2005/Atom"><title>Latest Filings</title>{xml_entries}</feed>').encode()
+
+
+def parse_with_beautifulsoup(content: bytes):
+    soup = BeautifulSoup(content.decode(), features="xml")
+    entries = []
+    for entry in soup.find_all("entry"):
+        form_type, company_name, cik, status = parse_title(child_text(entry, "title"))
+        filing_date, accession_number = parse_summary(child_text(entry, "summary"))
+        entries.append({'form': form_type, 'company': company_name, 'cik': cik,
+                        'filing_date': filing_date, 'accession_number': accession_number})
+    return entries
+
+
+def timed(function, content, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function(content)
+    return (time.perf_counter() - start) / repeat, result
+
+
+if __name__ == '__main__':
+    table = Table("Entries", "BeautifulSoup (ms)", "lxml (ms)", "Speedup")
+    for entries in [10, 40, 100]:
+        content = current_feed(entries)
+        soup_time, soup_entries = timed(parse_with_beautifulsoup, content, 50)
+        lxml_time, lxml_entries = timed(parse_current_entries, content, 50)
+        assert soup_entries == lxml_entries
+        table.add_row(str(entries), f"{soup_time * 1000:.2f}", f"{lxml_time * 1000:.2f}",
+                      f"{soup_time / lxml_time:.1f}x")
+    print(table)
@@ -0,0 +1,69 @@
+"""
+Compare table extraction from full document parsing with the lxml table-only fast path.
+
+    python tests/perf/perf_extract_tables.py
+
+- document : Document.parse(html).tables then TableProcessor on each table
+- pandas   : extract_tables(html) using pandas.read_html
+- lxml     : extract_tables(html, parser='lxml') which only looks at the <table> elements
+- parallel : extract_tables_from_documents over all the samples in a process pool
+"""
+import time
+from pathlib import Path
+
+from rich import print
+from rich.table import Table
+
+from edgar.files.html import Document
+from edgar.files.htmltools import extract_tables, extract_tables_from_documents
+from edgar.files.tables import TableProcessor
+
+samples = ['data/html/Apple.10-K.html',
+           'data/html/Apple.10-Q.html',
+           'data/html/Oracle.10-Q.html',
+           'data/html/BuckleInc.8-K.EX99.1.html',
+           'data/Nvidia.10-K.html',
+           'data/PacificGas.424B5.html']
+
+
+def parse_document_tables(html: str):
+    document = Document.parse(html)
+    return [TableProcessor.process_table(table) for table in document.tables]
+
+
+def read_html_tables(html: str):
+    try:
+        return extract_tables(html)
+    except (ImportError, ValueError):
+        # read_html can need html5lib for some documents
+        return None
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+if __name__ == '__main__':
+    documents = [Path(sample).read_text() for sample in samples]
+    table = Table("File", "Tables", "document (s)", "pandas (s)", "lxml (s)", "Speedup vs document")
+    totals = [0.0, 0.0, 0.0]
+    for sample, html in zip(samples, documents):
+        document_time, _ = timed(parse_document_tables, html)
+        pandas_time, pandas_tables = timed(read_html_tables, html)
+        lxml_time, tables = timed(extract_tables, html, parser='lxml')
+        for i, elapsed in enumerate([document_time, pandas_time, lxml_time]):
+            totals[i] += elapsed
+        pandas_result = f"{pandas_time:.3f}" if pandas_tables is not None else "n/a"
+        table.add_row(Path(sample).name, str(len(tables)), f"{document_time:.3f}", pandas_result,
+                      f"{lxml_time:.3f}", f"{document_time / lxml_time:.1f}x")
+    table.add_row("Total", "", *[f"{total:.3f}" for total in totals], f"{totals[0] / totals[2]:.1f}x")
+    print(table)
+
+    # Many documents at once, e.g. the exhibits of a day of 8-K filings. The speedup depends on the number of cpus
+    many_documents = documents * 8
+    sequential_time, _ = timed(extract_tables_from_documents, many_documents, max_workers=1)
+    parallel_time, _ = timed(extract_tables_from_documents, many_documents)
+    print(f"{len(many_documents)} documents: sequential {sequential_time:.2f}s, parallel {parallel_time:.2f}s "
+          f"({sequential_time / parallel_time:.1f}x)")
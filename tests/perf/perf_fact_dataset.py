@@ -0,0 +1,62 @@
+"""
+Compare querying the facts of many filings by looping over FactQuery with querying a FactDataset.
+
+    python tests/perf/perf_fact_dataset.py
+
+The filings are the fixtures with facts, repeated to make larger sets of filings.
+The FactQuery loop is timed with the facts of each XBRL already cached.
+"""
+import time
+from pathlib import Path
+
+import pandas as pd
+from rich import print
+from rich.table import Table
+
+from edgar.xbrl import XBRL, FactDataset
+
+fixtures = ['aapl/10k_2023', 'aapl/10q_2023', 'ba/10k_2024', 'msft/10k_2015', 'nvda/10k_2024', 'pg/10k_2023']
+
+queries = {
+    'concept': (lambda query: query.by_concept('Revenue'),
+                lambda query: query.by_concept('Revenue')),
+    'concept + unit': (lambda query: query.by_concept('Revenue').by_unit('iso4217_USD'),
+                       lambda query: query.by_concept('Revenue').by_unit('iso4217_USD')),
+    'dimension': (lambda query: query.by_dimension('us-gaap_StatementBusinessSegmentsAxis'),
+                  lambda query: query.by_dimension('us-gaap:StatementBusinessSegmentsAxis')),
+    'durations in date range': (lambda query: query.by_period_type('duration').by_date_range('2022-01-01', '2023-12-31'),
+                                lambda query: query.by_period_type('duration').by_date_range('2022-01-01', '2023-12-31')),
+}
+
+
+def loop_query(xbrls, build_query):
+    frames = []
+    for key, xbrl in xbrls.items():
+        df = build_query(xbrl.facts.query()).to_dataframe()
+        if len(df):
+            frames.append(df.assign(filing=key))
+    return pd.concat(frames) if frames else pd.DataFrame()
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+if __name__ == '__main__':
+    parsed = {name: XBRL.parse_directory(Path('tests/fixtures/xbrl2') / name) for name in fixtures}
+    for xbrl in parsed.values():
+        xbrl.facts.to_dataframe()
+
+    table = Table("Filings", "Query", "FactQuery loop (s)", "FactDataset (s)", "Speedup", "Facts", "Same facts")
+    for copies in [1, 5, 20]:
+        xbrls = {f"{name}#{copy}": xbrl for copy in range(copies) for name, xbrl in parsed.items()}
+        build_time, dataset = timed(lambda: FactDataset.from_xbrl(xbrls))
+        table.add_row(str(len(xbrls)), "build dataset", "", f"{build_time:.3f}", "", str(len(dataset)), "")
+        for name, (loop_filter, dataset_filter) in queries.items():
+            loop_time, expected = timed(lambda: loop_query(xbrls, loop_filter))
+            dataset_time, result = timed(lambda: dataset_filter(dataset.query()).to_dataframe())
+            table.add_row(str(len(xbrls)), name, f"{loop_time:.3f}", f"{dataset_time:.3f}",
+                          f"{loop_time / dataset_time:.0f}x", str(len(result)), str(len(result) == len(expected)))
+    print(table)
@@ -0,0 +1,71 @@
+"""
+Compare extracting a daily feed file into one file per filing with keeping it as an indexed compressed archive.
+
+    python tests/perf/perf_feed_archive.py
+
+The feed file is made of copies of the filings in data/localstorage with different accession numbers.
+Reading reads a sample of the filings of the day, from the extracted files or from the archive.
+"""
+import random
+import tarfile
+import tempfile
+import time
+from pathlib import Path
+
+from rich import print
+from rich.table import Table
+
+from edgar.feed_archive import compress_feed_archive
+from edgar.httprequests import extract_archive
+
+FILINGS = 3000
+SAMPLE = 300
+
+
+def make_feed_file(directory: Path) -> Path:
+    texts = [path.read_bytes() for path in Path('data/localstorage/filings').glob('*/*.nc')]
+    tar_path = directory / '20250108.nc.tar.gz'
+    with tarfile.open(tar_path, 'w:gz') as tar:
+        for number in range(FILINGS):
+            filing = directory / f"0000000000-25-{number:06d}.nc"
+            filing.write_bytes(texts[number % len(texts)])
+            tar.add(filing, arcname=filing.name)
+            filing.unlink()
+    return tar_path
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def disk_usage(paths):
+    return sum(path.stat().st_blocks * 512 for path in paths) / 1024 / 1024
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as temp:
+        temp = Path(temp)
+        tar_path = make_feed_file(temp)
+        sample = random.Random(0).sample(range(FILINGS), SAMPLE)
+
+        extracted = temp / 'filings' / '20250108'
+        extracted.mkdir(parents=True)
+        extract_time, _ = timed(lambda: extract_archive(tar_path, extracted))
+        read_files_time, _ = timed(lambda: [(extracted / f"0000000000-25-{number:06d}.nc").read_text()
+                                            for number in sample])
+        files = list(extracted.iterdir())
+        files_disk = disk_usage(files)
+
+        compress_time, archive = timed(lambda: compress_feed_archive(tar_path, temp / 'filings' / '20250108.nc.gz'))
+        read_archive_time, _ = timed(lambda: [archive.read_filing(f"0000000000-25-{number:06d}") for number in sample])
+        archive_files = [archive.path, archive.path.with_name('20250108.nc.idx')]
+        archive_disk = disk_usage(archive_files)
+
+    table = Table("Storage", "Prepare (s)", "Files", "Disk (MB)", f"Read {SAMPLE} filings (s)")
+    table.add_row("Extracted", f"{extract_time:.2f}", str(len(files)), f"{files_disk:.1f}",
+                  f"{read_files_time:.3f}")
+    table.add_row("Indexed archive", f"{compress_time:.2f}", str(len(archive_files)),
+                  f"{archive_disk:.1f}", f"{read_archive_time:.3f}")
+    print(table)
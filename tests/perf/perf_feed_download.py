@@ -0,0 +1,78 @@
+"""
+Compare downloading feed files one at a time with downloading them concurrently, and extracting
+each feed file as it downloads with extracting it after it is downloaded.
+
+    python tests/perf/perf_feed_download.py
+
+The feed files are served by a local server that sends each archive slowly, like a download from the SEC,
+so the time is spent waiting on the network as it is for the real feed files.
+"""
+import tarfile
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pandas as pd
+from rich import print
+from rich.table import Table
+
+from edgar.feed_download import download_feed_files
+
+DAYS = 12
+SECONDS_PER_FILE = 0.5
+CHUNKS = 10
+
+
+def make_handler(served: Path):
+    class SlowHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            content = (served / self.path.lstrip('/')).read_bytes()
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            chunk_size = len(content) // CHUNKS + 1
+            for start in range(0, len(content), chunk_size):
+                time.sleep(SECONDS_PER_FILE / CHUNKS)
+                self.wfile.write(content[start:start + chunk_size])
+
+        def log_message(self, *args):
+            pass
+    return SlowHandler
+
+
+def make_feed_files(served: Path, url: str) -> pd.DataFrame:
+    rows = []
+    for day in range(DAYS):
+        name = f"202401{day + 1:02d}.nc.tar.gz"
+        filing = served / f"{day}.nc"
+        filing.write_text('<SEC-DOCUMENT>' * 20000)
+        with tarfile.open(served / name, 'w:gz') as tar:
+            tar.add(filing, arcname=filing.name)
+        rows.append({'Name': name, 'File': f"{url}/{name}", 'Size': (served / name).stat().st_size})
+    return pd.DataFrame(rows)
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as temp:
+        served = Path(temp) / 'served'
+        served.mkdir()
+        server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(served))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        feed_files = make_feed_files(served, f"http://127.0.0.1:{server.server_port}")
+
+        table = Table("Feed files", "Concurrent downloads", "Extract while downloading", "Time (s)", "Downloaded",
+                      "Rerun (s)")
+        for max_downloads, stream in [(1, False), (1, True), (4, False), (4, True), (8, True)]:
+            data_directory = Path(temp) / f"filings_{max_downloads}_{stream}"
+            start = time.perf_counter()
+            summary = download_feed_files(feed_files, data_directory, max_downloads=max_downloads, stream=stream)
+            elapsed = time.perf_counter() - start
+            start = time.perf_counter()
+            download_feed_files(feed_files, data_directory, max_downloads=max_downloads, stream=stream)
+            rerun = time.perf_counter() - start
+            table.add_row(str(DAYS), str(max_downloads), str(stream), f"{elapsed:.2f}", str(len(summary.downloaded)),
+                          f"{rerun:.3f}")
+        server.shutdown()
+    print(table)
@@ -0,0 +1,46 @@
+"""
+Compare loading the financial cache of many tickers from one JSON file per ticker against the cache store.
+
+    python tests/perf/perf_financial_cache.py
+
+The JSON timing opens and parses `financial_cache_{ticker}.json` for every ticker, which is what loading the
+cache did before the store. The store timing is `FinancialCache.load_many`, one query per 500 tickers.
+The files are copies of data/financial_cache_AAPL.json under other tickers.
+"""
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from rich import print
+from rich.table import Table
+
+from pipeline.financial_cache import FinancialCache, METADATA_KEYS
+
+
+def load_json_files(directory: Path, tickers):
+    return {ticker: json.loads((directory / f"financial_cache_{ticker}.json").read_text()) for ticker in tickers}
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+if __name__ == '__main__':
+    data = json.loads(Path('data/financial_cache_AAPL.json').read_text())
+    sections = {section: value for section, value in data.items() if section not in METADATA_KEYS}
+
+    table = Table("Tickers", "JSON files (s)", "Store load_many (s)", "Speedup", "Store save (s)")
+    for count in [100, 500, 2000]:
+        tickers = [f"T{index:05d}" for index in range(count)]
+        with tempfile.TemporaryDirectory() as directory:
+            cache = FinancialCache(Path(directory))
+            save_time, _ = timed(lambda: [cache.save(ticker, sections) for ticker in tickers])
+            json_time, _ = timed(lambda: load_json_files(Path(directory), tickers))
+            store_time, loaded = timed(lambda: cache.load_many(tickers))
+            assert len(loaded) == count
+            table.add_row(str(count), f"{json_time:.3f}", f"{store_time:.3f}",
+                          f"{json_time / store_time:.1f}x", f"{save_time:.3f}")
+    print(table)
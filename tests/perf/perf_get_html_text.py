@@ -1,14 +1,48 @@
-from pyinstrument import Profiler
-from html.html_documents import HtmlDocument
+"""
+Compare the BeautifulSoup and lxml backends of Document.parse.
 
-from edgar import Filing
+    python tests/perf/perf_get_html_text.py
 
-if __name__ == '__main__':
-    filing = Filing(form='10-K', filing_date='2024-05-10',
-                    company='Arogo Capital Acquisition Corp.',
-                    cik=1881741, accession_no='0001213900-24-041641')
-    html = filing.html()
-    with Profiler() as p:
-        html_document = HtmlDocument.from_html(html, extract_data=False)
-    p.print(timeline=True)
+Each sample file is parsed with both backends and the time and node counts are printed.
+"""
+import time
+from pathlib import Path
+
+from rich import print
+from rich.table import Table
+
+from edgar.files.html import Document
+
+samples = ['data/html/Apple.10-K.html',
+           'data/html/Apple.10-Q.html',
+           'data/html/Oracle.10-Q.html',
+           'data/html/HealthPeak.424B2.html',
+           'data/html/PG&E-424B5.html',
+           'data/html/Flushing-424B4.html']
 
+
+def time_parse(html: str, parser: str, repeat: int = 3):
+    best = None
+    document = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        document = Document.parse(html, parser=parser)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, document
+
+
+if __name__ == '__main__':
+    table = Table("File", "Size (KB)", "bs4 (s)", "lxml (s)", "Speedup", "Nodes match")
+    total_bs4, total_lxml = 0.0, 0.0
+    for sample in samples:
+        html = Path(sample).read_text()
+        bs4_time, bs4_document = time_parse(html, 'bs4')
+        lxml_time, lxml_document = time_parse(html, 'lxml')
+        total_bs4 += bs4_time
+        total_lxml += lxml_time
+        nodes_match = [node.type for node in bs4_document.nodes] == [node.type for node in lxml_document.nodes]
+        table.add_row(Path(sample).name, f"{len(html) // 1024:,}", f"{bs4_time:.3f}", f"{lxml_time:.3f}",
+                      f"{bs4_time / lxml_time:.1f}x", str(nodes_match))
+    table.add_row("Total", "", f"{total_bs4:.3f}", f"{total_lxml:.3f}", f"{total_bs4 / total_lxml:.1f}x", "")
+    print(table)
@@ -0,0 +1,85 @@
+"""
+Compare fetching prices ticker by ticker with fetch_last_5_working_days_prices against PriceFetcher.
+
+    python tests/perf/perf_price_fetcher.py
+
+Both fetch from a local stub server that answers after 50ms, like a remote API. The 15 second sleeps of
+fetch_last_5_working_days_prices are skipped and PriceFetcher has no rate limit, so the timings compare a new
+client per ticker with serial requests against one pooled client with concurrent requests.
+The prices state files are written to a temporary directory.
+"""
+import json
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+from rich import print
+from rich.table import Table
+
+import pipeline.polygon
+from pipeline.polygon import PriceFetcher, fetch_last_5_working_days_prices
+
+LATENCY = 0.05
+# The sleeps of the fetch are patched out, not the latency of the server
+server_sleep = time.sleep
+
+
+class OpenCloseHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server_sleep(LATENCY)
+        content = json.dumps({'status': 'OK', 'open': 10.0, 'high': 12.0, 'low': 9.0, 'close': 11.0,
+                              'volume': 1000}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+if __name__ == '__main__':
+    server = ThreadingHTTPServer(('127.0.0.1', 0), OpenCloseHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    table = Table("Tickers", "Per ticker (s)", "PriceFetcher (s)", "Speedup", "Requests")
+    for count in [5, 20, 50]:
+        tickers = [f"T{index:03d}" for index in range(count)]
+        with tempfile.TemporaryDirectory() as directory, \
+                patch.object(pipeline.polygon, 'get_prices_state_path',
+                             lambda ticker: Path(directory) / f"prices_{ticker}.json"):
+            # Only the host of the legacy URL is replaced so it requests the stub server
+            original_client = pipeline.polygon.httpx.Client
+
+            def stub_client(*args, **kwargs):
+                return original_client(*args, base_url=base_url, **kwargs)
+
+            with patch.object(pipeline.polygon.time, 'sleep'), \
+                    patch('pipeline.polygon.fetch_with_retry',
+                          lambda client, url, params, max_retries: client.get(url.replace('https://api.massive.com', ''),
+                                                                              params=params).json()), \
+                    patch.object(pipeline.polygon.httpx, 'Client', stub_client):
+                serial_time, _ = timed(lambda: [fetch_last_5_working_days_prices(ticker, api_key='key')
+                                                for ticker in tickers])
+            for file in Path(directory).glob('prices_*.json'):
+                file.unlink()
+            with PriceFetcher(api_key='key', requests_per_minute=0, max_workers=16,
+                              url=f"{base_url}/v1/open-close/{{ticker}}/{{date}}") as fetcher:
+                fetcher_time, result = timed(lambda: fetcher.fetch_many(tickers))
+        table.add_row(str(count), f"{serial_time:.2f}", f"{fetcher_time:.2f}",
+                      f"{serial_time / fetcher_time:.1f}x", str(result['requests']))
+    print(table)
+    server.shutdown()
@@ -0,0 +1,60 @@
+"""
+Compare stitching many statements with the dict based and the columnar stitcher.
+
+    python tests/perf/perf_stitch_statements.py
+
+The statements are copies of a real statement shifted back one quarter at a time,
+so 40 filings is ten years of quarters with the line items of a large filer.
+"""
+import copy
+import time
+from datetime import timedelta
+
+from rich import print
+from rich.table import Table
+
+from edgar.xbrl import XBRL
+from edgar.xbrl.core import parse_date
+from edgar.xbrl.stitching import StatementStitcher
+
+
+def shift_period(period_id: str, quarters: int) -> str:
+    parts = period_id.split('_')
+    dates = [(parse_date(part) - timedelta(days=91 * quarters)).strftime('%Y-%m-%d') for part in parts[1:]]
+    return '_'.join([parts[0]] + dates)
+
+
+def make_statements(statement, count: int):
+    statements = []
+    for quarter in range(count):
+        shifted = copy.deepcopy(statement)
+        shifted['periods'] = {shift_period(period_id, quarter): info
+                              for period_id, info in statement['periods'].items()}
+        for item in shifted['data']:
+            for field in ['values', 'decimals']:
+                item[field] = {shift_period(period_id, quarter): value
+                               for period_id, value in item.get(field, {}).items()}
+        statements.append(shifted)
+    return statements
+
+
+def timed_stitch(statements, columnar: bool):
+    start = time.perf_counter()
+    result = StatementStitcher().stitch_statements(statements, max_periods=len(statements), columnar=columnar)
+    return time.perf_counter() - start, result
+
+
+if __name__ == '__main__':
+    xbrl = XBRL.parse_directory('tests/fixtures/xbrl2/msft/10k_2015')
+
+    table = Table("Statement", "Filings", "Line items", "dict (s)", "columnar (s)", "Speedup", "Same output")
+    for statement_type in ['IncomeStatement', 'BalanceSheet', 'CashFlowStatement']:
+        statement = xbrl.get_statement_by_type(statement_type)
+        for count in [10, 20, 40]:
+            statements = make_statements(statement, count)
+            dict_time, dict_result = timed_stitch(copy.deepcopy(statements), columnar=False)
+            columnar_time, columnar_result = timed_stitch(copy.deepcopy(statements), columnar=True)
+            table.add_row(statement_type, str(count), str(len(columnar_result['statement_data'])),
+                          f"{dict_time:.3f}", f"{columnar_time:.3f}", f"{dict_time / columnar_time:.1f}x",
+                          str(dict_result == columnar_result))
+    print(table)
@@ -0,0 +1,86 @@
+"""
+Compare reading company submissions from json files with reading them from the Parquet submissions store.
+
+    python tests/perf/perf_submissions_store.py
+
+The entities are copies of data/company_submission.json with different ciks and exchanges.
+The json timings parse the submissions file of each company the way `load_company_submissions_from_local` does.
+"""
+import json
+import random
+import tempfile
+import time
+from datetime import date
+import zipfile
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from rich import print
+from rich.table import Table
+
+from edgar.entity.data import parse_entity_submissions
+from edgar.entity.submissions_store import build_submissions_store
+
+ENTITIES = 1000
+LOOKUPS = 50
+EXCHANGES = ['Nasdaq', 'NYSE', 'OTC', None]
+
+
+def make_submissions(directory: Path) -> Path:
+    submissions = json.loads(Path('data/company_submission.json').read_text())
+    submissions_zip = directory / 'submissions.zip'
+    with zipfile.ZipFile(submissions_zip, 'w', compression=zipfile.ZIP_DEFLATED) as z:
+        for cik in range(1, ENTITIES + 1):
+            exchange = EXCHANGES[cik % len(EXCHANGES)]
+            entity = dict(submissions, cik=f"{cik:010d}", name=f"COMPANY {cik}", exchanges=[exchange] if exchange else [])
+            z.writestr(f"CIK{cik:010d}.json", json.dumps(entity))
+    return submissions_zip
+
+
+def json_company(directory: Path, cik: int):
+    return parse_entity_submissions(json.loads((directory / f"CIK{cik:010d}.json").read_text()))
+
+
+def json_cross_company(directory: Path):
+    tables = []
+    for path in directory.glob('CIK*.json'):
+        company_data = parse_entity_submissions(json.loads(path.read_text()))
+        if 'Nasdaq' not in company_data.exchanges:
+            continue
+        filings = company_data.filings.data
+        mask = pc.and_(pc.equal(filings['form'], '8-K'),
+                       pc.and_(pc.greater_equal(filings['filing_date'], pa.scalar(date(2022, 1, 1))),
+                               pc.less_equal(filings['filing_date'], pa.scalar(date(2022, 12, 31)))))
+        tables.append(filings.filter(mask))
+    return pa.concat_tables(tables)
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as temp:
+        temp = Path(temp)
+        submissions_zip = make_submissions(temp)
+        json_directory = temp / 'submissions'
+        extract_time, _ = timed(lambda: zipfile.ZipFile(submissions_zip).extractall(json_directory))
+        build_time, store = timed(lambda: build_submissions_store(submissions_zip, temp / 'submissions_store'))
+        ciks = random.Random(0).sample(range(1, ENTITIES + 1), LOOKUPS)
+
+        json_lookup, _ = timed(lambda: [json_company(json_directory, cik) for cik in ciks])
+        store_lookup, _ = timed(lambda: [store.get_company_data(cik) for cik in ciks])
+        json_query, json_filings = timed(lambda: json_cross_company(json_directory))
+        store_query, store_filings = timed(lambda: store.get_filings(form='8-K', filing_date='2022-01-01:2022-12-31',
+                                                                     exchange='Nasdaq'))
+
+    table = Table("Operation", "json files (s)", "Submissions store (s)", "Speedup", "Rows")
+    table.add_row(f"Prepare {ENTITIES} entities", f"{extract_time:.2f} (extract)", f"{build_time:.2f} (build)", "", "")
+    table.add_row(f"{LOOKUPS} company lookups", f"{json_lookup:.3f}", f"{store_lookup:.3f}",
+                  f"{json_lookup / store_lookup:.1f}x", "")
+    table.add_row("Nasdaq 8-Ks in 2022", f"{json_query:.3f}", f"{store_query:.3f}",
+                  f"{json_query / store_query:.1f}x", f"{len(json_filings)} / {len(store_filings)}")
+    print(table)
@@ -0,0 +1,60 @@
+"""
+Compare parsing and holding many XBRL filings with and without the shared taxonomy catalog.
+
+    python tests/perf/perf_taxonomy_catalog.py
+
+- per filing : every filing has its own ElementCatalog for each standard element, the old behaviour
+- shared     : standard elements with the same labels are shared through the TaxonomyCatalog
+"""
+import gc
+import time
+import tracemalloc
+from pathlib import Path
+
+from rich import print
+from rich.table import Table
+
+from edgar.xbrl.parser import XBRLParser
+from edgar.xbrl.taxonomy_catalog import TaxonomyCatalog
+
+fixtures = [directory for directory in sorted(Path('tests/fixtures/xbrl2').glob('*/*'))
+            if directory.is_dir() and list(directory.glob('*_lab.xml'))]
+
+
+def parse_element_catalogs(taxonomy_catalog: TaxonomyCatalog):
+    """Parse the schema and label linkbase of every filing, which is what builds the element catalog"""
+    parsers = []
+    for directory in fixtures:
+        parser = XBRLParser(taxonomy_catalog=taxonomy_catalog)
+        for schema_file in directory.glob('*.xsd'):
+            parser.parse_schema(schema_file)
+        for label_file in directory.glob('*_lab.xml'):
+            parser.parse_labels(label_file)
+        parsers.append(parser)
+    return parsers
+
+
+def measure(taxonomy_catalog: TaxonomyCatalog):
+    start = time.perf_counter()
+    parse_element_catalogs(taxonomy_catalog)
+    elapsed = time.perf_counter() - start
+
+    taxonomy_catalog.clear()
+    gc.collect()
+    tracemalloc.start()
+    parsers = parse_element_catalogs(taxonomy_catalog)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    elements = sum(len(parser.element_catalog) for parser in parsers)
+    return elapsed, retained, elements, parsers
+
+
+if __name__ == '__main__':
+    table = Table("Mode", "Filings", "Elements", "Time (s)", "Retained (MB)", "Shared entries")
+    for mode, taxonomy_catalog in [("per filing", TaxonomyCatalog(enabled=False)),
+                                   ("shared", TaxonomyCatalog())]:
+        elapsed, retained, elements, parsers = measure(taxonomy_catalog)
+        table.add_row(mode, str(len(parsers)), str(elements), f"{elapsed:.3f}", f"{retained / 1024 / 1024:.1f}",
+                      f"{len(taxonomy_catalog)} ({taxonomy_catalog.hits} reused)")
+        del parsers
+    print(table)
@@ -0,0 +1,70 @@
+"""
+Compare the memory of XBRL contexts as Context models and in the ContextTable,
+and finding the facts of every element by scanning all contexts and with the integer keyed fact index.
+
+    python tests/perf/perf_xbrl_contexts.py
+"""
+import gc
+import time
+import tracemalloc
+
+from rich import print
+from rich.table import Table
+
+from edgar.xbrl import XBRL
+from edgar.xbrl.models import Context, ContextTable
+
+fixtures = ['tests/fixtures/xbrl2/aapl/10k_2015',
+            'tests/fixtures/xbrl2/ba/10k_2024',
+            'tests/fixtures/xbrl2/msft/10k_2015',
+            'tests/fixtures/xbrl2/pg/10k_2023']
+
+
+def retained_memory(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retained, result
+
+
+def as_models(contexts: ContextTable):
+    return {context_id: Context(**context.model_dump()) for context_id, context in contexts.items()}
+
+
+def as_table(contexts: ContextTable):
+    table = ContextTable()
+    for context_id, context in contexts.items():
+        table.add(context_id, dict(context.entity), dict(context.period), dict(context.dimensions))
+    return table
+
+
+def scan_contexts(xbrl: XBRL, elements):
+    # How facts were found for each statement line item before the fact index
+    for element_id in elements:
+        [xbrl.parser.get_fact(element_id, context_id) for context_id in xbrl.contexts]
+
+
+def fact_index(xbrl: XBRL, elements):
+    for element_id in elements:
+        xbrl.parser.get_element_facts(element_id)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    table = Table("Filing", "Contexts", "Periods", "Models (KB)", "Table (KB)", "Elements", "Scan (s)", "Index (s)")
+    for fixture in fixtures:
+        xbrl = XBRL.parse_directory(fixture)
+        model_memory, _ = retained_memory(lambda: as_models(xbrl.contexts))
+        table_memory, _ = retained_memory(lambda: as_table(xbrl.contexts))
+        elements = list(xbrl.element_catalog)
+        table.add_row(fixture.split('xbrl2/')[1], str(len(xbrl.contexts)), str(xbrl.contexts.period_count),
+                      f"{model_memory / 1024:.0f}", f"{table_memory / 1024:.0f}", str(len(elements)),
+                      f"{timed(scan_contexts, xbrl, elements):.3f}", f"{timed(fact_index, xbrl, elements):.3f}")
+    print(table)
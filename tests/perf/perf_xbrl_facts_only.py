@@ -0,0 +1,50 @@
+"""
+Time loading XBRL filings and getting their facts with all the documents and with only some of them.
+
+    python tests/perf/perf_xbrl_facts_only.py
+
+- all               : parse the schema, every linkbase and the instance, the default
+- instance + labels : XBRL.parse_directory(directory, parts=['instance', 'label'])
+- instance          : XBRL.parse_directory(directory, parts=['instance'])
+
+The calculation linkbase is always parsed with the instance so the fact values have their calculation weights.
+XBRL.from_filing(filing, parts=...) parses the same documents.
+"""
+import time
+
+from rich import print
+from rich.table import Table
+
+from edgar.xbrl import XBRL
+
+fixtures = ['tests/fixtures/xbrl2/aapl/10k_2023',
+            'tests/fixtures/xbrl2/ba/10k_2024',
+            'tests/fixtures/xbrl2/msft/10k_2015',
+            'tests/fixtures/xbrl2/nflx/10k_2024',
+            'tests/fixtures/xbrl2/nvda/10k_2024',
+            'tests/fixtures/xbrl2/pg/10k_2023']
+
+modes = {'all': None,
+         'instance + labels': ['instance', 'label'],
+         'instance': ['instance']}
+
+
+def load_facts(directory: str, parts):
+    start = time.perf_counter()
+    xbrl = XBRL.parse_directory(directory, parts=parts)
+    xbrl.facts.to_dataframe()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    table = Table("Filing", *[f"{mode} (s)" for mode in modes], "Saved")
+    totals = dict.fromkeys(modes, 0.0)
+    for fixture in fixtures:
+        timings = {mode: min(load_facts(fixture, parts) for _ in range(3)) for mode, parts in modes.items()}
+        for mode, elapsed in timings.items():
+            totals[mode] += elapsed
+        table.add_row(fixture.split('xbrl2/')[1], *[f"{elapsed:.3f}" for elapsed in timings.values()],
+                      f"{1 - timings['instance + labels'] / timings['all']:.0%}")
+    table.add_row("total", *[f"{elapsed:.3f}" for elapsed in totals.values()],
+                  f"{1 - totals['instance + labels'] / totals['all']:.0%}")
+    print(table)
@@ -0,0 +1,60 @@
+"""
+Compare loading XBRL documents one after the other and concurrently with parallel=True.
+
+    python tests/perf/perf_xbrl_parallel_parse.py
+
+- local files   : XBRL.parse_directory(directory) and XBRL.parse_directory(directory, parallel=True)
+- with download : the same documents with a delay before each one is read, like XBRL.from_filing
+                  downloading the attachments
+
+Parsing the documents overlaps only when there is more than one cpu. Downloads overlap on any host.
+"""
+import os
+import time
+
+from rich import print
+from rich.table import Table
+
+from edgar.xbrl import XBRL
+from edgar.xbrl.parser import XBRLParser
+
+fixtures = ['tests/fixtures/xbrl2/aapl/10k_2023',
+            'tests/fixtures/xbrl2/ba/10k_2024',
+            'tests/fixtures/xbrl2/msft/10k_2015',
+            'tests/fixtures/xbrl2/nvda/10k_2024',
+            'tests/fixtures/xbrl2/pg/10k_2023']
+
+download_delay = 0.1
+
+
+def downloaded(file_path):
+    def read():
+        time.sleep(download_delay)
+        return file_path.read_text()
+    return read
+
+
+def load_local(directory: str, parallel: bool):
+    start = time.perf_counter()
+    XBRL.parse_directory(directory, parallel=parallel)
+    return time.perf_counter() - start
+
+
+def load_downloaded(directory: str, parallel: bool):
+    start = time.perf_counter()
+    xbrl = XBRL()
+    xbrl._load_parts({part: downloaded(file_path)
+                      for part, file_path in XBRLParser.find_xbrl_files(directory).items()}, parallel=parallel)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    print(f"{os.cpu_count()} cpus")
+    table = Table("Filing", "local (s)", "local parallel (s)", "download (s)", "download parallel (s)")
+    for fixture in fixtures:
+        table.add_row(fixture.split('xbrl2/')[1],
+                      f"{min(load_local(fixture, False) for _ in range(3)):.3f}",
+                      f"{min(load_local(fixture, True) for _ in range(3)):.3f}",
+                      f"{load_downloaded(fixture, False):.3f}",
+                      f"{load_downloaded(fixture, True):.3f}")
+    print(table)
@@ -1,18 +1,50 @@
-from edgar.legacy.xbrl import XBRLInstance
-from pathlib import Path
+"""
+Time rendering the primary statements with standard=True and then querying facts.
 
-from edgar import *
-from pyinstrument import Profiler
+    python tests/perf/perf_xbrl_query_facts.py
 
-if __name__ == '__main__':
-    filing = Filing(company='Tesla, Inc.', cik=1318605,
-                    form='10-K', filing_date='2024-01-29',
-                    accession_no='0001628280-24-002390')
-    instance = XBRLInstance.parse(Path('data/xbrl/datafiles/aapl/aapl-20230930_htm.xml').read_text())
+- rebuild : clear the facts cache after each standardized statement, which is how standardized labels used to be applied
+- overlay : standardized labels are overlaid on the cached facts by FactsView.apply_standard_labels
+"""
+import time
+
+from rich import print
+from rich.table import Table
+
+from edgar.xbrl import XBRL
 
+fixtures = ['tests/fixtures/xbrl2/aapl/10k_2023',
+            'tests/fixtures/xbrl2/ba/10k_2024',
+            'tests/fixtures/xbrl2/msft/10k_2015',
+            'tests/fixtures/xbrl2/pg/10k_2023']
 
-    with Profiler(async_mode=True) as p:
-        revenue = instance.query_facts('us-gaap:Revenue')
+statement_types = ['BalanceSheet', 'IncomeStatement', 'CashFlowStatement',
+                   'StatementOfEquity', 'ComprehensiveIncome']
 
-    p.print()
 
+def render_and_query(xbrl: XBRL, rebuild: bool):
+    xbrl.facts.get_facts()
+    for statement_type in statement_types:
+        try:
+            xbrl.render_statement(statement_type, standard=True)
+        except Exception:
+            continue
+        if rebuild:
+            xbrl.facts.clear_cache()
+        xbrl.query().by_label("Revenue").execute()
+    return xbrl.query().by_label("Revenue", exact=True).to_dataframe()
+
+
+if __name__ == '__main__':
+    table = Table("Filing", "Facts", "rebuild (s)", "overlay (s)", "Speedup")
+    for fixture in fixtures:
+        timings = {}
+        for mode in ['rebuild', 'overlay']:
+            xbrl = XBRL.parse_directory(fixture)
+            start = time.perf_counter()
+            render_and_query(xbrl, rebuild=mode == 'rebuild')
+            timings[mode] = time.perf_counter() - start
+        table.add_row(fixture.split('xbrl2/')[1], str(len(xbrl.facts)),
+                      f"{timings['rebuild']:.3f}", f"{timings['overlay']:.3f}",
+                      f"{timings['rebuild'] / timings['overlay']:.1f}x")
+    print(table)
@@ -110,3 +110,142 @@ def test_current_filings_with_no_results():
     assert isinstance(filings, CurrentFilings)
     assert filings.start_date is None
     assert filings.end_date is None
+
+
+def _current_feed(entries):
+    """An Atom page of the current filings feed with (form, company, cik, accession number) entries"""
+    xml_entries = "".join(
+        f"<entry><title>{form} - {company} ({cik:010d}) (Filer)</title>"
+        f"<summary type=\"html\"> &lt;b&gt;Filed:&lt;/b&gt; 2025-01-08 &lt;b&gt;AccNo:&lt;/b&gt; {accession_number} "
+        f"&lt;b&gt;Size:&lt;/b&gt; 5 KB</summary></entry>"
+        for form, company, cik, accession_number in entries)
+    return ('<?xml version="1.0" encoding="ISO-8859-1" ?>'
+            f'<feed xmlns="http://www.w3.org/2005/Atom"><title>Latest Filings</title>{xml_entries}</feed>').encode()
+
+
+def test_parse_current_entries():
+    from edgar._filings import parse_current_entries
+    entries = parse_current_entries(_current_feed([('8-K', 'ACORN ENERGY, INC.', 880984, '0001493152-25-001317'),
+                                                   ('4', 'WILKS LEWIS', 1076463, '0001076463-25-000001')]))
+    assert entries == [{'form': '8-K', 'company': 'ACORN ENERGY, INC.', 'cik': '0000880984',
+                        'filing_date': datetime.date(2025, 1, 8), 'accession_number': '0001493152-25-001317'},
+                       {'form': '4', 'company': 'WILKS LEWIS', 'cik': '0001076463',
+                        'filing_date': datetime.date(2025, 1, 8), 'accession_number': '0001076463-25-000001'}]
+    assert parse_current_entries(_current_feed([])) == []
+
+
+def test_get_current_filings_reads_the_latest_first_page(monkeypatch, request):
+    from types import SimpleNamespace
+    from urllib.parse import parse_qs, urlparse
+    import edgar._filings
+    from edgar._filings import get_current_entries_on_page
+    get_current_entries_on_page.cache_clear()
+    request.addfinalizer(get_current_entries_on_page.cache_clear)
+    feed = [('8-K', f'COMPANY {i}', 1000 + i, f'0000000001-25-{i:06d}') for i in range(30, 0, -1)]
+    starts = []
+
+    def get_feed_page(url):
+        start = int(parse_qs(urlparse(url).query)['start'][0])
+        starts.append(start)
+        return SimpleNamespace(content=_current_feed(feed[max(start - 1, 0):max(start - 1, 0) + 10]))
+
+    monkeypatch.setattr(edgar._filings, 'get_with_retry', get_feed_page)
+    filings = get_current_filings(page_size=10)
+    assert filings.next() is not None
+    assert len(get_current_filings(page_size=10)) == 10
+    # A new call reads the first page again, while the pages already read by other calls stay cached
+    assert filings.previous() is not None and filings.next() is not None
+    assert starts == [0, 11, 0, 1]
+
+
+def test_current_filings_tailer_yields_only_new_filings(monkeypatch):
+    import asyncio
+    import threading
+    import httpx
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import parse_qs, urlparse
+    import edgar.current_feed
+    from edgar.current_feed import CurrentFilingsTailer
+
+    # The feed, newest first, served in pages of 10 with an ETag
+    feed = [('8-K', f'COMPANY {i}', 1000 + i, f'0000000001-25-{i:06d}') for i in range(5, 0, -1)]
+    requests = []
+    # Pages that fail once with a server error
+    failing_pages = set()
+
+    class FeedHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            start = int(parse_qs(urlparse(self.path).query)['start'][0])
+            etag = f'"{len(feed)}"'
+            requests.append((start, self.headers.get('If-None-Match')))
+            if start == 0 and self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            if start in failing_pages:
+                failing_pages.discard(start)
+                self.send_response(500)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            content = _current_feed(feed[start:start + 10])
+            self.send_response(200)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FeedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    monkeypatch.setattr(edgar.current_feed, 'get_current_url',
+                        lambda atom, count, start, form, owner: f"{url}/current?count={count}&start={start}")
+
+    async def poll(tailer, times):
+        async with edgar.current_feed.async_http_client() as client:
+            return [[filing.accession_no for filing in await tailer.poll(client)] for _ in range(times)]
+
+    try:
+        tailer = CurrentFilingsTailer(form='8-K', page_size=10)
+        # A failed first poll does not count, so the filings already in the feed are not returned as new
+        failing_pages.add(0)
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(poll(tailer, 1))
+        requests.clear()
+
+        # The filings already in the feed are only marked as seen, and the unchanged feed is not modified
+        assert asyncio.run(poll(tailer, 2)) == [[], []]
+        assert tailer.not_modified == 1
+        assert requests == [(0, None), (0, '"5"')]
+
+        # More new filings than fit on a page are read from the next pages and returned oldest first
+        feed[:0] = [('8-K', f'COMPANY {i}', 1000 + i, f'0000000001-25-{i:06d}') for i in range(30, 5, -1)]
+        requests.clear()
+        new_filings, = asyncio.run(poll(tailer, 1))
+        assert new_filings == [f'0000000001-25-{i:06d}' for i in range(6, 31)]
+        assert [start for start, _ in requests] == [0, 10, 20]
+
+        # A poll that fails on a later page does not keep the ETag, so the next poll reads the new filings
+        feed[:0] = [('8-K', f'COMPANY {i}', 1000 + i, f'0000000001-25-{i:06d}') for i in range(40, 30, -1)]
+        failing_pages.add(10)
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(poll(tailer, 1))
+        new_filings, = asyncio.run(poll(tailer, 1))
+        assert new_filings == [f'0000000001-25-{i:06d}' for i in range(31, 41)]
+
+        # With include_existing the filings in the feed are yielded by the async iterator
+        tailer = CurrentFilingsTailer(page_size=10, max_pages=2, include_existing=True)
+
+        async def tail():
+            return [(filing.accession_no, filing.cik, filing.company, filing.form)
+                    async for filing in tailer.tail(max_polls=1)]
+
+        filings = asyncio.run(tail())
+        assert [accession_number for accession_number, *_ in filings] == [f'0000000001-25-{i:06d}'
+                                                                          for i in range(21, 41)]
+        assert filings[-1] == ('0000000001-25-000040', 1040, 'COMPANY 40', '8-K')
+    finally:
+        server.shutdown()
@@ -0,0 +1,97 @@
+from pathlib import Path
+
+from edgar.documentcache import DocumentCache, MB, get_document_cache, configure_document_cache, SUBMISSION_TEXT
+from edgar.sgml import FilingSGML
+from edgar import Filing
+
+
+def test_document_cache_memory_tier():
+    cache = DocumentCache(memory_limit=MB, disk_limit=0)
+    assert cache.get('0001104659-25-002604', 'aapl.htm') is None
+    cache.put('0001104659-25-002604', 'aapl.htm', '<html></html>')
+
+    # Accession numbers with and without dashes are the same key
+    assert cache.get('000110465925002604', 'aapl.htm') == '<html></html>'
+    assert ('0001104659-25-002604', 'aapl.htm') in cache
+
+    stats = cache.get_stats()
+    assert stats.memory_hits == 1
+    assert stats.misses == 1
+    assert stats.hit_rate == 0.5
+
+
+def test_document_cache_evicts_least_recently_used():
+    cache = DocumentCache(memory_limit=100, disk_limit=0)
+    cache.put('1', 'a.htm', 'a' * 40)
+    cache.put('1', 'b.htm', 'b' * 40)
+    assert cache.get('1', 'a.htm')  # a is now most recently used
+    cache.put('1', 'c.htm', 'c' * 40)
+    assert cache.get('1', 'b.htm') is None
+    assert cache.get('1', 'a.htm')
+    assert cache.get('1', 'c.htm')
+    assert cache.get_stats().evictions == 1
+
+    # Content larger than the memory tier is not cached
+    cache.put('1', 'big.htm', 'x' * 200)
+    assert cache.get('1', 'big.htm') is None
+
+
+def test_document_cache_disk_tier(tmp_path):
+    cache = DocumentCache(memory_limit=MB, disk_limit=MB, cache_directory=tmp_path)
+    cache.put('0001104659-25-002604', 'aapl.htm', '<html>apple</html>')
+    cache.put('0001104659-25-002604', 'logo.jpg', b'\x89binary')
+    assert list(tmp_path.rglob('*.gz'))
+
+    # A new cache over the same directory is served from disk
+    cache = DocumentCache(memory_limit=MB, disk_limit=MB, cache_directory=tmp_path)
+    assert cache.get('0001104659-25-002604', 'aapl.htm') == '<html>apple</html>'
+    assert cache.get('0001104659-25-002604', 'logo.jpg') == b'\x89binary'
+    assert cache.get_stats().disk_hits == 2
+
+    cache.clear(disk=True)
+    assert not list(tmp_path.rglob('*.gz'))
+
+
+def test_document_cache_disk_tier_eviction(tmp_path):
+    cache = DocumentCache(memory_limit=0, disk_limit=2000, cache_directory=tmp_path)
+    for i in range(10):
+        # random-ish content does not compress well
+        cache.put('1', f'doc{i}.htm', ''.join(chr(33 + (i * 7919 + j * 104729) % 90) for j in range(500)))
+    total = sum(path.stat().st_size for path in tmp_path.rglob('*.gz'))
+    assert total <= 2000
+    assert cache.get('1', 'doc9.htm') is not None
+
+
+def test_get_or_fetch_only_fetches_once():
+    cache = DocumentCache(memory_limit=MB, disk_limit=0)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return "content"
+
+    assert cache.get_or_fetch('1', 'doc.htm', fetch) == "content"
+    assert cache.get_or_fetch('1', 'doc.htm', fetch) == "content"
+    assert len(calls) == 1
+
+
+def test_filing_sgml_from_filing_uses_document_cache():
+    submission_text = Path('data/sgml/0001104659-25-002604.txt').read_text()
+    filing = Filing.from_sgml('data/sgml/0001104659-25-002604.txt')
+    get_document_cache().put(filing.accession_no, SUBMISSION_TEXT, submission_text)
+
+    # No network access is needed because the submission is in the cache
+    filing_sgml = FilingSGML.from_filing(filing)
+    assert filing_sgml.accession_number == '0001104659-25-002604'
+    assert filing.sgml().html() == filing_sgml.html()
+
+
+def test_configure_document_cache():
+    cache = get_document_cache()
+    memory_limit, disk_limit = cache.memory_limit, cache.disk_limit
+    try:
+        configure_document_cache(memory_mb=1, disk_mb=0)
+        assert cache.memory_limit == MB
+        assert not cache.disk_enabled
+    finally:
+        cache.memory_limit, cache.disk_limit = memory_limit, disk_limit
@@ -149,4 +149,52 @@ def test_company_filing_acceptance_datetime():
     c = Company(1318605)
     assert c.get_filings().data['acceptanceDateTime']
     acceptance_datetime = c.get_filings().data['acceptanceDateTime'][0].as_py()
-    assert isinstance(acceptance_datetime, datetime)
\ No newline at end of file
+    assert isinstance(acceptance_datetime, datetime)
+
+def test_submissions_store_reads_company_and_cross_company_filings(tmp_path, monkeypatch, request):
+    import zipfile
+    from edgar.core import get_edgar_data_directory
+    from edgar.entity.data import extract_company_filings_table
+    from edgar.entity.submissions_store import SubmissionsStore, build_submissions_store
+    tsla_submissions = json.loads(Path("data/company_submission.json").read_text())
+    recent = tsla_submissions['filings']['recent']
+    # An older page of filings, and another company listed on the NYSE
+    older = {column: values[-10:] for column, values in recent.items()}
+    older['accessionNumber'] = [f"0000000000-12-{number:06d}" for number in range(10)]
+    older['filingDate'] = [f"2012-01-{day + 1:02d}" for day in range(10)]
+    other = dict(tsla_submissions, cik='0000000001', name='OTHER CO', exchanges=['NYSE'], tickers=['OTHR'])
+    other['filings'] = {'recent': {column: values[:50] for column, values in recent.items()}, 'files': []}
+
+    submissions_zip = tmp_path / 'submissions.zip'
+    with zipfile.ZipFile(submissions_zip, 'w') as z:
+        z.writestr('CIK0001318605.json', json.dumps(tsla_submissions))
+        z.writestr('CIK0001318605-submissions-001.json', json.dumps(older))
+        z.writestr('CIK0000000001.json', json.dumps(other))
+
+    store = build_submissions_store(submissions_zip, tmp_path / 'submissions_store', batch_size=2)
+    assert len(store) == 2
+
+    filings = store.get_company_filings(1318605)
+    assert len(filings) == len(recent['accessionNumber']) + 10
+    assert filings.slice(0, len(recent['accessionNumber'])).equals(extract_company_filings_table(recent))
+    assert filings['accession_number'][-1].as_py() == '0000000000-12-000000'
+
+    nasdaq_8ks = store.get_filings(form='8-K', filing_date='2022-01-01:2022-12-31', exchange='nasdaq')
+    assert len(nasdaq_8ks) == sum(1 for form, filing_date in zip(recent['form'], recent['filingDate'])
+                                  if form == '8-K' and filing_date.startswith('2022'))
+    assert set(nasdaq_8ks.data['company'].to_pylist()) == {tsla_submissions['name']}
+    assert len(store.get_filings(ticker='OTHR')) == 50
+    assert len(store.get_filings(cik=[1, 1318605], filing_date='2012-01-05')) == 1
+
+    # Company data is read from the store with local storage
+    monkeypatch.setenv('EDGAR_LOCAL_DATA_DIR', str(tmp_path))
+    monkeypatch.setenv('EDGAR_USE_LOCAL_DATA', "1")
+    get_edgar_data_directory.cache_clear()
+    get_entity_submissions.cache_clear()
+    request.addfinalizer(get_edgar_data_directory.cache_clear)
+    request.addfinalizer(get_entity_submissions.cache_clear)
+    assert SubmissionsStore.exists()
+    company_data = get_entity_submissions(1318605)
+    assert company_data.name == tsla_submissions['name']
+    assert len(company_data.get_filings()) == len(filings)
+    assert len(company_data.get_filings(form='10-K')) == sum(1 for form in recent['form'] if form == '10-K')
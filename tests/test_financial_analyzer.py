@@ -118,7 +118,7 @@ class TestCacheFunctions:
     
     def test_save_and_load_cache(self, tmp_path):
         """Test saving and loading cache"""
-        # Mock the cache path to use temp directory
+        # Mock the cache directory to use temp directory
         test_data = {
             'roic_history': {
                 'years': [2021, 2022, 2023],
@@ -126,13 +126,13 @@ class TestCacheFunctions:
             }
         }
         
-        with patch('pipeline.financial_analyzer.get_cache_path') as mock_path:
-            cache_file = tmp_path / 'financial_cache_TEST.json'
-            mock_path.return_value = cache_file
+        with patch('pipeline.financial_analyzer.get_cache_directory', return_value=tmp_path):
+            cache_file = get_cache_path('TEST')
             
             # Save cache
             save_to_cache('TEST', test_data)
             assert cache_file.exists()
+            assert (tmp_path / 'financial_cache.sqlite').exists()
             
             # Load cache
             loaded = load_from_cache('TEST')
@@ -142,20 +142,18 @@ class TestCacheFunctions:
     
     def test_load_cache_missing_file(self, tmp_path):
         """Test loading cache when file doesn't exist"""
-        with patch('pipeline.financial_analyzer.get_cache_path') as mock_path:
-            cache_file = tmp_path / 'missing_cache.json'
-            mock_path.return_value = cache_file
-            
+        with patch('pipeline.financial_analyzer.get_cache_directory', return_value=tmp_path):
             loaded = load_from_cache('MISSING')
             assert loaded is None
+            # Reading does not create the store
+            assert not (tmp_path / 'financial_cache.sqlite').exists()
     
     def test_cache_expiry(self, tmp_path):
         """Test that old cache is not loaded"""
         from datetime import datetime, timedelta
         
-        with patch('pipeline.financial_analyzer.get_cache_path') as mock_path:
-            cache_file = tmp_path / 'old_cache.json'
-            mock_path.return_value = cache_file
+        with patch('pipeline.financial_analyzer.get_cache_directory', return_value=tmp_path):
+            cache_file = tmp_path / 'financial_cache_OLD.json'
             
             # Create cache with old date
             old_date = (datetime.now() - timedelta(days=100)).isoformat()
@@ -170,6 +168,81 @@ class TestCacheFunctions:
             # Should not load old cache
             loaded = load_from_cache('OLD')
             assert loaded is None
+    
+    def test_import_json_cache_files(self, tmp_path):
+        """Test that the JSON cache files are imported when the store is created"""
+        from datetime import datetime, timedelta
+        
+        cached_at = (datetime.now() - timedelta(days=10)).isoformat()
+        (tmp_path / 'financial_cache_AAPL.json').write_text(json.dumps({
+            'cache_date': cached_at,
+            'ticker': 'AAPL',
+            'roic_history': {'years': [2023]},
+            'wacc_components': {'cost_of_equity': 0.09},
+        }))
+        
+        with patch('pipeline.financial_analyzer.get_cache_directory', return_value=tmp_path):
+            loaded = load_from_cache('AAPL')
+        assert loaded == {'roic_history': {'years': [2023]}, 'wacc_components': {'cost_of_equity': 0.09}}
+    
+    def test_sections_are_saved_separately(self, tmp_path):
+        """Test that saving a section keeps the other sections of the ticker and exports all of them"""
+        with patch('pipeline.financial_analyzer.get_cache_directory', return_value=tmp_path):
+            save_to_cache('TEST', {'roic_history': {'years': [2023]}})
+            save_to_cache('TEST', {'wacc_components': {'cost_of_equity': 0.09}})
+            loaded = load_from_cache('TEST')
+        
+        assert set(loaded) == {'roic_history', 'wacc_components'}
+        export = json.loads((tmp_path / 'financial_cache_TEST.json').read_text())
+        assert export['ticker'] == 'TEST'
+        assert export['roic_history'] == {'years': [2023]}
+        assert set(export['cache_sections']) == {'roic_history', 'wacc_components'}
+    
+    def test_cache_invalidated_by_new_10k(self, tmp_path):
+        """Test that sections calculated from an older 10-K are not loaded"""
+        with patch('pipeline.financial_analyzer.get_cache_directory', return_value=tmp_path):
+            save_to_cache('TEST', {'roic_history': {'years': [2023]}}, accession='0000000001-24-000001')
+            
+            assert load_from_cache('TEST', accession='0000000001-24-000001') is not None
+            assert load_from_cache('TEST', accession='0000000001-25-000001') is None
+            # Without the latest accession only the TTL is checked
+            assert load_from_cache('TEST') is not None
+    
+    def test_section_ttls(self, tmp_path):
+        """Test that each section has its own TTL"""
+        from datetime import datetime, timedelta
+        from pipeline.financial_cache import FinancialCache
+        
+        cache = FinancialCache(tmp_path, ttls={'spread_result': timedelta(days=1)})
+        now = datetime.now()
+        cached_at = (now - timedelta(days=2)).isoformat()
+        assert cache.is_fresh('roic_history', cached_at, None, now=now)
+        assert not cache.is_fresh('spread_result', cached_at, None, now=now)
+    
+    def test_load_many_from_cache(self, tmp_path):
+        """Test loading the cache of many tickers at once"""
+        from pipeline.financial_analyzer import load_many_from_cache
+        
+        with patch('pipeline.financial_analyzer.get_cache_directory', return_value=tmp_path):
+            for ticker in ['AAA', 'BBB', 'CCC']:
+                save_to_cache(ticker, {'roic_history': {'ticker': ticker}}, accession=f"{ticker}-1")
+            loaded = load_many_from_cache(['AAA', 'BBB', 'CCC', 'DDD'], accessions={'BBB': 'BBB-2'})
+        
+        assert loaded == {'AAA': {'roic_history': {'ticker': 'AAA'}}, 'CCC': {'roic_history': {'ticker': 'CCC'}}}
+    
+    def test_concurrent_saves(self, tmp_path):
+        """Test that workers saving sections of the same ticker at the same time keep every section"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        sections = [f"section_{index}" for index in range(20)]
+        with patch('pipeline.financial_analyzer.get_cache_directory', return_value=tmp_path):
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(lambda section: save_to_cache('TEST', {section: {'name': section}}), sections))
+            loaded = load_from_cache('TEST')
+        
+        assert set(loaded) == set(sections)
+        export = json.loads((tmp_path / 'financial_cache_TEST.json').read_text())
+        assert set(export['cache_sections']) == set(sections)
 
 
 class TestExtractXBRLValue:
@@ -774,3 +847,101 @@ def test_calculate_spread_google_real_data():
         assert len(spread_result.years) >= 3
         # Google typically has positive spread
         assert spread_result.current_spread > 0
+
+
+def _company_facts_json(cik, name, reports):
+    """
+    Company facts JSON with a 10-K per (fiscal year, filed, values) report. Each 10-K also reports
+    the values of the prior year as comparatives, like real 10-Ks, and a 10-Q is added for each year
+    """
+    facts = {}
+
+    def add(concept, start, end, val, accn, fy, form, filed):
+        fact = facts.setdefault(concept, {'label': concept, 'description': concept, 'units': {'USD': []}})
+        entry = {'end': end, 'val': val, 'accn': accn, 'fy': fy, 'fp': 'FY', 'form': form, 'filed': filed}
+        if start:
+            entry['start'] = start
+        fact['units']['USD'].append(entry)
+
+    balance_concepts = {'Assets', 'CashAndCashEquivalentsAtCarryingValue', 'LiabilitiesCurrent', 'DebtCurrent',
+                        'LongTermDebt', 'StockholdersEquity'}
+    previous = None
+    for fiscal_year, filed, values in reports:
+        accn = f"0000{cik}-{fiscal_year % 100:02d}-000001"
+        for year, year_values in [(fiscal_year, values), (fiscal_year - 1, previous)]:
+            for concept, val in (year_values or {}).items():
+                start = None if concept in balance_concepts else f"{year - 1}-10-01"
+                add(concept, start, f"{year}-09-30", val, accn, fiscal_year, '10-K', filed)
+        # A quarter in a 10-Q that is not used
+        add('OperatingIncomeLoss', f"{fiscal_year}-10-01", f"{fiscal_year}-12-31", 1.0,
+            f"0000{cik}-{fiscal_year % 100:02d}-000002", fiscal_year + 1, '10-Q', f"{fiscal_year + 1}-02-01")
+        previous = values
+    return {'cik': cik, 'entityName': name, 'facts': {'us-gaap': facts}}
+
+
+class TestExtractFinancialsBatch:
+    """Test the batch extraction from company facts"""
+
+    def test_extract_financials_batch_from_company_facts(self):
+        from edgar.entity.facts import parse_company_facts
+        from pipeline.financial_analyzer import extract_financials_batch
+
+        def values(operating_income, assets):
+            return {'OperatingIncomeLoss': operating_income,
+                    'IncomeTaxExpenseBenefit': 30.0,
+                    'IncomeLossFromContinuingOperationsBeforeIncomeTaxesExtraordinaryItemsNoncontrollingInterest': 200.0,
+                    'InterestExpense': 4.0,
+                    'Assets': assets,
+                    'CashAndCashEquivalentsAtCarryingValue': 100.0,
+                    'LiabilitiesCurrent': 300.0,
+                    'DebtCurrent': 50.0,
+                    'LongTermDebt': 150.0,
+                    'StockholdersEquity': 800.0}
+
+        reports = [(year, f"{year}-11-01", values(100.0 * (year - 2019), 1000.0 + year - 2020))
+                   for year in range(2020, 2025)]
+        # BBB does not report total assets so its ROIC history comes from the 10-K XBRL
+        bbb_reports = [(year, f"{year}-11-01", {k: v for k, v in values(100.0, 1000.0).items() if k != 'Assets'})
+                       for year in range(2020, 2025)]
+        company_facts = {1: parse_company_facts(_company_facts_json(1, 'AAA', reports)),
+                         2: parse_company_facts(_company_facts_json(2, 'BBB', bbb_reports))}
+        xbrl_roic = ROICData(years=[2022, 2023, 2024], roic_values=[0.1, 0.1, 0.1],
+                             nopat_values=[1, 1, 1], invested_capital_values=[10, 10, 10])
+
+        with patch('pipeline.financial_analyzer.find_cik', side_effect={'AAA': 1, 'BBB': 2, 'CCC': None}.get), \
+                patch('pipeline.financial_analyzer.get_company_facts', side_effect=company_facts.get), \
+                patch('pipeline.financial_analyzer.load_many_from_cache', return_value={}), \
+                patch('pipeline.financial_analyzer.save_to_cache') as save, \
+                patch('pipeline.financial_analyzer.extract_roic_history', return_value=xbrl_roic) as xbrl, \
+                patch('pipeline.financial_analyzer.extract_wacc_components',
+                      side_effect=FinancialDataError("No 10-K filing found for CCC")):
+            result = extract_financials_batch(['AAA', 'BBB', 'CCC'], years=3)
+
+        assert result.sources == {'AAA': 'companyfacts', 'BBB': 'xbrl'}
+        assert list(result.failed) == ['CCC']
+        # The XBRL fallback is keyed by the latest 10-K in the company facts
+        xbrl.assert_called_once_with('BBB', 3, latest_accession='00002-24-000001')
+
+        # The latest 3 10-Ks, with the values of the fiscal year of each 10-K and not the comparatives
+        roic = result.roic['AAA']
+        assert roic.years == [2022, 2023, 2024]
+        tax_rate = 30.0 / 200.0
+        invested_capital = [1000.0 + year - 2020 - 100.0 - (300.0 - 50.0) for year in roic.years]
+        assert roic.nopat_values == pytest.approx([100.0 * (year - 2019) * (1 - tax_rate) for year in roic.years])
+        assert roic.invested_capital_values == pytest.approx(invested_capital)
+        assert roic.roic_values == pytest.approx([nopat / capital for nopat, capital
+                                                  in zip(roic.nopat_values, invested_capital)])
+
+        wacc = result.wacc_components['AAA']
+        assert wacc.total_debt == 200.0 and wacc.total_equity == 800.0
+        assert wacc.cost_of_debt == pytest.approx(4.0 / 200.0)
+        assert wacc.debt_ratio == pytest.approx(0.2) and wacc.equity_ratio == pytest.approx(0.8)
+        assert wacc.tax_rate == pytest.approx(tax_rate)
+        assert wacc.cost_of_equity == pytest.approx(DEFAULT_RISK_FREE_RATE + DEFAULT_BETA * DEFAULT_MARKET_RISK_PREMIUM)
+        # BBB's WACC components come from its company facts
+        assert result.wacc_components['BBB'].total_equity == 800.0
+
+        # The results are cached for calculate_spread
+        assert [call.args[0] for call in save.call_args_list] == ['AAA', 'BBB']
+        assert set(save.call_args_list[0].args[1]) == {'roic_history', 'wacc_components'}
+        assert save.call_args_list[0].kwargs['accession'] == '00001-24-000001'
@@ -435,3 +435,18 @@ def test_get_html_problem_filing():
     text = filing.text()
     assert text
     print(text)
+
+
+def test_lxml_parser_matches_bs4_parser():
+    for path in ['data/html/Apple.10-K.html', 'data/html/TableInsideIxElement.html', 'data/html/SpansInsideDiv.html',
+                 'data/html/LineBreaks.html']:
+        html = get_html(path)
+        bs4_document = Document.parse(html)
+        lxml_document = Document.parse(html, parser='lxml')
+        assert len(lxml_document.nodes) == len(bs4_document.nodes)
+        assert len(lxml_document.tables) == len(bs4_document.tables)
+        for bs4_node, lxml_node in zip(bs4_document.nodes, lxml_document.nodes):
+            assert lxml_node.type == bs4_node.type
+            if bs4_node.type != 'table':
+                assert lxml_node.content == bs4_node.content
+        assert lxml_document.to_markdown() == bs4_document.to_markdown()
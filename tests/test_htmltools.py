@@ -156,3 +156,45 @@ def test_html_text_works_with_no_failures():
 
 
 
+
+
+def test_lazy_chunked_document_gets_items_from_item_index():
+    lazy_document = ChunkedDocument(Nvidia_2021_10k, lazy=True)
+    eager_document = ChunkedDocument(Nvidia_2021_10k)
+    # Nothing is chunked until the full chunks are needed
+    assert 'chunks' not in lazy_document.__dict__
+
+    assert lazy_document.list_items() == eager_document.list_items()
+    for item in ['Item 1', 'Item 1A', 'Item 7', 'ITEM 9A']:
+        lazy_text, eager_text = lazy_document[item], eager_document[item]
+        assert ' '.join(lazy_text.split()).startswith(' '.join(eager_text.split())[:1000])
+        assert abs(len(lazy_text) - len(eager_text)) < 100
+    assert 'chunks' not in lazy_document.__dict__
+
+    # Items that are not in the index fall back to the chunked document
+    assert lazy_document['Item 99'] is None
+    lazy_document = ChunkedDocument(Nvidia_2021_10k, lazy=True)
+    item_index = lazy_document.item_index
+    item_index.items = [entry for entry in item_index.items if entry[0] != 'Item 7']
+    assert lazy_document['Item 7'] == eager_document['Item 7']
+
+
+def test_company_reports_chunk_eagerly_unless_lazy():
+    from unittest.mock import Mock
+    from edgar.company_reports import TenK
+    filing = Mock(form='10-K', accession_no='0001045810-21-000010')
+    filing.html.return_value = Nvidia_2021_10k
+    assert TenK(filing).chunked_document.lazy is False
+    assert TenK(filing, lazy=True).chunked_document.lazy is True
+
+
+def test_item_index_is_cached_by_accession_number():
+    from edgar.documentcache import get_document_cache
+    from edgar.files.htmltools import ItemIndex
+    lazy_document = ChunkedDocument(Nvidia_2021_10k, lazy=True, accession_number='0001045810-21-000010')
+    item_index = lazy_document.item_index
+    assert item_index.list_items()[:3] == ['Item 1', 'Item 1A', 'Item 1B']
+
+    cached = get_document_cache().get('0001045810-21-000010', '<item-index>')
+    assert ItemIndex.from_json(cached) == item_index
+    assert ChunkedDocument(Nvidia_2021_10k, lazy=True, accession_number='0001045810-21-000010').item_index == item_index
@@ -0,0 +1,58 @@
+import json
+from pathlib import Path
+
+import pyarrow.parquet as pq
+
+from edgar import Filing
+from edgar.documentcache import get_document_cache, SUBMISSION_TEXT
+from edgar.files.htmltools import ChunkedDocument, decimal_chunk_fn
+from edgar.item_extraction import extract_items
+from edgar.sgml import FilingSGML
+
+eightk_files = ['data/sgml/0000943374-24-000509.txt', 'data/sgml/0001213900-25-032135.txt']
+
+
+def get_cached_filings():
+    # Put the submissions in the document cache so no downloads are needed
+    filings = []
+    for path in eightk_files:
+        filing = Filing.from_sgml(path)
+        get_document_cache().put(filing.accession_no, SUBMISSION_TEXT, Path(path).read_text())
+        filings.append(filing)
+    return filings
+
+
+def test_extract_items_to_jsonl_and_resume(tmp_path):
+    filings = get_cached_filings()
+    output = tmp_path / "items.jsonl"
+    summary = extract_items(filings, ["Item 2.02", "Item 5.02"], output, max_workers=2)
+    assert summary.completed == 2
+    assert summary.items == 2
+    assert not summary.failed
+
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert {(row['accession_no'], row['item']) for row in rows} == {('0000943374-24-000509', 'Item 5.02'),
+                                                                   ('0001213900-25-032135', 'Item 2.02')}
+    assert all(row['text'].lstrip().startswith(row['item']) for row in rows)
+    # The same text as chunking the filing on its own
+    html = {filing.accession_no: FilingSGML.from_text(Path(path).read_text()).html()
+            for filing, path in zip(filings, eightk_files)}
+    assert all(row['text'] == ChunkedDocument(html[row['accession_no']], chunk_fn=decimal_chunk_fn)[row['item']]
+               for row in rows)
+
+    # Running again skips the filings in the checkpoint
+    summary = extract_items(filings, ["Item 2.02", "Item 5.02"], output, max_workers=2)
+    assert summary.skipped == 2
+    assert summary.completed == 0
+    assert len(output.read_text().splitlines()) == 2
+
+
+def test_extract_items_to_parquet(tmp_path):
+    filings = get_cached_filings()
+    output = tmp_path / "items"
+    summary = extract_items(filings, ["Item 9.01"], output, max_workers=1, batch_size=1)
+    assert summary.completed == 2
+    table = pq.read_table(output)
+    assert table.num_rows == 1
+    assert table.column('item').to_pylist() == ['Item 9.01']
+    assert (output / "_checkpoint.txt").read_text().split() == ['0000943374-24-000509', '0001213900-25-032135']
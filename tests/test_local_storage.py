@@ -1,5 +1,11 @@
 
+import re
 from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
 from edgar import *
 from edgar.storage import list_filing_feed_files, list_filing_feed_files_for_quarter, is_feed_file_in_date_range
 
@@ -75,4 +81,166 @@ def test_local_storage_and_related_filings(monkeypatch):
            accession_no='0001667731-25-000122')
     monkeypatch.setenv("EDGAR_USE_LOCAL_DATA", "1")
     related_filings = filing.related_filings()
-    assert len(related_filings) > 10
\ No newline at end of file
+    assert len(related_filings) > 10
+
+def _feed_archive(directory, name, filings):
+    import tarfile
+    archive = directory / name
+    with tarfile.open(archive, 'w:gz') as tar:
+        for filename, content in filings.items():
+            path = directory / filename
+            path.write_text(content)
+            tar.add(path, arcname=filename)
+    return archive
+
+
+@pytest.fixture
+def feed_server(tmp_path):
+    """Serve files from a directory with support for Range requests, recording the requests"""
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    served = tmp_path / 'served'
+    served.mkdir()
+    requests = []
+    # Files to send only half of, the first time they are requested
+    interrupt = set()
+
+    class RangeHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests.append((self.path, self.headers.get('Range')))
+            content = (served / self.path.lstrip('/')).read_bytes()
+            start = 0
+            if self.headers.get('Range'):
+                start = int(re.match(r'bytes=(\d+)-', self.headers['Range']).group(1))
+                self.send_response(206)
+                self.send_header('Content-Range', f'bytes {start}-{len(content) - 1}/{len(content)}')
+            else:
+                self.send_response(200)
+            self.send_header('Content-Length', str(len(content) - start))
+            self.end_headers()
+            if self.path.lstrip('/') in interrupt:
+                interrupt.discard(self.path.lstrip('/'))
+                self.wfile.write(content[start:len(content) // 2])
+                self.close_connection = True
+                return
+            self.wfile.write(content[start:])
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), RangeHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield served, f"http://127.0.0.1:{server.server_port}", requests, interrupt
+    server.shutdown()
+
+
+def test_download_feed_files_resumes_and_skips_completed_days(feed_server, tmp_path):
+    from edgar.feed_archive import FeedArchive
+    from edgar.feed_download import MANIFEST_FILENAME, PARTIAL_DIRECTORY, download_feed_files
+    read_feed = FeedArchive.open
+    served, url, requests, interrupt = feed_server
+    first = _feed_archive(served, '20240102.nc.tar.gz', {'0000320193-24-000001.nc': 'apple' * 1000})
+    second = _feed_archive(served, '20240103.nc.tar.gz', {'0000789019-24-000002.nc': 'microsoft' * 1000})
+    feed_files = pd.DataFrame({'Name': [first.name, second.name],
+                               'File': [f"{url}/{first.name}", f"{url}/{second.name}"],
+                               'Size': [first.stat().st_size, second.stat().st_size]})
+    data_directory = tmp_path / 'filings'
+
+    # An interrupted download of the first day is resumed from where it stopped
+    (data_directory / PARTIAL_DIRECTORY).mkdir(parents=True)
+    (data_directory / PARTIAL_DIRECTORY / f"{first.name}.part").write_bytes(first.read_bytes()[:100])
+
+    summary = download_feed_files(feed_files, data_directory, max_downloads=2)
+    assert sorted(summary.downloaded) == [first.name, second.name]
+    assert summary.resumed == [first.name], requests
+    assert (f"/{first.name}", 'bytes=100-') in requests
+    assert (data_directory / '20240102' / '0000320193-24-000001.nc').read_text() == 'apple' * 1000
+    assert (data_directory / '20240103' / '0000789019-24-000002.nc').read_text() == 'microsoft' * 1000
+    assert (data_directory / MANIFEST_FILENAME).exists()
+
+    # Days in the manifest are not downloaded again
+    requests.clear()
+    summary = download_feed_files(feed_files, data_directory)
+    assert sorted(summary.skipped) == [first.name, second.name]
+    assert requests == []
+
+    # A download that does not match the size in the listing fails and is not recorded
+    feed_files.loc[0, 'Size'] = first.stat().st_size + 1024 * 1024
+    summary = download_feed_files(feed_files, data_directory, overwrite_existing=True)
+    assert list(summary.failed) == [first.name]
+    assert summary.downloaded == [second.name]
+
+    # Keep the days compressed with only the filings of some accession numbers
+    feed_files.loc[0, 'Size'] = first.stat().st_size
+    summary = download_feed_files(feed_files, data_directory, compress=True, accession_numbers=['0000320193-24-000001'])
+    assert summary.filings == 1
+    assert (data_directory / '20240102.nc.gz').exists()
+    assert read_feed(data_directory / '20240102.nc.gz').read_filing('0000320193-24-000001') == 'apple' * 1000
+    assert len(read_feed(data_directory / '20240103.nc.gz')) == 0
+
+    # A download interrupted half way is resumed with a Range request
+    import secrets
+    large = _feed_archive(served, '20240104.nc.tar.gz', {'0000320193-24-000004.nc': secrets.token_hex(3_000_000)})
+    feed_files = pd.DataFrame({'Name': [large.name], 'File': [f"{url}/{large.name}"], 'Size': [large.stat().st_size]})
+    requests.clear()
+    interrupt.add(large.name)
+    summary = download_feed_files(feed_files, data_directory)
+    assert summary.downloaded == [large.name]
+    assert summary.resumed == [large.name]
+    assert requests[0] == (f"/{large.name}", None)
+    assert requests[1][1] not in (None, 'bytes=0-')
+    assert (data_directory / '20240104' / '0000320193-24-000004.nc').read_text() == \
+           (served / '0000320193-24-000004.nc').read_text()
+
+
+
+def test_download_feed_files_extracts_while_downloading(feed_server, tmp_path):
+    from edgar.feed_download import download_feed_files
+    served, url, requests, interrupt = feed_server
+    filings = {f"0000320193-24-{number:06d}.nc": f"filing {number}" * 20000 for number in range(5)}
+    feed = _feed_archive(served, '20240102.nc.tar.gz', filings)
+    feed_files = pd.DataFrame({'Name': [feed.name], 'File': [f"{url}/{feed.name}"], 'Size': [feed.stat().st_size]})
+    data_directory = tmp_path / 'filings'
+
+    # The download is interrupted half way and extracted again from the start
+    interrupt.add(feed.name)
+    summary = download_feed_files(feed_files, data_directory, stream=True,
+                                  accession_numbers=['0000320193-24-000001', '000032019324000003'])
+    assert summary.downloaded == [feed.name]
+    assert summary.filings == 2
+    assert requests == [(f"/{feed.name}", None), (f"/{feed.name}", None)]
+    assert sorted(path.name for path in (data_directory / '20240102').iterdir()) == \
+           ['0000320193-24-000001.nc', '0000320193-24-000003.nc']
+    assert (data_directory / '20240102' / '0000320193-24-000003.nc').read_text() == filings['0000320193-24-000003.nc']
+    # The feed file was never written to disk
+    assert sorted(path.name for path in data_directory.iterdir()) == ['20240102', '_feed_manifest.json']
+
+
+def test_read_filing_from_compressed_feed_archive(monkeypatch, tmp_path, request):
+    from edgar.core import get_edgar_data_directory
+    from edgar.feed_archive import FeedArchive, compress_feed_archive
+    from edgar.storage import read_local_filing
+    extracted = Path('data/localstorage/filings/20250108')
+    tar_path = _feed_archive(tmp_path, '20250108.nc.tar.gz',
+                             {path.name: path.read_text() for path in extracted.glob('*.nc')})
+    archive = compress_feed_archive(tar_path, tmp_path / 'filings' / '20250108.nc.gz')
+    assert sorted(archive.filenames) == sorted(path.name for path in extracted.glob('*.nc'))
+
+    # Only keep some filings
+    kept = compress_feed_archive(tar_path, tmp_path / '20250108.nc.gz', accession_numbers=['000149315225001317'])
+    assert kept.filenames == ['0001493152-25-001317.nc']
+
+    monkeypatch.setenv('EDGAR_LOCAL_DATA_DIR', str(tmp_path))
+    monkeypatch.setenv('EDGAR_USE_LOCAL_DATA', "1")
+    # The data directory is cached
+    get_edgar_data_directory.cache_clear()
+    request.addfinalizer(get_edgar_data_directory.cache_clear)
+    expected = (extracted / '0001493152-25-001317.nc').read_text()
+    assert read_local_filing('2025-01-08', '0001493152-25-001317') == expected
+    assert read_local_filing('2025-01-08', '0000000000-25-000000') is None
+    assert FeedArchive.open(tmp_path / 'filings' / '20250108.nc.gz') is archive
+
+    filing = Filing(form='8-K', filing_date='2025-01-08', company='ACORN ENERGY, INC.', cik=880984,
+                    accession_no='0001493152-25-001317')
+    assert filing.sgml().header.accession_number == '0001493152-25-001317'
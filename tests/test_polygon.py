@@ -648,5 +648,88 @@ class TestFetchLast5WorkingDays:
             assert price['volume'] == 1000000
 
 
+
+class TestPriceFetcher:
+    """Test fetching the prices of many tickers against a local stub server."""
+
+    def test_token_bucket_spaces_requests(self):
+        """Test that the token bucket releases requests at its rate after the burst."""
+        import time
+        from pipeline.polygon import TokenBucket
+
+        bucket = TokenBucket(rate=50, capacity=2)
+        start = time.monotonic()
+        waits = [bucket.acquire() for _ in range(6)]
+        elapsed = time.monotonic() - start
+
+        assert waits[:2] == [0.0, 0.0]
+        assert elapsed >= 4 / 50 * 0.9
+
+    def test_fetch_many_reuses_saved_bars(self, tmp_path):
+        """Test that the bars of all tickers are fetched once with one client and saved."""
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from pipeline.polygon import PriceFetcher
+
+        dates = ['2025-01-06', '2025-01-07', '2025-01-08', '2025-01-09']
+        requests = []
+
+        class OpenCloseHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                _, _, _, ticker, date_str = self.path.split('?')[0].split('/')
+                requests.append((ticker, date_str))
+                if ticker == 'BAD':
+                    status, body = 500, {'status': 'ERROR'}
+                elif date_str == '2025-01-09':
+                    status, body = 404, {'status': 'NOT_FOUND'}
+                else:
+                    status, body = 200, {'status': 'OK', 'from': date_str, 'symbol': ticker, 'open': 10.0,
+                                         'high': 12.0, 'low': 9.0, 'close': 11.0, 'volume': 1000}
+                content = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), OpenCloseHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/v1/open-close/{{ticker}}/{{date}}"
+
+        try:
+            with patch('pipeline.polygon.get_prices_state_path', side_effect=lambda ticker: tmp_path / f"prices_{ticker}.json"):
+                with PriceFetcher(api_key='test-key', requests_per_minute=6000, burst=10, max_workers=4, url=url,
+                                  max_retries=1, retry_delay=0) as fetcher:
+                    result = fetcher.fetch_many(['AAA', 'BBB', 'BAD'], dates)
+
+                    # Every (ticker, date) is requested once, and the failing ticker is retried
+                    assert result['requests'] == 2 * len(dates) + 2 * len(dates)
+                    assert sorted(set(requests)) == sorted((ticker, date_str) for ticker in ['AAA', 'BBB', 'BAD']
+                                                           for date_str in dates)
+                    assert list(result['failed']) == ['BAD']
+                    prices = result['states']['AAA']['prices']
+                    assert [price['date'] for price in prices] == dates[:3]
+                    assert prices[0] == {'date': '2025-01-06', 'open': 10.0, 'high': 12.0, 'low': 9.0,
+                                         'close': 11.0, 'volume': 1000}
+                    assert json.loads((tmp_path / 'prices_BBB.json').read_text())['prices'] == \
+                        result['states']['BBB']['prices']
+
+                    # The saved bars are not fetched again, only the dates without a bar
+                    requests.clear()
+                    result = fetcher.fetch_many(['AAA', 'BBB'], dates[1:] + ['2025-01-10'])
+                    assert sorted(requests) == [('AAA', '2025-01-09'), ('AAA', '2025-01-10'),
+                                                ('BBB', '2025-01-09'), ('BBB', '2025-01-10')]
+                    assert result['reused_bars'] == 4
+                    assert [price['date'] for price in result['states']['AAA']['prices']] == \
+                        ['2025-01-07', '2025-01-08', '2025-01-10']
+        finally:
+            server.shutdown()
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
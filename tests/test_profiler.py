@@ -0,0 +1,111 @@
+"""Tests for the pipeline stage profiler."""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from pipeline.profiler import (
+    PipelineProfiler,
+    get_active_profiler,
+    profile_ticker,
+    record_cache_lookups,
+    record_ticker_time,
+    skip_cache_lookups,
+)
+
+
+@pytest.fixture
+def stub_server():
+    """A local server that answers every GET with 1000 bytes, or a 404 for /missing"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            content = b'x' * 1000
+            self.send_response(404 if self.path == '/missing' else 200)
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+class TestPipelineProfiler:
+    """Test the stage, ticker, cache and HTTP recording of the profiler."""
+
+    def test_stages_tickers_and_caches(self, tmp_path):
+        """Test that the stage and ticker times and the cache lookups are in the report."""
+        profiler = PipelineProfiler()
+
+        def stage(tickers):
+            for ticker in tickers:
+                with profile_ticker(ticker):
+                    record_cache_lookups('price_bars', hits=4, misses=1)
+            record_ticker_time('AAA', 2.0)
+            # Lookups already recorded by a batch are not counted again
+            with skip_cache_lookups('price_bars'):
+                record_cache_lookups('price_bars', hits=4)
+            return True
+
+        with profiler:
+            assert get_active_profiler() is profiler
+            assert profiler.run_stage('fetch_prices', stage, ['AAA', 'BBB']) is True
+            assert profiler.run_stage('detect_alerts', lambda tickers: False, ['AAA']) is False
+        assert get_active_profiler() is None
+
+        # Nothing is recorded without an active profiler
+        record_ticker_time('CCC', 1.0)
+
+        path = profiler.write_report(tmp_path / 'pipeline_timing.json')
+        report = json.loads(path.read_text())
+        assert list(report['stages']) == ['fetch_prices', 'detect_alerts']
+        assert report['stages']['fetch_prices']['success'] is True
+        assert report['stages']['detect_alerts']['success'] is False
+        assert set(report['tickers']) == {'AAA', 'BBB'}
+        assert report['tickers']['AAA']['stages']['fetch_prices'] >= 2.0
+        assert report['slowest_tickers'][0] == 'AAA'
+        assert report['caches']['price_bars'] == {'hits': 8, 'misses': 2, 'hit_rate': 0.8}
+
+    def test_records_http_requests_per_host(self, stub_server):
+        """Test that the requests and bytes of the edgar clients and a client with the hooks are counted."""
+        import httpx
+        from edgar.httpclient import async_http_client, http_client, response_event_hooks
+
+        async def fetch_async():
+            async with async_http_client() as client:
+                response = await client.get(f"{stub_server}/async")
+                return len(response.content)
+
+        profiler = PipelineProfiler()
+        with profiler:
+            with http_client() as client:
+                assert len(client.get(f"{stub_server}/sync").content) == 1000
+                assert client.get(f"{stub_server}/missing").status_code == 404
+            assert asyncio.run(fetch_async()) == 1000
+            with httpx.Client(event_hooks=response_event_hooks()) as client:
+                with client.stream('GET', f"{stub_server}/stream") as response:
+                    assert sum(len(chunk) for chunk in response.iter_bytes()) == 1000
+
+        # Requests after the profiler has finished are not counted
+        with http_client() as client:
+            client.get(f"{stub_server}/sync")
+
+        counts = profiler.report()['http']['127.0.0.1']
+        assert counts['requests'] == 4
+        assert counts['errors'] == 1
+        assert counts['bytes_received'] == 4000
+        assert counts['seconds'] > 0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -53,6 +53,7 @@ class TestSECFilingFetcher:
         
         # Mock filing object
         mock_filing = MagicMock()
+        mock_filing.form = '8-K'
         mock_filing.filing_date = datetime.now() - timedelta(days=1)
         mock_filing.cik_link = "https://sec.gov/Archives/edgar/data/320193/0000320193-24-000001.txt"
         mock_filing.item_1a_risk_factors = "Officer departure due to strategic disagreement"
@@ -74,7 +75,9 @@ class TestSECFilingFetcher:
         
         # Verify Company was called correctly
         mock_company_class.assert_called_once_with('AAPL')
-        mock_company.get_filings.assert_called_once_with(form='8-K', trigger_full_load=False)
+        cutoff = (datetime.now() - timedelta(days=2)).strftime('%Y-%m-%d')
+        mock_company.get_filings.assert_called_once_with(form=['8-K'], filing_date=f"{cutoff}:",
+                                                         trigger_full_load=False)
 
     @patch('pipeline.sec_filings.Company')
     def test_fetch_multiple_form_types(self, mock_company_class):
@@ -93,22 +96,13 @@ class TestSECFilingFetcher:
         mock_10q.cik_link = "https://sec.gov/Archives/edgar/data/320193/10q.txt"
         mock_10q.item_1a_risk_factors = "Quarterly earnings report"
         
-        # Mock get_filings to return different results for each form type
-        def side_effect(form=None, **kwargs):
-            if form == '8-K':
-                mock_filings = MagicMock()
-                mock_filings.__iter__ = Mock(return_value=iter([mock_8k]))
-                return mock_filings
-            elif form == '10-Q':
-                mock_filings = MagicMock()
-                mock_filings.__iter__ = Mock(return_value=iter([mock_10q]))
-                return mock_filings
-            else:
-                mock_filings = MagicMock()
-                mock_filings.__iter__ = Mock(return_value=iter([]))
-                return mock_filings
+        mock_8k.form = '8-K'
+        mock_10q.form = '10-Q'
         
-        mock_company.get_filings.side_effect = side_effect
+        # The filings of all the form types are filtered in one call
+        mock_filings = MagicMock()
+        mock_filings.__iter__ = Mock(return_value=iter([mock_8k, mock_10q]))
+        mock_company.get_filings.return_value = mock_filings
         
         # Test fetch
         filings = fetch_recent_filings('AAPL', days_back=2, form_types=['8-K', '10-Q', '10-K'])
@@ -121,8 +115,9 @@ class TestSECFilingFetcher:
         
         # Verify Company was called correctly
         mock_company_class.assert_called_once_with('AAPL')
-        mock_company.get_filings.assert_any_call(form='8-K', trigger_full_load=False)
-        mock_company.get_filings.assert_any_call(form='10-Q', trigger_full_load=False)
+        cutoff = (datetime.now() - timedelta(days=2)).strftime('%Y-%m-%d')
+        mock_company.get_filings.assert_called_once_with(form=['8-K', '10-Q', '10-K'], filing_date=f"{cutoff}:",
+                                                         trigger_full_load=False)
 
     @patch('pipeline.sec_filings.Company')
     def test_fetch_no_filings_found(self, mock_company_class):
@@ -450,6 +445,42 @@ class TestFilingContextAppender:
         # The rank and summary calls may not happen if fetch returns empty
         assert mock_append.call_count == 2
 
+    @patch('pipeline.sec_filings.fetch_recent_filings')
+    @patch('pipeline.enrichment.append_filing_context_to_alert')
+    def test_enrich_tickers_concurrently(self, mock_append, mock_fetch):
+        """Test 4f: Tickers are enriched concurrently with the results in ticker order."""
+        import threading
+        import time
+        
+        active = []
+        peak = []
+        lock = threading.Lock()
+        
+        def fetch_side_effect(ticker, **kwargs):
+            with lock:
+                active.append(ticker)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.remove(ticker)
+            if ticker == 'BAD':
+                raise FilingError("Company not found")
+            return []
+        
+        mock_fetch.side_effect = fetch_side_effect
+        mock_append.return_value = True
+        tickers = ['AAPL', 'BAD', 'MSFT', 'NVDA', 'GOOGL', 'AMZN']
+        
+        results = safe_enrich_all_alerts(tickers, max_workers=3)
+        
+        assert results['success'] == ['AAPL', 'MSFT', 'NVDA', 'GOOGL', 'AMZN']
+        assert results['failed'] == ['BAD']
+        assert results['errors'] == {'BAD': 'Filing fetch failed: Company not found'}
+        assert set(results['timings']) == set(tickers)
+        assert all(seconds >= 0.05 for seconds in results['timings'].values())
+        # No more than max_workers tickers at the same time
+        assert 1 < max(peak) <= 3
+
 
 class TestDashboardFilingRenderer:
     """Test Unit 5: Dashboard Filing Renderer."""
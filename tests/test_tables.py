@@ -279,4 +279,31 @@ def test_correct_parsing_of_table_headers_operations():
     document = Document.parse(html)
     table:BaseNode = document.tables[0]
     rich_table = table.render(400)
-    print(rich_table)
\ No newline at end of file
+    print(rich_table)
+
+def test_parse_number():
+    from edgar.files.tables import parse_number
+    assert parse_number('1,234.5') == 1234.5
+    assert parse_number('(1,234)') == -1234
+    assert parse_number('$ 12') == 12
+    assert parse_number('—') is None
+    assert parse_number('Total') is None
+
+
+def test_extract_tables_with_lxml_parser():
+    from edgar.files.htmltools import extract_tables, extract_tables_from_documents
+    html = Path('data/html/Apple.10-K.html').read_text()
+    tables = extract_tables(html, parser='lxml')
+    assert len(tables) > 40
+
+    # The period headers are the column names and the values are numbers
+    tax_table = next(table for table in tables
+                     if table.iloc[:, 0].astype(str).str.contains('Provision for income taxes').any())
+    assert list(tax_table.columns[1:]) == ['2024', '2023', '2022']
+    assert tax_table['2024'].dtype == 'float64'
+    assert tax_table['2024'].iloc[0] == 29749.0
+
+    tables_per_document = extract_tables_from_documents([html, Path('data/html/OneTable.html').read_text()],
+                                                         max_workers=2)
+    assert len(tables_per_document) == 2
+    assert len(tables_per_document[0]) == len(tables)
@@ -247,6 +247,42 @@ def test_parse_directory():
             console.print(dfs['statement'].head(5))
 
 
+def test_parse_directory_with_only_some_parts():
+    full_xbrl = XBRL.parse_directory(Path("tests/fixtures/xbrl2/aapl/10k_2023"))
+    xbrl = XBRL.parse_directory(Path("tests/fixtures/xbrl2/aapl/10k_2023"), parts=['instance', 'label'])
+    assert xbrl.deferred_parts == ['presentation', 'definition']
+
+    # Facts are available without parsing the deferred linkbases, with the same values as a full load
+    # The labels preferred by the presentation and the statement columns come from the presentation linkbase
+    facts = xbrl.facts.to_dataframe()
+    columns = [column for column in facts.columns if column not in ['label', 'original_label']]
+    full_facts = full_xbrl.facts.to_dataframe()[columns]
+    assert (facts['numeric_value'] < 0).any()
+    assert facts[columns].equals(full_facts)
+    assert xbrl.entity_info['document_type'] == full_xbrl.entity_info['document_type']
+    assert xbrl.deferred_parts == ['presentation', 'definition']
+
+    # Asking for a statement parses them
+    income_statement = xbrl.statements.income_statement()
+    assert not xbrl.deferred_parts
+    assert str(income_statement.render()) == str(full_xbrl.statements.income_statement().render())
+    assert xbrl.facts.to_dataframe().equals(full_xbrl.facts.to_dataframe())
+
+    with pytest.raises(ValueError):
+        XBRL.parse_directory(Path("tests/fixtures/xbrl2/aapl/10k_2023"), parts=['instance', 'footnotes'])
+
+
+def test_parse_directory_in_parallel():
+    xbrl = XBRL.parse_directory(Path("tests/fixtures/xbrl2/msft/10k_2015"))
+    parallel_xbrl = XBRL.parse_directory(Path("tests/fixtures/xbrl2/msft/10k_2015"), parallel=True)
+    assert list(parallel_xbrl.element_catalog) == list(xbrl.element_catalog)
+    assert list(parallel_xbrl.presentation_trees) == list(xbrl.presentation_trees)
+    assert list(parallel_xbrl.calculation_trees) == list(xbrl.calculation_trees)
+    assert parallel_xbrl.reporting_periods == xbrl.reporting_periods
+    assert parallel_xbrl.facts.to_dataframe().equals(xbrl.facts.to_dataframe())
+    assert str(parallel_xbrl.statements.balance_sheet().render()) == str(xbrl.statements.balance_sheet().render())
+
+
 def test_period_views_for_AAPL():
     c = Company("AAPL")
     filing = Filing(company='Apple Inc.', cik=320193, form='10-K', filing_date='2024-11-01', accession_no='0000320193-24-000123')
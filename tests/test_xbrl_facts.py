@@ -3,7 +3,7 @@ from edgar import *
 from unittest.mock import MagicMock
 
 from edgar import Company, Filing
-from edgar.xbrl import XBRL, FactsView
+from edgar.xbrl import XBRL, FactDataset, FactsView
 from edgar.xbrl.facts import FactQuery
 from rich import print
 
@@ -225,4 +225,67 @@ def test_integration_standardization_and_facts_query(intc_xbrl):
         print(f"Testing displayed label: {test_label}, found {len(results)} facts")
         
         # We should find at least one fact with this label
-        assert len(results) > 0, f"Failed to find facts by statement label: {test_label}"
\ No newline at end of file
+        assert len(results) > 0, f"Failed to find facts by statement label: {test_label}"
+
+def test_standardized_labels_are_overlaid_without_rebuilding_facts():
+    xbrl = XBRL.parse_directory("tests/fixtures/xbrl2/aapl/10k_2023")
+    facts = xbrl.facts.get_facts()
+    df = xbrl.facts.to_dataframe()
+
+    xbrl.render_statement("IncomeStatement", standard=True)
+
+    # The cached facts are updated in place
+    assert xbrl.facts.get_facts() is facts
+    assert xbrl.facts.to_dataframe() is df
+    revenue = xbrl.query().by_label("Revenue", exact=True).execute()
+    assert revenue
+    assert any(fact['original_label'] == 'Net sales' for fact in revenue)
+    assert (df[df.label == 'Revenue'].original_label == 'Net sales').any()
+
+    # The overlay is kept when the facts are rebuilt
+    xbrl.facts.clear_cache()
+    assert len(xbrl.query().by_label("Revenue", exact=True).execute()) == len(revenue)
+
+
+def test_fact_dataset_queries_facts_across_filings():
+    xbrls = {name: XBRL.parse_directory(f"tests/fixtures/xbrl2/{name}") for name in ["aapl/10k_2023", "aapl/10q_2023"]}
+    dataset = FactDataset.from_xbrl(xbrls)
+    assert dataset.filings == ["aapl/10k_2023", "aapl/10q_2023"]
+    assert len(dataset) == sum(len(xbrl.facts.to_dataframe()) for xbrl in xbrls.values())
+
+    # The same facts as querying each filing
+    concept = "us-gaap:RevenueFromContractWithCustomerExcludingAssessedTax"
+    df = dataset.query().by_concept(concept, exact=True).to_dataframe()
+    for name, xbrl in xbrls.items():
+        expected = xbrl.query().by_concept(concept, exact=True).to_dataframe()
+        assert (df.filing == name).sum() == len(expected)
+        assert sorted(df[df.filing == name].numeric_value) == sorted(expected.numeric_value)
+
+    # Dimensions, units and periods
+    products = (dataset.query()
+                .by_concept(concept, exact=True)
+                .by_dimension("srt:ProductOrServiceAxis", "aapl:IPhoneMember")
+                .by_date_range("2022-09-01", "2023-09-30")
+                .to_dataframe())
+    assert set(products['dim_srt_ProductOrServiceAxis']) == {"aapl:IPhoneMember"}
+    assert (products.period_start >= "2022-09-01").all() and (products.period_end <= "2023-09-30").all()
+    assert set(products.filing) == {"aapl/10k_2023", "aapl/10q_2023"}
+
+    totals = dataset.query().by_concept(concept, exact=True).without_dimensions().to_dataframe()
+    assert not any(column.startswith("dim_") for column in totals.columns)
+    assert len(totals) + dataset.query().by_concept(concept, exact=True).by_dimension(
+        "srt:ProductOrServiceAxis").count() <= len(df)
+    assert dataset.query().by_unit("usd").by_period_type("instant").count() > 0
+
+
+def test_fact_dataset_from_filings_has_the_values_of_a_full_load(monkeypatch):
+    directory = "tests/fixtures/xbrl2/aapl/10k_2023"
+    monkeypatch.setattr(XBRL, "from_filing",
+                        classmethod(lambda cls, filing, parts=None: XBRL.parse_directory(directory, parts=parts)))
+    filing = MagicMock(accession_no="0000320193-23-000106")
+    dataset = FactDataset.from_filings([filing])
+
+    # The default parts include the calculation linkbase, so the values have their calculation weights
+    full_facts = XBRL.parse_directory(directory).facts.to_dataframe()
+    assert (dataset.facts['numeric_value'] < 0).any()
+    assert dataset.facts['numeric_value'].fillna(0).tolist() == full_facts['numeric_value'].fillna(0).tolist()
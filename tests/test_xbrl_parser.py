@@ -1,5 +1,7 @@
 from edgar.xbrl import XBRL
 from edgar.xbrl.parser import XBRLParser
+from edgar.xbrl.models import Context, ContextTable
+from edgar.xbrl.taxonomy_catalog import TaxonomyCatalog
 from pathlib import Path
 
 
@@ -17,4 +19,81 @@ def test_parse_instance_content():
     assert len(facts) == unique_count
     
     # Verify total instances matches the SEC site count (899)
-    assert total_instances == 899  # This is the count shown on the SEC site
\ No newline at end of file
+    assert total_instances == 899  # This is the count shown on the SEC site
+
+def test_standard_elements_are_shared_across_filings():
+    taxonomy_catalog = TaxonomyCatalog()
+    parser_10q = XBRLParser(taxonomy_catalog=taxonomy_catalog)
+    parser_10q.parse_directory("tests/fixtures/xbrl2/aapl/10q_2023")
+    parser_10k = XBRLParser(taxonomy_catalog=taxonomy_catalog)
+    parser_10k.parse_directory("tests/fixtures/xbrl2/aapl/10k_2023")
+
+    # A standard element with the same labels is one catalog entry
+    shared = [element_id for element_id in parser_10k.shared_elements
+              if parser_10k.element_catalog[element_id] is parser_10q.element_catalog.get(element_id)]
+    assert "us-gaap_Assets" in shared
+    assert taxonomy_catalog.hits == len(shared)
+    assert "https://xbrl.fasb.org/us-gaap/2023/elts/us-gaap-2023.xsd" in taxonomy_catalog.taxonomies()
+
+    # Extension elements belong to the filing
+    assert not any(element_id.startswith("aapl_") for element_id in parser_10k.shared_elements)
+    assert "aapl_CashCashEquivalentsAndMarketableSecuritiesCost" in parser_10k.element_catalog
+
+    # A filing with different labels for an element gets its own entry
+    relabeled = [element_id for element_id in parser_10k.shared_elements
+                 if element_id in parser_10q.element_catalog and element_id not in shared]
+    for element_id in relabeled:
+        assert parser_10k.element_catalog[element_id].labels != parser_10q.element_catalog[element_id].labels
+
+    # Entries are released when no filing uses them
+    del parser_10q, parser_10k
+    assert len(taxonomy_catalog) == 0
+
+
+def test_contexts_are_stored_in_a_context_table():
+    parser = XBRLParser()
+    parser.parse_directory("tests/fixtures/xbrl2/msft/10k_2015")
+    contexts = parser.contexts
+    assert isinstance(contexts, ContextTable)
+
+    # Contexts for the same period share an interned period
+    assert contexts.period_count < len(contexts)
+    context_ids = list(contexts)
+    same_period = [context_id for context_id in context_ids
+                   if contexts.period_id(context_id) == contexts.period_id(context_ids[0])]
+    assert len(same_period) > 1
+    assert contexts[same_period[0]].period is contexts[same_period[1]].period
+
+    # The views have the same attributes as the Context model
+    context = contexts[context_ids[0]]
+    assert Context(**context.model_dump()) == context
+    assert context.period_string.startswith(("As of", "From"))
+    assert context.entity['identifier'] == '0000789019'
+    dimensional = next(contexts[context_id] for context_id in context_ids if contexts[context_id].dimensions)
+    assert all(dimension.startswith(('us-gaap', 'msft', 'dei', 'srt')) for dimension in dimensional.dimensions)
+
+    # Facts by element in context order with integer keyed lookup
+    element_facts = parser.get_element_facts("us-gaap:DeferredRevenue")
+    assert element_facts
+    assert [contexts.index_of(context_id) for context_id, _ in element_facts] == \
+           sorted(contexts.index_of(context_id) for context_id, _ in element_facts)
+    for context_id, fact in element_facts:
+        assert parser.get_fact("us-gaap_DeferredRevenue", context_id) is fact
+
+
+def test_context_table_mapping():
+    contexts = ContextTable()
+    contexts['c-1'] = Context(context_id='c-1', period={'type': 'instant', 'instant': '2024-12-31'})
+    contexts.add('c-2', {'scheme': 'http://www.sec.gov/CIK', 'identifier': '0000320193'},
+                 {'type': 'instant', 'instant': '2024-12-31'}, {'us-gaap:StatementBusinessSegmentsAxis': 'aapl:AmericasMember'})
+    assert list(contexts) == ['c-1', 'c-2']
+    assert contexts.index_of('c-2') == 1
+    assert contexts.period_id('c-1') == contexts.period_id('c-2')
+    assert contexts.get('c-3') is None
+    assert contexts['c-2'].dimensions == {'us-gaap:StatementBusinessSegmentsAxis': 'aapl:AmericasMember'}
+    assert contexts['c-1'].model_dump() == {'context_id': 'c-1', 'entity': {},
+                                            'period': {'type': 'instant', 'instant': '2024-12-31'}, 'dimensions': {}}
+    # Replacing a context keeps its position
+    contexts.add('c-1', period={'type': 'forever'})
+    assert list(contexts) == ['c-1', 'c-2']
+    assert contexts['c-1'].period_string == "Forever"
@@ -245,4 +245,36 @@ def test_calculate_quick_ratio(comcast_xbrl):
     # Calculate quick ratio
     quick_ratio = ratios.calculate_quick_ratio()
     assert quick_ratio is not None
-    print(quick_ratio)
\ No newline at end of file
+    print(quick_ratio)
+
+def test_batch_ratios_match_financial_ratios():
+    xbrls = {name: XBRL.parse_directory(f"tests/fixtures/xbrl2/{name}") for name in ["aapl/10k_2023", "msft/10k_2015"]}
+    batch = BatchFinancialRatios(xbrls)
+    df = batch.calculate_all()
+    assert set(df.columns) == {'filing', 'period', 'group', 'ratio', 'value'}
+    assert set(df.filing) == set(xbrls)
+    assert set(df.group) == {'liquidity', 'profitability', 'efficiency', 'leverage'}
+
+    for name, xbrl in xbrls.items():
+        fr = FinancialRatios(xbrl)
+        for ratio, analysis in [('current', fr.calculate_current_ratio()), ('quick', fr.calculate_quick_ratio())]:
+            expected = analysis.results.iloc[0].dropna()
+            actual = df[(df.filing == name) & (df.ratio == ratio)].set_index('period')['value']
+            assert actual.to_dict() == pytest.approx(expected.to_dict())
+
+
+
+def test_batch_ratios_calculate_missing_concepts_from_equivalents():
+    class WithoutGrossProfit(BatchFinancialRatios):
+        def _filing_matrix(self, xbrl):
+            matrix = super()._filing_matrix(xbrl)
+            matrix.loc[StandardConcept.GROSS_PROFIT] = float('nan')
+            return matrix
+
+    batch = WithoutGrossProfit([XBRL.parse_directory("tests/fixtures/xbrl2/aapl/10k_2023")])
+    matrix = batch.concept_matrix()
+    gross_profit = matrix.loc[StandardConcept.GROSS_PROFIT]
+    assert not gross_profit.isna().any()
+    assert gross_profit.tolist() == (matrix.loc[StandardConcept.REVENUE] -
+                                     matrix.loc[StandardConcept.COST_OF_REVENUE]).tolist()
+    assert len(batch.calculate_all().query("ratio == 'gross_margin'")) == len(gross_profit)
@@ -1,11 +1,12 @@
 import os
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
 from edgar.xbrl.standardization import (
     StandardConcept, MappingStore, ConceptMapper, 
-    standardize_statement, initialize_default_mappings
+    standardize_statement, initialize_default_mappings,
+    InferredMappingCache, get_concept_mapper
 )
 
 # Directly import company fixtures
@@ -326,4 +327,74 @@ def test_concept_mapper_learning(test_companies):
     
     # Clean up
     if os.path.exists("test_learning_mapping.json"):
-        os.remove("test_learning_mapping.json")
\ No newline at end of file
+        os.remove("test_learning_mapping.json")
+
+def test_inferred_mappings_are_persisted(tmp_path):
+    """Test that inferred mappings are saved and reused by a new mapper."""
+    store = initialize_default_mappings(read_only=True)
+    cache_path = tmp_path / "inferred_mappings.json"
+    mapper = ConceptMapper(store, inferred_cache=InferredMappingCache(cache_path))
+
+    context = {"statement_type": "BalanceSheet"}
+    assert mapper.map_concept("acme_TotalCurrentAssets", "Total current assets", context) == "Total Current Assets"
+    assert mapper.map_concept("acme_WidgetReserve", "Widget reserve", context) is None
+    mapper.inferred_cache.save()
+    assert cache_path.exists()
+
+    # A new mapper is served from the saved cache without inferring
+    mapper = ConceptMapper(store, inferred_cache=InferredMappingCache(cache_path))
+    mapper._infer_mapping = MagicMock(side_effect=AssertionError("should not infer"))
+    assert mapper.map_concept("acme_TotalCurrentAssets", "Total current assets", context) == "Total Current Assets"
+    assert mapper.map_concept("acme_WidgetReserve", "Widget reserve", context) is None
+
+    # The cache is ignored when the inference rules change
+    with patch("edgar.xbrl.standardization.core.INFERENCE_VERSION", -1):
+        assert len(InferredMappingCache(cache_path)) == 0
+
+
+def test_inferred_mappings_depend_on_the_label(tmp_path):
+    """Test that a concept seen with another label is inferred again, in memory and from the saved cache."""
+    store = initialize_default_mappings(read_only=True)
+    cache_path = tmp_path / "inferred_mappings.json"
+    mapper = ConceptMapper(store, inferred_cache=InferredMappingCache(cache_path))
+    context = {"statement_type": "BalanceSheet"}
+    assert mapper.map_concept("us-gaap_OtherLiabilitiesCurrentXYZ", "Misc items", context) is None
+    assert mapper.map_concept("us-gaap_OtherLiabilitiesCurrentXYZ", "Total current liabilities",
+                              context) == "Total Current Liabilities"
+    mapper.inferred_cache.save()
+
+    mapper = ConceptMapper(store, inferred_cache=InferredMappingCache(cache_path))
+    mapper._infer_mapping = MagicMock(side_effect=AssertionError("should not infer"))
+    assert mapper.map_concept("us-gaap_OtherLiabilitiesCurrentXYZ", "Misc items", context) is None
+    assert mapper.map_concept("us-gaap_OtherLiabilitiesCurrentXYZ", "Total current liabilities",
+                              context) == "Total Current Liabilities"
+
+def test_inferred_mapping_matches_full_difflib_scan():
+    """Test that ranking with rapidfuzz picks the same best label as scoring every label with difflib."""
+    from difflib import SequenceMatcher
+    mapper = ConceptMapper(initialize_default_mappings(read_only=True))
+    labels = ["Total current liabilities and accruals", "Cash and cash equivalents at end of period",
+              "Research and development expense", "Accounts payable, trade", "Other comprehensive loss",
+              "Net cash used in investing activities", "Property plant equipment net of depreciation",
+              "Selling general and admin", "Deferred tax liabilities noncurrent", "Short term borrowings"]
+    for label in labels:
+        for statement_type in ["BalanceSheet", "IncomeStatement", "CashFlowStatement", ""]:
+            concept, confidence = mapper._infer_mapping("acme_Concept", label, {"statement_type": statement_type})
+            if concept is None:
+                continue
+            # The first label with the highest ratio, as a full scan picks it
+            candidates = mapper._candidate_labels[statement_type]
+            if not any(kw in label.lower() for kw in {"BalanceSheet": mapper._bs_keywords,
+                                                      "IncomeStatement": mapper._is_keywords,
+                                                      "CashFlowStatement": mapper._cf_keywords}.get(statement_type, [])):
+                candidates = mapper._candidate_labels['']
+            expected = max(candidates, key=lambda candidate: SequenceMatcher(None, label.lower(), candidate).ratio())
+            assert concept == mapper._std_concept_by_label[expected].value
+
+
+def test_get_concept_mapper_is_shared():
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        mappers = list(executor.map(lambda _: get_concept_mapper(), range(8)))
+    assert all(mapper is mappers[0] for mapper in mappers)
+    assert mappers[0].inferred_cache is not None
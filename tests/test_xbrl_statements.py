@@ -559,4 +559,46 @@ def test_historical_vs_modern_xbrl_statements(nflx_10k_2010, nflx_10k_2024):
     
     # Due to taxonomy changes over time, we don't enforce a specific number of common concepts
     # but there should be at least some core concepts shared
-    assert common_concepts, "No common concepts found between historical and modern statements"
\ No newline at end of file
+    assert common_concepts, "No common concepts found between historical and modern statements"
+
+def test_statements_are_cached(aapl_xbrl):
+    balance_sheet = aapl_xbrl.statements.balance_sheet()
+    rendered = balance_sheet.render()
+    assert aapl_xbrl.statements.balance_sheet().render() == rendered
+    balance_sheet.to_dataframe()
+
+    stats = aapl_xbrl.statement_cache_stats()
+    assert stats.hits['rendered'] == 2
+    assert stats.misses['statement'] == 1
+
+    # Different arguments are cached separately
+    balance_sheet.render(standard=False)
+    assert aapl_xbrl.statement_cache_stats().misses['rendered'] == 2
+
+    # The results are deep copies so callers can annotate and edit them
+    data = aapl_xbrl.get_statement("BalanceSheet")
+    item = next(item for item in data if item['values'])
+    period = next(iter(item['values']))
+    original_value = item['values'][period]
+    data[0]['statement_type'] = 'Annotated'
+    item['values'][period] = -1
+    item['children'].append('Annotated')
+    data = aapl_xbrl.get_statement("BalanceSheet")
+    assert 'statement_type' not in data[0]
+    item = next(item for item in data if item['values'])
+    assert item['values'][period] == original_value
+    assert 'Annotated' not in item['children']
+
+    rendered.rows[0].cells.clear()
+    assert balance_sheet.render() != rendered
+    matching_statements, _, _ = aapl_xbrl.find_statement("BalanceSheet")
+    matching_statements.clear()
+    assert aapl_xbrl.find_statement("BalanceSheet")[0]
+    period_views = aapl_xbrl.get_period_views("BalanceSheet")
+    period_views[0]['period_keys'].clear()
+    assert aapl_xbrl.get_period_views("BalanceSheet")[0]['period_keys']
+
+    aapl_xbrl.clear_statement_cache()
+    balance_sheet.render()
+    assert aapl_xbrl.statement_cache_stats().invalidations == 1
+    assert aapl_xbrl.statement_cache_stats().misses['rendered'] == 3
@@ -2,6 +2,7 @@
 Tests for the XBRL statement stitching functionality.
 """
 
+import copy
 from unittest.mock import MagicMock, patch
 from edgar import *
 from edgar.xbrl import XBRL, XBRLS
@@ -216,6 +217,20 @@ def test_stitch_statements(stitcher):
     assert result['statement_data'][0]['label'] == 'Total Assets'
 
 
+def test_columnar_stitching_matches_dict_stitching():
+    xbrls = [XBRL.parse_directory(f'tests/fixtures/xbrl2/aapl/{filing}')
+             for filing in ['10k_2023', '10k_2022', '10k_2015', '10k_2010']]
+    for statement_type in ['IncomeStatement', 'BalanceSheet', 'CashFlowStatement']:
+        statements = [xbrl.get_statement_by_type(statement_type) for xbrl in xbrls]
+        for standard in [True, False]:
+            dict_result = StatementStitcher().stitch_statements(copy.deepcopy(statements), max_periods=10,
+                                                                standard=standard, columnar=False)
+            columnar_result = StatementStitcher().stitch_statements(copy.deepcopy(statements), max_periods=10,
+                                                                    standard=standard, columnar=True)
+            assert columnar_result == dict_result
+            assert columnar_result['statement_data']
+
+
 def test_stitch_aapl_statements():
     c = Company("AAPL")
     filings = c.latest("10-K", 2)  # 2 filings should cover ~4 years with overlaps